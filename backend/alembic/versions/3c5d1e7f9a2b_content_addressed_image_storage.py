@@ -0,0 +1,37 @@
+"""Content-addressed image storage
+
+Revision ID: 3c5d1e7f9a2b
+Revises: 2a8b7c9d3e1f
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5d1e7f9a2b'
+down_revision: Union[str, None] = '2a8b7c9d3e1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The initial schema left the storage_path_full unique constraint unnamed
+naming_convention = {
+    "uq": "uq_%(table_name)s_%(column_0_name)s",
+}
+
+
+def upgrade() -> None:
+    # Identical images now share one blob, so storage_path_full is no longer unique
+    with op.batch_alter_table('image_assets', naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('uq_image_assets_storage_path_full', type_='unique')
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index('idx_content_hash', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('image_assets', naming_convention=naming_convention) as batch_op:
+        batch_op.drop_index('idx_content_hash')
+        batch_op.drop_column('content_hash')
+        batch_op.create_unique_constraint('uq_image_assets_storage_path_full', ['storage_path_full'])
@@ -1,13 +1,15 @@
 """Frontend Integration API - Simplified endpoints for web frontend"""
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..models import GameSession, Character as DBCharacter, Location as DBLocation, Event as DBEvent
-from ..services.game_state_manager import get_session, create_session
+from ..services.game_state_manager import get_session_async, create_session_async
+from ..services import game_queries
 
 router = APIRouter(prefix="/api/v1/frontend", tags=["frontend"])
 
@@ -54,21 +56,11 @@ class GameStateSummary(BaseModel):
 @router.get("/sessions", response_model=List[GameSessionSummary])
 async def list_sessions_summary(
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a simplified list of all game sessions for frontend display"""
-    sessions = db.query(GameSession).filter(
-        GameSession.deleted_at == None
-    ).order_by(GameSession.last_played_at.desc()).limit(limit).all()
-
     summaries = []
-    for session in sessions:
-        # Count characters
-        char_count = db.query(DBCharacter).filter(
-            DBCharacter.session_id == session.id,
-            DBCharacter.deleted_at == None
-        ).count()
-
+    for session, char_count in await game_queries.list_sessions_with_character_counts(db, limit):
         summaries.append(GameSessionSummary(
             id=session.id,
             name=session.name,
@@ -85,14 +77,11 @@ async def list_sessions_summary(
 @router.get("/sessions/{session_id}/state", response_model=GameStateSummary)
 async def get_game_state_summary(
     session_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get complete game state in a frontend-friendly format"""
     # Get session
-    db_session = db.query(GameSession).filter(
-        GameSession.id == session_id,
-        GameSession.deleted_at == None
-    ).first()
+    db_session = await game_queries.get_active_session(db, session_id)
 
     if not db_session:
         raise HTTPException(
@@ -101,10 +90,7 @@ async def get_game_state_summary(
         )
 
     # Get characters
-    characters = db.query(DBCharacter).filter(
-        DBCharacter.session_id == session_id,
-        DBCharacter.deleted_at == None
-    ).all()
+    characters = await game_queries.list_characters(db, session_id)
 
     character_summaries = [
         CharacterSummary(
@@ -113,7 +99,7 @@ async def get_game_state_summary(
             char_class=char.char_class,
             hp=char.hp,
             max_hp=char.max_hp,
-            alive=char.data.get("alive", True) if char.data else True,
+            alive=char.alive,
             team=char.team
         )
         for char in characters
@@ -122,11 +108,7 @@ async def get_game_state_summary(
     # Get current location
     current_location = None
     if db_session.current_location_id:
-        loc = db.query(DBLocation).filter(
-            DBLocation.id == db_session.current_location_id,
-            DBLocation.session_id == session_id,
-            DBLocation.deleted_at == None
-        ).first()
+        loc = await game_queries.get_location(db, session_id, db_session.current_location_id)
 
         if loc:
             current_location = LocationSummary(
@@ -134,13 +116,11 @@ async def get_game_state_summary(
                 name=loc.name,
                 description=loc.description,
                 location_type=loc.location_type,
-                visited=loc.data.get("visited_count", 0) > 0 if loc.data else False
+                visited=loc.visited > 0
             )
 
     # Get recent events
-    recent_events = db.query(DBEvent).filter(
-        DBEvent.session_id == session_id
-    ).order_by(DBEvent.created_at.desc()).limit(10).all()
+    recent_events = await game_queries.recent_events(db, session_id, 10)
 
     event_summaries = [
         {
@@ -191,9 +171,9 @@ async def perform_quick_action(
         )
 
     # Get or create state manager
-    state_manager = get_session(session_id)
+    state_manager = await get_session_async(session_id)
     if not state_manager:
-        state_manager = create_session(session_id)
+        state_manager = await create_session_async(session_id)
 
     result = {"action": action, "success": False, "message": ""}
 
@@ -213,7 +193,7 @@ async def perform_quick_action(
             "team": char_data.get("team", "player")
         }
 
-        state_manager.add_character(character)
+        state_manager.add_character(char_id, character)
 
         # Persist to database
         db_char = DBCharacter(
@@ -250,17 +230,17 @@ async def perform_quick_action(
             result["message"] = "Attacker or target not found"
             return result
 
-        # Simple attack calculation
+        # Simple attack calculation (state is read-only, so build the update)
         damage = max(1, attacker["attack"] - target["defense"])
-        target["hp"] = max(0, target["hp"] - damage)
+        updates = {"hp": max(0, target["hp"] - damage)}
 
-        if target["hp"] <= 0:
-            target["alive"] = False
+        if updates["hp"] <= 0:
+            updates["alive"] = False
             message = f"{attacker['name']} defeats {target['name']}!"
         else:
             message = f"{attacker['name']} attacks {target['name']} for {damage} damage!"
 
-        state_manager.update_character(target_id, target)
+        state_manager.update_character(target_id, updates)
 
         # Log event
         event = DBEvent(
@@ -323,13 +303,10 @@ async def perform_quick_action(
 
 
 @router.get("/sessions/{session_id}/dashboard")
-async def get_dashboard_data(session_id: str, db: Session = Depends(get_db)):
+async def get_dashboard_data(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get dashboard data for the frontend"""
     # Get session
-    db_session = db.query(GameSession).filter(
-        GameSession.id == session_id,
-        GameSession.deleted_at == None
-    ).first()
+    db_session = await game_queries.get_active_session(db, session_id)
 
     if not db_session:
         raise HTTPException(
@@ -338,24 +315,10 @@ async def get_dashboard_data(session_id: str, db: Session = Depends(get_db)):
         )
 
     # Get statistics
-    char_count = db.query(DBCharacter).filter(
-        DBCharacter.session_id == session_id,
-        DBCharacter.deleted_at == None
-    ).count()
-
-    loc_count = db.query(DBLocation).filter(
-        DBLocation.session_id == session_id,
-        DBLocation.deleted_at == None
-    ).count()
-
-    event_count = db.query(DBEvent).filter(
-        DBEvent.session_id == session_id
-    ).count()
+    stats = await game_queries.session_statistics(db, session_id)
 
     # Get recent activity
-    recent_events = db.query(DBEvent).filter(
-        DBEvent.session_id == session_id
-    ).order_by(DBEvent.created_at.desc()).limit(5).all()
+    recent_events = await game_queries.recent_events(db, session_id, 5)
 
     recent_activity = [
         {
@@ -371,9 +334,9 @@ async def get_dashboard_data(session_id: str, db: Session = Depends(get_db)):
         "session_id": session_id,
         "session_name": db_session.name,
         "statistics": {
-            "characters": char_count,
-            "locations": loc_count,
-            "events": event_count,
+            "characters": stats["characters"],
+            "locations": stats["locations"],
+            "events": stats["events"],
             "turns": db_session.turn_count
         },
         "recent_activity": recent_activity,
@@ -1,22 +1,25 @@
 """Game session CRUD API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..models import GameSession, Character as DBCharacter, Location as DBLocation, Event as DBEvent
 from ..services.game_state_manager import (
     GameStateManager,
-    get_session,
-    create_session,
+    get_session_async,
+    create_session_async,
     delete_session,
-    get_all_active_sessions
+    get_all_active_sessions,
+    register_session_async
 )
+from ..services.turn_log import TurnLogIntegrityError, load_state, record_changes
 from ..services.game_service import game_service
+from ..services import game_queries
 
 router = APIRouter(prefix="/api/v1/game", tags=["game"])
 
@@ -86,7 +89,7 @@ async def create_game_session(
     db.refresh(db_session)
 
     # Create in-memory state manager
-    state_manager = create_session(session_id)
+    state_manager = await create_session_async(session_id)
 
     return GameSessionResponse(
         id=db_session.id,
@@ -107,19 +110,14 @@ async def list_game_sessions(
     limit: int = 20,
     offset: int = 0,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all game sessions with pagination.
 
     Filter by status (active, completed, failed, paused).
     """
-    query = db.query(GameSession).filter(GameSession.deleted_at == None)
-
-    if status:
-        query = query.filter(GameSession.status == status)
-
-    sessions = query.order_by(desc(GameSession.last_played_at)).offset(offset).limit(limit).all()
+    sessions = await game_queries.list_sessions(db, limit, offset, status)
 
     return [
         GameSessionResponse(
@@ -141,13 +139,10 @@ async def list_game_sessions(
 @router.get("/sessions/{session_id}", response_model=GameSessionResponse)
 async def get_game_session(
     session_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific game session"""
-    db_session = db.query(GameSession).filter(
-        GameSession.id == session_id,
-        GameSession.deleted_at == None
-    ).first()
+    db_session = await game_queries.get_active_session(db, session_id)
 
     if not db_session:
         raise HTTPException(
@@ -207,7 +202,7 @@ async def delete_game_session(
 @router.get("/sessions/{session_id}/state")
 async def get_game_state(
     session_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get complete game state (fast, from memory if available).
@@ -215,10 +210,7 @@ async def get_game_state(
     Returns the full in-memory state including characters, locations, and recent events.
     """
     # Check session exists in DB
-    db_session = db.query(GameSession).filter(
-        GameSession.id == session_id,
-        GameSession.deleted_at == None
-    ).first()
+    db_session = await game_queries.get_active_session(db, session_id)
 
     if not db_session:
         raise HTTPException(
@@ -227,7 +219,7 @@ async def get_game_state(
         )
 
     # Get from memory if available
-    state_manager = get_session(session_id)
+    state_manager = await get_session_async(session_id)
 
     if state_manager:
         return {
@@ -267,11 +259,11 @@ async def save_game_state(
     """
     Save current game state to database.
 
-    Takes the in-memory state and persists it to the database.
-    Includes integrity checksum for verification.
+    Records any pending changes to the turn log and writes a full
+    snapshot (with integrity checksum), so the next load needs no replay.
     """
     # Get in-memory state
-    state_manager = get_session(session_id)
+    state_manager = await get_session_async(session_id)
 
     if not state_manager:
         raise HTTPException(
@@ -279,10 +271,6 @@ async def save_game_state(
             detail=f"No active session {session_id} in memory. Load it first."
         )
 
-    # Create snapshot with checksum
-    snapshot_data = state_manager.snapshot()
-
-    # Update database record
     db_session = db.query(GameSession).filter(GameSession.id == session_id).first()
 
     if not db_session:
@@ -291,19 +279,15 @@ async def save_game_state(
             detail=f"Game session {session_id} not found in database"
         )
 
-    db_session.state_snapshot = snapshot_data["snapshot"]
-    db_session.turn_count = state_manager.get_turn()
-    db_session.status = state_manager.get_status()
-    db_session.current_location_id = state_manager.state.get("current_location_id")
-    db_session.last_played_at = datetime.now()
+    saved = record_changes(db, state_manager, force_snapshot=True)
     db_session.updated_at = datetime.now()
-
     db.commit()
+    saved.committed()
 
     return {
         "session_id": session_id,
-        "saved_at": snapshot_data["timestamp"],
-        "checksum": snapshot_data["checksum"],
+        "saved_at": datetime.now().isoformat(),
+        "checksum": saved.checksum,
         "turn": db_session.turn_count,
         "status": "success"
     }
@@ -318,8 +302,9 @@ async def load_game_state(
     """
     Load game state from database into memory.
 
-    Creates or updates the in-memory state manager with persisted data.
-    Optionally verifies integrity using checksum.
+    Rebuilds the state from the latest snapshot plus the turn deltas
+    recorded since, replacing any in-memory state for the session.
+    Optionally verifies each delta against its chained checksum.
     """
     db_session = db.query(GameSession).filter(
         GameSession.id == session_id,
@@ -332,20 +317,21 @@ async def load_game_state(
             detail=f"Game session {session_id} not found"
         )
 
-    if not db_session.state_snapshot:
+    try:
+        state_manager = load_state(db, session_id, verify=verify_integrity)
+    except TurnLogIntegrityError as e:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"No saved state available for session {session_id}"
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
         )
 
-    # Get or create state manager
-    state_manager = get_session(session_id)
     if not state_manager:
-        state_manager = create_session(session_id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No saved state available for session {session_id}"
+        )
 
-    # Load state
-    state_json = state_manager.to_json()
-    state_manager.from_json(str(db_session.state_snapshot))
+    await register_session_async(state_manager)
 
     # Update last played
     db_session.last_played_at = datetime.now()
@@ -372,9 +358,11 @@ async def advance_turn(
     """
     Advance to the next turn.
 
-    Updates turn counter, logs events, optionally auto-saves.
+    Updates turn counter, logs events, optionally auto-saves. Auto-save
+    records only this turn's changes; a full snapshot is written every
+    GAME_SNAPSHOT_INTERVAL turns or once enough deltas have accumulated.
     """
-    state_manager = get_session(session_id)
+    state_manager = await get_session_async(session_id)
 
     if not state_manager:
         raise HTTPException(
@@ -403,23 +391,19 @@ async def advance_turn(
         )
         db.add(db_event)
 
+    # Auto-save if requested: the turn delta commits together with its events
+    saved = record_changes(db, state_manager) if auto_save else None
     db.commit()
-
-    # Auto-save if requested
-    if auto_save:
-        db_session = db.query(GameSession).filter(GameSession.id == session_id).first()
-        if db_session:
-            snapshot_data = state_manager.snapshot()
-            db_session.state_snapshot = snapshot_data["snapshot"]
-            db_session.turn_count = new_turn
-            db_session.last_played_at = datetime.now()
-            db.commit()
+    if saved:
+        saved.committed()
 
     return {
         "session_id": session_id,
         "turn": new_turn,
         "events_logged": len(request.events),
-        "auto_saved": auto_save
+        "auto_saved": auto_save,
+        "snapshot_written": bool(saved and saved.snapshot),
+        "delta_bytes": saved.delta_bytes if saved else 0
     }
 
 
@@ -431,7 +415,7 @@ async def get_characters(
     alive_only: bool = False
 ):
     """Get all characters in the session"""
-    state_manager = get_session(session_id)
+    state_manager = await get_session_async(session_id)
 
     if not state_manager:
         raise HTTPException(
@@ -452,7 +436,7 @@ async def update_character(
     updates: CharacterUpdateRequest
 ):
     """Update character state"""
-    state_manager = get_session(session_id)
+    state_manager = await get_session_async(session_id)
 
     if not state_manager:
         raise HTTPException(
@@ -485,19 +469,14 @@ async def get_events(
     session_id: str,
     turn: Optional[int] = None,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get event history for a session.
 
     Retrieves from database for complete history.
     """
-    query = db.query(DBEvent).filter(DBEvent.session_id == session_id)
-
-    if turn is not None:
-        query = query.filter(DBEvent.turn_number == turn)
-
-    events = query.order_by(desc(DBEvent.created_at)).limit(limit).all()
+    events = await game_queries.recent_events(db, session_id, limit, turn=turn)
 
     return {
         "session_id": session_id,
@@ -521,7 +500,7 @@ async def get_active_sessions():
 @router.get("/sessions/{session_id}/summary")
 async def get_session_summary(session_id: str):
     """Get quick summary of session state"""
-    state_manager = get_session(session_id)
+    state_manager = await get_session_async(session_id)
 
     if not state_manager:
         raise HTTPException(
@@ -16,8 +16,9 @@ from dnd_game import Character as GameCharacter
 
 from ..database import get_db
 from ..models import GameSession, Character as DBCharacter, Location as DBLocation, Event as DBEvent
-from ..services.game_state_manager import get_session, create_session
+from ..services.game_state_manager import get_session_async, create_session_async
 from ..services.game_service import GameService
+from ..services.session_actors import MailboxFullError
 
 router = APIRouter(prefix="/api/v1/game-logic", tags=["game-logic"])
 
@@ -119,9 +120,9 @@ async def create_character(
         )
 
     # Get or create state manager
-    state_manager = get_session(session_id)
+    state_manager = await get_session_async(session_id)
     if not state_manager:
-        state_manager = create_session(session_id)
+        state_manager = await create_session_async(session_id)
 
     # Create character using dnd_game.Character (game logic)
     char_id = f"char_{uuid.uuid4().hex[:12]}"
@@ -173,7 +174,7 @@ async def get_characters(
     alive_only: bool = False
 ):
     """Get all characters in the session, optionally filtered by team or alive status"""
-    state_manager = get_session(session_id)
+    state_manager = await get_session_async(session_id)
 
     if not state_manager:
         raise HTTPException(
@@ -181,7 +182,7 @@ async def get_characters(
             detail=f"No active session {session_id}"
         )
 
-    characters = state_manager.get_all_characters()
+    characters = list(state_manager.get_all_characters().values())
 
     if team:
         characters = [c for c in characters if c.get("team") == team]
@@ -198,7 +199,7 @@ async def get_character(
     char_id: str
 ):
     """Get a specific character"""
-    state_manager = get_session(session_id)
+    state_manager = await get_session_async(session_id)
 
     if not state_manager:
         raise HTTPException(
@@ -326,6 +327,11 @@ async def perform_combat_action(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(exc)
         ) from exc
+    except MailboxFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc)
+        ) from exc
 
     return CombatResult(**result)
 
@@ -1,11 +1,17 @@
 """Image generation and management API endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, Request
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
-from ..database import get_db
+from ..database import get_async_db, get_db
+from ..core.http_cache import is_not_modified, validator_headers
 from ..schemas.image import GenerateImageRequest, ImageResponse, ImageListResponse
-from ..services.gemini_client import GeminiClient, QuotaExceededError, GenerationTimeoutError
+from ..services import game_queries
+from ..services.image_jobs import ImageJob, ImageJobSpec, QueueFullError, get_image_job_queue
 from ..services.storage import StorageService
+from ..services.usage_counter import image_usage
 from ..models.image_asset import ImageAsset
 from ..config import settings
 from slowapi import Limiter
@@ -15,84 +21,115 @@ router = APIRouter(prefix="/api/v1/images", tags=["images"])
 limiter = Limiter(key_func=get_remote_address)
 
 
-@router.post("/generate", response_model=ImageResponse)
-@limiter.limit(f"{settings.MAX_REQUESTS_PER_MINUTE}/minute")
-async def generate_image(
-    request: Request,
-    data: GenerateImageRequest,
-    db: Session = Depends(get_db)
-):
-    """
-    Generate new image with error handling
-
-    Rate limited to MAX_REQUESTS_PER_MINUTE per minute per IP address.
-    """
-    try:
-        # Initialize services
-        gemini = GeminiClient(settings.GEMINI_API_KEY)
-        storage = StorageService(settings.IMAGE_STORAGE_DIR)
-
-        # Build full prompt
-        full_prompt = data.prompt
-        if data.custom_prompt:
-            full_prompt = f"{data.prompt}. {data.custom_prompt}"
-
-        # Generate image
-        image_bytes, gen_time = gemini.generate_image(full_prompt, data.aspect_ratio)
-
-        # Save to filesystem
-        paths = storage.save_image(image_bytes, data.subject_name)
-
-        # Save to database (atomic transaction)
-        asset = ImageAsset(
-            component=data.component,
-            subject_type=data.subject_type,
-            subject_name=data.subject_name,
-            prompt_used=full_prompt,
-            custom_prompt=data.custom_prompt,
-            storage_path_full=paths["full_path"],
-            storage_path_thumbnail=paths["thumbnail_path"],
-            file_size_bytes=paths["file_size_bytes"],
-            aspect_ratio=data.aspect_ratio,
-            generation_time_ms=gen_time
-        )
-        db.add(asset)
-        db.commit()
-        db.refresh(asset)
+def _job_http_error(job: ImageJob) -> HTTPException:
+    """Map a failed job to the endpoint's error format"""
+    error = job.error or {"code": 500, "message": "Image generation failed"}
+    return HTTPException(
+        status_code=error["code"],
+        detail={
+            "status": "error",
+            "code": error["code"],
+            "message": error["message"],
+            "detail": error.get("detail")
+        }
+    )
 
-        return asset
 
-    except QuotaExceededError as e:
+def submit_image_job(spec: ImageJobSpec) -> ImageJob:
+    """Queue a generation, mapping a full queue to 503"""
+    try:
+        return get_image_job_queue().submit(spec)
+    except QueueFullError as e:
         raise HTTPException(
-            status_code=429,
+            status_code=503,
             detail={
                 "status": "error",
-                "code": 429,
-                "message": "API quota exceeded",
+                "code": 503,
+                "message": "Image generation queue is full",
                 "detail": str(e)
             }
         )
-    except GenerationTimeoutError as e:
+
+
+async def wait_for_image_asset(job: ImageJob, db: Session) -> ImageAsset:
+    """Await a queued job without blocking the event loop and load its asset"""
+    await get_image_job_queue().wait(job, timeout=settings.IMAGE_JOB_WAIT_TIMEOUT)
+    if not job.finished:
         raise HTTPException(
             status_code=504,
             detail={
                 "status": "error",
                 "code": 504,
                 "message": "Image generation timeout",
-                "detail": str(e)
+                "detail": f"Job {job.id} still {job.status}"
             }
         )
-    except Exception as e:
-        db.rollback()
+    if job.status == "failed":
+        raise _job_http_error(job)
+    return db.get(ImageAsset, job.asset_id)
+
+
+@router.post("/generate", response_model=ImageResponse)
+@limiter.limit(f"{settings.MAX_REQUESTS_PER_MINUTE}/minute")
+async def generate_image(
+    request: Request,
+    data: GenerateImageRequest,
+    wait: bool = True,
+    db: Session = Depends(get_db)
+):
+    """
+    Generate new image with error handling
+
+    The generation is queued and runs on the image worker pool, off the
+    event loop. With wait=true (default) the response is the finished
+    image; with wait=false it is 202 with a job to poll at /jobs/{job_id}.
+    Identical in-flight prompts share one job.
+
+    Rate limited to MAX_REQUESTS_PER_MINUTE per minute per IP address.
+    """
+    job = submit_image_job(ImageJobSpec(
+        subject_type=data.subject_type,
+        subject_name=data.subject_name,
+        prompt=data.prompt,
+        aspect_ratio=data.aspect_ratio,
+        component=data.component,
+        custom_prompt=data.custom_prompt
+    ))
+
+    if not wait:
+        return JSONResponse(status_code=202, content=job.to_dict())
+
+    return await wait_for_image_asset(job, db)
+
+
+@router.get("/jobs/stats")
+async def image_job_stats():
+    """Queue counters: submitted, coalesced, completed, failed, in flight"""
+    return get_image_job_queue().get_stats()
+
+
+@router.get("/jobs/{job_id}")
+async def get_image_job(job_id: str, wait: float = 0):
+    """
+    Poll an image job
+
+    Query params:
+    - wait: Seconds to long-poll for completion before answering (max 60)
+    """
+    queue = get_image_job_queue()
+    job = queue.get(job_id)
+    if not job:
         raise HTTPException(
-            status_code=500,
+            status_code=404,
             detail={
                 "status": "error",
-                "code": 500,
-                "message": "Image generation failed",
-                "detail": str(e)
+                "code": 404,
+                "message": "Image job not found"
             }
         )
+    if wait > 0 and not job.finished:
+        await queue.wait(job, timeout=min(wait, 60))
+    return job.to_dict()
 
 
 @router.get("/search", response_model=ImageListResponse)
@@ -102,7 +139,7 @@ async def search_images(
     is_featured: Optional[bool] = None,
     page: int = 1,
     page_size: int = 12,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Search images with pagination and filtering
@@ -114,27 +151,14 @@ async def search_images(
     - page: Page number (default: 1)
     - page_size: Items per page (default: 12)
     """
-    # Base query - exclude deleted images
-    query = db.query(ImageAsset).filter(ImageAsset.deleted_at == None)
-
-    # Apply filters
-    if subject_name:
-        query = query.filter(ImageAsset.subject_name == subject_name)
-    if subject_type:
-        query = query.filter(ImageAsset.subject_type == subject_type)
-    if is_featured is not None:
-        query = query.filter(ImageAsset.is_featured == is_featured)
-
-    # Order: featured first, then newest
-    query = query.order_by(
-        ImageAsset.is_featured.desc(),
-        ImageAsset.created_at.desc()
+    # Excludes deleted images; featured first, then newest
+    items, total = await game_queries.search_images(
+        db, page, page_size,
+        subject_name=subject_name,
+        subject_type=subject_type,
+        is_featured=is_featured
     )
 
-    # Pagination
-    total = query.count()
-    items = query.offset((page - 1) * page_size).limit(page_size).all()
-
     return ImageListResponse(
         items=items,
         total=total,
@@ -144,16 +168,7 @@ async def search_images(
     )
 
 
-@router.get("/{image_id}")
-async def get_image(image_id: int, include_data: bool = True, db: Session = Depends(get_db)):
-    """
-    Get specific image by ID with optional base64 data
-
-    Increments use_count and updates last_used timestamp.
-
-    Query params:
-    - include_data: If true (default), includes base64 encoded image data
-    """
+def _get_active_asset(db: Session, image_id: int) -> ImageAsset:
     asset = db.query(ImageAsset).filter(
         ImageAsset.id == image_id,
         ImageAsset.deleted_at == None
@@ -168,10 +183,102 @@ async def get_image(image_id: int, include_data: bool = True, db: Session = Depe
                 "message": "Image not found"
             }
         )
+    return asset
 
-    # Increment usage counter
-    asset.use_count += 1
-    db.commit()
+
+def _image_file_missing() -> HTTPException:
+    return HTTPException(
+        status_code=404,
+        detail={
+            "status": "error",
+            "code": 404,
+            "message": "Image file missing"
+        }
+    )
+
+
+def _serve_image_file(request: Request, asset: ImageAsset, path: Optional[str], variant: str) -> Response:
+    """Stream a stored WebP with validators and long-lived cache headers"""
+    if path is None:
+        raise _image_file_missing()
+
+    image_usage.record(asset.id)
+    etag = StorageService.content_etag(path, variant)
+    last_modified = os.stat(path).st_mtime
+    # An image id always refers to the same bytes, so it can be cached as immutable
+    headers = validator_headers(etag, last_modified, settings.IMAGE_CACHE_MAX_AGE)
+    if is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    # FileResponse streams from disk (sendfile where available) instead of buffering
+    return FileResponse(path, media_type="image/webp", headers=headers)
+
+
+@router.get("/{image_id}/file")
+async def get_image_file(image_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Full-size image bytes (image/webp)
+
+    Supports conditional requests (ETag / If-None-Match, Last-Modified /
+    If-Modified-Since) and is cacheable by browsers and proxies.
+    """
+    asset = _get_active_asset(db, image_id)
+    return _serve_image_file(request, asset, StorageService.resolve_path(asset.storage_path_full), "full")
+
+
+@router.get("/{image_id}/thumbnail")
+async def get_image_thumbnail(
+    image_id: int,
+    request: Request,
+    size: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Thumbnail bytes (image/webp), with the same caching as /file
+
+    Query params:
+    - size: Longest edge in pixels, one of THUMBNAIL_SIZES (default 200).
+      Each size is encoded on its first request and stored.
+    """
+    asset = _get_active_asset(db, image_id)
+    storage = StorageService(settings.IMAGE_STORAGE_DIR)
+    size = size or storage.default_thumbnail_size
+    if size not in storage.thumbnail_sizes:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "code": 400,
+                "message": "Unsupported thumbnail size",
+                "detail": f"size must be one of {list(storage.thumbnail_sizes)}"
+            }
+        )
+
+    # Images stored before lazy thumbnails already have their default-size file
+    legacy_thumbnail = asset.storage_path_thumbnail and size == storage.default_thumbnail_size
+    path = StorageService.resolve_path(asset.storage_path_thumbnail) if legacy_thumbnail else None
+    if path is None:
+        full_path = StorageService.resolve_path(asset.storage_path_full)
+        if full_path is None:
+            raise _image_file_missing()
+        path = await storage.ensure_thumbnail_async(full_path, size)
+    return _serve_image_file(request, asset, path, f"thumb{size}")
+
+
+@router.get("/{image_id}")
+async def get_image(image_id: int, include_data: bool = True, db: Session = Depends(get_db)):
+    """
+    Get specific image metadata by ID, with URLs for the binary endpoints
+
+    Counts a use of the image (written in batches, not on this request).
+
+    Query params:
+    - include_data: If true (default), also includes base64 encoded image data;
+      pass false and load full_url / thumbnail_url, which are cacheable and smaller
+    """
+    asset = _get_active_asset(db, image_id)
+
+    # Increment usage counter (flushed in batches by the usage counter task)
+    image_usage.record(asset.id)
 
     # Convert to dict
     response_data = {
@@ -181,26 +288,21 @@ async def get_image(image_id: int, include_data: bool = True, db: Session = Depe
         "component": asset.component,
         "storage_path_full": asset.storage_path_full,
         "storage_path_thumbnail": asset.storage_path_thumbnail,
+        "full_url": f"{router.prefix}/{asset.id}/file",
+        "thumbnail_url": f"{router.prefix}/{asset.id}/thumbnail",
         "file_size_bytes": asset.file_size_bytes,
         "generation_time_ms": asset.generation_time_ms,
         "created_at": asset.created_at.isoformat(),
         "is_featured": asset.is_featured,
-        "use_count": asset.use_count
+        "use_count": asset.use_count + image_usage.pending(asset.id)
     }
 
     # Include base64 data if requested
     if include_data:
         import base64
-        import os
-
-        # storage_path_full already includes "images/full/...", so just use it directly
-        full_path = os.path.join('backend', asset.storage_path_full) if not asset.storage_path_full.startswith('/') else asset.storage_path_full
-
-        # Try backend-relative path first, then absolute
-        if not os.path.exists(full_path):
-            full_path = asset.storage_path_full
 
-        if os.path.exists(full_path):
+        full_path = StorageService.resolve_path(asset.storage_path_full)
+        if full_path:
             with open(full_path, 'rb') as f:
                 image_bytes = f.read()
                 response_data['base64_data'] = base64.b64encode(image_bytes).decode('utf-8')
@@ -254,7 +356,8 @@ async def delete_image(image_id: int, db: Session = Depends(get_db)):
     """
     Soft delete image (marks deleted_at timestamp)
 
-    Actual file deletion happens via cleanup job after 30 days.
+    The image garbage collector purges the row after BACKUP_RETENTION_DAYS
+    (30 days by default) and removes its files once no other image shares them.
     """
     asset = db.query(ImageAsset).filter(
         ImageAsset.id == image_id,
@@ -1,12 +1,13 @@
 """Maintenance and cleanup API endpoints"""
+import asyncio
 from fastapi import APIRouter, Depends
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from datetime import datetime
 from ..database import get_db
 from ..models.scene_cache import SceneCache
 from ..models.image_asset import ImageAsset
-from ..services.storage import StorageService
-from ..config import settings
+from ..services.image_gc import image_gc
 
 router = APIRouter(prefix="/api/v1/maintenance", tags=["maintenance"])
 
@@ -36,37 +37,21 @@ async def cleanup_expired_cache(db: Session = Depends(get_db)):
 
 
 @router.post("/cleanup/orphaned-images")
-async def cleanup_orphaned_images(db: Session = Depends(get_db)):
+async def cleanup_orphaned_images():
     """
     Delete images marked deleted > BACKUP_RETENTION_DAYS days ago
 
-    Performs hard delete - removes from filesystem and database.
+    Performs hard delete - removes rows from the database and files that no
+    remaining image shares. The same collection also runs every
+    IMAGE_GC_INTERVAL seconds in the background.
     """
-    cutoff = datetime.now() - timedelta(days=settings.BACKUP_RETENTION_DAYS)
-
-    orphaned = db.query(ImageAsset).filter(
-        ImageAsset.deleted_at < cutoff
-    ).all()
-
-    storage = StorageService(settings.IMAGE_STORAGE_DIR)
-    count = 0
-
-    for asset in orphaned:
-        # Delete files
-        try:
-            storage.delete_image(asset.storage_path_full, asset.storage_path_thumbnail)
-        except Exception as e:
-            print(f"Error deleting files for asset {asset.id}: {e}")
-
-        # Delete from database
-        db.delete(asset)
-        count += 1
-
-    db.commit()
+    result = await asyncio.to_thread(image_gc.collect)
 
     return {
-        "deleted": count,
-        "message": f"Deleted {count} orphaned images",
+        "deleted": result["assets_purged"],
+        "files_removed": result["files_removed"],
+        "bytes_freed": result["bytes_freed"],
+        "message": f"Deleted {result['assets_purged']} orphaned images",
         "timestamp": datetime.now().isoformat()
     }
 
@@ -88,13 +73,13 @@ async def get_stats(db: Session = Depends(get_db)):
         SceneCache.expires_at > datetime.now()
     ).count()
 
-    # Storage size
+    # Storage size (identical images share one file, so count each path once)
     total_size = db.query(
-        ImageAsset.file_size_bytes
+        func.max(ImageAsset.file_size_bytes)
     ).filter(
         ImageAsset.deleted_at == None
-    ).all()
-    total_bytes = sum(row[0] for row in total_size)
+    ).group_by(ImageAsset.storage_path_full).all()
+    total_bytes = sum(row[0] or 0 for row in total_size)
     total_mb = round(total_bytes / (1024 * 1024), 2)
 
     return {
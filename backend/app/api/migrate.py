@@ -84,7 +84,7 @@ async def migrate_from_localstorage(
             total_bytes += len(image_bytes)
 
             # Save to filesystem
-            paths = storage.save_image(image_bytes, location)
+            paths = await storage.save_image_async(image_bytes, location)
 
             # Create image asset
             asset = ImageAsset(
@@ -95,6 +95,7 @@ async def migrate_from_localstorage(
                 storage_path_full=paths["full_path"],
                 storage_path_thumbnail=paths["thumbnail_path"],
                 file_size_bytes=paths["file_size_bytes"],
+                content_hash=paths["content_hash"],
                 aspect_ratio="16:9",
                 generation_time_ms=0  # Unknown for migrated images
             )
@@ -134,7 +135,7 @@ async def migrate_from_localstorage(
                 total_bytes += len(image_bytes)
 
                 # Save to filesystem
-                paths = storage.save_image(image_bytes, item_name)
+                paths = await storage.save_image_async(image_bytes, item_name)
 
                 # Create image asset
                 asset = ImageAsset(
@@ -146,6 +147,7 @@ async def migrate_from_localstorage(
                     storage_path_full=paths["full_path"],
                     storage_path_thumbnail=paths["thumbnail_path"],
                     file_size_bytes=paths["file_size_bytes"],
+                    content_hash=paths["content_hash"],
                     aspect_ratio="1:1",
                     generation_time_ms=0,  # Unknown for migrated images
                     is_featured=img_data.get("is_featured", False)
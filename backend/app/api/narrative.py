@@ -1,14 +1,17 @@
 """Narrative and World Management API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..models import GameSession, Location as DBLocation, Event as DBEvent
 from ..services.game_state_manager import get_session, create_session
+from ..services import game_queries
+from ..services.turn_log import STATE_DELTA_EVENT
 
 router = APIRouter(prefix="/api/v1/narrative", tags=["narrative"])
 
@@ -291,18 +294,12 @@ async def get_narrative_events(
     event_type: Optional[str] = None,
     location_id: Optional[str] = None,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get narrative events for the session"""
-    query = db.query(DBEvent).filter(DBEvent.session_id == session_id)
-
-    if event_type:
-        query = query.filter(DBEvent.event_type == event_type)
-
-    if location_id:
-        query = query.filter(DBEvent.location_id == location_id)
-
-    events = query.order_by(DBEvent.created_at.desc()).limit(limit).all()
+    events = await game_queries.recent_events(
+        db, session_id, limit, event_type=event_type, location_id=location_id
+    )
 
     return [
         NarrativeEventResponse(
@@ -363,7 +360,8 @@ async def get_world_state(
 
     # Get recent events
     recent_events = db.query(DBEvent).filter(
-        DBEvent.session_id == session_id
+        DBEvent.session_id == session_id,
+        DBEvent.event_type != STATE_DELTA_EVENT
     ).order_by(DBEvent.created_at.desc()).limit(20).all()
 
     event_responses = [
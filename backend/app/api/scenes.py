@@ -2,19 +2,96 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from ..database import get_db
-from ..schemas.image import GenerateImageRequest, ImageResponse
+from typing import Optional, Tuple
+from ..database import SessionLocal, get_db
+from ..schemas.image import ImageResponse
 from ..models.scene_cache import SceneCache
 from ..models.image_asset import ImageAsset
 from ..config import settings
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from .images import generate_image
+from ..services.image_jobs import ImageJobSpec
+from ..services.scene_cache_service import HotSceneCache, HotSceneEntry, SceneKey
+from ..services.single_flight import SingleFlight
+from .images import submit_image_job, wait_for_image_asset
 
 router = APIRouter(prefix="/api/v1/scenes", tags=["scenes"])
 limiter = Limiter(key_func=get_remote_address)
 
 
+# Hot front cache ahead of the SceneCache/ImageAsset join, and single-flight
+# so concurrent misses for the same scene share one generation
+hot_scene_cache = HotSceneCache()
+scene_flights = SingleFlight()
+
+
+def _lookup_cached_scene(db: Session, key: SceneKey) -> Optional[HotSceneEntry]:
+    location, time_of_day, weather = key
+    cached = db.query(SceneCache).join(ImageAsset).filter(
+        SceneCache.location == location,
+        SceneCache.time_of_day == time_of_day,
+        SceneCache.weather == weather,
+        SceneCache.expires_at > datetime.now(),
+        ImageAsset.deleted_at == None
+    ).first()
+    if not cached:
+        return None
+    return HotSceneEntry(cached.id, cached.image_asset_id, cached.expires_at)
+
+
+async def _resolve_scene(key: SceneKey, force_regenerate: bool) -> Tuple[HotSceneEntry, bool]:
+    """
+    Single-flight leader: find a cached scene or generate one and insert
+    its cache row. Returns (entry, generated).
+    """
+    location, time_of_day, weather = key
+    db = SessionLocal()
+    try:
+        if not force_regenerate:
+            entry = _lookup_cached_scene(db, key)
+            if entry:
+                return entry, False
+
+        prompt = f"A {weather} {time_of_day} at {location}. Fantasy RPG setting, detailed environment, atmospheric lighting."
+
+        # Generate through the shared image job queue (coalesces identical prompts)
+        job = submit_image_job(ImageJobSpec(
+            subject_type="scene",
+            subject_name=location,
+            prompt=prompt,
+            aspect_ratio="16:9",
+            component="scene-viewer"
+        ))
+        asset = await wait_for_image_asset(job, db)
+
+        # Create cache entry
+        cache_entry = SceneCache(
+            location=location,
+            time_of_day=time_of_day,
+            weather=weather,
+            image_asset_id=asset.id,
+            expires_at=datetime.now() + timedelta(days=settings.CACHE_EXPIRY_DAYS)
+        )
+        db.add(cache_entry)
+        db.commit()
+        return HotSceneEntry(cache_entry.id, asset.id, cache_entry.expires_at), True
+    finally:
+        db.close()
+
+
+def _record_scene_hit(db: Session, entry: HotSceneEntry) -> Optional[ImageAsset]:
+    """Bump usage stats for a cache hit and return its asset (None if it was deleted)"""
+    asset = db.get(ImageAsset, entry.image_asset_id)
+    if asset is None or asset.deleted_at is not None:
+        return None
+    db.query(SceneCache).filter(SceneCache.id == entry.cache_id).update(
+        {SceneCache.use_count: SceneCache.use_count + 1, SceneCache.last_used: datetime.now()},
+        synchronize_session=False
+    )
+    db.commit()
+    return asset
+
+
 @router.post("/generate", response_model=ImageResponse)
 @limiter.limit("5/minute")  # Stricter limit for scenes
 async def generate_scene(
@@ -28,56 +105,43 @@ async def generate_scene(
     """
     Generate or retrieve cached scene
 
-    Checks cache first (unless force_regenerate=true). Cache entries
-    expire after CACHE_EXPIRY_DAYS days.
+    Checks the in-memory hot cache, then the database cache (unless
+    force_regenerate=true). Cache entries expire after CACHE_EXPIRY_DAYS
+    days. Concurrent misses for the same scene wait on a single generation.
 
     Rate limited to 5/minute per IP address.
     """
+    key: SceneKey = (location, time_of_day, weather)
 
-    # Check cache first (unless forced)
+    # Hot path: no join query
     if not force_regenerate:
-        cached = db.query(SceneCache).join(ImageAsset).filter(
-            SceneCache.location == location,
-            SceneCache.time_of_day == time_of_day,
-            SceneCache.weather == weather,
-            SceneCache.expires_at > datetime.now(),
-            ImageAsset.deleted_at == None
-        ).first()
-
-        if cached:
-            # Cache hit - update usage stats
-            cached.use_count += 1
-            cached.last_used = datetime.now()
-            db.commit()
-            return cached.image_asset
-
-    # Cache miss - generate new scene
-    prompt = f"A {weather} {time_of_day} at {location}. Fantasy RPG setting, detailed environment, atmospheric lighting."
-
-    # Generate via image API (reuse logic)
-    asset = await generate_image(
-        request=request,
-        data=GenerateImageRequest(
-            subject_type="scene",
-            subject_name=location,
-            prompt=prompt,
-            aspect_ratio="16:9",
-            component="scene-viewer"
-        ),
-        db=db
-    )
-
-    # Create cache entry
-    cache_entry = SceneCache(
-        location=location,
-        time_of_day=time_of_day,
-        weather=weather,
-        image_asset_id=asset.id,
-        expires_at=datetime.now() + timedelta(days=settings.CACHE_EXPIRY_DAYS)
+        entry = hot_scene_cache.get(key)
+        if entry:
+            asset = _record_scene_hit(db, entry)
+            if asset is not None:
+                return asset
+            hot_scene_cache.invalidate(location)
+
+    flight_key = ("regenerate",) + key if force_regenerate else key
+    (entry, generated), shared = await scene_flights.do(
+        flight_key, lambda: _resolve_scene(key, force_regenerate)
     )
-    db.add(cache_entry)
-    db.commit()
-
+    hot_scene_cache.put(key, entry)
+
+    if generated and not shared:
+        # This request's generation created the row (use_count starts at 1)
+        return db.get(ImageAsset, entry.image_asset_id)
+
+    asset = _record_scene_hit(db, entry)
+    if asset is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "status": "error",
+                "code": 404,
+                "message": "Scene image was deleted"
+            }
+        )
     return asset
 
 
@@ -91,6 +155,8 @@ async def cache_stats(db: Session = Depends(get_db)):
     - active_cache_entries: Non-expired entries
     - expired: Expired entries waiting for cleanup
     - cache_hit_rate: Percentage of cache hits
+    - hot_cache: In-memory front cache counters
+    - coalesced_requests: Requests that waited on another request's lookup/generation
     """
     total = db.query(SceneCache).count()
     active = db.query(SceneCache).filter(
@@ -109,6 +175,8 @@ async def cache_stats(db: Session = Depends(get_db)):
         "active_cache_entries": active,
         "expired": total - active,
         "cache_hit_rate": round(hit_rate, 2),
+        "hot_cache": hot_scene_cache.get_stats(),
+        "coalesced_requests": scene_flights.stats["followers"],
         "timestamp": datetime.now().isoformat()
     }
 
@@ -135,6 +203,7 @@ async def clear_cache(
         message = "Cleared all scene cache"
 
     db.commit()
+    hot_scene_cache.invalidate(location)
 
     return {
         "deleted": deleted,
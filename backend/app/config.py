@@ -1,5 +1,5 @@
 """Application configuration using Pydantic Settings"""
-from typing import Tuple
+from typing import Optional, Tuple
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -15,6 +15,15 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./dnd_game.db"
+    # Async driver URL for read endpoints; derived from DATABASE_URL when unset
+    # (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Connection pools (SQLite: reader pool plus one writer; other databases: one pool)
+    DB_POOL_SIZE: int = 8
+    DB_POOL_MAX_OVERFLOW: int = 8
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a connection (the SQLite write queue)
+    DB_BUSY_TIMEOUT: float = 5.0  # seconds SQLite retries a locked database
+    DB_SQLITE_SYNCHRONOUS: str = "NORMAL"  # safe with WAL; FULL for power-loss durability
 
     # Storage
     IMAGE_STORAGE_DIR: str = "images"
@@ -23,8 +32,31 @@ class Settings(BaseSettings):
     OBSIDIAN_VAULT_PATH: str = "ai-dnd-test-vault"
     OBSIDIAN_LOG_SUBDIR: str = "Logs"
 
+    # Log pipeline (DatabaseLogProvider -> LogEvent table -> LogWorker -> vault)
+    LOG_BUFFER_MAX_BATCH: int = 200
+    LOG_BUFFER_FLUSH_INTERVAL: float = 0.25
+    LOG_WORKER_BATCH_SIZE: int = 500
+    LOG_WORKER_MIN_POLL: float = 0.05
+    LOG_WORKER_MAX_POLL: float = 5.0
+
+    # Game state persistence (turn deltas + periodic snapshots)
+    GAME_SNAPSHOT_INTERVAL: int = 10  # turns between full snapshots
+    GAME_SNAPSHOT_DELTA_BYTES: int = 65536  # or sooner, once this much delta has accumulated
+
+    # In-memory session residency (game engines and state managers)
+    GAME_SESSION_MAX_RESIDENT: int = 256
+    GAME_SESSION_IDLE_SECONDS: int = 1800  # flushed and evicted after this long unused
+    GAME_SESSION_SWEEP_INTERVAL: int = 60
+
+    # Game action execution (one ordered mailbox per session)
+    GAME_ACTION_WORKERS: int = 16  # threads shared by all sessions; one action per session at a time
+    GAME_ACTION_MAILBOX_SIZE: int = 64  # queued actions per session before rejecting
+    GAME_SIMULATION_PROCESSES: int = 0  # process pool for CPU-heavy simulation (0 = CPU count)
+
     # Caching
     CACHE_EXPIRY_DAYS: int = 7
+    SCENE_HOT_CACHE_SIZE: int = 256
+    SCENE_HOT_CACHE_TTL: float = 300.0
 
     # API
     # Provide a safe default so imports and tests don't fail when the key isn't configured.
@@ -34,13 +66,29 @@ class Settings(BaseSettings):
     GEMINI_THINKING_LEVEL: str = "high"
     GEMINI_MEDIA_RESOLUTION: str = "media_resolution_high"
     MAX_REQUESTS_PER_MINUTE: int = 10
+    GEMINI_IMAGE_MODEL: str = "gemini-2.5-flash-image"
+
+    # Image job queue
+    IMAGE_JOB_WORKERS: int = 4
+    IMAGE_JOB_MAX_PENDING: int = 100
+    IMAGE_JOB_RETENTION: int = 1000
+    IMAGE_JOB_WAIT_TIMEOUT: float = 120.0
+    # Per-model generation limits, e.g. "gemini-2.5-flash-image=2,imagen-4=1"
+    IMAGE_MODEL_CONCURRENCY: str = ""
+    IMAGE_MODEL_DEFAULT_CONCURRENCY: int = 2
 
     # Image processing
-    THUMBNAIL_SIZE: Tuple[int, int] = (200, 200)
+    THUMBNAIL_SIZE: Tuple[int, int] = (200, 200)  # default thumbnail
+    THUMBNAIL_SIZES: Tuple[int, ...] = (64, 128, 200, 512)  # generated on first request
+    IMAGE_ENCODER_WORKERS: int = 2
     WEBP_QUALITY: int = 85
+    IMAGE_CACHE_MAX_AGE: int = 31536000  # seconds; image ids never change content
+    USAGE_FLUSH_INTERVAL: float = 5.0
 
     # Backup
-    BACKUP_RETENTION_DAYS: int = 30
+    BACKUP_RETENTION_DAYS: int = 30  # soft-deleted images are purged after this
+    IMAGE_GC_INTERVAL: float = 3600.0
+    IMAGE_GC_BLOB_GRACE: float = 3600.0  # seconds before an unreferenced new blob may be removed
 
 
 # Global settings instance
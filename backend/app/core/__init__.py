@@ -1,5 +1,5 @@
 """Core utilities for backend services."""
 
-from . import providers
+from . import http_cache, providers
 
-__all__ = ["providers"]
+__all__ = ["http_cache", "providers"]
@@ -0,0 +1,31 @@
+"""Conditional-request helpers for cacheable binary responses"""
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Mapping
+
+
+def validator_headers(etag: str, last_modified: float, max_age: int) -> Dict[str, str]:
+    """ETag, Last-Modified and Cache-Control for an immutable resource"""
+    return {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": f"public, max-age={max_age}, immutable",
+    }
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: float) -> bool:
+    """
+    Whether a GET can be answered with 304: If-None-Match takes precedence
+    (weak comparison, per RFC 9110); otherwise If-Modified-Since.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
@@ -1,4 +1,6 @@
-from typing import Protocol, Any, Dict, Optional
+from typing import Protocol, Any, Dict, List, Optional, Tuple
+import asyncio
+import threading
 import time
 import logging
 from abc import abstractmethod
@@ -23,6 +25,9 @@ class RealTimeProvider:
     def time(self) -> float:
         return time.time()
 
+    async def async_sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
 class InstantTimeProvider:
     """Zero-delay provider for API/Async modes (non-blocking)"""
     def sleep(self, seconds: float) -> None:
@@ -32,6 +37,10 @@ class InstantTimeProvider:
     def time(self) -> float:
         return time.time()
 
+    async def async_sleep(self, seconds: float) -> None:
+        # Yield to the event loop without delaying
+        await asyncio.sleep(0)
+
 # Define Protocol for Log Provider
 class LogProvider(Protocol):
     @abstractmethod
@@ -59,5 +68,52 @@ class FileLogProvider:
     def log(self, level: int, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
         self.logger.log(level, message, extra=extra)
 
+class NullLogProvider:
+    """Discards every record (headless simulation / benchmarks)"""
+    def log(self, level: int, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+class SequencedLogProvider:
+    """
+    Buffers log records under sequence numbers and forwards them to an inner
+    provider strictly in sequence order, so pipelined producers that finish
+    out of order still produce a deterministic log.
+    """
+    def __init__(self, inner: LogProvider):
+        self.inner = inner
+        self.current_seq = 0
+        self._next_seq = 0
+        self._buffers: Dict[int, List[Tuple[int, str, Optional[Dict[str, Any]]]]] = {}
+        self._completed: set = set()
+        self._lock = threading.Lock()
+
+    def log(self, level: int, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Record under the sequence currently being produced."""
+        self.emit(self.current_seq, level, message, extra)
+
+    def emit(self, seq: int, level: int, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Record under an explicit sequence number."""
+        with self._lock:
+            self._buffers.setdefault(seq, []).append((level, message, extra))
+
+    def complete(self, seq: int) -> None:
+        """Mark a sequence finished and flush every ready sequence in order."""
+        with self._lock:
+            self._completed.add(seq)
+            while self._next_seq in self._completed:
+                self._completed.discard(self._next_seq)
+                for level, message, extra in self._buffers.pop(self._next_seq, []):
+                    self.inner.log(level, message, extra)
+                self._next_seq += 1
+
+    def drain(self) -> None:
+        """Flush everything still buffered in sequence order, skipping sequences that never finished."""
+        with self._lock:
+            for seq in sorted(self._buffers):
+                for level, message, extra in self._buffers.pop(seq):
+                    self.inner.log(level, message, extra)
+            self._next_seq = max([self._next_seq, *(seq + 1 for seq in self._completed)])
+            self._completed.clear()
+
 # Database log provider will be defined in services to avoid circular imports
 # or needing models at core level, but we define the interface here.
@@ -1,19 +1,150 @@
-"""Database configuration with SQLite concurrency handling"""
-from sqlalchemy import create_engine
+"""Database configuration with SQLite concurrency handling
+
+SQLite runs in WAL mode with a pool of reader connections and a single
+writer connection. Sessions read through the reader pool and move to the
+writer for the rest of their transaction as soon as they write, so reads
+never wait on each other and writes are queued on the one writer instead
+of failing with "database is locked". Any other DATABASE_URL (e.g.
+PostgreSQL behind PgBouncer) gets one ordinary pooled engine.
+
+Hot read-only endpoints use AsyncSession (aiosqlite / asyncpg) through
+``get_async_db`` so their queries don't block the event loop; writes,
+Alembic and scripts keep the sync sessions above.
+"""
+from typing import AsyncIterator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from sqlalchemy.sql.base import Executable
 from .config import settings
 
-# StaticPool serializes writes - prevents SQLite locking issues
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,  # Single connection, all writes serialized
-    echo=False  # Set True for SQL debugging
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _is_memory_sqlite(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.DB_SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.DB_BUSY_TIMEOUT * 1000)}")
+    cursor.close()
+
+
+def _begin_immediate_on(engine: Engine) -> None:
+    """
+    Take the write lock at BEGIN rather than on the first write, so a
+    transaction never has to upgrade a read lock (which SQLite can only
+    resolve by failing one side with SQLITE_BUSY).
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_engines(url: str):
+    """Return (write_engine, read_engine) for a database URL"""
+    if not url.startswith("sqlite"):
+        pooled = create_engine(
+            url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_pre_ping=True,  # survive PgBouncer/server-side connection drops
+            pool_recycle=1800,
+            echo=False
+        )
+        return pooled, pooled
+
+    if _is_memory_sqlite(url):
+        # One shared connection: separate connections would see separate databases
+        memory = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            echo=False
+        )
+        return memory, memory
+
+    connect_args = {"check_same_thread": False, "timeout": settings.DB_BUSY_TIMEOUT}
+
+    # Single writer; sessions waiting for it queue on the pool (FIFO, up to DB_POOL_TIMEOUT)
+    writer = create_engine(
+        url,
+        connect_args=connect_args,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        echo=False  # Set True for SQL debugging
+    )
+    event.listen(writer, "connect", _set_sqlite_pragmas)
+    _begin_immediate_on(writer)
+
+    reader = create_engine(
+        url,
+        connect_args=connect_args,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        echo=False
+    )
+    event.listen(reader, "connect", _set_sqlite_pragmas)
+    return writer, reader
+
+
+engine, read_engine = create_engines(settings.DATABASE_URL)
+
+
+class RoutingSession(Session):
+    """
+    Session that reads through ``read_bind`` and writes through ``bind``.
+    Once a transaction has written it stays on the writer, so it always
+    reads its own uncommitted changes.
+    """
+
+    def __init__(self, *args, read_bind: Engine = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_bind = read_bind
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.read_bind is None or self.read_bind is self.bind:
+            return self.bind
+        if self.info.get("writer") or self._flushing or _is_write(clause):
+            self.info["writer"] = True
+            return self.bind
+        return self.read_bind
+
+
+def _is_write(clause) -> bool:
+    if clause is None or not isinstance(clause, Executable):
+        return False
+    if getattr(clause, "is_dml", False) or getattr(clause, "is_ddl", False):
+        return True
+    if getattr(clause, "is_select", False):
+        return False
+    # Raw SQL: only plain SELECTs are safe on a reader
+    return not str(clause).lstrip().upper().startswith("SELECT")
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("writer", None)
+
+
+def routing_sessionmaker(write_engine: Engine, reader: Engine) -> sessionmaker:
+    return sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False,
+                        bind=write_engine, read_bind=reader)
+
+
+SessionLocal = routing_sessionmaker(engine, read_engine)
 Base = declarative_base()
 
 
@@ -25,3 +156,84 @@ def get_db():
     finally:
         db.close()
 
+
+def pool_status() -> dict:
+    """Connection pool occupancy, for health and stats endpoints"""
+    status = {"writer": engine.pool.status()}
+    if read_engine is not engine:
+        status["readers"] = read_engine.pool.status()
+    return status
+
+
+# ========== Async sessions (read path) ==========
+
+_async_engine = None
+_async_session_factory = None
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL to its asyncio driver (aiosqlite, asyncpg)"""
+    parsed = make_url(url)
+    backend, driver = parsed.get_backend_name(), parsed.get_driver_name()
+    if backend == "sqlite" and driver != "aiosqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    elif backend == "postgresql" and driver in ("psycopg2", "pg8000"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+def create_async_read_engine(url: str):
+    """Async engine for read queries, pooled like the sync reader"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = async_database_url(url)
+    if _is_memory_sqlite(url.replace("+aiosqlite", "")):
+        return create_async_engine(url, poolclass=StaticPool, echo=False)
+
+    if make_url(url).get_backend_name() == "sqlite":
+        async_engine = create_async_engine(
+            url,
+            connect_args={"timeout": settings.DB_BUSY_TIMEOUT},
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            echo=False
+        )
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return async_engine
+
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        echo=False
+    )
+
+
+def get_async_sessionmaker():
+    """Process-wide async session factory, created on first use"""
+    global _async_engine, _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_engine = create_async_read_engine(settings.ASYNC_DATABASE_URL or settings.DATABASE_URL)
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncIterator:
+    """Async database dependency for FastAPI (read endpoints)"""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
@@ -11,9 +11,15 @@ import shutil
 from pathlib import Path
 
 from .config import settings
-from .database import engine, Base, get_db
+from .database import engine, Base, dispose_async_engine, get_db, pool_status
 from .api import images_router, scenes_router, maintenance_router, migrate_router, game_router, game_logic_router, narrative_router, frontend_router, character_generation_router
 from .services.log_worker import LogWorker
+from .services.image_jobs import get_image_job_queue
+from .services.usage_counter import image_usage
+from .services.image_gc import image_gc
+from .services.game_service import game_service
+from .services.game_state_manager import get_session_residency
+from .services.turn_log import TurnLogIntegrityError
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -74,12 +80,22 @@ if frontend_path.parent.exists():
 async def startup_services():
     """Initialize background services."""
     log_worker.start()
+    image_usage.start()
+    image_gc.start()
+    game_service.start()
+    get_session_residency().start()
 
 
 @app.on_event("shutdown")
 async def shutdown_services():
     """Tear down background services."""
-    log_worker.stop()
+    await log_worker.stop()
+    await get_image_job_queue().shutdown()
+    await image_usage.stop()
+    await image_gc.stop()
+    await game_service.stop()
+    await get_session_residency().stop()
+    await dispose_async_engine()
 
 
 @app.get("/")
@@ -141,6 +157,12 @@ async def health():
         "timestamp": datetime.now().isoformat(),
         "checks": {
             "database": db_status,
+            "database_pools": pool_status(),
+            "session_residency": {
+                "games": game_service.residency_metrics(),
+                "states": get_session_residency().metrics()
+            },
+            "game_actors": game_service.actor_metrics(),
             "disk_space": {
                 "status": disk_status,
                 "free_gb": disk_free_gb
@@ -166,6 +188,12 @@ async def not_found_handler(request: Request, exc):
     )
 
 
+@app.exception_handler(TurnLogIntegrityError)
+async def turn_log_integrity_handler(request: Request, exc: TurnLogIntegrityError):
+    """A session whose saved turn log fails verification can't be reloaded"""
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+
 @app.exception_handler(500)
 async def internal_error_handler(request: Request, exc):
     """Custom 500 handler"""
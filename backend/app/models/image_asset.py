@@ -20,10 +20,13 @@ class ImageAsset(Base):
     prompt_used = Column(Text, nullable=False)
     custom_prompt = Column(Text, nullable=True)
 
-    # Storage (filesystem only)
-    storage_path_full = Column(String(500), nullable=False, unique=True)
+    # Storage (filesystem only). Identical images share one content-addressed
+    # file, so several rows can point at the same path.
+    storage_path_full = Column(String(500), nullable=False)
+    # Legacy only: thumbnails are now made on request, so new rows store ""
     storage_path_thumbnail = Column(String(500), nullable=False)
     file_size_bytes = Column(Integer, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the source bytes; NULL for older files
 
     # Generation metadata
     model_used = Column(String(100), default="gemini-2.5-flash-image")
@@ -45,6 +48,7 @@ class ImageAsset(Base):
         Index('idx_component_lookup', 'component', 'subject_name'),
         Index('idx_featured', 'subject_name', 'is_featured'),
         Index('idx_active', 'deleted_at'),  # For "not deleted" queries
+        Index('idx_content_hash', 'content_hash'),  # Blob reference counts
     )
 
     def __repr__(self):
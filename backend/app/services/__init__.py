@@ -1,7 +1,9 @@
 """Service layer for business logic"""
 from .gemini_client import GeminiClient, GeminiError, QuotaExceededError, GenerationTimeoutError
 from .storage import StorageService
+from .log_buffer import LogBuffer, get_log_buffer
 from .log_worker import LogWorker
+from .image_jobs import ImageJobQueue, ImageJobSpec, QueueFullError, get_image_job_queue
 from .game_service import GameService, game_service
 
 __all__ = [
@@ -10,7 +12,13 @@ __all__ = [
     "QuotaExceededError",
     "GenerationTimeoutError",
     "StorageService",
+    "LogBuffer",
+    "get_log_buffer",
     "LogWorker",
+    "ImageJobQueue",
+    "ImageJobSpec",
+    "QueueFullError",
+    "get_image_job_queue",
     "GameService",
     "game_service",
 ]
@@ -0,0 +1,127 @@
+"""Async read queries for the hot game, frontend and image endpoints"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import GameSession, Character as DBCharacter, Location as DBLocation, Event as DBEvent
+from ..models.image_asset import ImageAsset
+from .turn_log import STATE_DELTA_EVENT
+
+
+async def get_active_session(db: AsyncSession, session_id: str) -> Optional[GameSession]:
+    """A session that has not been soft-deleted, or None"""
+    result = await db.execute(
+        select(GameSession).where(
+            GameSession.id == session_id,
+            GameSession.deleted_at == None
+        )
+    )
+    return result.scalars().first()
+
+
+async def list_sessions(db: AsyncSession, limit: int, offset: int = 0,
+                        status: Optional[str] = None) -> Sequence[GameSession]:
+    """Active sessions, most recently played first"""
+    query = select(GameSession).where(GameSession.deleted_at == None)
+    if status:
+        query = query.where(GameSession.status == status)
+    query = query.order_by(desc(GameSession.last_played_at)).offset(offset).limit(limit)
+    return (await db.execute(query)).scalars().all()
+
+
+async def list_sessions_with_character_counts(db: AsyncSession, limit: int) -> List[Tuple[GameSession, int]]:
+    """Active sessions with their live character counts, in one query"""
+    char_counts = (
+        select(DBCharacter.session_id, func.count(DBCharacter.id).label("char_count"))
+        .where(DBCharacter.deleted_at == None)
+        .group_by(DBCharacter.session_id)
+        .subquery()
+    )
+    query = (
+        select(GameSession, func.coalesce(char_counts.c.char_count, 0))
+        .outerjoin(char_counts, char_counts.c.session_id == GameSession.id)
+        .where(GameSession.deleted_at == None)
+        .order_by(GameSession.last_played_at.desc())
+        .limit(limit)
+    )
+    return [(session, count) for session, count in (await db.execute(query)).all()]
+
+
+async def list_characters(db: AsyncSession, session_id: str) -> Sequence[DBCharacter]:
+    result = await db.execute(
+        select(DBCharacter).where(
+            DBCharacter.session_id == session_id,
+            DBCharacter.deleted_at == None
+        )
+    )
+    return result.scalars().all()
+
+
+async def get_location(db: AsyncSession, session_id: str, location_id: str) -> Optional[DBLocation]:
+    result = await db.execute(
+        select(DBLocation).where(
+            DBLocation.id == location_id,
+            DBLocation.session_id == session_id,
+            DBLocation.deleted_at == None
+        )
+    )
+    return result.scalars().first()
+
+
+async def recent_events(db: AsyncSession, session_id: str, limit: int, turn: Optional[int] = None,
+                        event_type: Optional[str] = None, location_id: Optional[str] = None) -> Sequence[DBEvent]:
+    """Newest narrative events first (turn-log deltas excluded), optionally filtered"""
+    query = select(DBEvent).where(DBEvent.session_id == session_id, DBEvent.event_type != STATE_DELTA_EVENT)
+    if turn is not None:
+        query = query.where(DBEvent.turn_number == turn)
+    if event_type:
+        query = query.where(DBEvent.event_type == event_type)
+    if location_id:
+        query = query.where(DBEvent.location_id == location_id)
+    query = query.order_by(desc(DBEvent.created_at)).limit(limit)
+    return (await db.execute(query)).scalars().all()
+
+
+async def session_statistics(db: AsyncSession, session_id: str) -> Dict[str, int]:
+    """Character, location and event counts for one session, in one round trip"""
+    characters = (
+        select(func.count(DBCharacter.id))
+        .where(DBCharacter.session_id == session_id, DBCharacter.deleted_at == None)
+        .scalar_subquery()
+    )
+    locations = (
+        select(func.count(DBLocation.id))
+        .where(DBLocation.session_id == session_id, DBLocation.deleted_at == None)
+        .scalar_subquery()
+    )
+    events = (
+        select(func.count(DBEvent.id))
+        .where(DBEvent.session_id == session_id, DBEvent.event_type != STATE_DELTA_EVENT)
+        .scalar_subquery()
+    )
+    row = (await db.execute(select(characters, locations, events))).one()
+    return {"characters": row[0], "locations": row[1], "events": row[2]}
+
+
+async def search_images(db: AsyncSession, page: int, page_size: int, subject_name: Optional[str] = None,
+                        subject_type: Optional[str] = None,
+                        is_featured: Optional[bool] = None) -> Tuple[Sequence[ImageAsset], int]:
+    """One page of non-deleted images (featured first, then newest) and the total match count"""
+    filters = [ImageAsset.deleted_at == None]
+    if subject_name:
+        filters.append(ImageAsset.subject_name == subject_name)
+    if subject_type:
+        filters.append(ImageAsset.subject_type == subject_type)
+    if is_featured is not None:
+        filters.append(ImageAsset.is_featured == is_featured)
+
+    total = (await db.execute(select(func.count(ImageAsset.id)).where(*filters))).scalar_one()
+    items = (await db.execute(
+        select(ImageAsset)
+        .where(*filters)
+        .order_by(ImageAsset.is_featured.desc(), ImageAsset.created_at.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )).scalars().all()
+    return items, total
@@ -2,15 +2,18 @@ import asyncio
 import logging
 import json
 from typing import Dict, Optional, Any, Callable, List
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import partial
 
 from sqlalchemy.orm import Session
 
+from ..config import settings
 from ..database import SessionLocal
 from ..models import GameSession, Character as DBCharacter
 from ..core.providers import InstantTimeProvider, LogProvider
-from ..models.log_event import LogEvent
+from .log_buffer import LogBuffer, get_log_buffer
+from .session_actors import SessionActors
+from .session_residency import SessionResidency
 
 # Import the unified game engine
 # We need to add the project root to sys.path if not already done in main
@@ -20,48 +23,53 @@ project_root = Path(__file__).parent.parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from dnd_game import DnDGame, Character
+from dnd_game import DnDGame, CompactCharacter
+
+logger = logging.getLogger("game_service")
 
 class DatabaseLogProvider(LogProvider):
     """
-    Log provider that writes events to the SQLite database queue
-    instead of direct file I/O.
+    Log provider that queues events for the LogEvent table instead of
+    direct file I/O. Lines go through the shared LogBuffer, which
+    bulk-inserts them, rather than one DB session and commit per line.
     """
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, log_buffer: Optional[LogBuffer] = None):
         self.session_id = session_id
+        self.log_buffer = log_buffer or get_log_buffer()
 
     def log(self, level: int, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
         # Map integer level to string
         level_name = logging.getLevelName(level)
-
-        # Create a new DB session for this log entry to ensure it's committed immediately
-        db = SessionLocal()
-        try:
-            log_event = LogEvent(
-                session_id=self.session_id,
-                level=level_name,
-                message=message,
-                log_metadata=extra or {},
-                status="pending"
-            )
-            db.add(log_event)
-            db.commit()
-        except Exception as e:
-            print(f"CRITICAL: Failed to write log to DB: {e}")
-        finally:
-            db.close()
+        self.log_buffer.enqueue(self.session_id, level_name, message, extra or {})
 
 class GameService:
     """
     Service to manage DnDGame instances, handle rehydration from DB,
     and execute actions in a thread pool to avoid blocking the async loop.
+
+    Each session acts as an actor: its actions queue in a per-session
+    mailbox and run one at a time, in order, so they never interleave on
+    the same DnDGame, while different sessions run in parallel. A slow
+    session holds at most one worker thread.
+
+    Games live in a bounded SessionResidency: idle or least recently used
+    games are flushed to the DB and dropped, and rehydrated on next use.
     """
     _instance: Optional['GameService'] = None
 
     def __init__(self):
-        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._executor = ThreadPoolExecutor(max_workers=settings.GAME_ACTION_WORKERS)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._actors = SessionActors(settings.GAME_ACTION_MAILBOX_SIZE)
         # In-memory cache of active games: session_id -> DnDGame
-        self._active_games: Dict[str, DnDGame] = {}
+        self._active_games: SessionResidency[DnDGame] = SessionResidency(
+            "game",
+            loader=self._load_game,
+            flush=self._flush_game,
+            max_resident=settings.GAME_SESSION_MAX_RESIDENT,
+            idle_seconds=settings.GAME_SESSION_IDLE_SECONDS,
+            sweep_interval=settings.GAME_SESSION_SWEEP_INTERVAL,
+        )
 
     @classmethod
     def get_instance(cls) -> 'GameService':
@@ -72,13 +80,35 @@ class GameService:
     async def execute_action(self, session_id: str, action_fn: Callable[[DnDGame], Any]) -> Any:
         """
         Execute a function against a DnDGame instance in a separate thread.
-        Handles loading/caching the game instance.
+        Handles loading/caching the game instance. Runs after any actions
+        already queued for the session.
+
+        Raises:
+            MailboxFullError: too many actions already queued for the session
         """
+        loop = asyncio.get_running_loop()
         # Run the blocking logic in the thread pool
-        return await asyncio.get_running_loop().run_in_executor(
+        return await self._actors.submit(session_id, lambda: loop.run_in_executor(
             self._executor,
             partial(self._run_action_sync, session_id, action_fn)
-        )
+        ))
+
+    async def execute_simulation(self, session_id: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run CPU-heavy work for a session in the process pool, ordered with
+        its other actions. ``fn`` and ``args`` must be picklable, so pass
+        plain data (e.g. character dicts) rather than the live DnDGame.
+        """
+        loop = asyncio.get_running_loop()
+        return await self._actors.submit(session_id, lambda: loop.run_in_executor(
+            self._get_process_pool(),
+            partial(fn, *args)
+        ))
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=settings.GAME_SIMULATION_PROCESSES or None)
+        return self._process_pool
 
     def _run_action_sync(self, session_id: str, action_fn: Callable[[DnDGame], Any]) -> Any:
         """Synchronous worker method"""
@@ -100,10 +130,10 @@ class GameService:
         Get game from cache or rehydrate from DB.
         This runs inside the thread pool.
         """
-        if session_id in self._active_games:
-            return self._active_games[session_id]
+        return self._active_games.get(session_id)
 
-        # Rehydration Logic
+    def _load_game(self, session_id: str) -> Optional[DnDGame]:
+        """Rehydrate a game from the DB (called once per cold session)"""
         db = SessionLocal()
         try:
             session = db.query(GameSession).filter(GameSession.id == session_id).first()
@@ -122,7 +152,8 @@ class GameService:
             game = DnDGame(
                 auto_create_characters=False,
                 time_provider=time_provider,
-                log_provider=log_provider
+                log_provider=log_provider,
+                compact_characters=True
             )
 
             # Load characters from DB
@@ -156,22 +187,20 @@ class GameService:
                     "proficiency_bonus": db_char.proficiency_bonus,
                     "skill_proficiencies": db_char.skill_proficiencies,
                 }
-                character = Character.from_db_dict(char_data)
+                character = CompactCharacter.from_db_dict(char_data)
 
                 if character.team == "players":
                     game.players.append(character)
                 else:
                     game.enemies.append(character)
 
-            # Cache it
-            self._active_games[session_id] = game
             return game
 
         finally:
             db.close()
 
-    def _snapshot_characters(self, session_id: str, game: DnDGame):
-        """Save updated character state to DB"""
+    def _flush_game(self, session_id: str, game: DnDGame):
+        """Save updated character state to DB; raises so eviction keeps unsaved games resident"""
         db = SessionLocal()
         try:
             all_chars = game.players + game.enemies
@@ -187,15 +216,22 @@ class GameService:
                     db_char.alive = char.alive
                     # Update other stats
             db.commit()
-        except Exception as e:
-            print(f"Error snapshotting characters: {e}")
+        except Exception:
+            db.rollback()
+            raise
         finally:
             db.close()
 
+    def _snapshot_characters(self, session_id: str, game: DnDGame):
+        """Per-action snapshot; failures are logged, the game stays resident and is flushed again on eviction"""
+        try:
+            self._flush_game(session_id, game)
+        except Exception as e:
+            logger.error(f"Error snapshotting characters for {session_id}: {e}")
+
     def invalidate_cache(self, session_id: str):
         """Remove session from cache (e.g. after deletion)"""
-        if session_id in self._active_games:
-            del self._active_games[session_id]
+        self._active_games.discard(session_id)
 
     def clear_cache(self, session_id: Optional[str] = None):
         """Clear cache for a specific session or all sessions."""
@@ -204,6 +240,24 @@ class GameService:
         else:
             self._active_games.clear()
 
+    def residency_metrics(self) -> Dict[str, Any]:
+        return self._active_games.metrics()
+
+    def actor_metrics(self) -> Dict[str, Any]:
+        return self._actors.metrics()
+
+    def start(self) -> None:
+        """Start evicting idle games"""
+        self._active_games.start()
+
+    async def stop(self) -> None:
+        """Finish queued actions, stop evicting and flush resident games to the DB"""
+        await self._actors.join()
+        await self._active_games.stop()
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
 
 # Shared singleton instance for modules that prefer direct import
 game_service = GameService.get_instance()
@@ -1,9 +1,84 @@
 """In-memory game state manager with JSON serialization"""
 import json
 import hashlib
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Set
 from datetime import datetime
-from copy import deepcopy
+
+from ..config import settings
+from .session_residency import SessionResidency
+
+# Keys of the state hashed entity-by-entity rather than as one blob
+_ENTITY_KINDS = ("characters", "locations")
+_MAX_EVENTS = 100
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict used for every level of the game state.
+
+    Still a real dict, so json, SQLAlchemy JSON columns, pydantic and
+    FastAPI handle it unchanged, but any attempt to mutate it raises
+    TypeError. Copying returns the same object, as it can never change.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("game state is read-only; use the GameStateManager methods to change it")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples"""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _digest(value: Any) -> str:
+    json_str = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(json_str.encode()).hexdigest()
+
+
+def _map_digest(hashes: Mapping[str, str]) -> str:
+    """Merkle node over per-entity hashes, independent of insertion order"""
+    return hashlib.sha256("".join(f"{key}:{hashes[key]}\n" for key in sorted(hashes)).encode()).hexdigest()
+
+
+def _list_digest(hashes: Sequence[str]) -> str:
+    return hashlib.sha256("".join(hashes).encode()).hexdigest()
+
+
+def _root_digest(state: Mapping[str, Any], sections: Mapping[str, str]) -> str:
+    header = {key: value for key, value in state.items() if key not in sections}
+    return hashlib.sha256(
+        (_digest(header) + "".join(sections[key] for key in sorted(sections))).encode()
+    ).hexdigest()
+
+
+def state_checksum(state: Mapping[str, Any]) -> str:
+    """
+    Merkle checksum of a full state, computed from scratch. Matches what
+    GameStateManager maintains incrementally, so saved snapshots can be
+    verified without a manager.
+    """
+    sections = {kind: _map_digest({key: _digest(entity) for key, entity in state.get(kind, {}).items()})
+                for kind in _ENTITY_KINDS}
+    sections["events"] = _list_digest([_digest(event) for event in state.get("events", ())])
+    return _root_digest(state, sections)
 
 
 class GameStateManager:
@@ -14,29 +89,42 @@ class GameStateManager:
     - Fast in-memory access
     - Automatic JSON conversion
     - State snapshots for save/load
-    - Integrity checksums
-    - Event sourcing support
+    - Integrity checksums, kept incrementally per entity (Merkle-style)
+    - Event sourcing support: every mutation is tracked, and
+      ``collect_delta`` returns just what changed since the last call
+      (``apply_delta`` replays it onto a restored snapshot)
+
+    The state is persistent: ``self.state`` is a read-only FrozenDict that
+    is never changed in place. Every write builds a new version that shares
+    all untouched entities with the previous one, so readers get the
+    current version (or keep an old one) without copying anything.
     """
 
     def __init__(self, session_id: str):
         self.session_id = session_id
-        self.state = {
+        now = datetime.now().isoformat()
+        self.revision = 0  # bumped on every write
+        # Persistence bookkeeping (not part of the state)
+        self.snapshot_turn = 0
+        self.bytes_since_snapshot = 0
+        self.restore({
             "session_id": session_id,
             "turn": 0,
+            "version": 0,      # number of deltas collected so far
             "status": "active",
             "current_location_id": None,
             "characters": {},  # char_id -> character data
             "locations": {},   # loc_id -> location data
             "events": [],      # event list (most recent)
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
+                "created_at": now,
+                "updated_at": now
             }
-        }
+        })
 
-    def get_state(self) -> Dict[str, Any]:
-        """Get complete game state as dictionary"""
-        return deepcopy(self.state)
+    def get_state(self) -> Mapping[str, Any]:
+        """Get complete game state (a read-only view of the current version)"""
+        return self.state
 
     def to_json(self) -> str:
         """Serialize state to JSON string"""
@@ -44,59 +132,177 @@ class GameStateManager:
 
     def from_json(self, json_str: str) -> None:
         """Load state from JSON string"""
-        self.state = json.loads(json_str)
-        self.state["metadata"]["updated_at"] = datetime.now().isoformat()
+        self.restore(json.loads(json_str))
+        self._commit()
+
+    def restore(self, state: Mapping[str, Any]) -> None:
+        """Replace the state with a saved snapshot; nothing is marked changed"""
+        state = freeze(state)
+        if "version" not in state:
+            state = FrozenDict({**state, "version": 0})
+        self._hashes = {kind: {key: _digest(entity) for key, entity in state.get(kind, {}).items()}
+                        for kind in _ENTITY_KINDS}
+        self._event_hashes = tuple(_digest(event) for event in state.get("events", ()))
+        self._sections: Dict[str, Optional[str]] = {}
+        self.state = state
+        self.revision += 1
+        self.snapshot_turn = state.get("turn", 0)
+        self.bytes_since_snapshot = 0
+        self._reset_changes()
+
+    # Change tracking
+    def has_changes(self) -> bool:
+        return bool(
+            self._changed_fields or self._changed_characters or self._removed_characters
+            or self._changed_locations or self._new_events
+        )
+
+    def collect_delta(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the changes since the last call as a compact delta (or None
+        if nothing changed) and start tracking afresh. Changed entities are
+        recorded whole when added and field-by-field when updated.
+        """
+        delta = self.pending_delta()
+        if delta is not None:
+            self.delta_saved(delta)
+        return delta
 
-    def snapshot(self) -> Dict[str, Any]:
+    def pending_delta(self) -> Optional[Dict[str, Any]]:
+        """
+        The delta ``collect_delta`` would return, without bumping the
+        version or resetting change tracking; once it is persisted, pass it
+        to ``delta_saved``.
+        """
+        if not self.has_changes():
+            return None
+
+        delta: Dict[str, Any] = {
+            "version": self.state.get("version", 0) + 1,
+            "turn": self.state["turn"],
+            "updated_at": self.state["metadata"]["updated_at"],
+        }
+        if self._changed_fields:
+            delta["set"] = {field: self.state.get(field) for field in sorted(self._changed_fields)}
+        if self._removed_characters:
+            delta["removed_characters"] = sorted(self._removed_characters)
+        for kind in _ENTITY_KINDS:
+            changed = self._changed_characters if kind == "characters" else self._changed_locations
+            full, partial = {}, {}
+            for entity_id, fields in changed.items():
+                entity = self.state[kind].get(entity_id)
+                if entity is None:
+                    continue
+                if fields is None:
+                    full[entity_id] = entity
+                else:
+                    partial[entity_id] = {field: entity.get(field) for field in fields}
+            if full:
+                delta[kind] = full
+            if partial:
+                delta[f"{kind}_updates"] = partial
+        if self._new_events:
+            delta["events"] = list(self._new_events)
+        return delta
+
+    def delta_saved(self, delta: Mapping[str, Any]) -> None:
+        """Mark a delta from ``pending_delta`` as persisted: bump the version and track afresh"""
+        self._commit(touch=False, version=delta["version"])
+        self._reset_changes()
+
+    def apply_delta(self, delta: Mapping[str, Any]) -> None:
+        """Replay a delta from ``collect_delta`` (used when rebuilding from the log)"""
+        changes = dict(freeze(delta.get("set", {})))
+        removed = delta.get("removed_characters", ())
+        for kind in _ENTITY_KINDS:
+            added, updated = delta.get(kind, {}), delta.get(f"{kind}_updates", {})
+            if not (added or updated or (kind == "characters" and removed)):
+                continue
+            entities = dict(self.state[kind])
+            if kind == "characters":
+                for char_id in removed:
+                    if entities.pop(char_id, None) is not None:
+                        del self._hashes[kind][char_id]
+            for entity_id, data in added.items():
+                entities[entity_id] = self._hash_entity(kind, entity_id, freeze(data))
+            for entity_id, fields in updated.items():
+                if entity_id in entities:
+                    entities[entity_id] = self._hash_entity(
+                        kind, entity_id, FrozenDict({**entities[entity_id], **freeze(fields)})
+                    )
+            self._sections.pop(kind, None)
+            changes[kind] = FrozenDict(entities)
+        if delta.get("events"):
+            changes["events"] = self._append_events(freeze(delta["events"]))
+        updated_at = delta.get("updated_at", self.state["metadata"]["updated_at"])
+        self._commit(touch=False, version=delta["version"],
+                     metadata=FrozenDict({**self.state["metadata"], "updated_at": updated_at}), **changes)
+
+    def snapshot(self, **fields: Any) -> Dict[str, Any]:
         """
         Create a state snapshot for database persistence.
-        Includes checksum for integrity verification.
+        Includes checksum for integrity verification. ``fields`` replace
+        top-level scalar fields in the snapshot only (e.g. a version that
+        is applied once the snapshot is committed).
         """
-        snapshot = self.get_state()
-        checksum = self.calculate_checksum(snapshot)
+        state = FrozenDict({**self.state, **fields}) if fields else self.state
         return {
-            "snapshot": snapshot,
-            "checksum": checksum,
+            "snapshot": state,
+            "checksum": self._checksum(state),
             "timestamp": datetime.now().isoformat()
         }
 
-    def calculate_checksum(self, data: Dict[str, Any]) -> str:
-        """Calculate SHA-256 checksum of state data"""
-        json_str = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(json_str.encode()).hexdigest()
+    def checksum(self) -> str:
+        """Merkle checksum of the current state; only changed sections are rehashed"""
+        return self._checksum(self.state)
 
-    def verify_integrity(self, snapshot: Dict[str, Any], checksum: str) -> bool:
+    def calculate_checksum(self, data: Mapping[str, Any]) -> str:
+        """Calculate the Merkle checksum of state data"""
+        return state_checksum(data)
+
+    def verify_integrity(self, snapshot: Mapping[str, Any], checksum: str) -> bool:
         """Verify snapshot integrity using checksum"""
         calculated = self.calculate_checksum(snapshot)
         return calculated == checksum
 
+    def set_log_checksum(self, checksum: Optional[str]) -> None:
+        """Record where the persisted turn log continues from (see turn_log)"""
+        self._commit(touch=False, metadata=FrozenDict({**self.state["metadata"], "log_checksum": checksum}))
+
     # Character Management
     def add_character(self, char_id: str, char_data: Dict[str, Any]) -> None:
         """Add or update a character"""
-        self.state["characters"][char_id] = char_data
-        self._update_timestamp()
+        self._put_entity("characters", char_id, freeze(char_data))
+        self._changed_characters[char_id] = None
+        self._removed_characters.discard(char_id)
 
-    def get_character(self, char_id: str) -> Optional[Dict[str, Any]]:
+    def get_character(self, char_id: str) -> Optional[Mapping[str, Any]]:
         """Get character data by ID"""
         return self.state["characters"].get(char_id)
 
     def update_character(self, char_id: str, updates: Dict[str, Any]) -> None:
         """Update specific character fields"""
-        if char_id in self.state["characters"]:
-            self.state["characters"][char_id].update(updates)
-            self._update_timestamp()
+        character = self.state["characters"].get(char_id)
+        if character is not None:
+            self._put_entity("characters", char_id, FrozenDict({**character, **freeze(updates)}))
+            self._mark_fields(self._changed_characters, char_id, updates)
 
     def remove_character(self, char_id: str) -> None:
         """Remove a character"""
         if char_id in self.state["characters"]:
-            del self.state["characters"][char_id]
-            self._update_timestamp()
-
-    def get_all_characters(self) -> Dict[str, Dict[str, Any]]:
+            characters = dict(self.state["characters"])
+            del characters[char_id]
+            del self._hashes["characters"][char_id]
+            self._sections.pop("characters", None)
+            self._commit(characters=FrozenDict(characters))
+            self._changed_characters.pop(char_id, None)
+            self._removed_characters.add(char_id)
+
+    def get_all_characters(self) -> Mapping[str, Mapping[str, Any]]:
         """Get all characters"""
-        return deepcopy(self.state["characters"])
+        return self.state["characters"]
 
-    def get_alive_characters(self) -> List[Dict[str, Any]]:
+    def get_alive_characters(self) -> List[Mapping[str, Any]]:
         """Get all alive characters"""
         return [
             char for char in self.state["characters"].values()
@@ -106,20 +312,21 @@ class GameStateManager:
     # Location Management
     def add_location(self, loc_id: str, loc_data: Dict[str, Any]) -> None:
         """Add or update a location"""
-        self.state["locations"][loc_id] = loc_data
-        self._update_timestamp()
+        self._put_entity("locations", loc_id, freeze(loc_data))
+        self._changed_locations[loc_id] = None
 
-    def get_location(self, loc_id: str) -> Optional[Dict[str, Any]]:
+    def get_location(self, loc_id: str) -> Optional[Mapping[str, Any]]:
         """Get location data by ID"""
         return self.state["locations"].get(loc_id)
 
     def update_location(self, loc_id: str, updates: Dict[str, Any]) -> None:
         """Update specific location fields"""
-        if loc_id in self.state["locations"]:
-            self.state["locations"][loc_id].update(updates)
-            self._update_timestamp()
+        location = self.state["locations"].get(loc_id)
+        if location is not None:
+            self._put_entity("locations", loc_id, FrozenDict({**location, **freeze(updates)}))
+            self._mark_fields(self._changed_locations, loc_id, updates)
 
-    def get_current_location(self) -> Optional[Dict[str, Any]]:
+    def get_current_location(self) -> Optional[Mapping[str, Any]]:
         """Get current location"""
         loc_id = self.state.get("current_location_id")
         if loc_id:
@@ -128,26 +335,24 @@ class GameStateManager:
 
     def set_current_location(self, loc_id: str) -> None:
         """Set current location"""
-        self.state["current_location_id"] = loc_id
-        self._update_timestamp()
+        self._commit(current_location_id=loc_id)
+        self._changed_fields.add("current_location_id")
 
     # Event Management
     def add_event(self, event_data: Dict[str, Any]) -> None:
         """Add an event to the timeline"""
         event_data["timestamp"] = datetime.now().isoformat()
-        self.state["events"].append(event_data)
+        event = freeze(event_data)
+        self._new_events.append(event)
 
         # Keep only last 100 events in memory (older ones in DB)
-        if len(self.state["events"]) > 100:
-            self.state["events"] = self.state["events"][-100:]
+        self._commit(events=self._append_events((event,)))
 
-        self._update_timestamp()
-
-    def get_recent_events(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_recent_events(self, limit: int = 10) -> List[Mapping[str, Any]]:
         """Get most recent events"""
-        return self.state["events"][-limit:]
+        return list(self.state["events"][-limit:])
 
-    def get_events_by_turn(self, turn: int) -> List[Dict[str, Any]]:
+    def get_events_by_turn(self, turn: int) -> List[Mapping[str, Any]]:
         """Get all events for a specific turn"""
         return [
             event for event in self.state["events"]
@@ -157,8 +362,8 @@ class GameStateManager:
     # Turn Management
     def next_turn(self) -> int:
         """Increment turn counter and return new turn number"""
-        self.state["turn"] += 1
-        self._update_timestamp()
+        self._commit(turn=self.state["turn"] + 1)
+        self._changed_fields.add("turn")
         return self.state["turn"]
 
     def get_turn(self) -> int:
@@ -168,17 +373,58 @@ class GameStateManager:
     # Status Management
     def set_status(self, status: str) -> None:
         """Set game status (active, paused, completed, failed)"""
-        self.state["status"] = status
-        self._update_timestamp()
+        self._commit(status=status)
+        self._changed_fields.add("status")
 
     def get_status(self) -> str:
         """Get current game status"""
         return self.state["status"]
 
     # Utility
-    def _update_timestamp(self) -> None:
-        """Update the last modified timestamp"""
-        self.state["metadata"]["updated_at"] = datetime.now().isoformat()
+    def _checksum(self, state: Mapping[str, Any]) -> str:
+        for kind in _ENTITY_KINDS:
+            if self._sections.get(kind) is None:
+                self._sections[kind] = _map_digest(self._hashes[kind])
+        if self._sections.get("events") is None:
+            self._sections["events"] = _list_digest(self._event_hashes)
+        return _root_digest(state, self._sections)
+
+    def _commit(self, touch: bool = True, **changes: Any) -> None:
+        """Publish a new state version sharing everything not in ``changes``"""
+        if touch:
+            changes.setdefault(
+                "metadata", FrozenDict({**self.state["metadata"], "updated_at": datetime.now().isoformat()})
+            )
+        self.state = FrozenDict({**self.state, **changes})
+        self.revision += 1
+
+    def _put_entity(self, kind: str, entity_id: str, entity: FrozenDict) -> None:
+        self._hash_entity(kind, entity_id, entity)
+        self._commit(**{kind: FrozenDict({**self.state[kind], entity_id: entity})})
+
+    def _hash_entity(self, kind: str, entity_id: str, entity: FrozenDict) -> FrozenDict:
+        self._hashes[kind][entity_id] = _digest(entity)
+        self._sections.pop(kind, None)
+        return entity
+
+    def _append_events(self, events: Sequence[FrozenDict]) -> tuple:
+        self._event_hashes = (self._event_hashes + tuple(_digest(event) for event in events))[-_MAX_EVENTS:]
+        self._sections.pop("events", None)
+        return (self.state["events"] + tuple(events))[-_MAX_EVENTS:]
+
+    def _reset_changes(self) -> None:
+        self._changed_fields: Set[str] = set()
+        # id -> changed field names, or None when the whole record changed
+        self._changed_characters: Dict[str, Optional[Set[str]]] = {}
+        self._removed_characters: Set[str] = set()
+        self._changed_locations: Dict[str, Optional[Set[str]]] = {}
+        self._new_events: List[Mapping[str, Any]] = []
+
+    @staticmethod
+    def _mark_fields(changed: Dict[str, Optional[Set[str]]], entity_id: str, updates: Dict[str, Any]) -> None:
+        if entity_id in changed and changed[entity_id] is None:
+            return  # already recorded whole
+        changed.setdefault(entity_id, set()).update(updates)
 
     def get_summary(self) -> Dict[str, Any]:
         """Get a summary of current game state"""
@@ -195,30 +441,94 @@ class GameStateManager:
         }
 
 
-# Global registry of active game sessions
-_active_sessions: Dict[str, GameStateManager] = {}
+def _load_saved_state(session_id: str) -> Optional[GameStateManager]:
+    """
+    Rehydrate an evicted (or never loaded) session from its snapshot and
+    turn log. Blocks on the DB; async code goes through get_session_async.
+    """
+    from ..database import SessionLocal
+    from .turn_log import load_state
+
+    db = SessionLocal()
+    try:
+        return load_state(db, session_id)
+    finally:
+        db.close()
+
+
+def _flush_state(session_id: str, manager: GameStateManager) -> None:
+    """Persist unsaved changes before a session leaves memory"""
+    if not manager.has_changes():
+        return
+    from ..database import SessionLocal
+    from .turn_log import record_changes
+
+    db = SessionLocal()
+    try:
+        saved = record_changes(db, manager, force_snapshot=True)
+        db.commit()
+        saved.committed()
+    finally:
+        db.close()
+
+
+# Global registry of active game sessions (bounded; idle sessions are
+# flushed through the turn log and reloaded from it on next access)
+_active_sessions: SessionResidency[GameStateManager] = SessionResidency(
+    "state",
+    loader=_load_saved_state,
+    flush=_flush_state,
+    max_resident=settings.GAME_SESSION_MAX_RESIDENT,
+    idle_seconds=settings.GAME_SESSION_IDLE_SECONDS,
+    sweep_interval=settings.GAME_SESSION_SWEEP_INTERVAL,
+)
 
 
 def get_session(session_id: str) -> Optional[GameStateManager]:
-    """Get an active game session"""
+    """Get an active game session, reloading it from the DB if it was evicted"""
     return _active_sessions.get(session_id)
 
 
+async def get_session_async(session_id: str) -> Optional[GameStateManager]:
+    """
+    ``get_session`` for async handlers: reloading an evicted session from
+    the DB runs on a worker thread instead of the event loop.
+
+    Raises:
+        TurnLogIntegrityError: the saved turn log fails verification
+    """
+    return await _active_sessions.get_async(session_id)
+
+
 def create_session(session_id: str) -> GameStateManager:
     """Create and register a new game session"""
-    manager = GameStateManager(session_id)
-    _active_sessions[session_id] = manager
-    return manager
+    return _active_sessions.put(session_id, GameStateManager(session_id))
+
+
+async def create_session_async(session_id: str) -> GameStateManager:
+    """``create_session`` for async handlers (evictions it causes flush off the event loop)"""
+    return await _active_sessions.put_async(session_id, GameStateManager(session_id))
+
+
+def register_session(manager: GameStateManager) -> GameStateManager:
+    """Make a rebuilt manager the active one for its session"""
+    return _active_sessions.put(manager.session_id, manager)
+
+
+async def register_session_async(manager: GameStateManager) -> GameStateManager:
+    """``register_session`` for async handlers"""
+    return await _active_sessions.put_async(manager.session_id, manager)
 
 
 def delete_session(session_id: str) -> bool:
     """Delete an active game session"""
-    if session_id in _active_sessions:
-        del _active_sessions[session_id]
-        return True
-    return False
+    return _active_sessions.discard(session_id)
 
 
 def get_all_active_sessions() -> List[str]:
     """Get list of all active session IDs"""
-    return list(_active_sessions.keys())
+    return _active_sessions.keys()
+
+
+def get_session_residency() -> SessionResidency[GameStateManager]:
+    return _active_sessions
@@ -0,0 +1,168 @@
+"""Background garbage collection for stored images"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.image_asset import ImageAsset
+from ..models.scene_cache import SceneCache
+from .storage import StorageService
+
+logger = logging.getLogger("image_gc")
+
+
+class ImageGarbageCollector:
+    """
+    Hard-deletes images soft-deleted more than ``retention_days`` ago and
+    removes files no ImageAsset row references any more.
+
+    A blob's reference count is the number of rows (soft-deleted ones
+    included, until they are purged) carrying its content hash, so shared
+    blobs stay on disk while any row still points at them. Blobs younger
+    than ``blob_grace`` seconds are left alone: their row may not be
+    committed yet.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        storage: Optional[StorageService] = None,
+        retention_days: Optional[int] = None,
+        interval: Optional[float] = None,
+        blob_grace: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self._storage = storage
+        self.retention_days = settings.BACKUP_RETENTION_DAYS if retention_days is None else retention_days
+        self.interval = interval or settings.IMAGE_GC_INTERVAL
+        self.blob_grace = settings.IMAGE_GC_BLOB_GRACE if blob_grace is None else blob_grace
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"runs": 0, "assets_purged": 0, "files_removed": 0, "bytes_freed": 0}
+
+    @property
+    def storage(self) -> StorageService:
+        if self._storage is None:
+            self._storage = StorageService(settings.IMAGE_STORAGE_DIR)
+        return self._storage
+
+    def collect(self) -> Dict[str, int]:
+        """Run one purge + sweep; returns what was removed"""
+        purged, freed_paths = self._purge_expired()
+        files, freed = 0, 0
+        for full_path, thumb_path in freed_paths:
+            files, freed = self._remove(full_path, files, freed, thumb_path)
+        files, freed = self._sweep_blobs(files, freed)
+
+        self.stats["runs"] += 1
+        self.stats["assets_purged"] += purged
+        self.stats["files_removed"] += files
+        self.stats["bytes_freed"] += freed
+        if purged or files:
+            logger.info(f"Image GC purged {purged} assets, removed {files} files ({freed} bytes)")
+        return {"assets_purged": purged, "files_removed": files, "bytes_freed": freed}
+
+    def start(self) -> None:
+        """Start the periodic collection task on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ------------------------------------------------------------------
+
+    def _purge_expired(self):
+        """Delete expired rows; returns (count, unreferenced legacy (full, thumbnail) paths)"""
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        db = self.session_factory()
+        try:
+            expired = db.query(ImageAsset).filter(ImageAsset.deleted_at < cutoff).all()
+            if not expired:
+                return 0, []
+            expired_ids = [asset.id for asset in expired]
+            legacy_paths = {
+                asset.storage_path_full: asset.storage_path_thumbnail
+                for asset in expired if not asset.content_hash
+            }
+
+            db.query(SceneCache).filter(
+                SceneCache.image_asset_id.in_(expired_ids)
+            ).delete(synchronize_session=False)
+            db.query(ImageAsset).filter(
+                ImageAsset.id.in_(expired_ids)
+            ).delete(synchronize_session=False)
+            db.commit()
+
+            # Blobs are swept by hash; files from before content addressing go by path
+            still_used = {
+                row[0] for row in db.query(ImageAsset.storage_path_full).filter(
+                    ImageAsset.storage_path_full.in_(legacy_paths)
+                )
+            } if legacy_paths else set()
+            return len(expired_ids), sorted(
+                (full, thumb) for full, thumb in legacy_paths.items() if full not in still_used
+            )
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _sweep_blobs(self, files: int, freed: int):
+        db = self.session_factory()
+        try:
+            referenced = {
+                row[0] for row in db.query(ImageAsset.content_hash).filter(
+                    ImageAsset.content_hash != None
+                ).distinct()
+            }
+        finally:
+            db.close()
+
+        horizon = time.time() - self.blob_grace
+        for content_hash, path in self.storage.iter_blobs():
+            if content_hash in referenced:
+                continue
+            try:
+                if path.stat().st_mtime > horizon:
+                    continue
+            except FileNotFoundError:
+                continue
+            files, freed = self._remove(str(path), files, freed)
+        return files, freed
+
+    def _remove(self, stored_path: str, files: int, freed: int, stored_thumbnail: Optional[str] = None):
+        """Delete a full image and its thumbnails, counting what was there"""
+        path = StorageService.resolve_path(stored_path)
+        if path is None:
+            return files, freed
+        thumb_path = (stored_thumbnail and StorageService.resolve_path(stored_thumbnail)) \
+            or str(self.storage.thumbnail_path(path))
+        try:
+            freed += Path(path).stat().st_size
+            self.storage.delete_image(path, thumb_path)
+            files += 1
+        except Exception as e:
+            logger.error(f"Error deleting image file {path}: {e}")
+        return files, freed
+
+    async def _run_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.collect)
+            except Exception as e:
+                logger.error(f"Error in image GC loop: {e}")
+
+
+image_gc = ImageGarbageCollector()
@@ -0,0 +1,285 @@
+"""Asynchronous image generation job queue"""
+import asyncio
+import hashlib
+import logging
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.image_asset import ImageAsset
+from .gemini_client import GeminiClient, GenerationTimeoutError, QuotaExceededError
+from .storage import StorageService
+
+logger = logging.getLogger("image_jobs")
+
+
+class QueueFullError(Exception):
+    """Raised when too many image jobs are already queued or running"""
+    pass
+
+
+@dataclass
+class ImageJobSpec:
+    """Everything needed to generate and store one image"""
+    subject_type: str
+    subject_name: str
+    prompt: str
+    aspect_ratio: str = "16:9"
+    component: str = "scene-viewer"
+    custom_prompt: Optional[str] = None
+    model: Optional[str] = None
+
+    @property
+    def full_prompt(self) -> str:
+        if self.custom_prompt:
+            return f"{self.prompt}. {self.custom_prompt}"
+        return self.prompt
+
+    def coalesce_key(self) -> str:
+        """
+        Identical requests share one job. The subject and component are part
+        of the key because the job stores a single ImageAsset under them.
+        """
+        material = "\x1f".join([
+            self.model or "", self.full_prompt, self.aspect_ratio,
+            self.subject_type, self.subject_name, self.component,
+        ])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ImageJob:
+    """State of one queued generation, shared by every coalesced requester"""
+    id: str
+    key: str
+    spec: ImageJobSpec
+    status: str = "queued"  # queued, running, completed, failed
+    asset_id: Optional[int] = None
+    error: Optional[Dict[str, Any]] = None
+    requesters: int = 1
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "model": self.spec.model,
+            "subject_type": self.spec.subject_type,
+            "subject_name": self.spec.subject_name,
+            "asset_id": self.asset_id,
+            "error": self.error,
+            "requesters": self.requesters,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+def parse_model_concurrency(spec: str) -> Dict[str, int]:
+    """Parse ``"model-a=2,model-b=1"`` into a per-model limit mapping"""
+    limits = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        model, _, value = part.partition("=")
+        try:
+            limits[model.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning(f"Ignoring invalid concurrency entry: {part!r}")
+    return limits
+
+
+def generate_and_store(spec: ImageJobSpec) -> int:
+    """
+    Default job runner: Gemini generation, WebP encode/thumbnail and the
+    ImageAsset insert. Runs on a worker thread; returns the new asset id.
+    """
+    gemini = GeminiClient(settings.GEMINI_API_KEY, image_model=spec.model)
+    storage = StorageService(settings.IMAGE_STORAGE_DIR)
+
+    image_bytes, gen_time = gemini.generate_image(spec.full_prompt, spec.aspect_ratio)
+    paths = storage.save_image(image_bytes, spec.subject_name)
+
+    db = SessionLocal()
+    try:
+        asset = ImageAsset(
+            component=spec.component,
+            subject_type=spec.subject_type,
+            subject_name=spec.subject_name,
+            prompt_used=spec.full_prompt,
+            custom_prompt=spec.custom_prompt,
+            storage_path_full=paths["full_path"],
+            storage_path_thumbnail=paths["thumbnail_path"],
+            file_size_bytes=paths["file_size_bytes"],
+            content_hash=paths["content_hash"],
+            model_used=spec.model,
+            aspect_ratio=spec.aspect_ratio,
+            generation_time_ms=gen_time
+        )
+        db.add(asset)
+        db.commit()
+        return asset.id
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class ImageJobQueue:
+    """
+    Runs image generations off the event loop.
+
+    ``submit`` returns immediately with a job (an in-flight job with the
+    same model, prompt, aspect ratio, subject and component is reused).
+    Jobs run on a bounded thread pool, with at most N concurrent
+    generations per model, and callers either poll ``get`` or await
+    ``wait``. Finished jobs are kept
+    for polling up to ``retention`` entries.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[ImageJobSpec], int] = generate_and_store,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        model_concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: Optional[int] = None,
+        retention: Optional[int] = None,
+    ):
+        self.runner = runner
+        self.workers = workers or settings.IMAGE_JOB_WORKERS
+        self.max_pending = max_pending or settings.IMAGE_JOB_MAX_PENDING
+        self.model_concurrency = (
+            model_concurrency if model_concurrency is not None
+            else parse_model_concurrency(settings.IMAGE_MODEL_CONCURRENCY)
+        )
+        self.default_concurrency = default_concurrency or settings.IMAGE_MODEL_DEFAULT_CONCURRENCY
+        self.retention = retention or settings.IMAGE_JOB_RETENTION
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image-job")
+        self._jobs: "OrderedDict[str, ImageJob]" = OrderedDict()
+        self._inflight: Dict[str, ImageJob] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {"submitted": 0, "coalesced": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+    def submit(self, spec: ImageJobSpec) -> ImageJob:
+        """Queue a generation (or join an identical in-flight one). Must be called on the event loop."""
+        spec.model = spec.model or settings.GEMINI_IMAGE_MODEL
+        key = spec.coalesce_key()
+
+        existing = self._inflight.get(key)
+        if existing is not None:
+            existing.requesters += 1
+            self.stats["coalesced"] += 1
+            return existing
+
+        if len(self._inflight) >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise QueueFullError(f"{len(self._inflight)} image jobs already pending")
+
+        job = ImageJob(id=uuid.uuid4().hex, key=key, spec=spec)
+        self._inflight[key] = job
+        self._jobs[job.id] = job
+        self._trim()
+        self._tasks[job.id] = asyncio.get_running_loop().create_task(self._run(job))
+        self.stats["submitted"] += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[ImageJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: ImageJob, timeout: Optional[float] = None) -> ImageJob:
+        """Wait for a job to finish; returns it as-is if ``timeout`` elapses first."""
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "inflight": len(self._inflight),
+            "running": sum(1 for job in self._inflight.values() if job.status == "running"),
+            "retained": len(self._jobs),
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel outstanding jobs and stop the worker threads"""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        if model not in self._semaphores:
+            limit = self.model_concurrency.get(model, self.default_concurrency)
+            self._semaphores[model] = asyncio.Semaphore(limit)
+        return self._semaphores[model]
+
+    async def _run(self, job: ImageJob) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._semaphore(job.spec.model):
+                job.status = "running"
+                job.started_at = datetime.now()
+                job.asset_id = await loop.run_in_executor(self._executor, self.runner, job.spec)
+            job.status = "completed"
+            self.stats["completed"] += 1
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = {"code": 503, "message": "Image generation cancelled"}
+            raise
+        except QuotaExceededError as e:
+            self._fail(job, 429, "API quota exceeded", e)
+        except GenerationTimeoutError as e:
+            self._fail(job, 504, "Image generation timeout", e)
+        except Exception as e:
+            self._fail(job, 500, "Image generation failed", e)
+        finally:
+            job.finished_at = datetime.now()
+            self._inflight.pop(job.key, None)
+            self._tasks.pop(job.id, None)
+            job.done.set()
+
+    def _fail(self, job: ImageJob, code: int, message: str, error: Exception) -> None:
+        job.status = "failed"
+        job.error = {"code": code, "message": message, "detail": str(error)}
+        self.stats["failed"] += 1
+        logger.error(f"Image job {job.id} failed: {error}")
+
+    def _trim(self) -> None:
+        """Forget the oldest finished jobs beyond the retention limit"""
+        excess = len(self._jobs) - self.retention
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, job in self._jobs.items() if job.finished][:excess]:
+            del self._jobs[job_id]
+
+
+_default_queue: Optional[ImageJobQueue] = None
+
+
+def get_image_job_queue() -> ImageJobQueue:
+    """Process-wide queue shared by the image and scene endpoints"""
+    global _default_queue
+    if _default_queue is None:
+        _default_queue = ImageJobQueue()
+    return _default_queue
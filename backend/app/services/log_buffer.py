@@ -0,0 +1,158 @@
+"""In-process buffer that bulk-inserts queued log events"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.log_event import LogEvent
+
+logger = logging.getLogger("log_buffer")
+
+
+class LogBuffer:
+    """
+    Collects log lines from game threads and writes them to the LogEvent
+    table in bulk: one INSERT/commit per batch instead of one per line.
+
+    A daemon thread flushes whenever ``max_batch`` rows are waiting or
+    ``flush_interval`` seconds have passed since the first unflushed row.
+    Listeners (e.g. the LogWorker) are called after every flush so they can
+    pick the rows up without waiting for their next poll.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        max_batch: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch or settings.LOG_BUFFER_MAX_BATCH
+        self.flush_interval = settings.LOG_BUFFER_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.stats = {"enqueued": 0, "flushed": 0, "batches": 0, "errors": 0}
+
+        self._rows: List[Dict[str, Any]] = []
+        self._first_enqueued_at = 0.0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._listeners: List[Callable[[int], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def enqueue(self, session_id: str, level: str, message: str,
+                metadata: Optional[Dict[str, Any]] = None, exception: Optional[str] = None) -> None:
+        """Queue one log line; returns immediately."""
+        row = {
+            "session_id": session_id,
+            "level": level,
+            "message": message,
+            "log_metadata": metadata or {},
+            "exception": exception,
+            "status": "pending",
+            "attempts": 0,
+        }
+        with self._cond:
+            if not self._rows:
+                self._first_enqueued_at = time.monotonic()
+            self._rows.append(row)
+            self.stats["enqueued"] += 1
+            if self._closed:
+                flush_now = True
+            else:
+                flush_now = False
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="log-buffer", daemon=True)
+                    self._thread.start()
+                if len(self._rows) >= self.max_batch:
+                    self._cond.notify()
+        if flush_now:
+            self.flush()
+
+    def add_listener(self, callback: Callable[[int], None]) -> None:
+        """Call ``callback(rows_written)`` after each successful flush."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[int], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._rows)
+
+    def flush(self) -> int:
+        """Insert everything queued so far; returns the number of rows written."""
+        with self._flush_lock:
+            with self._cond:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+
+            db = self.session_factory()
+            try:
+                db.execute(insert(LogEvent), rows)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                self.stats["errors"] += 1
+                logger.error(f"Failed to write {len(rows)} log events: {e}")
+                # Put the rows back in front so ordering is preserved for the retry
+                with self._cond:
+                    self._rows[:0] = rows
+                return 0
+            finally:
+                db.close()
+
+            self.stats["flushed"] += len(rows)
+            self.stats["batches"] += 1
+
+        for callback in list(self._listeners):
+            try:
+                callback(len(rows))
+            except Exception as e:
+                logger.error(f"Log buffer listener failed: {e}")
+        return len(rows)
+
+    def close(self) -> None:
+        """Flush remaining rows and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._rows and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                deadline = self._first_enqueued_at + self.flush_interval
+                remaining = deadline - time.monotonic()
+                if len(self._rows) < self.max_batch and remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+            if self.flush() == 0 and self.pending:
+                # Database unavailable: back off instead of spinning on retries
+                time.sleep(self.flush_interval)
+
+
+_default_buffer: Optional[LogBuffer] = None
+_default_buffer_lock = threading.Lock()
+
+
+def get_log_buffer() -> LogBuffer:
+    """Process-wide buffer shared by every DatabaseLogProvider."""
+    global _default_buffer
+    with _default_buffer_lock:
+        if _default_buffer is None:
+            _default_buffer = LogBuffer()
+        return _default_buffer
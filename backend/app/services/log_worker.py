@@ -1,13 +1,23 @@
 import asyncio
 import logging
-import traceback
+import os
+import sys
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
 from sqlalchemy.orm import Session
 
 from ..database import SessionLocal
 from ..models.log_event import LogEvent
 from ..config import settings
+from .log_buffer import LogBuffer, get_log_buffer
+
+project_root = Path(__file__).parent.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from obsidian_logger import sanitize_filename
 
 # Configure logger for the worker itself
 logger = logging.getLogger("log_worker")
@@ -16,11 +26,31 @@ class LogWorker:
     """
     Background worker that polls the LogEvent table and writes entries
     to Obsidian files sequentially to ensure order and prevent race conditions.
+
+    Each batch is grouped by target note and appended with a single
+    open/write per file. The worker wakes as soon as the LogBuffer flushes
+    new rows and backs off (up to LOG_WORKER_MAX_POLL) while idle.
     """
     _instance: Optional['LogWorker'] = None
     _running: bool = False
     _task: Optional[asyncio.Task] = None
 
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        vault_path: Optional[str] = None,
+        log_buffer: Optional[LogBuffer] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.vault_path = vault_path or settings.OBSIDIAN_VAULT_PATH
+        self.log_dir = os.path.join(self.vault_path, settings.OBSIDIAN_LOG_SUBDIR)
+        self.log_buffer = log_buffer or get_log_buffer()
+        self.batch_size = batch_size or settings.LOG_WORKER_BATCH_SIZE
+        self.poll_interval = settings.LOG_WORKER_MIN_POLL
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
     @classmethod
     def get_instance(cls) -> 'LogWorker':
         if cls._instance is None:
@@ -33,75 +63,124 @@ class LogWorker:
             return
 
         self._running = True
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.log_buffer.add_listener(self._on_flush)
         self._task = asyncio.create_task(self._run_loop())
         logger.info("LogWorker started")
 
     async def stop(self):
-        """Stop the background worker task"""
+        """Stop the background worker task, draining queued logs first"""
         self._running = False
+        self.log_buffer.remove_listener(self._on_flush)
         if self._task:
             self._task.cancel()
             try:
                 await self._task
             except asyncio.CancelledError:
                 pass
+
+        # Write whatever is still buffered or pending so nothing is lost on shutdown
+        await asyncio.to_thread(self.log_buffer.flush)
+        while await asyncio.to_thread(self._process_batch) == self.batch_size:
+            pass
         logger.info("LogWorker stopped")
 
+    def _on_flush(self, rows: int):
+        """LogBuffer listener: wake the poll loop (called from the buffer thread)"""
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
     async def _run_loop(self):
-        """Main polling loop"""
+        """Main polling loop with adaptive interval"""
         while self._running:
+            processed = 0
             try:
                 # Run processing in a thread to avoid blocking the async loop with DB/File IO
-                await asyncio.to_thread(self._process_batch)
+                processed = await asyncio.to_thread(self._process_batch)
             except Exception as e:
                 logger.error(f"Error in LogWorker loop: {e}")
 
-            # Poll interval
-            await asyncio.sleep(1.0)
+            if processed >= self.batch_size:
+                # Backlog: go straight to the next batch
+                self.poll_interval = settings.LOG_WORKER_MIN_POLL
+                continue
+            if processed:
+                self.poll_interval = settings.LOG_WORKER_MIN_POLL
+            else:
+                self.poll_interval = min(self.poll_interval * 2, settings.LOG_WORKER_MAX_POLL)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
 
-    def _process_batch(self):
-        """Process a batch of pending logs"""
-        db: Session = SessionLocal()
+    def _process_batch(self) -> int:
+        """Process a batch of pending logs; returns the number of events handled"""
+        db: Session = self.session_factory()
         try:
             # Fetch pending events ordered by ID (creation time)
             events = db.query(LogEvent).filter(
                 LogEvent.status == "pending"
-            ).order_by(LogEvent.id.asc()).limit(50).all()
+            ).order_by(LogEvent.id.asc()).limit(self.batch_size).all()
 
             if not events:
-                return
+                return 0
 
+            # Group by target note, keeping event order within each note
+            groups: Dict[str, List[LogEvent]] = OrderedDict()
             for event in events:
-                self._process_event(db, event)
+                groups.setdefault(self._target_path(event), []).append(event)
+
+            for path, group in groups.items():
+                self._write_group(path, group)
 
             db.commit()
+            return len(events)
         except Exception as e:
             logger.error(f"Error processing batch: {e}")
             db.rollback()
+            return 0
         finally:
             db.close()
 
-    def _process_event(self, db: Session, event: LogEvent):
-        """Process a single log event"""
+    def _target_path(self, event: LogEvent) -> str:
+        """
+        Note that receives an event: ``metadata["note"]`` if set, otherwise the
+        session log, under OBSIDIAN_LOG_SUBDIR using ObsidianLogger file naming.
+        """
+        metadata = event.log_metadata or {}
+        note_name = metadata.get("note") or f"Session {event.session_id}"
+        return os.path.join(self.log_dir, f"{sanitize_filename(str(note_name))}.md")
+
+    @staticmethod
+    def _format_event(event: LogEvent) -> str:
+        timestamp = (event.created_at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        line = f"- `{timestamp}` **{event.level}** {event.message}\n"
+        if event.exception:
+            line += "  ```\n" + "".join(f"  {l}\n" for l in event.exception.splitlines()) + "  ```\n"
+        return line
+
+    def _write_group(self, path: str, events: List[LogEvent]):
+        """Append a group of events to one note with a single write"""
         try:
-            # Determine target file based on metadata or session_id
-            # This logic mirrors the ObsidianLogger but adapted for the worker context
-            # For now, we'll use a simple mapping or default to a session log
-
-            # TODO: Integrate full ObsidianLogger logic here if needed.
-            # For this implementation, we assume the 'message' is formatted for the log.
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            chunk = "".join(self._format_event(event) for event in events)
+            if not os.path.exists(path):
+                title = os.path.splitext(os.path.basename(path))[0]
+                chunk = f"# {title}\n\n" + chunk
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(chunk)
+        except Exception as e:
+            for event in events:
+                event.status = "failed"
+                event.error_message = str(e)
+                event.attempts += 1
+            logger.error(f"Failed to write {len(events)} log events to {path}: {e}")
+            return
 
-            # Mark as processed
+        processed_at = datetime.now()
+        for event in events:
             event.status = "completed"
-            event.processed_at = datetime.now()
-
-            # If we had actual file writing logic, it would go here.
-            # Currently, the ObsidianLogger in the legacy code handles file path logic.
-            # We might need to import a modified version of it or re-implement the writing.
-            # For now, we just mark it as processed to verify the queue works.
-
-        except Exception as e:
-            event.status = "failed"
-            event.error_message = str(e)
-            event.attempts += 1
-            logger.error(f"Failed to process log event {event.id}: {e}")
+            event.processed_at = processed_at
@@ -0,0 +1,71 @@
+"""Hot in-memory front cache for scene lookups"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from ..config import settings
+
+SceneKey = Tuple[str, str, str]  # (location, time_of_day, weather)
+
+
+@dataclass(frozen=True)
+class HotSceneEntry:
+    """Resolved SceneCache row: enough to serve a hit without the join query"""
+    cache_id: int
+    image_asset_id: int
+    expires_at: datetime
+
+
+class HotSceneCache:
+    """
+    Bounded LRU of recently served scenes, checked before the SQLite
+    SceneCache/ImageAsset join. Entries live for at most ``ttl`` seconds
+    and never past the row's own ``expires_at``.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 time_fn: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries or settings.SCENE_HOT_CACHE_SIZE
+        self.ttl = settings.SCENE_HOT_CACHE_TTL if ttl is None else ttl
+        self._time = time_fn
+        self._entries: "OrderedDict[SceneKey, Tuple[HotSceneEntry, float]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: SceneKey) -> Optional[HotSceneEntry]:
+        item = self._entries.get(key)
+        if item is not None:
+            entry, cached_until = item
+            if cached_until > self._time() and entry.expires_at > datetime.now():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+            del self._entries[key]
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: SceneKey, entry: HotSceneEntry) -> None:
+        self._entries[key] = (entry, self._time() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, location: Optional[str] = None) -> int:
+        """Drop one location (all times/weathers) or everything; returns entries removed"""
+        if location is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+        keys = [key for key in self._entries if key[0] == location]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, float]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": round(self.stats["hits"] / lookups * 100, 2) if lookups else 0.0,
+        }
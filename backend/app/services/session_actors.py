@@ -0,0 +1,93 @@
+"""Per-session mailboxes: actions for one session run in order, sessions run in parallel"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+Job = Callable[[], Awaitable[Any]]
+
+
+class MailboxFullError(Exception):
+    """Raised when a session already has ``mailbox_size`` actions waiting"""
+    pass
+
+
+class SessionActors:
+    """
+    One actor per busy session. ``submit`` appends a job to the session's
+    mailbox; the session's worker task runs jobs one at a time in arrival
+    order, so two actions on the same game never interleave, while other
+    sessions' workers run concurrently.
+
+    Workers exist only while their mailbox has work: an empty mailbox ends
+    the worker and the next ``submit`` starts a fresh one. Mailboxes are
+    bounded: a flooded session has its extra actions rejected with
+    MailboxFullError rather than growing memory. Jobs whose caller has
+    gone away are skipped.
+    """
+
+    def __init__(self, mailbox_size: int = 64):
+        self.mailbox_size = mailbox_size
+        self._mailboxes: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self.stats = {"processed": 0, "failed": 0, "skipped": 0, "max_depth": 0}
+
+    async def submit(self, session_id: str, job: Job) -> Any:
+        """
+        Queue ``job`` behind the session's earlier jobs and return its result.
+
+        Raises:
+            MailboxFullError: the session's mailbox is full
+        """
+        mailbox = self._mailboxes.get(session_id)
+        if mailbox is None:
+            mailbox = asyncio.Queue(maxsize=self.mailbox_size)
+            self._mailboxes[session_id] = mailbox
+            self._workers[session_id] = asyncio.create_task(self._drain(session_id, mailbox))
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            mailbox.put_nowait((job, future))
+        except asyncio.QueueFull:
+            raise MailboxFullError(f"{mailbox.qsize()} actions already queued for session {session_id}")
+        self.stats["max_depth"] = max(self.stats["max_depth"], mailbox.qsize())
+        return await future
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "active_sessions": len(self._workers),
+            "queued_actions": sum(mailbox.qsize() for mailbox in self._mailboxes.values()),
+            **self.stats,
+        }
+
+    async def join(self) -> None:
+        """Wait for every queued job to finish"""
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def _drain(self, session_id: str, mailbox: asyncio.Queue) -> None:
+        try:
+            while True:
+                try:
+                    job, future = mailbox.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if future.done():
+                    self.stats["skipped"] += 1
+                    continue
+                try:
+                    result = await job()
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    self.stats["processed"] += 1
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            # No await between the empty check and here, so no job can slip in unseen
+            if self._mailboxes.get(session_id) is mailbox:
+                del self._mailboxes[session_id]
+                del self._workers[session_id]
+            while not mailbox.empty():
+                _, future = mailbox.get_nowait()
+                future.cancel()
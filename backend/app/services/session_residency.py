@@ -0,0 +1,256 @@
+"""Bounded, idle-evicting residency for per-session in-memory objects"""
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger("session_residency")
+
+T = TypeVar("T")
+
+
+class SessionResidency(Generic[T]):
+    """
+    LRU map of session_id -> live object (a DnDGame, a GameStateManager).
+
+    - At most ``max_resident`` sessions stay in memory; the least recently
+      used is evicted to make room, and sessions untouched for
+      ``idle_seconds`` are evicted by ``evict_idle`` (run periodically
+      once ``start`` is called).
+    - Evicted objects are handed to ``flush`` first and only dropped once
+      it succeeds; if it raises (say the database is down) they stay
+      resident, so the bound is soft, and eviction is retried later. The
+      next ``get`` of an evicted session rehydrates it through ``loader``.
+    - Loads are single-flight: concurrent ``get`` calls for the same cold
+      session wait on a per-session lock and share one rehydration, which
+      also waits for any in-progress flush of that session.
+
+    Thread-safe; loader and flush run on the calling thread, or on a worker
+    thread for ``get_async`` / ``put_async``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Optional[Callable[[str], Optional[T]]] = None,
+        flush: Optional[Callable[[str, T], None]] = None,
+        max_resident: int = 256,
+        idle_seconds: float = 1800,
+        sweep_interval: float = 60,
+    ):
+        self.name = name
+        self.loader = loader
+        self.flush = flush
+        self.max_resident = max_resident
+        self.idle_seconds = idle_seconds
+        self.sweep_interval = sweep_interval
+        # session_id -> (object, last used monotonic time), oldest first
+        self._entries: "OrderedDict[str, Tuple[T, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Held while a session loads or flushes; dropped once nobody uses it
+        self._session_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"hits": 0, "misses": 0, "rehydrations": 0, "rehydration_seconds": 0.0,
+                      "rehydration_max_seconds": 0.0, "evictions": 0, "flush_errors": 0}
+
+    def get(self, session_id: str) -> Optional[T]:
+        """Resident object for the session, rehydrating it on a miss (None if the loader has none)"""
+        value = self._touch(session_id)
+        if value is not None:
+            return value
+
+        with self._session_lock(session_id):
+            value = self._touch(session_id, count=False)
+            if value is not None:
+                return value
+            with self._lock:
+                self.stats["misses"] += 1
+            if self.loader is None:
+                return None
+            started = time.perf_counter()
+            value = self.loader(session_id)
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.stats["rehydrations"] += 1
+                self.stats["rehydration_seconds"] += elapsed
+                self.stats["rehydration_max_seconds"] = max(self.stats["rehydration_max_seconds"], elapsed)
+                if value is not None:
+                    self._entries[session_id] = (value, time.monotonic())
+        self._evict_overflow()
+        return value
+
+    def put(self, session_id: str, value: T) -> T:
+        """Make ``value`` the resident object for the session"""
+        with self._lock:
+            self._entries[session_id] = (value, time.monotonic())
+            self._entries.move_to_end(session_id)
+        self._evict_overflow()
+        return value
+
+    async def get_async(self, session_id: str) -> Optional[T]:
+        """``get`` for the event loop: resident sessions return at once, misses load on a worker thread"""
+        value = self._touch(session_id)
+        if value is not None:
+            return value
+        return await asyncio.to_thread(self.get, session_id)
+
+    async def put_async(self, session_id: str, value: T) -> T:
+        """``put`` for the event loop: any eviction it causes flushes on a worker thread"""
+        with self._lock:
+            self._entries[session_id] = (value, time.monotonic())
+            self._entries.move_to_end(session_id)
+            overflow = len(self._entries) > self.max_resident
+        if overflow:
+            await asyncio.to_thread(self._evict_overflow)
+        return value
+
+    def peek(self, session_id: str) -> Optional[T]:
+        """Resident object without loading or refreshing it"""
+        with self._lock:
+            entry = self._entries.get(session_id)
+        return entry[0] if entry else None
+
+    def discard(self, session_id: str) -> bool:
+        """Drop a session without flushing it (e.g. it was deleted)"""
+        with self._lock:
+            return self._entries.pop(session_id, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def evict(self, session_id: str) -> bool:
+        """
+        Flush and drop one session; concurrent loads of it wait until the flush is done.
+
+        Returns False, leaving the session resident, if it is not resident,
+        the flush failed, or it was used again while flushing.
+        """
+        with self._session_lock(session_id):
+            with self._lock:
+                entry = self._entries.get(session_id)
+            if entry is None or not self._flush(session_id, entry[0]):
+                return False
+            with self._lock:
+                # Touched mid-flush: it may hold changes the flush missed
+                if self._entries.get(session_id) is not entry:
+                    return False
+                del self._entries[session_id]
+                self.stats["evictions"] += 1
+        return True
+
+    def evict_idle(self) -> int:
+        """Evict every session unused for ``idle_seconds``; returns how many"""
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            idle = [session_id for session_id, (_, used) in self._entries.items() if used < cutoff]
+        return sum(1 for session_id in idle if self.evict(session_id))
+
+    def flush_all(self) -> None:
+        """Flush every resident session without evicting it (e.g. on shutdown)"""
+        with self._lock:
+            entries = list(self._entries.items())
+        for session_id, (value, _) in entries:
+            with self._session_lock(session_id):
+                self._flush(session_id, value)
+
+    def metrics(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self.stats)
+            resident = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        rehydrations = stats["rehydrations"]
+        return {
+            "resident": resident,
+            "max_resident": self.max_resident,
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "evictions": stats["evictions"],
+            "flush_errors": stats["flush_errors"],
+            "rehydrations": rehydrations,
+            "rehydration_avg_ms": round(stats["rehydration_seconds"] / rehydrations * 1000, 2) if rehydrations else 0.0,
+            "rehydration_max_ms": round(stats["rehydration_max_seconds"] * 1000, 2),
+        }
+
+    def start(self) -> None:
+        """Start the periodic idle sweep on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        """Stop the sweep and flush everything still resident"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush_all)
+
+    def _touch(self, session_id: str, count: bool = True) -> Optional[T]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            self._entries[session_id] = (entry[0], time.monotonic())
+            self._entries.move_to_end(session_id)
+            if count:
+                self.stats["hits"] += 1
+            return entry[0]
+
+    def _session_lock(self, session_id: str) -> threading.Lock:
+        with self._lock:
+            lock = self._session_locks.get(session_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._session_locks[session_id] = lock
+            return lock
+
+    def _evict_overflow(self) -> None:
+        # One victim at a time, never while holding another session's lock;
+        # stop at the first that stays (flush failing), the next call retries
+        while True:
+            with self._lock:
+                if len(self._entries) <= self.max_resident:
+                    return
+                victim = next(iter(self._entries))
+            if not self.evict(victim):
+                return
+
+    def _flush(self, session_id: str, value: T) -> bool:
+        if self.flush is None:
+            return True
+        try:
+            self.flush(session_id, value)
+        except Exception as e:
+            with self._lock:
+                self.stats["flush_errors"] += 1
+            logger.error(f"Error flushing {self.name} session {session_id}: {e}")
+            return False
+        return True
+
+    async def _run_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                evicted = await asyncio.to_thread(self.evict_idle)
+                if evicted:
+                    logger.info(f"Evicted {evicted} idle {self.name} sessions")
+            except Exception as e:
+                logger.error(f"Error in {self.name} residency sweep: {e}")
@@ -0,0 +1,41 @@
+"""Request coalescing for concurrent identical async work"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers with the
+    same key await the leader's result (or exception) instead of repeating
+    the work.
+
+    The leader's work runs in its own task, so a caller that disconnects
+    does not cancel the generation the other callers are waiting on.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"leaders": 0, "followers": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for callers that joined another's call."""
+        future = self._inflight.get(key)
+        shared = future is not None
+        if not shared:
+            self.stats["leaders"] += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _f: self._forget(key, _f))
+        else:
+            self.stats["followers"] += 1
+        return await asyncio.shield(future), shared
+
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception retrieved so an unawaited failure doesn't warn
+            future.exception()
@@ -1,69 +1,251 @@
 """Filesystem storage service with WebP compression"""
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 from io import BytesIO
+import asyncio
 import hashlib
-from datetime import datetime
-from typing import Dict
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from ..config import settings
+
+# Content-addressed blobs are "<sha256>.webp"; older files are
+# "<subject>_<timestamp>_<md5 prefix>.webp" as written by save_image
+_HASHED_NAME = re.compile(r"(?:^|_)([0-9a-f]{8,64})\.webp$")
+_BLOB_NAME = re.compile(r"^([0-9a-f]{64})\.webp$")
+
+THUMBNAIL_QUALITY = 80
+
+
+class ImageEncoder:
+    """
+    Bounded thread pool for WebP encoding. Work submitted under a key that
+    is already being encoded joins the running job instead of repeating it.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or settings.IMAGE_ENCODER_WORKERS,
+            thread_name_prefix="image-encode"
+        )
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "coalesced": 0}
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args) -> Future:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future
+            future = self._executor.submit(fn, *args)
+            self._inflight[key] = future
+            self.stats["submitted"] += 1
+        future.add_done_callback(lambda _f: self._forget(key, _f))
+        return future
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _forget(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
+_default_encoder: Optional[ImageEncoder] = None
+_encoder_lock = threading.Lock()
+
+
+def get_image_encoder() -> ImageEncoder:
+    """Process-wide encoder shared by every StorageService"""
+    global _default_encoder
+    with _encoder_lock:
+        if _default_encoder is None:
+            _default_encoder = ImageEncoder()
+        return _default_encoder
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file so readers never see a partial image"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
 
 
 class StorageService:
-    """Handles filesystem storage with WebP compression and thumbnail generation"""
+    """
+    Content-addressed image store with WebP compression and lazy thumbnails
 
-    def __init__(self, base_dir: str = "images"):
+    Full images are stored once per SHA-256 of the source bytes under
+    ``blobs/<xx>/<hash>.webp``; ImageAsset rows that share a hash share the
+    blob, and the garbage collector removes a blob once no row references
+    it. Thumbnails are encoded on first request, per size, under
+    ``thumbnails/<size>/``.
+    """
+
+    def __init__(self, base_dir: str = "images", thumbnail_sizes: Optional[Tuple[int, ...]] = None,
+                 encoder: Optional[ImageEncoder] = None):
         """
         Initialize storage service
 
         Args:
             base_dir: Base directory for image storage
+            thumbnail_sizes: Allowed thumbnail edge lengths (default THUMBNAIL_SIZES)
+            encoder: Thread pool for encoding (default: the shared encoder)
         """
         self.base_dir = Path(base_dir)
-        self.full_dir = self.base_dir / "full"
+        self.blob_dir = self.base_dir / "blobs"
+        self.full_dir = self.base_dir / "full"  # files written before content addressing
         self.thumb_dir = self.base_dir / "thumbnails"
+        self.thumbnail_sizes = tuple(thumbnail_sizes or settings.THUMBNAIL_SIZES)
+        self.default_thumbnail_size = max(settings.THUMBNAIL_SIZE)
+        self._encoder = encoder
 
         # Create directories if they don't exist
-        self.full_dir.mkdir(parents=True, exist_ok=True)
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
         self.thumb_dir.mkdir(parents=True, exist_ok=True)
 
-    def save_image(self, image_data: bytes, subject_name: str) -> Dict[str, any]:
+    @property
+    def encoder(self) -> ImageEncoder:
+        if self._encoder is None:
+            self._encoder = get_image_encoder()
+        return self._encoder
+
+    @staticmethod
+    def content_hash(image_data: bytes) -> str:
+        return hashlib.sha256(image_data).hexdigest()
+
+    def blob_path(self, content_hash: str) -> Path:
+        return self.blob_dir / content_hash[:2] / f"{content_hash}.webp"
+
+    def thumbnail_path(self, full_path: str, size: Optional[int] = None) -> Path:
+        """Where the ``size`` thumbnail of a stored full image lives (it may not exist yet)"""
+        return self.thumb_dir / str(size or self.default_thumbnail_size) / Path(full_path).name
+
+    def save_image(self, image_data: bytes, subject_name: str) -> Dict[str, Any]:
         """
-        Save image with WebP compression and thumbnail
+        Store an image once per content hash
+
+        Identical bytes are not decoded or encoded again; the existing blob
+        is returned. Encoding runs on the shared encoder pool.
 
         Args:
             image_data: Raw image bytes (PNG format from Gemini)
-            subject_name: Subject name for filename
+            subject_name: Subject name (kept for callers; blobs are named by content)
 
         Returns:
-            Dictionary with full_path, thumbnail_path, and file_size_bytes
+            Dictionary with full_path, thumbnail_path, file_size_bytes,
+            content_hash and deduplicated. thumbnail_path is always empty:
+            thumbnails are made on request by ensure_thumbnail.
         """
-        # Generate unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        content_hash = hashlib.md5(image_data).hexdigest()[:8]
-        # Sanitize subject name for filename
-        safe_subject = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in subject_name)
-        safe_subject = safe_subject.replace(' ', '_')[:50]  # Limit length
-        filename = f"{safe_subject}_{timestamp}_{content_hash}.webp"
-
-        # Load image from bytes
-        img = Image.open(BytesIO(image_data))
+        content_hash = self.content_hash(image_data)
+        full_path = self.blob_path(content_hash)
+        deduplicated = self._reuse_blob(full_path)
+        if not deduplicated:
+            self.encoder.submit(("blob", content_hash), self._encode_full, image_data, full_path).result()
+        return self._stored(content_hash, full_path, deduplicated)
+
+    async def save_image_async(self, image_data: bytes, subject_name: str) -> Dict[str, Any]:
+        """``save_image`` for the event loop: encoding is awaited, not run inline"""
+        content_hash = self.content_hash(image_data)
+        full_path = self.blob_path(content_hash)
+        deduplicated = self._reuse_blob(full_path)
+        if not deduplicated:
+            await asyncio.wrap_future(
+                self.encoder.submit(("blob", content_hash), self._encode_full, image_data, full_path)
+            )
+        return self._stored(content_hash, full_path, deduplicated)
+
+    def ensure_thumbnail(self, full_path: str, size: Optional[int] = None) -> str:
+        """
+        Path of the ``size`` thumbnail for a stored full image, encoding it
+        first if this is the first request for that size.
 
-        # Save full size (WebP, 85% quality)
-        full_path = self.full_dir / filename
-        img.save(full_path, "WEBP", quality=85)
-        full_size = full_path.stat().st_size
+        Raises:
+            ValueError: size is not one of ``thumbnail_sizes``
+            FileNotFoundError: the full image is missing
+        """
+        size = size or self.default_thumbnail_size
+        thumb_path = self.thumbnail_path(full_path, size)
+        if not thumb_path.exists():
+            self._check_size(size)
+            self.encoder.submit(("thumb", str(thumb_path)), self._encode_thumbnail, full_path, thumb_path, size).result()
+        return str(thumb_path)
+
+    async def ensure_thumbnail_async(self, full_path: str, size: Optional[int] = None) -> str:
+        """``ensure_thumbnail`` for the event loop"""
+        size = size or self.default_thumbnail_size
+        thumb_path = self.thumbnail_path(full_path, size)
+        if not thumb_path.exists():
+            self._check_size(size)
+            await asyncio.wrap_future(
+                self.encoder.submit(("thumb", str(thumb_path)), self._encode_thumbnail, full_path, thumb_path, size)
+            )
+        return str(thumb_path)
+
+    def iter_blobs(self) -> Iterator[Tuple[str, Path]]:
+        """Yield ``(content_hash, path)`` for every stored blob"""
+        for path in self.blob_dir.glob("*/*.webp"):
+            match = _BLOB_NAME.match(path.name)
+            if match:
+                yield match.group(1), path
 
-        # Save thumbnail (200x200)
-        img_thumb = img.copy()
-        img_thumb.thumbnail((200, 200), Image.Resampling.LANCZOS)
-        thumb_path = self.thumb_dir / filename
-        img_thumb.save(thumb_path, "WEBP", quality=80)
+    def delete_thumbnails(self, full_path: str) -> None:
+        """Remove every generated thumbnail size of a full image"""
+        name = Path(full_path).name
+        for size_dir in self.thumb_dir.iterdir():
+            if size_dir.is_dir():
+                (size_dir / name).unlink(missing_ok=True)
 
+    # ------------------------------------------------------------------
+
+    def _stored(self, content_hash: str, full_path: Path, deduplicated: bool) -> Dict[str, Any]:
         return {
             "full_path": str(full_path),
-            "thumbnail_path": str(thumb_path),
-            "file_size_bytes": full_size
+            # Thumbnails are encoded lazily; only legacy rows store a path
+            "thumbnail_path": "",
+            "file_size_bytes": full_path.stat().st_size,
+            "content_hash": content_hash,
+            "deduplicated": deduplicated
         }
 
+    @staticmethod
+    def _reuse_blob(full_path: Path) -> bool:
+        """True if the blob exists; refreshes its mtime so the GC grace period covers the new row"""
+        try:
+            os.utime(full_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _check_size(self, size: int) -> None:
+        if size not in self.thumbnail_sizes:
+            raise ValueError(f"Thumbnail size must be one of {list(self.thumbnail_sizes)}")
+
+    @staticmethod
+    def _encode_full(image_data: bytes, full_path: Path) -> None:
+        if full_path.exists():
+            return
+        img = Image.open(BytesIO(image_data))
+        buffer = BytesIO()
+        img.save(buffer, "WEBP", quality=settings.WEBP_QUALITY)
+        _write_atomic(full_path, buffer.getvalue())
+
+    @staticmethod
+    def _encode_thumbnail(full_path: str, thumb_path: Path, size: int) -> None:
+        if thumb_path.exists():
+            return
+        with Image.open(full_path) as img:
+            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = BytesIO()
+            img.save(buffer, "WEBP", quality=THUMBNAIL_QUALITY)
+        _write_atomic(thumb_path, buffer.getvalue())
+
     def get_image(self, path: str) -> bytes:
         """
         Read image from filesystem
@@ -78,12 +260,42 @@ class StorageService:
 
     def delete_image(self, full_path: str, thumb_path: str) -> None:
         """
-        Delete both full and thumbnail images
+        Delete a full image and all of its thumbnails
+
+        Callers must make sure no other ImageAsset still references
+        ``full_path`` (blobs are shared between identical images).
 
         Args:
             full_path: Path to full size image
             thumb_path: Path to thumbnail
         """
         Path(full_path).unlink(missing_ok=True)
-        Path(thumb_path).unlink(missing_ok=True)
+        if thumb_path:
+            Path(thumb_path).unlink(missing_ok=True)
+        self.delete_thumbnails(full_path)
 
+    @staticmethod
+    def resolve_path(path: str) -> Optional[str]:
+        """
+        Find a stored file whose path was recorded relative to the backend
+        directory, whether we run from the repo root or from backend/.
+        """
+        candidates = [path] if os.path.isabs(path) else [os.path.join('backend', path), path]
+        for candidate in candidates:
+            if os.path.exists(candidate):
+                return candidate
+        return None
+
+    @staticmethod
+    def content_etag(path: str, variant: str = "full") -> str:
+        """
+        Strong ETag for a stored image. Uses the content hash embedded in
+        the filename; falls back to size and mtime for other files.
+        """
+        match = _HASHED_NAME.search(os.path.basename(path))
+        if match:
+            tag = match.group(1)
+        else:
+            stat = os.stat(path)
+            tag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+        return f'"{tag}-{variant}"'
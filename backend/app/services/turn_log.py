@@ -0,0 +1,161 @@
+"""Event-sourced persistence for GameStateManager: per-turn deltas plus periodic snapshots"""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import GameSession, Event as DBEvent
+from .game_state_manager import FrozenDict, GameStateManager
+
+# Event rows carrying a state delta in ``state_after``; narrative listings skip them
+STATE_DELTA_EVENT = "state_delta"
+
+
+class TurnLogIntegrityError(Exception):
+    """Raised when a stored delta does not match its chained checksum"""
+    pass
+
+
+def _canonical(delta: Dict[str, Any]) -> str:
+    return json.dumps(delta, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def chain_checksum(previous: Optional[str], payload: str) -> str:
+    """Each delta's checksum covers the previous one, so the log can't be edited or reordered"""
+    return hashlib.sha256(((previous or "") + payload).encode()).hexdigest()
+
+
+@dataclass
+class RecordedChanges:
+    """What ``record_changes`` added to the DB session, pending its commit"""
+    delta_bytes: int
+    snapshot: bool
+    checksum: Optional[str]
+    _on_commit: Callable[[], None] = field(default=lambda: None, repr=False)
+
+    def committed(self) -> None:
+        """Advance the manager past what was recorded; call only once db.commit() succeeded"""
+        self._on_commit()
+
+
+def record_changes(db: Session, manager: GameStateManager, force_snapshot: bool = False) -> RecordedChanges:
+    """
+    Persist what changed since the last call: one ``state_delta`` event,
+    plus a full snapshot in ``GameSession.state_snapshot`` every
+    GAME_SNAPSHOT_INTERVAL turns, once GAME_SNAPSHOT_DELTA_BYTES of deltas
+    have accumulated, when there is no snapshot yet, or when forced.
+
+    Adds to ``db`` without committing, so the delta lands in the same
+    transaction as the turn's events. The manager is left untouched until
+    the caller commits and calls ``committed()`` on the result; if the
+    commit fails, the same changes are recorded again next time.
+    """
+    db_session = db.query(GameSession).filter(GameSession.id == manager.session_id).first()
+    if db_session is None:
+        return RecordedChanges(0, False, None)
+
+    metadata = manager.state["metadata"]
+    log_checksum = metadata.get("log_checksum")
+    delta = manager.pending_delta()
+    delta_bytes = 0
+    if delta is not None:
+        payload = _canonical(delta)
+        delta_bytes = len(payload)
+        log_checksum = chain_checksum(log_checksum, payload)
+        db.add(DBEvent(
+            session_id=manager.session_id,
+            event_type=STATE_DELTA_EVENT,
+            turn_number=delta["turn"],
+            summary=f"State delta v{delta['version']}",
+            data={"version": delta["version"], "bytes": delta_bytes},
+            state_after=delta,
+            checksum=log_checksum
+        ))
+
+    turn = manager.get_turn()
+    snapshot_due = (
+        force_snapshot
+        or db_session.state_snapshot is None
+        or turn - manager.snapshot_turn >= settings.GAME_SNAPSHOT_INTERVAL
+        or manager.bytes_since_snapshot + delta_bytes >= settings.GAME_SNAPSHOT_DELTA_BYTES
+    )
+    snapshot_checksum = None
+    if snapshot_due:
+        # The snapshot is of the state as it will be once the delta is applied
+        pending = {}
+        if delta is not None:
+            pending = {"version": delta["version"],
+                       "metadata": FrozenDict({**metadata, "log_checksum": log_checksum})}
+        snapshot_data = manager.snapshot(**pending)
+        db_session.state_snapshot = snapshot_data["snapshot"]
+        snapshot_checksum = snapshot_data["checksum"]
+
+    db_session.turn_count = turn
+    db_session.status = manager.get_status()
+    db_session.current_location_id = manager.state.get("current_location_id")
+    db_session.last_played_at = datetime.now()
+
+    def on_commit() -> None:
+        if delta is not None:
+            manager.delta_saved(delta)
+            # Stored in the state so a snapshot knows where the log continues from
+            manager.set_log_checksum(log_checksum)
+            manager.bytes_since_snapshot += delta_bytes
+        if snapshot_due:
+            manager.snapshot_turn = turn
+            manager.bytes_since_snapshot = 0
+
+    return RecordedChanges(delta_bytes, snapshot_due, snapshot_checksum or log_checksum, on_commit)
+
+
+def load_state(db: Session, session_id: str, verify: bool = True) -> Optional[GameStateManager]:
+    """
+    Rebuild a session's state: its latest snapshot plus a replay of the
+    deltas recorded after it. Returns None if nothing was ever saved or
+    the session was deleted.
+
+    Raises:
+        TurnLogIntegrityError: verify is set and a delta fails its checksum
+    """
+    db_session = db.query(GameSession).filter(
+        GameSession.id == session_id,
+        GameSession.deleted_at == None
+    ).first()
+    if db_session is None:
+        return None
+
+    manager = GameStateManager(session_id)
+    if db_session.state_snapshot:
+        manager.restore(db_session.state_snapshot)
+    base_version = manager.state.get("version", 0)
+    previous = manager.state["metadata"].get("log_checksum")
+
+    deltas = db.query(DBEvent).filter(
+        DBEvent.session_id == session_id,
+        DBEvent.event_type == STATE_DELTA_EVENT,
+        DBEvent.turn_number >= manager.snapshot_turn
+    ).order_by(DBEvent.id).all()
+
+    replayed = 0
+    for row in deltas:
+        delta = row.state_after or {}
+        if delta.get("version", 0) <= base_version:
+            continue
+        payload = _canonical(delta)
+        if verify and chain_checksum(previous, payload) != row.checksum:
+            raise TurnLogIntegrityError(
+                f"Delta v{delta.get('version')} of session {session_id} failed checksum verification"
+            )
+        manager.apply_delta(delta)
+        manager.bytes_since_snapshot += len(payload)
+        previous = row.checksum
+        replayed += 1
+
+    if not db_session.state_snapshot and not replayed:
+        return None
+    manager.set_log_checksum(previous)
+    return manager
@@ -0,0 +1,110 @@
+"""Batched image usage counters"""
+import asyncio
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import bindparam, update
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.image_asset import ImageAsset
+
+logger = logging.getLogger("usage_counter")
+
+
+class ImageUsageCounter:
+    """
+    Accumulates ImageAsset.use_count increments in memory and writes them
+    in one executemany UPDATE per flush, keeping commits off the read path.
+    """
+
+    def __init__(self, session_factory: Callable = SessionLocal, flush_interval: Optional[float] = None):
+        self.session_factory = session_factory
+        self.flush_interval = settings.USAGE_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self._pending: Counter = Counter()
+        self._last_used: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"recorded": 0, "flushes": 0, "rows_updated": 0}
+
+    def record(self, asset_id: int) -> None:
+        """Count one use of an image"""
+        with self._lock:
+            self._pending[asset_id] += 1
+            self._last_used[asset_id] = datetime.now()
+            self.stats["recorded"] += 1
+
+    def pending(self, asset_id: int) -> int:
+        """Uses recorded but not yet written, for up-to-date responses"""
+        with self._lock:
+            return self._pending.get(asset_id, 0)
+
+    def flush(self) -> int:
+        """Write pending increments; returns the number of rows updated"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            last_used, self._last_used = self._last_used, {}
+        if not pending:
+            return 0
+
+        rows = [
+            {"asset_id": asset_id, "increment": count, "used_at": last_used[asset_id]}
+            for asset_id, count in pending.items()
+        ]
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(ImageAsset.__table__)
+                .where(ImageAsset.__table__.c.id == bindparam("asset_id"))
+                .values(
+                    use_count=ImageAsset.__table__.c.use_count + bindparam("increment"),
+                    last_used=bindparam("used_at"),
+                ),
+                rows,
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to flush {len(rows)} usage counters: {e}")
+            # Keep the counts for the next attempt
+            with self._lock:
+                self._pending.update(pending)
+                for asset_id, used_at in last_used.items():
+                    self._last_used.setdefault(asset_id, used_at)
+            return 0
+        finally:
+            db.close()
+
+        self.stats["flushes"] += 1
+        self.stats["rows_updated"] += len(rows)
+        return len(rows)
+
+    def start(self) -> None:
+        """Start the periodic flush task on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write what is left"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    async def _run_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Error in usage counter loop: {e}")
+
+
+image_usage = ImageUsageCounter()
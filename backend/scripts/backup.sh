@@ -17,8 +17,13 @@ fi
 
 echo "Creating backup: $BACKUP_NAME"
 
-# Create backup
-cp "$DB_FILE" "$BACKUP_DIR/$BACKUP_NAME"
+# Create backup. The database runs in WAL mode, so copying the file alone
+# would miss committed pages still in dnd_game.db-wal; use SQLite's online backup.
+if command -v sqlite3 >/dev/null 2>&1; then
+    sqlite3 "$DB_FILE" ".backup '$BACKUP_DIR/$BACKUP_NAME'"
+else
+    python3 -c "import sqlite3, sys; src = sqlite3.connect(sys.argv[1]); dst = sqlite3.connect(sys.argv[2]); src.backup(dst); dst.close(); src.close()" "$DB_FILE" "$BACKUP_DIR/$BACKUP_NAME"
+fi
 
 if [ $? -ne 0 ]; then
     echo "Error: Failed to create backup"
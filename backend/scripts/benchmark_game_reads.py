@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Concurrent read benchmark for the /api/v1/game endpoints.
+
+Seeds a few game sessions, then keeps ``--concurrency`` clients issuing
+GETs (session list, session, characters, events) for ``--duration``
+seconds and reports throughput and latency.
+
+Against a running server:
+    python scripts/benchmark_game_reads.py --url http://localhost:8000
+
+Or let the script start uvicorn with 1, 2 and 4 worker processes on a
+fresh WAL database, to see read throughput scale with cores:
+    python scripts/benchmark_game_reads.py --spawn 1,2,4 --concurrency 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+async def seed_sessions(client: httpx.AsyncClient, count: int) -> list:
+    session_ids = []
+    for i in range(count):
+        response = await client.post("/api/v1/game/sessions", json={"name": f"Benchmark {i}"})
+        response.raise_for_status()
+        session_ids.append(response.json()["id"])
+    return session_ids
+
+
+def read_paths(session_ids: list) -> itertools.cycle:
+    paths = ["/api/v1/game/sessions"]
+    for session_id in session_ids:
+        paths += [
+            f"/api/v1/game/sessions/{session_id}",
+            f"/api/v1/game/sessions/{session_id}/characters",
+            f"/api/v1/game/sessions/{session_id}/events",
+        ]
+    return itertools.cycle(paths)
+
+
+async def run_load(base_url: str, concurrency: int, duration: float, sessions: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        paths = read_paths(await seed_sessions(client, sessions))
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(next(paths))
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+def wait_until_healthy(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+
+def spawn_server(workers: int, port: int, database_url: str) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+def print_row(label: str, result: dict) -> None:
+    print(f"{label:<12} {result['requests']:>9} {result['errors']:>7} "
+          f"{result['rps']:>10.1f} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000", help="server to load (ignored with --spawn)")
+    parser.add_argument("--spawn", help="comma-separated uvicorn worker counts to start, e.g. 1,2,4")
+    parser.add_argument("--port", type=int, default=8765, help="port for spawned servers")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--sessions", type=int, default=5, help="sessions to seed before loading")
+    args = parser.parse_args()
+
+    print(f"{'target':<12} {'requests':>9} {'errors':>7} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    if not args.spawn:
+        print_row("server", asyncio.run(run_load(args.url, args.concurrency, args.duration, args.sessions)))
+        return
+
+    for workers in [int(n) for n in args.spawn.split(",")]:
+        with tempfile.TemporaryDirectory() as tmp:
+            base_url = f"http://127.0.0.1:{args.port}"
+            server = spawn_server(workers, args.port, f"sqlite:///{tmp}/benchmark.db")
+            try:
+                wait_until_healthy(base_url)
+                result = asyncio.run(run_load(base_url, args.concurrency, args.duration, args.sessions))
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+        print_row(f"{workers} worker(s)", result)
+
+
+if __name__ == "__main__":
+    main()
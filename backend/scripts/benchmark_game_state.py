@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for GameStateManager reads, writes and checksums.
+
+Builds a session with ``--characters`` characters (default 1000) and
+feeds it ``--events`` events (default 10000; only the newest 100 stay in
+memory), then times the hot operations. The "deepcopy" rows reproduce
+what reads and snapshots cost when every call copied and re-serialised
+the whole state, for comparison.
+
+    python scripts/benchmark_game_state.py
+    python scripts/benchmark_game_state.py --characters 5000 --events 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+import timeit
+from copy import deepcopy
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.game_state_manager import GameStateManager  # noqa: E402
+
+
+def build_session(characters: int, events: int) -> tuple:
+    manager = GameStateManager("benchmark")
+    for n in range(characters):
+        manager.add_character(f"c{n}", {
+            "id": f"c{n}", "name": f"Hero {n}", "char_class": "Fighter", "hp": 30, "max_hp": 30,
+            "attack": 10, "defense": 5, "alive": True, "team": "player",
+            "inventory": [{"item": "potion", "qty": 2}, {"item": "sword", "qty": 1}],
+        })
+    for n in range(20):
+        manager.add_location(f"l{n}", {"name": f"Location {n}", "npcs": [], "items": []})
+
+    started = time.perf_counter()
+    for n in range(events):
+        manager.add_event({"type": "combat", "turn_number": n // 10, "summary": f"Event {n}"})
+    return manager, time.perf_counter() - started
+
+
+def deepcopy_snapshot(state: dict) -> str:
+    copied = deepcopy(state)
+    return hashlib.sha256(json.dumps(copied, sort_keys=True).encode()).hexdigest()
+
+
+def per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--characters", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--number", type=int, default=200, help="calls per timing run")
+    args = parser.parse_args()
+
+    manager, event_seconds = build_session(args.characters, args.events)
+    plain_state = json.loads(manager.to_json())
+    counter = iter(range(10 ** 9))
+
+    def write_then_checksum():
+        manager.update_character("c1", {"hp": next(counter) % 30})
+        manager.checksum()
+
+    rows = [
+        ("get_state", lambda: manager.get_state()),
+        ("get_state (deepcopy)", lambda: deepcopy(plain_state)),
+        ("get_all_characters", lambda: manager.get_all_characters()),
+        ("get_all_characters (deepcopy)", lambda: deepcopy(plain_state["characters"])),
+        ("get_summary", lambda: manager.get_summary()),
+        ("update_character", lambda: manager.update_character("c1", {"hp": next(counter) % 30})),
+        ("add_event", lambda: manager.add_event({"type": "move", "turn_number": 0})),
+        ("write + checksum", write_then_checksum),
+        ("snapshot", lambda: manager.snapshot()),
+        ("snapshot (deepcopy)", lambda: deepcopy_snapshot(plain_state)),
+    ]
+
+    print(f"{args.characters} characters, {args.events} events "
+          f"({event_seconds / args.events * 1e6:.1f} us per add_event while loading)")
+    print(f"{'operation':<32} {'us/call':>12}")
+    for label, stmt in rows:
+        number = max(1, args.number // 20) if "deepcopy" in label else args.number
+        print(f"{label:<32} {per_call_us(stmt, number):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Load test for GameService's per-session action mailboxes.
+
+Seeds ``--sessions`` game sessions (default 300) in a scratch SQLite
+database, then fires ``--actions`` actions at every session at once
+through ``game_service.execute_action``. Each action mutates the live
+DnDGame and records its sequence number, so the run also checks that no
+session saw its actions interleave or reorder. With ``--simulations`` each
+session additionally runs CPU-heavy combat simulations in the process pool
+via ``execute_simulation``.
+
+    python scripts/load_test_game_actions.py
+    python scripts/load_test_game_actions.py --sessions 500 --actions 20 --simulations 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def simulate_duel(attacker: dict, defender: dict, rounds: int) -> float:
+    """Monte Carlo win rate of attacker vs defender (pure CPU, picklable)"""
+    rng = random.Random(rounds)
+    wins = 0
+    for _ in range(rounds):
+        hp_a, hp_d = attacker["hp"], defender["hp"]
+        while hp_a > 0 and hp_d > 0:
+            hp_d -= max(1, attacker["attack"] + rng.randint(1, 6) - defender["defense"])
+            if hp_d > 0:
+                hp_a -= max(1, defender["attack"] + rng.randint(1, 6) - attacker["defense"])
+        wins += hp_d <= 0
+    return wins / rounds
+
+
+def seed(session_count: int) -> list:
+    from app.database import Base, SessionLocal, engine
+    from app.models import GameSession, Character as DBCharacter
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    session_ids = [f"load-{n}" for n in range(session_count)]
+    for session_id in session_ids:
+        db.add(GameSession(id=session_id, name=session_id, quest_progress={}))
+        db.add(DBCharacter(id=f"{session_id}-hero", session_id=session_id, name="Hero", char_class="Fighter",
+                           team="players", hp=30, max_hp=30, attack=8, defense=4))
+        db.add(DBCharacter(id=f"{session_id}-orc", session_id=session_id, name="Orc", char_class="Fighter",
+                           team="enemies", hp=10_000, max_hp=10_000, attack=6, defense=3))
+    db.commit()
+    db.close()
+    return session_ids
+
+
+async def run(session_ids: list, actions: int, simulations: int) -> dict:
+    from app.services.game_service import game_service
+
+    sequences = {session_id: [] for session_id in session_ids}
+    in_flight = set()
+    violations = []
+    lock = threading.Lock()
+    latencies = []
+
+    def action(session_id: str, step: int):
+        def apply(game):
+            with lock:
+                if session_id in in_flight:
+                    violations.append(f"{session_id} interleaved at step {step}")
+                in_flight.add(session_id)
+            try:
+                hero, orc = game.players[0], game.enemies[0]
+                hero.attack_target(orc)
+                time.sleep(0.001)  # stand-in for engine work that releases the GIL
+                sequences[session_id].append(step)
+            finally:
+                with lock:
+                    in_flight.discard(session_id)
+            return step
+        return apply
+
+    async def timed(call):
+        started = time.perf_counter()
+        await call
+        latencies.append(time.perf_counter() - started)
+
+    calls = []
+    for step in range(actions):
+        for session_id in session_ids:
+            calls.append(timed(game_service.execute_action(session_id, action(session_id, step))))
+            if simulations and step % max(1, actions // simulations) == 0:
+                calls.append(timed(game_service.execute_simulation(
+                    session_id, simulate_duel,
+                    {"hp": 30, "attack": 8, "defense": 4}, {"hp": 20, "attack": 6, "defense": 3}, 2000
+                )))
+
+    started = time.perf_counter()
+    await asyncio.gather(*calls)
+    elapsed = time.perf_counter() - started
+    await game_service.stop()
+
+    out_of_order = [s for s, steps in sequences.items() if steps != list(range(actions))]
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "elapsed": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "violations": len(violations) + len(out_of_order),
+        "actors": game_service.actor_metrics(),
+        "residency": game_service.residency_metrics(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--actions", type=int, default=10, help="actions per session")
+    parser.add_argument("--simulations", type=int, default=0, help="process-pool simulations per session")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point the app at a scratch database before anything imports it
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/load_test.db"
+        sys.path.insert(0, str(BACKEND_DIR))
+        session_ids = seed(args.sessions)
+        result = asyncio.run(run(session_ids, args.actions, args.simulations))
+
+    print(f"{args.sessions} sessions x {args.actions} actions"
+          f"{f' + {args.simulations} simulations' if args.simulations else ''}")
+    print(f"calls {result['calls']}  elapsed {result['elapsed']:.2f}s  {result['rps']:.0f} calls/s  "
+          f"p50 {result['p50_ms']:.1f} ms  p99 {result['p99_ms']:.1f} ms")
+    print(f"ordering violations: {result['violations']}")
+    print(f"actors: {result['actors']}")
+    print(f"residency: {result['residency']}")
+    if result["violations"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
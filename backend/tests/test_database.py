@@ -0,0 +1,85 @@
+"""Tests for the SQLite WAL engine pair and read/write session routing"""
+import threading
+
+import pytest
+from sqlalchemy import select, text
+
+from app.database import Base, create_engines, routing_sessionmaker
+from app.models.game_session import GameSession
+
+
+@pytest.fixture
+def engines(tmp_path):
+    writer, reader = create_engines(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=writer)
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+def _session_row(session_id):
+    return GameSession(id=session_id, name="Test", turn_count=0, status="active",
+                       quest_progress={}, difficulty="medium", ai_model="mistral")
+
+
+def test_sqlite_connections_use_wal(engines):
+    for engine in engines:
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() > 0
+
+
+def test_reads_use_reader_until_the_session_writes(engines):
+    writer, reader = engines
+    db = routing_sessionmaker(writer, reader)()
+
+    assert db.get_bind(clause=select(GameSession)) is reader
+    assert db.get_bind(clause=text("SELECT 1")) is reader
+    assert db.get_bind(clause=text("PRAGMA optimize")) is writer
+
+    db.add(_session_row("g1"))
+    db.flush()
+    # Uncommitted row is only visible on the writer, so reads must follow it
+    assert db.get_bind(clause=select(GameSession)) is writer
+    assert db.query(GameSession).count() == 1
+    db.commit()
+
+    assert db.get_bind(clause=select(GameSession)) is reader
+    assert db.query(GameSession).count() == 1
+    db.close()
+
+
+def test_concurrent_writers_queue_on_single_writer(engines):
+    factory = routing_sessionmaker(*engines)
+    errors = []
+
+    def write(worker):
+        try:
+            for i in range(20):
+                db = factory()
+                db.add(_session_row(f"w{worker}-{i}"))
+                db.commit()
+                db.query(GameSession).count()
+                db.close()
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    db = factory()
+    assert db.query(GameSession).count() == 120
+    db.close()
+
+
+def test_memory_database_shares_one_engine():
+    writer, reader = create_engines("sqlite:///:memory:")
+    assert writer is reader
+    db = routing_sessionmaker(writer, reader)()
+    assert db.get_bind(clause=select(GameSession)) is writer
+    db.close()
@@ -0,0 +1,91 @@
+"""Tests for the async read layer used by the hot endpoints"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import Base, async_database_url
+from app.models import GameSession, Character as DBCharacter, Location as DBLocation, Event as DBEvent
+from app.models.image_asset import ImageAsset
+
+
+def test_async_database_url_maps_drivers():
+    assert async_database_url("sqlite:///./dnd_game.db") == "sqlite+aiosqlite:///./dnd_game.db"
+    assert async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+    assert async_database_url("postgresql://u:p@db:5432/dnd") == "postgresql+asyncpg://u:p@db:5432/dnd"
+    assert async_database_url("postgresql+psycopg://u:p@db/dnd") == "postgresql+psycopg://u:p@db/dnd"
+
+
+@pytest.fixture
+def run_with_db(tmp_path):
+    """Run ``scenario(db)`` against a seeded file database through aiosqlite"""
+    pytest.importorskip("aiosqlite")
+    from app.database import create_async_read_engine, create_engines, routing_sessionmaker
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    writer, reader = create_engines(url)
+    Base.metadata.create_all(bind=writer)
+    db = routing_sessionmaker(writer, reader)()
+    now = datetime.now()
+    db.add_all([
+        GameSession(id="g1", name="One", quest_progress={}, last_played_at=now),
+        GameSession(id="g2", name="Two", quest_progress={}, last_played_at=now - timedelta(hours=1)),
+        GameSession(id="gone", name="Deleted", quest_progress={}, deleted_at=now),
+        DBCharacter(id="c1", session_id="g1", name="Hero", char_class="Fighter", hp=10, max_hp=10,
+                    attack=5, defense=3),
+        DBCharacter(id="c2", session_id="g1", name="Mage", char_class="Wizard", hp=0, max_hp=8,
+                    attack=2, defense=1, alive=False),
+        DBLocation(id="l1", session_id="g1", name="Tavern", visited=2),
+        DBEvent(session_id="g1", event_type="combat", turn_number=1, summary="Fight"),
+        DBEvent(session_id="g1", event_type="dialogue", turn_number=2, summary="Talk"),
+        ImageAsset(component="scene-viewer", subject_type="scene", subject_name="Tavern",
+                   prompt_used="p", storage_path_full="a.webp", storage_path_thumbnail="a.webp",
+                   file_size_bytes=1, aspect_ratio="16:9", generation_time_ms=1, is_featured=True),
+        ImageAsset(component="scene-viewer", subject_type="scene", subject_name="Cave",
+                   prompt_used="p", storage_path_full="b.webp", storage_path_thumbnail="b.webp",
+                   file_size_bytes=1, aspect_ratio="16:9", generation_time_ms=1),
+    ])
+    db.commit()
+    db.close()
+
+    def run(scenario):
+        async def main():
+            async_engine = create_async_read_engine(url)
+            try:
+                async with async_sessionmaker(async_engine, expire_on_commit=False)() as session:
+                    return await scenario(session)
+            finally:
+                await async_engine.dispose()
+        return asyncio.run(main())
+
+    yield run
+    writer.dispose()
+    reader.dispose()
+
+
+def test_session_queries(run_with_db):
+    from app.services import game_queries
+
+    async def scenario(db):
+        assert (await game_queries.get_active_session(db, "gone")) is None
+        assert [s.id for s in await game_queries.list_sessions(db, limit=10)] == ["g1", "g2"]
+        counts = await game_queries.list_sessions_with_character_counts(db, limit=10)
+        assert [(s.id, n) for s, n in counts] == [("g1", 2), ("g2", 0)]
+        assert await game_queries.session_statistics(db, "g1") == {"characters": 2, "locations": 1, "events": 2}
+        events = await game_queries.recent_events(db, "g1", 10, event_type="combat")
+        assert [e.summary for e in events] == ["Fight"]
+
+    run_with_db(scenario)
+
+
+def test_image_search(run_with_db):
+    from app.services import game_queries
+
+    async def scenario(db):
+        items, total = await game_queries.search_images(db, page=1, page_size=1)
+        assert total == 2 and [i.subject_name for i in items] == ["Tavern"]
+        items, total = await game_queries.search_images(db, page=1, page_size=10, subject_name="Cave")
+        assert total == 1 and items[0].subject_name == "Cave"
+
+    run_with_db(scenario)
@@ -0,0 +1,96 @@
+"""Tests for the copy-on-write game state and its incremental Merkle checksum"""
+import copy
+import json
+
+import pytest
+
+from app.services.game_state_manager import GameStateManager, state_checksum
+
+
+def _world(characters=20, events=30):
+    manager = GameStateManager("g1")
+    for n in range(characters):
+        manager.add_character(f"c{n}", {"name": f"Hero {n}", "hp": 10, "alive": True, "tags": ["a"]})
+    manager.add_location("l1", {"name": "Tavern", "npcs": [{"name": "Bob"}]})
+    for n in range(events):
+        manager.add_event({"type": "combat", "turn_number": n})
+    return manager
+
+
+def test_reads_are_frozen_and_cheap():
+    manager = _world()
+    state = manager.get_state()
+    assert state is manager.get_state()
+    assert copy.deepcopy(state) is state
+
+    with pytest.raises(TypeError):
+        state["turn"] = 5
+    with pytest.raises(TypeError):
+        manager.get_character("c1")["hp"] = 0
+    with pytest.raises(TypeError):
+        manager.get_location("l1")["npcs"][0]["name"] = "Eve"
+    assert json.loads(manager.to_json())["characters"]["c1"]["tags"] == ["a"]
+
+
+def test_writes_create_versions_sharing_untouched_entities():
+    manager = _world()
+    before = manager.get_state()
+    revision = manager.revision
+
+    manager.update_character("c1", {"hp": 3})
+
+    after = manager.get_state()
+    assert manager.revision > revision
+    assert before["characters"]["c1"]["hp"] == 10
+    assert after["characters"]["c1"]["hp"] == 3
+    assert after["characters"]["c2"] is before["characters"]["c2"]
+    assert after["locations"] is before["locations"]
+    assert after["events"] is before["events"]
+
+
+def test_callers_data_is_not_aliased():
+    manager = GameStateManager("g1")
+    data = {"name": "Hero", "hp": 10}
+    manager.add_character("c1", data)
+    data["hp"] = 0
+    assert manager.get_character("c1")["hp"] == 10
+
+
+def test_incremental_checksum_matches_full_recompute():
+    manager = _world()
+    manager.checksum()
+    manager.update_character("c4", {"hp": 1})
+    manager.remove_character("c5")
+    manager.update_location("l1", {"visited": 2})
+    manager.next_turn()
+    for n in range(120):
+        manager.add_event({"type": "move", "turn_number": n})
+
+    snapshot = manager.snapshot()
+    assert snapshot["checksum"] == state_checksum(json.loads(json.dumps(snapshot["snapshot"])))
+    assert manager.verify_integrity(snapshot["snapshot"], snapshot["checksum"])
+    assert len(manager.get_state()["events"]) == 100
+
+
+def test_checksum_detects_single_entity_change():
+    manager = _world()
+    saved = json.loads(manager.to_json())
+    checksum = manager.checksum()
+    saved["characters"]["c7"]["hp"] = 11
+    assert not manager.verify_integrity(saved, checksum)
+
+
+def test_restore_and_replay_round_trip():
+    manager = _world()
+    manager.collect_delta()
+    saved = json.loads(manager.to_json())
+    manager.update_character("c2", {"hp": 1})
+    manager.add_location("l2", {"name": "Cave"})
+    manager.add_event({"type": "loot"})
+    delta = json.loads(json.dumps(manager.collect_delta()))
+
+    rebuilt = GameStateManager("g1")
+    rebuilt.restore(saved)
+    rebuilt.apply_delta(delta)
+    assert rebuilt.get_state() == manager.get_state()
+    assert rebuilt.checksum() == manager.checksum()
@@ -0,0 +1,89 @@
+"""Tests for cacheable image delivery and batched usage counters"""
+import time
+from email.utils import formatdate
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.http_cache import is_not_modified, validator_headers
+from app.database import Base
+from app.models.image_asset import ImageAsset
+from app.services.storage import StorageService
+from app.services.usage_counter import ImageUsageCounter
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+def _asset(name):
+    return ImageAsset(
+        component="scene-viewer", subject_type="scene", subject_name=name,
+        prompt_used="A test scene", storage_path_full=f"images/full/{name}.webp",
+        storage_path_thumbnail=f"images/thumbnails/{name}.webp", file_size_bytes=1,
+        aspect_ratio="16:9", generation_time_ms=1,
+    )
+
+
+def test_usage_counter_batches_increments(session_factory):
+    db = session_factory()
+    db.add_all([_asset("a"), _asset("b")])
+    db.commit()
+    a_id, b_id = [asset.id for asset in db.query(ImageAsset).order_by(ImageAsset.id)]
+    db.close()
+
+    counter = ImageUsageCounter(session_factory, flush_interval=60)
+    for _ in range(5):
+        counter.record(a_id)
+    counter.record(b_id)
+    assert counter.pending(a_id) == 5
+
+    assert counter.flush() == 2
+    assert counter.pending(a_id) == 0
+    assert counter.flush() == 0
+
+    db = session_factory()
+    counts = {asset.id: asset.use_count for asset in db.query(ImageAsset)}
+    db.close()
+    assert counts == {a_id: 6, b_id: 2}  # use_count starts at 1
+
+
+def test_content_etag_uses_filename_hash(tmp_path):
+    hashed = tmp_path / "Tavern_20250101_120000_deadbeef.webp"
+    hashed.write_bytes(b"x")
+    assert StorageService.content_etag(str(hashed), "full") == '"deadbeef-full"'
+    assert StorageService.content_etag(str(hashed), "thumb") == '"deadbeef-thumb"'
+
+    plain = tmp_path / "legacy.webp"
+    plain.write_bytes(b"xyz")
+    assert StorageService.content_etag(str(plain)).startswith('"3-')
+
+
+def test_conditional_requests():
+    etag = '"deadbeef-full"'
+    mtime = time.time() - 100
+    assert is_not_modified({"if-none-match": etag}, etag, mtime)
+    assert is_not_modified({"if-none-match": f'"other", W/{etag}'}, etag, mtime)
+    assert not is_not_modified({"if-none-match": '"other"'}, etag, mtime)
+    # If-None-Match wins over If-Modified-Since
+    assert not is_not_modified(
+        {"if-none-match": '"other"', "if-modified-since": formatdate(time.time(), usegmt=True)}, etag, mtime
+    )
+    assert is_not_modified({"if-modified-since": formatdate(time.time(), usegmt=True)}, etag, mtime)
+    assert not is_not_modified({"if-modified-since": formatdate(mtime - 60, usegmt=True)}, etag, mtime)
+    assert not is_not_modified({"if-modified-since": "garbage"}, etag, mtime)
+    assert not is_not_modified({}, etag, mtime)
+
+    headers = validator_headers(etag, mtime, 3600)
+    assert headers["Cache-Control"] == "public, max-age=3600, immutable"
+    assert headers["ETag"] == etag
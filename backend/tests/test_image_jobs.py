@@ -0,0 +1,130 @@
+"""Tests for the asynchronous image job queue"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.gemini_client import QuotaExceededError
+from app.services.image_jobs import ImageJobQueue, ImageJobSpec, QueueFullError, parse_model_concurrency
+
+
+def _spec(prompt="A misty forest clearing", model="model-a"):
+    return ImageJobSpec(subject_type="scene", subject_name="Forest", prompt=prompt, model=model)
+
+
+class SlowRunner:
+    """Fake generator that records peak concurrency per model"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self.active = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, spec):
+        with self.lock:
+            self.calls += 1
+            call_no = self.calls
+            self.active[spec.model] = self.active.get(spec.model, 0) + 1
+            self.peak[spec.model] = max(self.peak.get(spec.model, 0), self.active[spec.model])
+        time.sleep(self.delay)
+        with self.lock:
+            self.active[spec.model] -= 1
+        return call_no
+
+
+def test_identical_prompts_are_coalesced():
+    runner = SlowRunner()
+
+    async def scenario():
+        queue = ImageJobQueue(runner, workers=4)
+        jobs = [queue.submit(_spec()) for _ in range(5)]
+        assert len({job.id for job in jobs}) == 1
+        await queue.wait(jobs[0], timeout=5)
+        assert jobs[0].status == "completed" and jobs[0].requesters == 5
+        # A new request after completion starts a fresh job
+        assert queue.submit(_spec()).id != jobs[0].id
+        await queue.shutdown()
+        return queue.stats
+
+    stats = asyncio.run(scenario())
+    assert stats["coalesced"] == 4
+    assert runner.calls >= 1
+
+
+def test_same_prompt_for_different_subjects_is_not_coalesced():
+    runner = SlowRunner()
+
+    async def scenario():
+        queue = ImageJobQueue(runner, workers=4)
+        forest = queue.submit(_spec())
+        grove = queue.submit(ImageJobSpec(subject_type="scene", subject_name="Grove",
+                                          prompt="A misty forest clearing", model="model-a"))
+        assert forest.id != grove.id
+        await asyncio.gather(queue.wait(forest, timeout=5), queue.wait(grove, timeout=5))
+        assert forest.asset_id != grove.asset_id
+        await queue.shutdown()
+        return queue.stats
+
+    stats = asyncio.run(scenario())
+    assert stats["coalesced"] == 0
+    assert runner.calls == 2
+
+
+def test_per_model_concurrency_limits():
+    runner = SlowRunner()
+
+    async def scenario():
+        queue = ImageJobQueue(runner, workers=8, model_concurrency={"model-a": 1}, default_concurrency=3)
+        jobs = [queue.submit(_spec(f"prompt {i} for a", "model-a")) for i in range(4)]
+        jobs += [queue.submit(_spec(f"prompt {i} for b", "model-b")) for i in range(6)]
+        await asyncio.gather(*(queue.wait(job, timeout=5) for job in jobs))
+        await queue.shutdown()
+        return jobs
+
+    jobs = asyncio.run(scenario())
+    assert all(job.status == "completed" for job in jobs)
+    assert runner.peak["model-a"] == 1
+    assert runner.peak["model-b"] == 3
+
+
+def test_event_loop_stays_responsive():
+    runner = SlowRunner(delay=0.3)
+
+    async def scenario():
+        queue = ImageJobQueue(runner, workers=2)
+        job = queue.submit(_spec())
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        await queue.wait(job, timeout=5)
+        await queue.shutdown()
+        return elapsed
+
+    assert asyncio.run(scenario()) < 0.2
+
+
+def test_failures_are_mapped_and_queue_bounded():
+    def failing(spec):
+        raise QuotaExceededError("quota")
+
+    async def scenario():
+        queue = ImageJobQueue(failing, workers=1, max_pending=2)
+        first = queue.submit(_spec("prompt one"))
+        queue.submit(_spec("prompt two"))
+        with pytest.raises(QueueFullError):
+            queue.submit(_spec("prompt three"))
+        await queue.wait(first, timeout=5)
+        await queue.shutdown()
+        return first
+
+    job = asyncio.run(scenario())
+    assert job.status == "failed"
+    assert job.error["code"] == 429
+
+
+def test_parse_model_concurrency():
+    assert parse_model_concurrency("a=2, b=1,bad,c=x") == {"a": 2, "b": 1}
+    assert parse_model_concurrency("") == {}
@@ -0,0 +1,134 @@
+"""Tests for the content-addressed image store and image garbage collection"""
+import asyncio
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.image_asset import ImageAsset
+from app.services.image_gc import ImageGarbageCollector
+from app.services.storage import ImageEncoder, StorageService
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    encoder = ImageEncoder(workers=2)
+    yield StorageService(str(tmp_path / "images"), encoder=encoder)
+    encoder.shutdown()
+
+
+def _png(color, size=(640, 360)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _blob_path(storage, color):
+    return str(storage.blob_path(StorageService.content_hash(_png(color))))
+
+
+def _asset(name, paths, deleted_at=None):
+    return ImageAsset(
+        component="scene-viewer", subject_type="scene", subject_name=name,
+        prompt_used="A test scene", storage_path_full=paths["full_path"],
+        storage_path_thumbnail=paths["thumbnail_path"], file_size_bytes=paths["file_size_bytes"],
+        content_hash=paths.get("content_hash"), aspect_ratio="16:9", generation_time_ms=1,
+        deleted_at=deleted_at,
+    )
+
+
+def test_identical_bytes_share_one_blob(storage):
+    data = _png("red")
+    first = storage.save_image(data, "Tavern")
+    second = storage.save_image(data, "Another Tavern")
+    other = storage.save_image(_png("blue"), "Tavern")
+
+    assert first["full_path"] == second["full_path"]
+    assert not first["deduplicated"] and second["deduplicated"]
+    assert other["full_path"] != first["full_path"]
+    assert len(list(storage.iter_blobs())) == 2
+    assert first["full_path"].endswith(f"{first['content_hash']}.webp")
+    assert StorageService.content_etag(first["full_path"]) == f'"{first["content_hash"]}-full"'
+
+
+def test_thumbnails_are_lazy_and_sized(storage):
+    paths = storage.save_image(_png("green"), "Forest")
+    assert not list(storage.thumb_dir.rglob("*.webp"))
+
+    for size in (64, 128, 200, 512):
+        thumb = storage.ensure_thumbnail(paths["full_path"], size)
+        with Image.open(thumb) as img:
+            assert max(img.size) == size
+    assert paths["thumbnail_path"] == ""
+    assert storage.ensure_thumbnail(paths["full_path"]) == str(storage.thumbnail_path(paths["full_path"]))
+
+    with pytest.raises(ValueError):
+        storage.ensure_thumbnail(paths["full_path"], 300)
+
+
+def test_concurrent_saves_coalesce(storage):
+    data = _png("purple")
+
+    async def scenario():
+        return await asyncio.gather(*(storage.save_image_async(data, "Crypt") for _ in range(8)))
+
+    results = asyncio.run(scenario())
+    assert len({r["full_path"] for r in results}) == 1
+    assert storage.encoder.stats["submitted"] == 1
+
+
+def test_gc_purges_expired_and_keeps_shared_blobs(session_factory, storage):
+    shared = storage.save_image(_png("red"), "Tavern")
+    storage.save_image(_png("red"), "Tavern")
+    alone = storage.save_image(_png("blue"), "Cave")
+    storage.ensure_thumbnail(alone["full_path"], 64)
+    orphan = storage.save_image(_png("white"), "Unused")
+
+    long_ago = datetime.now() - timedelta(days=31)
+    db = session_factory()
+    db.add_all([
+        _asset("Tavern", shared, deleted_at=long_ago),
+        _asset("Tavern", shared),
+        _asset("Cave", alone, deleted_at=long_ago),
+        _asset("Recent", storage.save_image(_png("black"), "Recent"), deleted_at=datetime.now()),
+    ])
+    db.commit()
+    db.close()
+
+    gc = ImageGarbageCollector(session_factory, storage=storage, retention_days=30, blob_grace=0)
+    result = gc.collect()
+
+    assert result["assets_purged"] == 2
+    assert result["files_removed"] == 2  # the Cave blob and the never-referenced orphan
+    db = session_factory()
+    assert sorted(a.subject_name for a in db.query(ImageAsset)) == ["Recent", "Tavern"]
+    db.close()
+
+    remaining = {str(path) for _, path in storage.iter_blobs()}
+    assert remaining == {shared["full_path"], _blob_path(storage, "black")}
+    assert not list(storage.thumb_dir.rglob(f"{alone['content_hash']}.webp"))
+    assert orphan["content_hash"] not in {h for h, _ in storage.iter_blobs()}
+
+
+def test_gc_leaves_fresh_unreferenced_blobs(session_factory, storage):
+    storage.save_image(_png("yellow"), "In flight")
+    gc = ImageGarbageCollector(session_factory, storage=storage, blob_grace=3600)
+    assert gc.collect()["files_removed"] == 0
+    assert len(list(storage.iter_blobs())) == 1
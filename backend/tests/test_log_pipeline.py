@@ -0,0 +1,103 @@
+"""Tests for the buffered log pipeline (LogBuffer -> LogEvent -> LogWorker -> vault)"""
+import asyncio
+import logging
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.log_event import LogEvent
+from app.services.game_service import DatabaseLogProvider
+from app.services.log_buffer import LogBuffer
+from app.services.log_worker import LogWorker
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory database shared across threads"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_buffer_bulk_inserts_in_order(session_factory):
+    buffer = LogBuffer(session_factory, max_batch=1000, flush_interval=60)
+    provider = DatabaseLogProvider("s1", log_buffer=buffer)
+    for i in range(100):
+        provider.log(logging.INFO, f"line {i}", {"turn": i})
+
+    assert buffer.flush() == 100
+    assert buffer.stats["batches"] == 1
+    db = session_factory()
+    rows = db.query(LogEvent).order_by(LogEvent.id).all()
+    assert [r.message for r in rows] == [f"line {i}" for i in range(100)]
+    assert rows[0].level == "INFO" and rows[5].log_metadata == {"turn": 5}
+    db.close()
+    buffer.close()
+
+
+def test_buffer_flushes_in_background(session_factory):
+    buffer = LogBuffer(session_factory, max_batch=1000, flush_interval=0.01)
+    flushed = []
+    buffer.add_listener(flushed.append)
+    buffer.enqueue("s1", "INFO", "hello")
+    buffer.close()
+    assert sum(flushed) == 1
+    db = session_factory()
+    assert db.query(LogEvent).count() == 1
+    db.close()
+
+
+def test_worker_groups_events_per_note(session_factory, tmp_path):
+    buffer = LogBuffer(session_factory, max_batch=1000, flush_interval=60)
+    buffer.enqueue("s1", "INFO", "first")
+    buffer.enqueue("s2", "INFO", "other session")
+    buffer.enqueue("s1", "WARNING", "second")
+    buffer.enqueue("s1", "INFO", "combat", {"note": "Combat: Round 1"})
+    buffer.flush()
+
+    worker = LogWorker(session_factory, vault_path=str(tmp_path), log_buffer=buffer)
+    assert worker._process_batch() == 4
+    assert worker._process_batch() == 0
+
+    log_dir = tmp_path / "Logs"
+    assert sorted(os.listdir(log_dir)) == ["Combat Round 1.md", "Session s1.md", "Session s2.md"]
+    s1 = (log_dir / "Session s1.md").read_text()
+    assert s1.startswith("# Session s1\n")
+    assert s1.index("first") < s1.index("**WARNING** second")
+
+    db = session_factory()
+    assert {e.status for e in db.query(LogEvent).all()} == {"completed"}
+    db.close()
+
+
+def test_worker_wakes_on_flush_and_drains_on_stop(session_factory, tmp_path):
+    buffer = LogBuffer(session_factory, max_batch=1000, flush_interval=60)
+    worker = LogWorker(session_factory, vault_path=str(tmp_path), log_buffer=buffer)
+
+    async def scenario():
+        worker.start()
+        await asyncio.sleep(0.3)  # let the idle backoff grow
+        buffer.enqueue("s1", "INFO", "woken")
+        await asyncio.to_thread(buffer.flush)
+        for _ in range(50):
+            if (tmp_path / "Logs" / "Session s1.md").exists():
+                break
+            await asyncio.sleep(0.02)
+        assert (tmp_path / "Logs" / "Session s1.md").exists()
+
+        buffer.enqueue("s1", "INFO", "at shutdown")
+        await worker.stop()
+
+    asyncio.run(scenario())
+    content = (tmp_path / "Logs" / "Session s1.md").read_text()
+    assert "woken" in content and "at shutdown" in content
+    buffer.close()
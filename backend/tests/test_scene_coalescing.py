@@ -0,0 +1,89 @@
+"""Tests for scene request coalescing and the hot scene cache"""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.services.scene_cache_service import HotSceneCache, HotSceneEntry
+from app.services.single_flight import SingleFlight
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _entry(asset_id=1, days=1):
+    return HotSceneEntry(cache_id=asset_id, image_asset_id=asset_id,
+                         expires_at=datetime.now() + timedelta(days=days))
+
+
+def test_single_flight_runs_once_for_concurrent_callers():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "scene"
+
+    async def scenario():
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.do("tavern", work) for _ in range(10)))
+        return flights, results
+
+    flights, results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [r for r, _ in results] == ["scene"] * 10
+    assert sum(shared for _, shared in results) == 9
+    assert flights.inflight() == 0
+
+
+def test_single_flight_shares_errors_and_survives_cancelled_caller():
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("quota")
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.do("k", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        leader = asyncio.ensure_future(flights.do("s", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("s", slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == ("done", True)
+
+
+def test_hot_cache_ttl_lru_and_invalidate():
+    clock = FakeClock()
+    cache = HotSceneCache(max_entries=2, ttl=10, time_fn=clock)
+    cache.put(("Tavern", "day", "clear"), _entry(1))
+    cache.put(("Tavern", "night", "rain"), _entry(2))
+    assert cache.get(("Tavern", "day", "clear")).image_asset_id == 1
+
+    cache.put(("Forest", "day", "clear"), _entry(3))
+    assert cache.get(("Tavern", "night", "rain")) is None  # evicted as LRU
+
+    clock.now += 11
+    assert cache.get(("Forest", "day", "clear")) is None  # ttl
+
+    cache.put(("Forest", "day", "clear"), _entry(3))
+    cache.put(("Tavern", "day", "clear"), _entry(1))
+    assert cache.invalidate("Tavern") == 1
+    assert cache.get(("Forest", "day", "clear")) is not None
+    assert cache.get_stats()["entries"] == 1
+
+
+def test_hot_cache_respects_row_expiry():
+    cache = HotSceneCache(ttl=1000)
+    cache.put(("Cave", "day", "clear"), _entry(1, days=-1))
+    assert cache.get(("Cave", "day", "clear")) is None
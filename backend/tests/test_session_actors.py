@@ -0,0 +1,94 @@
+"""Tests for per-session ordered mailboxes"""
+import asyncio
+import random
+
+import pytest
+
+from app.services.session_actors import MailboxFullError, SessionActors
+
+
+def test_hundreds_of_sessions_run_in_order_and_in_parallel():
+    async def scenario():
+        actors = SessionActors()
+        log = {f"s{n}": [] for n in range(300)}
+        running = {"now": 0, "peak": 0}
+        busy = set()
+
+        def job(session_id, step):
+            async def run():
+                assert session_id not in busy, "two actions interleaved on one session"
+                busy.add(session_id)
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+                await asyncio.sleep(random.random() / 1000)
+                log[session_id].append(step)
+                running["now"] -= 1
+                busy.discard(session_id)
+                return step
+            return run
+
+        calls = [actors.submit(session_id, job(session_id, step))
+                 for step in range(10) for session_id in log]
+        results = await asyncio.gather(*calls)
+
+        assert results == [step for step in range(10) for _ in log]
+        assert all(steps == list(range(10)) for steps in log.values())
+        assert running["peak"] > 100
+        assert actors.metrics()["active_sessions"] == 0
+        assert actors.metrics()["processed"] == 3000
+
+    asyncio.run(scenario())
+
+
+def test_slow_session_does_not_block_others():
+    async def scenario():
+        actors = SessionActors()
+        gate = asyncio.Event()
+
+        async def slow():
+            await gate.wait()
+            return "slow"
+
+        async def fast():
+            return "fast"
+
+        slow_call = asyncio.ensure_future(actors.submit("slow", slow))
+        assert await asyncio.wait_for(actors.submit("other", fast), 1) == "fast"
+        queued = asyncio.ensure_future(actors.submit("slow", fast))
+        await asyncio.sleep(0)
+        assert not queued.done()
+        gate.set()
+        assert await slow_call == "slow" and await queued == "fast"
+
+    asyncio.run(scenario())
+
+
+def test_errors_propagate_and_full_mailbox_rejects():
+    async def scenario():
+        actors = SessionActors(mailbox_size=2)
+
+        async def boom():
+            raise ValueError("bad action")
+
+        with pytest.raises(ValueError):
+            await actors.submit("s", boom)
+
+        gate = asyncio.Event()
+
+        async def wait():
+            await gate.wait()
+
+        running = asyncio.ensure_future(actors.submit("s", wait))
+        for _ in range(3):
+            await asyncio.sleep(0)  # let the worker pick it up
+        pending = [running] + [asyncio.ensure_future(actors.submit("s", wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert actors.metrics()["queued_actions"] == 2
+        with pytest.raises(MailboxFullError):
+            await actors.submit("s", wait)
+        gate.set()
+        await asyncio.gather(*pending)
+        await actors.join()
+        assert actors.metrics()["failed"] == 1
+
+    asyncio.run(scenario())
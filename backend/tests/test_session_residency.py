@@ -0,0 +1,163 @@
+"""Tests for the bounded, idle-evicting session residency"""
+import asyncio
+import threading
+import time
+
+from app.services.session_residency import SessionResidency
+
+
+def _residency(**kwargs):
+    loads, flushed = [], []
+
+    def loader(session_id):
+        loads.append(session_id)
+        return None if session_id == "missing" else {"id": session_id}
+
+    residency = SessionResidency("test", loader=loader, flush=lambda sid, value: flushed.append(sid), **kwargs)
+    return residency, loads, flushed
+
+
+def test_lru_eviction_flushes_least_recently_used():
+    residency, loads, flushed = _residency(max_resident=2)
+    residency.get("a")
+    residency.get("b")
+    residency.get("a")
+    residency.get("c")
+
+    assert residency.keys() == ["a", "c"]
+    assert flushed == ["b"]
+    assert residency.get("b") == {"id": "b"}
+    assert loads == ["a", "b", "c", "b"]
+
+
+def test_idle_sessions_are_flushed_and_reloaded():
+    residency, loads, flushed = _residency(idle_seconds=0.05)
+    residency.get("a")
+    time.sleep(0.1)
+    residency.get("b")
+
+    assert residency.evict_idle() == 1
+    assert flushed == ["a"] and residency.keys() == ["b"]
+    residency.get("a")
+    assert loads == ["a", "b", "a"]
+
+
+def test_concurrent_misses_rehydrate_once():
+    calls = []
+
+    def slow_loader(session_id):
+        calls.append(session_id)
+        time.sleep(0.05)
+        return object()
+
+    residency = SessionResidency("test", loader=slow_loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(residency.get("a"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["a"]
+    assert len({id(result) for result in results}) == 1
+
+
+def test_discard_skips_flush_and_missing_sessions_stay_out():
+    residency, loads, flushed = _residency()
+    residency.put("a", {"id": "a"})
+    assert residency.discard("a")
+    assert flushed == []
+    assert residency.get("missing") is None
+    assert "missing" not in residency
+
+
+def test_failed_flush_keeps_session_resident():
+    loads, attempts = [], []
+
+    def flush(session_id, value):
+        attempts.append(session_id)
+        if len(attempts) == 1:
+            raise RuntimeError("database unavailable")
+
+    residency = SessionResidency("test", loader=lambda sid: loads.append(sid), flush=flush, max_resident=1)
+    a = residency.put("a", {"id": "a", "unsaved": True})
+    residency.put("b", {"id": "b"})
+
+    assert residency.keys() == ["a", "b"]
+    assert residency.get("a") is a
+    assert loads == []
+    assert residency.metrics()["flush_errors"] == 1
+
+    # Retried once the flush works again
+    residency.put("c", {"id": "c"})
+    assert attempts == ["a", "b", "a"]
+    assert residency.keys() == ["c"]
+
+
+def test_async_access_loads_and_flushes_off_the_event_loop():
+    threads = []
+
+    def loader(session_id):
+        threads.append(threading.get_ident())
+        return {"id": session_id}
+
+    residency = SessionResidency(
+        "test", loader=loader, flush=lambda sid, value: threads.append(threading.get_ident()), max_resident=1
+    )
+
+    async def run():
+        loaded = await residency.get_async("a")
+        assert await residency.get_async("a") is loaded
+        await residency.put_async("b", {"id": "b"})
+
+    asyncio.run(run())
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+    assert residency.keys() == ["b"]
+
+
+def test_metrics():
+    residency, _, _ = _residency(max_resident=1)
+    residency.get("a")
+    residency.get("a")
+    residency.get("a")
+    residency.get("b")
+
+    metrics = residency.metrics()
+    assert metrics["resident"] == 1
+    assert metrics["hits"] == 2 and metrics["misses"] == 2
+    assert metrics["hit_rate"] == 0.5
+    assert metrics["evictions"] == 1
+    assert metrics["rehydrations"] == 2
+    assert metrics["rehydration_avg_ms"] >= 0
+
+
+def test_game_service_keeps_game_resident_when_db_write_fails(monkeypatch):
+    from types import SimpleNamespace
+    import importlib
+    # app.services re-exports the game_service singleton under the module's name
+    game_service_module = importlib.import_module("app.services.game_service")
+
+    class BrokenSession:
+        def query(self, *args):
+            raise RuntimeError("database unavailable")
+
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(game_service_module, "SessionLocal", BrokenSession)
+    service = game_service_module.GameService()
+    residency = service._active_games
+    residency.max_resident = 1
+    game = SimpleNamespace(players=[SimpleNamespace(name="Hero", hp=3, alive=True)], enemies=[])
+
+    # The per-action snapshot logs and carries on
+    service._snapshot_characters("a", game)
+
+    residency.put("a", game)
+    residency.put("b", SimpleNamespace(players=[], enemies=[]))
+    assert "a" in residency
+    assert residency.metrics()["flush_errors"] == 1
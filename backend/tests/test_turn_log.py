@@ -0,0 +1,139 @@
+"""Tests for the event-sourced turn log (per-turn deltas plus periodic snapshots)"""
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database import Base
+from app.models import GameSession, Event as DBEvent
+from app.services.game_state_manager import GameStateManager
+from app.services.turn_log import (
+    STATE_DELTA_EVENT, TurnLogIntegrityError, load_state, record_changes
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False},
+                           poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(GameSession(id="g1", name="Test", quest_progress={}))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _party(size=50):
+    manager = GameStateManager("g1")
+    for n in range(size):
+        manager.add_character(f"c{n}", {"name": f"Hero {n}", "hp": 20, "inventory": ["sword"] * 10})
+    manager.add_location("l1", {"name": "Tavern", "visited": 0})
+    manager.set_current_location("l1")
+    return manager
+
+
+def _play_turn(manager, turn):
+    manager.next_turn()
+    manager.update_character(f"c{turn % 50}", {"hp": 20 - turn % 7})
+    manager.add_event({"type": "combat", "turn": turn})
+
+
+def _save(db, manager):
+    saved = record_changes(db, manager)
+    db.commit()
+    saved.committed()
+    return saved
+
+
+def _deltas(db):
+    return db.query(DBEvent).filter(DBEvent.event_type == STATE_DELTA_EVENT).order_by(DBEvent.id).all()
+
+
+def test_delta_holds_only_changed_fields():
+    manager = _party()
+    manager.collect_delta()
+    assert manager.collect_delta() is None
+
+    _play_turn(manager, 1)
+    delta = manager.collect_delta()
+    assert delta["set"] == {"turn": 1}
+    assert delta["characters_updates"] == {"c1": {"hp": 19}}
+    assert "characters" not in delta
+    assert len(json.dumps(delta)) < len(json.dumps(manager.state)) / 20
+
+
+def test_replay_rebuilds_identical_state(db):
+    manager = _party()
+    _save(db, manager)
+    for turn in range(1, 24):
+        _play_turn(manager, turn)
+        if turn == 9:
+            manager.remove_character("c3")
+            manager.add_location("l2", {"name": "Cave", "visited": 0})
+        _save(db, manager)
+
+    loaded = load_state(db, "g1")
+    assert loaded.get_state() == manager.get_state()
+    assert loaded.snapshot_turn == manager.snapshot_turn
+
+
+def test_snapshots_follow_turn_interval(db, monkeypatch):
+    monkeypatch.setattr(settings, "GAME_SNAPSHOT_INTERVAL", 5)
+    monkeypatch.setattr(settings, "GAME_SNAPSHOT_DELTA_BYTES", 10 ** 9)
+    manager = _party()
+    written = [_save(db, manager).snapshot]
+    for turn in range(1, 11):
+        _play_turn(manager, turn)
+        written.append(_save(db, manager).snapshot)
+
+    assert [turn for turn, snapshot in enumerate(written) if snapshot] == [0, 5, 10]
+    assert db.get(GameSession, "g1").state_snapshot["turn"] == 10
+    assert len(_deltas(db)) == 11
+
+
+def test_tampered_delta_is_rejected(db, monkeypatch):
+    monkeypatch.setattr(settings, "GAME_SNAPSHOT_INTERVAL", 100)
+    manager = _party()
+    _save(db, manager)
+    for turn in range(1, 4):
+        _play_turn(manager, turn)
+        _save(db, manager)
+
+    row = _deltas(db)[-1]
+    row.state_after = dict(row.state_after, set={"turn": 99})
+    db.commit()
+
+    with pytest.raises(TurnLogIntegrityError):
+        load_state(db, "g1")
+    assert load_state(db, "g1", verify=False).get_turn() == 99
+
+
+def test_failed_commit_is_recorded_again(db, monkeypatch):
+    monkeypatch.setattr(settings, "GAME_SNAPSHOT_INTERVAL", 100)
+    manager = _party()
+    _save(db, manager)
+    _play_turn(manager, 1)
+    _save(db, manager)
+    version = manager.get_state()["version"]
+
+    _play_turn(manager, 2)
+    record_changes(db, manager)
+    db.rollback()  # the commit failed; committed() is never called
+    assert manager.get_state()["version"] == version
+    assert manager.has_changes()
+
+    _play_turn(manager, 3)
+    _save(db, manager)
+    loaded = load_state(db, "g1")
+    assert loaded.get_state() == manager.get_state()
+    assert loaded.get_turn() == 3
+
+
+def test_nothing_saved_loads_as_none(db):
+    assert load_state(db, "g1") is None
+    assert load_state(db, "missing") is None
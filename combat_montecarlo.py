@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Vectorized Monte Carlo combat engine for balance dashboards.
+
+Simulates thousands of battles of one matchup at once as NumPy
+struct-of-arrays state (hp, attack, defense, alive, stunned), resolving each
+initiative step for every battle with array operations. The rules mirror
+``DnDGame._resolve_turn`` / ``Character.attack_target``:
+
+- initiative is reshuffled every turn, stunned characters lose their action
+- Clerics heal the most wounded ally first; everyone else hits the
+  weakest living opponent
+- 30% of attacks use the class ability (Heavy Strike, Fireball, Backstab,
+  Heal, Bone Shield, Cheap Shot, Rage, Fury) with the same quirks as the
+  scalar code, e.g. Fury subtracting defense twice and a Cleric's ability
+  "healing" an enemy
+- enemy deaths roll their ``LOOT_TABLES`` entry and the killer's team
+  collects the gold
+
+It draws from its own NumPy generator, so results agree with the scalar
+engine statistically rather than battle-for-battle; see
+test_combat_montecarlo.py for the validation against combat_simulator.
+
+Example:
+    python3 combat_montecarlo.py --battles 100000 --party Fighter Cleric --enemies Orc Goblin
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from combat_simulator import ENEMY_CLASSES, PLAYER_CLASSES, MatchupStats
+from items import LOOT_TABLES
+
+CLASS_CODES = {name: code for code, name in enumerate(PLAYER_CLASSES + ENEMY_CLASSES)}
+FIGHTER, WIZARD, ROGUE, CLERIC, GOBLIN, ORC, SKELETON, BANDIT = (
+    CLASS_CODES[name] for name in ["Fighter", "Wizard", "Rogue", "Cleric", "Goblin", "Orc", "Skeleton", "Bandit"]
+)
+
+ABILITY_CHANCE = 0.3
+STUN_CHANCE = 0.3
+# Bone Shield doubles defense without bound; cap it well past any damage
+# value so repeated doublings can't overflow int64.
+DEFENSE_CAP = 1 << 40
+
+
+def roll_loot_tables(table_name: str, n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """Vectorized equivalent of ``LOOT_TABLES[table_name].roll()`` for n drops."""
+    table = LOOT_TABLES.get(table_name)
+    if table is None:
+        # Mirrors get_loot_from_enemy's gold-only default
+        return {"gold_coin": rng.integers(1, 6, size=n)}
+
+    drops: Dict[str, np.ndarray] = {}
+    low, high = table.gold_range
+    if high > 0:
+        drops["gold_coin"] = rng.integers(low, high + 1, size=n)
+    for entry in table.items:
+        hit = rng.random(n) < entry["chance"]
+        quantity = rng.integers(entry["quantity"][0], entry["quantity"][1] + 1, size=n)
+        item_id = entry["item_id"]
+        drops[item_id] = drops.get(item_id, 0) + np.where(hit, quantity, 0)
+    return drops
+
+
+class _BattleArrays:
+    """Struct-of-arrays state for ``battles`` copies of one matchup."""
+
+    def __init__(self, party: Sequence[str], enemies: Sequence[str], battles: int, rng: np.random.Generator):
+        names = list(party) + list(enemies)
+        slots = len(names)
+        self.rng = rng
+        self.cls = np.array([CLASS_CODES[name] for name in names])
+        self.team = np.array([0] * len(party) + [1] * len(enemies))
+        self.loot_table = [name.lower() for name in names]
+
+        self.max_hp = rng.integers(20, 51, size=(battles, slots))
+        self.hp = self.max_hp.copy()
+        self.attack = rng.integers(5, 16, size=(battles, slots))
+        self.defense = rng.integers(1, 6, size=(battles, slots))
+        self.alive = np.ones((battles, slots), dtype=bool)
+        self.stunned = np.zeros((battles, slots), dtype=bool)
+
+        self.turns = np.zeros(battles, dtype=np.int64)
+        self.gold = np.zeros(battles, dtype=np.int64)
+        self.hits = {code: [] for code in np.unique(self.cls)}
+
+    def game_over(self) -> np.ndarray:
+        players_alive = (self.alive & (self.team == 0)).any(axis=1)
+        enemies_alive = (self.alive & (self.team == 1)).any(axis=1)
+        return ~players_alive | ~enemies_alive
+
+    # ------------------------------------------------------------------
+
+    def _take_damage(self, rows: np.ndarray, target: np.ndarray, damage: np.ndarray) -> np.ndarray:
+        """Character.take_damage for each (row, target); returns gold looted."""
+        actual = np.maximum(0, damage - self.defense[rows, target])
+        new_hp = np.maximum(0, self.hp[rows, target] - actual)
+        self.hp[rows, target] = new_hp
+        died = new_hp <= 0
+        self.alive[rows[died], target[died]] = False
+
+        gold = np.zeros(len(rows), dtype=np.int64)
+        dead_enemy = died & (self.team[target] == 1)
+        for slot in np.unique(target[dead_enemy]):
+            mask = dead_enemy & (target == slot)
+            drops = roll_loot_tables(self.loot_table[slot], int(mask.sum()), self.rng)
+            if "gold_coin" in drops:
+                gold[mask] = drops["gold_coin"]
+        return gold
+
+    def _heal(self, rows: np.ndarray, target: np.ndarray) -> None:
+        amount = self.rng.integers(1, 21, size=len(rows))
+        living = self.alive[rows, target]
+        healed = np.minimum(self.max_hp[rows, target], self.hp[rows, target] + amount)
+        self.hp[rows, target] = np.where(living, healed, self.hp[rows, target])
+
+    def _ability(self, rows: np.ndarray, actor: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """Dispatch the class ability for each row; returns gold looted."""
+        gold = np.zeros(len(rows), dtype=np.int64)
+        actor_cls = self.cls[actor]
+        attack = self.attack[rows, actor]
+
+        def hit(mask, damage):
+            if mask.any():
+                gold[mask] = self._take_damage(rows[mask], target[mask], damage[mask])
+
+        hit(actor_cls == FIGHTER, attack * 2)
+        hit(actor_cls == WIZARD, self.rng.integers(15, 21, size=len(rows)))
+
+        rogue = actor_cls == ROGUE
+        if rogue.any():
+            r, t = rows[rogue], target[rogue]
+            self.defense[r, t] = np.maximum(0, self.defense[r, t] - 2)
+            hit(rogue, np.floor(attack * 1.5).astype(np.int64))
+
+        cleric = actor_cls == CLERIC
+        if cleric.any():
+            self._heal(rows[cleric], target[cleric])
+
+        skeleton = actor_cls == SKELETON
+        if skeleton.any():
+            r, a = rows[skeleton], actor[skeleton]
+            self.defense[r, a] = np.minimum(self.defense[r, a] * 2, DEFENSE_CAP)
+
+        bandit = actor_cls == BANDIT
+        if bandit.any():
+            r, t = rows[bandit], target[bandit]
+            stun = (self.rng.random(len(r)) < STUN_CHANCE) & ~self.stunned[r, t]
+            self.stunned[r[stun], t[stun]] = True
+            hit(bandit, np.floor(attack * 1.2).astype(np.int64))
+
+        orc = actor_cls == ORC
+        if orc.any():
+            r, a = rows[orc], actor[orc]
+            self.attack[r, a] += 3
+            self.defense[r, a] += 2
+            hit(orc, np.floor(self.attack[rows, actor] * 1.5).astype(np.int64))
+
+        goblin = actor_cls == GOBLIN
+        if goblin.any():
+            r, a = rows[goblin], actor[goblin]
+            self.attack[r, a] += 2
+            damage = self.attack[rows, actor] - self.defense[rows, target]
+            # Negative damage raises in take_damage, aborting the action
+            fury = goblin & (damage >= 0)
+            if fury.any():
+                # A kill on the first hit is reported (and looted) by the second
+                self._take_damage(rows[fury], target[fury], damage[fury])
+                gold[fury] = self._take_damage(rows[fury], target[fury], damage[fury])
+        return gold
+
+    def step(self, rows: np.ndarray, actor: np.ndarray) -> None:
+        """Resolve one initiative slot: ``actor[i]`` acts in battle ``rows[i]``."""
+        acting = self.alive[rows, actor]
+
+        stunned = acting & self.stunned[rows, actor]
+        self.stunned[rows[stunned], actor[stunned]] = False
+        acting &= ~stunned
+        if not acting.any():
+            return
+        rows, actor = rows[acting], actor[acting]
+        alive, hp, max_hp = self.alive[rows], self.hp[rows], self.max_hp[rows]
+
+        actor_team = self.team[actor]
+        same_team = self.team[None, :] == actor_team[:, None]
+
+        # Clerics heal the ally with the lowest hp ratio before attacking
+        wounded = same_team & alive & (hp < max_hp)
+        ratio = np.where(wounded, hp / max_hp, np.inf)
+        heal_target = ratio.argmin(axis=1)
+        heals = (self.cls[actor] == CLERIC) & wounded.any(axis=1)
+        if heals.any():
+            self._heal(rows[heals], heal_target[heals])
+
+        opponents = ~same_team & alive
+        target = np.where(opponents, hp, np.iinfo(np.int64).max).argmin(axis=1)
+        attacks = ~heals & opponents.any(axis=1)
+        if not attacks.any():
+            return
+
+        r, a, t = rows[attacks], actor[attacks], target[attacks]
+        hp_before = self.hp[r, t].copy()
+        use_ability = self.rng.random(len(r)) < ABILITY_CHANCE
+
+        gold = np.zeros(len(r), dtype=np.int64)
+        if use_ability.any():
+            gold[use_ability] = self._ability(r[use_ability], a[use_ability], t[use_ability])
+        normal = ~use_ability
+        if normal.any():
+            damage = self.attack[r[normal], a[normal]] + self.rng.integers(1, 7, size=int(normal.sum()))
+            gold[normal] = self._take_damage(r[normal], t[normal], damage)
+
+        # Loot goes to the killer; only the players' haul is reported
+        self.gold[r] += np.where(self.team[a] == 0, gold, 0)
+
+        dealt = hp_before - self.hp[r, t]
+        for code in self.hits:
+            mask = (self.cls[a] == code) & (dealt > 0)
+            if mask.any():
+                self.hits[code].append(dealt[mask])
+
+
+def simulate_matchup(
+    party: Sequence[str],
+    enemies: Sequence[str],
+    battles: int,
+    seed: Optional[int] = None,
+    max_turns: int = 100,
+) -> MatchupStats:
+    """Run ``battles`` vectorized battles and aggregate them like combat_simulator."""
+    rng = np.random.default_rng(seed)
+    state = _BattleArrays(party, enemies, battles, rng)
+    slots = len(state.cls)
+
+    for _ in range(max_turns):
+        active = ~state.game_over()
+        if not active.any():
+            break
+        # Only battles still running take part in the turn
+        rows = np.flatnonzero(active)
+        state.turns[rows] += 1
+        order = rng.random((len(rows), slots)).argsort(axis=1)
+        for position in range(slots):
+            state.step(rows, order[:, position])
+
+    players_alive = (state.alive & (state.team == 0)).any(axis=1)
+    enemies_alive = (state.alive & (state.team == 1)).any(axis=1)
+
+    stats = MatchupStats(
+        battles=battles,
+        player_wins=int((players_alive & ~enemies_alive).sum()),
+        enemy_wins=int((enemies_alive & ~players_alive).sum()),
+        total_turns=int(state.turns.sum()),
+        total_gold=int(state.gold.sum()),
+    )
+    stats.draws = battles - stats.player_wins - stats.enemy_wins
+    class_names = {code: name for name, code in CLASS_CODES.items()}
+    for code, chunks in state.hits.items():
+        if chunks:
+            values, counts = np.unique(np.concatenate(chunks), return_counts=True)
+            stats.damage[class_names[code]] = Counter(dict(zip(values.tolist(), counts.tolist())))
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--battles", type=int, default=100000)
+    parser.add_argument("--party", nargs="+", default=["Fighter", "Wizard"], choices=PLAYER_CLASSES)
+    parser.add_argument("--enemies", nargs="+", default=["Goblin", "Orc"], choices=ENEMY_CLASSES)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = simulate_matchup(args.party, args.enemies, args.battles, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(json.dumps(stats.to_dict(), indent=2))
+    print(f"\n{args.battles} battles in {elapsed:.2f}s ({args.battles / elapsed * 60:,.0f} battles/minute)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Headless combat simulator for class balancing.
+
+Runs many independent DnDGame battles with the real combat rules
+(Character.attack_target, take_damage, class abilities and loot tables)
+but without narration or log output. Each battle seeds the RNG from
+(base seed, battle index), so results are reproducible no matter how the
+work is split across the process pool.
+
+Example:
+    python3 combat_simulator.py --battles 10000 --party Fighter Cleric --enemies Orc Goblin
+    python3 combat_simulator.py --battles 2000 --all-matchups --workers 8
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.app.core.providers import InstantTimeProvider, NullLogProvider
+from dnd_game import Character, DnDGame
+
+PLAYER_CLASSES = ["Fighter", "Wizard", "Rogue", "Cleric"]
+ENEMY_CLASSES = ["Goblin", "Orc", "Skeleton", "Bandit"]
+
+Matchup = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+class _NullNarrativeEngine:
+    """Stands in for the narrative engine; the simulator never narrates."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: ""
+
+
+@dataclass
+class BattleResult:
+    """Outcome of one simulated battle."""
+    winner: str  # "players", "enemies" or "draw"
+    turns: int
+    # (attacker class, damage) for every damaging hit
+    hits: List[Tuple[str, int]] = field(default_factory=list)
+    gold_looted: int = 0
+
+
+@dataclass
+class MatchupStats:
+    """Aggregated results for one party-vs-enemies matchup."""
+    battles: int = 0
+    player_wins: int = 0
+    enemy_wins: int = 0
+    draws: int = 0
+    total_turns: int = 0
+    total_gold: int = 0
+    damage: Dict[str, Counter] = field(default_factory=dict)
+
+    def add(self, result: BattleResult) -> None:
+        self.battles += 1
+        self.total_turns += result.turns
+        self.total_gold += result.gold_looted
+        if result.winner == "players":
+            self.player_wins += 1
+        elif result.winner == "enemies":
+            self.enemy_wins += 1
+        else:
+            self.draws += 1
+        for char_class, amount in result.hits:
+            self.damage.setdefault(char_class, Counter())[amount] += 1
+
+    def merge(self, other: "MatchupStats") -> None:
+        self.battles += other.battles
+        self.player_wins += other.player_wins
+        self.enemy_wins += other.enemy_wins
+        self.draws += other.draws
+        self.total_turns += other.total_turns
+        self.total_gold += other.total_gold
+        for char_class, histogram in other.damage.items():
+            self.damage.setdefault(char_class, Counter()).update(histogram)
+
+    def to_dict(self) -> Dict:
+        battles = self.battles or 1
+        damage_summary = {}
+        for char_class, histogram in sorted(self.damage.items()):
+            values = sorted(histogram.elements())
+            damage_summary[char_class] = {
+                "hits": len(values),
+                "mean": round(statistics.fmean(values), 2) if values else 0.0,
+                "p50": values[len(values) // 2] if values else 0,
+                "p90": values[int(len(values) * 0.9)] if values else 0,
+                "max": values[-1] if values else 0,
+                "histogram": {str(k): v for k, v in sorted(histogram.items())},
+            }
+        return {
+            "battles": self.battles,
+            "player_win_rate": round(self.player_wins / battles, 4),
+            "enemy_win_rate": round(self.enemy_wins / battles, 4),
+            "draw_rate": round(self.draws / battles, 4),
+            "avg_turns": round(self.total_turns / battles, 2),
+            "avg_gold_looted": round(self.total_gold / battles, 2),
+            "damage": damage_summary,
+        }
+
+
+def simulate_battle(party: Sequence[str], enemies: Sequence[str], seed: int,
+                    max_turns: int = 100) -> BattleResult:
+    """Run one battle to completion with a fixed seed."""
+    random.seed(seed)
+    log_provider = NullLogProvider()
+
+    game = DnDGame(
+        auto_create_characters=False,
+        time_provider=InstantTimeProvider(),
+        log_provider=log_provider,
+        batch_narration=True
+    )
+    game.narrative_engine = _NullNarrativeEngine()
+
+    game.players = [Character(f"Hero {i+1}", cls, log_provider=log_provider) for i, cls in enumerate(party)]
+    game.enemies = [Character(f"Monster {i+1}", cls, log_provider=log_provider) for i, cls in enumerate(enemies)]
+    for char in game.players:
+        char.team = "players"
+    for char in game.enemies:
+        char.team = "enemies"
+
+    class_by_name = {char.name: char.char_class for char in game.players + game.enemies}
+    starting_gold = sum(char.inventory.gold for char in game.players)
+
+    result = BattleResult(winner="draw", turns=0)
+    while not game.is_game_over() and result.turns < max_turns:
+        actions: List[Dict] = []
+        game._resolve_turn(actions, pace=False)
+        result.turns += 1
+        for action in actions:
+            if action["type"] == "attack":
+                result.hits.append((class_by_name[action["actor"]], action["damage"]))
+
+    if any(char.alive for char in game.players) and not any(char.alive for char in game.enemies):
+        result.winner = "players"
+    elif any(char.alive for char in game.enemies) and not any(char.alive for char in game.players):
+        result.winner = "enemies"
+    result.gold_looted = sum(char.inventory.gold for char in game.players) - starting_gold
+    return result
+
+
+def _battle_seed(base_seed: int, matchup_index: int, battle_index: int) -> int:
+    return (base_seed * 1_000_003 + matchup_index) * 10_000_019 + battle_index
+
+
+def _run_chunk(args) -> Tuple[int, MatchupStats]:
+    matchup_index, party, enemies, base_seed, start, stop, max_turns = args
+    stats = MatchupStats()
+    for battle_index in range(start, stop):
+        stats.add(simulate_battle(party, enemies, _battle_seed(base_seed, matchup_index, battle_index), max_turns))
+    return matchup_index, stats
+
+
+def run_simulation(
+    matchups: Iterable[Matchup],
+    battles_per_matchup: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    chunk_size: int = 250,
+    max_turns: int = 100,
+) -> Dict[Matchup, MatchupStats]:
+    """Simulate every matchup and return aggregated stats keyed by matchup."""
+    matchups = [(tuple(party), tuple(enemies)) for party, enemies in matchups]
+    jobs = [
+        (index, party, enemies, seed, start, min(start + chunk_size, battles_per_matchup), max_turns)
+        for index, (party, enemies) in enumerate(matchups)
+        for start in range(0, battles_per_matchup, chunk_size)
+    ]
+    results = {matchup: MatchupStats() for matchup in matchups}
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for index, stats in map(_run_chunk, jobs):
+            results[matchups[index]].merge(stats)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for index, stats in pool.map(_run_chunk, jobs):
+                results[matchups[index]].merge(stats)
+    return results
+
+
+def all_matchups(team_size: int = 2) -> List[Matchup]:
+    """Every unordered party composition against every enemy composition."""
+    parties = itertools.combinations_with_replacement(PLAYER_CLASSES, team_size)
+    enemy_teams = list(itertools.combinations_with_replacement(ENEMY_CLASSES, team_size))
+    return [(party, enemies) for party in parties for enemies in enemy_teams]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--battles", type=int, default=1000, help="battles per matchup")
+    parser.add_argument("--party", nargs="+", default=["Fighter", "Wizard"], choices=PLAYER_CLASSES)
+    parser.add_argument("--enemies", nargs="+", default=["Goblin", "Orc"], choices=ENEMY_CLASSES)
+    parser.add_argument("--all-matchups", action="store_true", help="simulate every 2v2 composition")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print full JSON report")
+    args = parser.parse_args()
+
+    matchups = all_matchups() if args.all_matchups else [(tuple(args.party), tuple(args.enemies))]
+    start = time.perf_counter()
+    results = run_simulation(matchups, args.battles, workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    total = sum(stats.battles for stats in results.values())
+
+    if args.json:
+        print(json.dumps({
+            f"{'+'.join(party)} vs {'+'.join(enemies)}": stats.to_dict()
+            for (party, enemies), stats in results.items()
+        }, indent=2))
+    else:
+        for (party, enemies), stats in results.items():
+            summary = stats.to_dict()
+            print(f"{'+'.join(party):<20} vs {'+'.join(enemies):<18} "
+                  f"win {summary['player_win_rate']:6.1%}  turns {summary['avg_turns']:5.2f}  "
+                  f"gold {summary['avg_gold_looted']:6.1f}")
+    print(f"\n{total} battles in {elapsed:.1f}s ({total / elapsed * 60:,.0f} battles/minute)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,10 @@
+import asyncio
 import random
 import logging
 import sys
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 from narrative_engine import NarrativeEngine
 from items import Inventory, get_loot_from_enemy
 from spells import SpellBook, get_class_starting_spells
@@ -10,6 +13,7 @@ from backend.app.core.providers import (
     RealTimeProvider,
     LogProvider,
     FileLogProvider,
+    SequencedLogProvider,
 )
 
 # Get logger without adding handlers (main.py will configure logging)
@@ -19,88 +23,53 @@ class GameError(Exception):
     """Custom exception for game-related errors."""
     pass
 
-class Character:
-    def __init__(
-        self,
-        name: str,
-        char_class: str,
-        hp: int = None,
-        max_hp: int = None,
-        attack: int = None,
-        defense: int = None,
-        log_provider: Optional[LogProvider] = None,
-        character_id: Optional[str] = None,
-    ):
-        self.name = name
-        self.char_class = char_class
-        self.team = None
-        self.log_provider = log_provider
-        self.id: Optional[str] = character_id
-
-        # Validate character class
-        valid_classes = ["Fighter", "Wizard", "Rogue", "Cleric", "Goblin", "Orc", "Skeleton", "Bandit"]
-        if char_class not in valid_classes:
-            raise GameError(f"Invalid character class: {char_class}")
-
-        # Generate random values if not provided
-        if max_hp is None:
-            max_hp = random.randint(20, 50)
-        if hp is None:
-            hp = max_hp
-        if attack is None:
-            attack = random.randint(5, 15)
-        if defense is None:
-            defense = random.randint(1, 5)
-
-        self.hp = hp
-        self.max_hp = max_hp
-        self.attack = attack
-        self.defense = defense
-        self.alive = True
-        self.status_effects: List[str] = []
-
-        # Initialize D&D ability scores based on class
-        self.ability_scores = self._generate_ability_scores(char_class)
-
-        # Initialize mana system
-        self.max_mana = 50 + (self.get_ability_modifier('INT') * 10)
-        self.mana = self.max_mana
-
-        # Initialize inventory system
-        self.inventory = Inventory(capacity=20)
-
-        # Initialize spellbook
-        self.spellbook = SpellBook()
-
-        # Give starting equipment and spells based on class
-        self._give_starting_equipment(char_class)
-        self._learn_starting_spells(char_class)
-
-        # Initialize proficiency bonus (starts at +2)
-        self.proficiency_bonus = 2
-
-        # Initialize skill proficiencies based on class
-        self.skill_proficiencies = self._get_class_proficiencies(char_class)
-
-        # Initialize abilities
-        self.abilities = {}
-        if char_class == "Fighter":
-            self.abilities["Heavy Strike"] = self._heavy_strike
-        elif char_class == "Wizard":
-            self.abilities["Fireball"] = self._fireball
-        elif char_class == "Rogue":
-            self.abilities["Backstab"] = self._backstab
-            self.abilities["Cheap Shot"] = self._cheap_shot
-        elif char_class == "Cleric":
-            self.abilities["Heal"] = self._heal
-        elif char_class == "Skeleton":
-            self.abilities["Bone Shield"] = self._bone_shield
-        elif char_class == "Bandit":
-            self.abilities["Cheap Shot"] = self._cheap_shot
-        elif char_class == "Orc":
-            self.abilities["Rage"] = self._rage
-        elif char_class == "Goblin":
-            self.abilities["Fury"] = self._fury
+@dataclass(frozen=True)
+class CharacterTemplate:
+    """Immutable per-class data shared by every character of that class."""
+    ability_scores: Mapping[str, int]
+    skill_proficiencies: Tuple[str, ...]
+    # (ability name, method name) in priority order
+    abilities: Tuple[Tuple[str, str], ...]
+    starting_spells: Tuple[str, ...]
+
+
+def _template(scores: Dict[str, int], proficiencies: List[str], abilities: List[Tuple[str, str]],
+              char_class: str) -> CharacterTemplate:
+    return CharacterTemplate(
+        ability_scores=MappingProxyType(scores),
+        skill_proficiencies=tuple(proficiencies),
+        abilities=tuple(abilities),
+        starting_spells=tuple(get_class_starting_spells(char_class)),
+    )
+
+
+_MONSTER_SCORES = {"STR": 12, "DEX": 12, "CON": 12, "INT": 10, "WIS": 10, "CHA": 10}
+
+CLASS_TEMPLATES: Dict[str, CharacterTemplate] = {
+    "Fighter": _template({"STR": 16, "DEX": 12, "CON": 14, "INT": 10, "WIS": 12, "CHA": 10},
+                         ["Athletics", "Intimidation"], [("Heavy Strike", "_heavy_strike")], "Fighter"),
+    "Wizard": _template({"STR": 8, "DEX": 12, "CON": 12, "INT": 16, "WIS": 14, "CHA": 10},
+                        ["Arcana", "Investigation"], [("Fireball", "_fireball")], "Wizard"),
+    "Rogue": _template({"STR": 10, "DEX": 16, "CON": 12, "INT": 12, "WIS": 12, "CHA": 14},
+                       ["Stealth", "Sleight of Hand", "Perception"],
+                       [("Backstab", "_backstab"), ("Cheap Shot", "_cheap_shot")], "Rogue"),
+    "Cleric": _template({"STR": 12, "DEX": 10, "CON": 14, "INT": 10, "WIS": 16, "CHA": 12},
+                        ["Medicine", "Insight"], [("Heal", "_heal")], "Cleric"),
+    "Goblin": _template(_MONSTER_SCORES, ["Perception"], [("Fury", "_fury")], "Goblin"),
+    "Orc": _template(_MONSTER_SCORES, ["Perception"], [("Rage", "_rage")], "Orc"),
+    "Skeleton": _template(_MONSTER_SCORES, ["Perception"], [("Bone Shield", "_bone_shield")], "Skeleton"),
+    "Bandit": _template(_MONSTER_SCORES, ["Perception"], [("Cheap Shot", "_cheap_shot")], "Bandit"),
+}
+
+
+class CharacterBase:
+    """
+    Combat rules and serialization shared by Character and CompactCharacter.
+
+    Subclasses provide the storage: plain instance attributes (Character) or
+    __slots__ with lazily built inventory/spellbook (CompactCharacter).
+    """
+    __slots__ = ()
 
     def _log(
         self,
@@ -127,26 +96,11 @@ class Character:
 
     def _generate_ability_scores(self, char_class: str) -> dict:
         """Generate D&D ability scores based on class."""
-        if char_class == "Fighter":
-            return {"STR": 16, "DEX": 12, "CON": 14, "INT": 10, "WIS": 12, "CHA": 10}
-        elif char_class == "Wizard":
-            return {"STR": 8, "DEX": 12, "CON": 12, "INT": 16, "WIS": 14, "CHA": 10}
-        elif char_class == "Rogue":
-            return {"STR": 10, "DEX": 16, "CON": 12, "INT": 12, "WIS": 12, "CHA": 14}
-        elif char_class == "Cleric":
-            return {"STR": 12, "DEX": 10, "CON": 14, "INT": 10, "WIS": 16, "CHA": 12}
-        else:  # Monsters
-            return {"STR": 12, "DEX": 12, "CON": 12, "INT": 10, "WIS": 10, "CHA": 10}
+        return dict(CLASS_TEMPLATES[char_class].ability_scores)
 
     def _get_class_proficiencies(self, char_class: str) -> List[str]:
         """Get skill proficiencies based on class."""
-        proficiencies = {
-            "Fighter": ["Athletics", "Intimidation"],
-            "Wizard": ["Arcana", "Investigation"],
-            "Rogue": ["Stealth", "Sleight of Hand", "Perception"],
-            "Cleric": ["Medicine", "Insight"],
-        }
-        return proficiencies.get(char_class, ["Perception"])
+        return list(CLASS_TEMPLATES[char_class].skill_proficiencies)
 
     def _give_starting_equipment(self, char_class: str) -> None:
         """Give starting equipment based on class."""
@@ -184,7 +138,7 @@ class Character:
 
     def _learn_starting_spells(self, char_class: str) -> None:
         """Learn starting spells based on class."""
-        starting_spells = get_class_starting_spells(char_class)
+        starting_spells = CLASS_TEMPLATES[char_class].starting_spells
         for spell_id in starting_spells:
             self.spellbook.learn_spell(spell_id)
             self._log(f"{self.name} learned spell: {spell_id}")
@@ -465,7 +419,7 @@ class Character:
             "max_mana": self.max_mana,
             "attack": self.attack,
             "defense": self.defense,
-            "ability_scores": self.ability_scores,
+            "ability_scores": dict(self.ability_scores),
             "alive": self.alive,
             "status_effects": self.status_effects,
             "inventory": self.inventory.to_dict() if hasattr(self.inventory, 'to_dict') else {
@@ -475,7 +429,7 @@ class Character:
             },
             "spells": list(self.spellbook.spells.keys()) if hasattr(self.spellbook, 'spells') else [],
             "proficiency_bonus": self.proficiency_bonus,
-            "skill_proficiencies": self.skill_proficiencies,
+            "skill_proficiencies": list(self.skill_proficiencies),
             "abilities": list(self.abilities.keys()) if self.abilities else []
         }
 
@@ -501,19 +455,19 @@ class Character:
             "max_mana": self.max_mana,
             "attack": self.attack,
             "defense": self.defense,
-            "ability_scores": self.ability_scores,
+            "ability_scores": dict(self.ability_scores),
             "alive": self.alive,
             "current_location_id": None,  # Can be set from context
             "status_effects": self.status_effects,
             "inventory": inventory_dict,
             "spells": spells_list,
             "proficiency_bonus": self.proficiency_bonus,
-            "skill_proficiencies": self.skill_proficiencies,
+            "skill_proficiencies": list(self.skill_proficiencies),
             "bio": None  # Can be set if available
         }
 
     @classmethod
-    def from_db_dict(cls, data: Dict[str, Any], log_provider: Optional[LogProvider] = None) -> 'Character':
+    def from_db_dict(cls, data: Dict[str, Any], log_provider: Optional[LogProvider] = None) -> 'CharacterBase':
         """Create Character instance from backend Character model dictionary"""
         char = cls(
             name=data["name"],
@@ -682,19 +636,167 @@ class Character:
 
         return fixes
 
+
+class Character(CharacterBase):
+    def __init__(
+        self,
+        name: str,
+        char_class: str,
+        hp: int = None,
+        max_hp: int = None,
+        attack: int = None,
+        defense: int = None,
+        log_provider: Optional[LogProvider] = None,
+        character_id: Optional[str] = None,
+    ):
+        self.name = name
+        self.char_class = char_class
+        self.team = None
+        self.log_provider = log_provider
+        self.id: Optional[str] = character_id
+
+        # Validate character class
+        if char_class not in CLASS_TEMPLATES:
+            raise GameError(f"Invalid character class: {char_class}")
+
+        # Generate random values if not provided
+        if max_hp is None:
+            max_hp = random.randint(20, 50)
+        if hp is None:
+            hp = max_hp
+        if attack is None:
+            attack = random.randint(5, 15)
+        if defense is None:
+            defense = random.randint(1, 5)
+
+        self.hp = hp
+        self.max_hp = max_hp
+        self.attack = attack
+        self.defense = defense
+        self.alive = True
+        self.status_effects: List[str] = []
+
+        # Initialize D&D ability scores based on class
+        self.ability_scores = self._generate_ability_scores(char_class)
+
+        # Initialize mana system
+        self.max_mana = 50 + (self.get_ability_modifier('INT') * 10)
+        self.mana = self.max_mana
+
+        # Initialize inventory system
+        self.inventory = Inventory(capacity=20)
+
+        # Initialize spellbook
+        self.spellbook = SpellBook()
+
+        # Give starting equipment and spells based on class
+        self._give_starting_equipment(char_class)
+        self._learn_starting_spells(char_class)
+
+        # Initialize proficiency bonus (starts at +2)
+        self.proficiency_bonus = 2
+
+        # Initialize skill proficiencies based on class
+        self.skill_proficiencies = self._get_class_proficiencies(char_class)
+
+        # Initialize abilities
+        self.abilities = {
+            name: getattr(self, method) for name, method in CLASS_TEMPLATES[char_class].abilities
+        }
+
+
+class CompactCharacter(CharacterBase):
+    """
+    Memory-lean Character for large or long-lived sessions.
+
+    Same public API as Character, but stored in __slots__: ability scores,
+    proficiencies and the ability table come from the shared per-class
+    CharacterTemplate (copied only if reassigned), and the inventory and
+    spellbook are built with their starting contents on first access.
+    """
+    __slots__ = (
+        "name", "char_class", "team", "log_provider", "id",
+        "hp", "max_hp", "attack", "defense", "alive", "status_effects",
+        "ability_scores", "max_mana", "mana", "proficiency_bonus", "skill_proficiencies",
+        "_template", "_inventory", "_spellbook",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        char_class: str,
+        hp: int = None,
+        max_hp: int = None,
+        attack: int = None,
+        defense: int = None,
+        log_provider: Optional[LogProvider] = None,
+        character_id: Optional[str] = None,
+    ):
+        template = CLASS_TEMPLATES.get(char_class)
+        if template is None:
+            raise GameError(f"Invalid character class: {char_class}")
+
+        self.name = name
+        self.char_class = char_class
+        self.team = None
+        self.log_provider = log_provider
+        self.id = character_id
+        self._template = template
+        self._inventory = None
+        self._spellbook = None
+
+        if max_hp is None:
+            max_hp = random.randint(20, 50)
+        self.max_hp = max_hp
+        self.hp = max_hp if hp is None else hp
+        self.attack = random.randint(5, 15) if attack is None else attack
+        self.defense = random.randint(1, 5) if defense is None else defense
+        self.alive = True
+        self.status_effects = []
+
+        self.ability_scores = template.ability_scores
+        self.skill_proficiencies = template.skill_proficiencies
+        self.proficiency_bonus = 2
+        self.max_mana = 50 + (self.get_ability_modifier('INT') * 10)
+        self.mana = self.max_mana
+
+    @property
+    def inventory(self) -> Inventory:
+        if self._inventory is None:
+            self._inventory = Inventory(capacity=20)
+            self._give_starting_equipment(self.char_class)
+        return self._inventory
+
+    @property
+    def spellbook(self) -> SpellBook:
+        if self._spellbook is None:
+            self._spellbook = SpellBook()
+            self._learn_starting_spells(self.char_class)
+        return self._spellbook
+
+    @property
+    def abilities(self) -> Dict[str, Any]:
+        return {name: getattr(self, method) for name, method in self._template.abilities}
+
+
 class DnDGame:
     def __init__(
         self,
         auto_create_characters: bool = True,
         model: str = "mistral",
         time_provider: Optional[TimeProvider] = None,
-        log_provider: Optional[LogProvider] = None
+        log_provider: Optional[LogProvider] = None,
+        batch_narration: bool = False,
+        compact_characters: bool = False
     ):
         self.time_provider: TimeProvider = time_provider or RealTimeProvider()
         self.log_provider: LogProvider = log_provider or FileLogProvider()
+        self.batch_narration = batch_narration
+        # Build CompactCharacter instead of Character for generated parties
+        self.character_class = CompactCharacter if compact_characters else Character
         self._log("Initializing DnDGame")
-        self.players: List[Character] = []
-        self.enemies: List[Character] = []
+        self.players: List[CharacterBase] = []
+        self.enemies: List[CharacterBase] = []
         self.narrative_engine = NarrativeEngine(model)
         self.current_location = "Starting Tavern"
         self.current_quest = None
@@ -748,7 +850,7 @@ class DnDGame:
     def _create_characters(self, generate_intros: bool = False) -> None:
         try:
             self.players = [
-                Character(
+                self.character_class(
                     f"Hero {i+1}",
                     random.choice(["Fighter", "Wizard", "Rogue", "Cleric"]),
                     log_provider=self.log_provider
@@ -759,7 +861,7 @@ class DnDGame:
                 player.team = "players"
 
             self.enemies = [
-                Character(
+                self.character_class(
                     f"Monster {i+1}",
                     random.choice(["Goblin", "Orc", "Skeleton", "Bandit"]),
                     log_provider=self.log_provider
@@ -781,30 +883,39 @@ class DnDGame:
         if not self.players or not self.enemies:
             raise GameError("Cannot play turn with no characters")
 
+        # In batch mode the turn is resolved first and narrated in one call
+        actions: Optional[List[Dict[str, Any]]] = [] if self.batch_narration else None
+        self._resolve_turn(actions)
+        if actions:
+            self._narrate_batch(actions)
+
+    def _resolve_turn(self, actions: Optional[List[Dict[str, Any]]], pace: bool = True) -> None:
+        """Run one turn of combat, narrating inline or recording into ``actions``."""
         self.scene_counter += 1
         all_characters = self.players + self.enemies
         random.shuffle(all_characters)
 
         # Describe the scene at the start of each turn
-        scene_description = self.narrative_engine.describe_scene(
-            self.current_location,
-            [char.name for char in all_characters if char.alive]
-        )
-        self._log(scene_description)
+        self._narrate_action(actions, {
+            "type": "scene",
+            "location": self.current_location,
+            "characters": [char.name for char in all_characters if char.alive],
+        })
 
         for char in all_characters:
             if not char.alive:
                 continue
 
             if "stunned" in char.status_effects:
-                status_desc = self.narrative_engine.describe_combat(
-                    char.name,
-                    "themselves",
-                    "struggles with the stun effect"
-                )
-                self._log(status_desc)
+                self._narrate_action(actions, {
+                    "type": "status",
+                    "actor": char.name,
+                    "target": "themselves",
+                    "action": "struggles with the stun effect",
+                })
                 char.status_effects.remove("stunned")
-                self._pause()
+                if pace:
+                    self._pause()
                 continue
 
             try:
@@ -815,12 +926,13 @@ class DnDGame:
                         char.attack_target(heal_target)
                         heal_amount = heal_target.hp - old_hp
                         if heal_amount > 0:
-                            heal_desc = self.narrative_engine.describe_combat(
-                                char.name,
-                                heal_target.name,
-                                "casts a healing spell on"
-                            )
-                            self._log(heal_desc)
+                            self._narrate_action(actions, {
+                                "type": "heal",
+                                "actor": char.name,
+                                "target": heal_target.name,
+                                "action": "casts a healing spell on",
+                                "amount": heal_amount,
+                            })
                         continue
 
                 attack_target = self._select_attack_target(char)
@@ -829,20 +941,57 @@ class DnDGame:
                     char.attack_target(attack_target)
                     damage_dealt = old_hp - attack_target.hp
                     if damage_dealt > 0:
-                        combat_desc = self.narrative_engine.describe_combat(
-                            char.name,
-                            attack_target.name,
-                            "attacks",
-                            damage_dealt
-                        )
-                        self._log(combat_desc)
+                        self._narrate_action(actions, {
+                            "type": "attack",
+                            "actor": char.name,
+                            "target": attack_target.name,
+                            "action": "attacks",
+                            "damage": damage_dealt,
+                        })
 
             except Exception as e:
                 self._log(f"Error during {char.name}'s turn: {e}", level="ERROR", metadata={"character": char.name}, exc_info=e)
             finally:
-                self._pause()
+                if pace:
+                    self._pause()
 
-    def _select_heal_target(self, char: Character) -> Character:
+    def _narrate_action(self, actions: Optional[List[Dict[str, Any]]], action: Dict[str, Any]) -> None:
+        """Narrate an action now, or queue it when batching the turn."""
+        if actions is not None:
+            actions.append(action)
+            return
+        self._log(self._describe_action(action))
+
+    def _describe_action(self, action: Dict[str, Any]) -> str:
+        """Per-action narration call for a recorded turn action."""
+        if action["type"] == "scene":
+            return self.narrative_engine.describe_scene(action["location"], action["characters"])
+        if action.get("damage"):
+            return self.narrative_engine.describe_combat(
+                action["actor"], action["target"], action["action"], action["damage"]
+            )
+        return self.narrative_engine.describe_combat(action["actor"], action["target"], action["action"])
+
+    def _narrate_batch(self, actions: List[Dict[str, Any]]) -> None:
+        """Narrate a whole turn in one engine call, falling back per action."""
+        for line in self._render_narration(actions):
+            self._log(line)
+
+    def _render_narration(self, actions: List[Dict[str, Any]]) -> List[str]:
+        """Produce narration lines for recorded actions without logging them."""
+        lines = None
+        narrate_actions = getattr(self.narrative_engine, "narrate_actions", None)
+        if narrate_actions:
+            try:
+                lines = narrate_actions(actions)
+            except Exception as e:
+                logger.warning(f"Batched narration failed: {e}")
+        if not lines or len(lines) != len(actions):
+            logger.debug("Falling back to per-action narration")
+            lines = [self._describe_action(action) for action in actions]
+        return lines
+
+    def _select_heal_target(self, char: CharacterBase) -> CharacterBase:
         valid_targets = [p for p in self.players if p.alive and p.hp < p.max_hp] if char.team == "players" else [e for e in self.enemies if e.alive and e.hp < e.max_hp]
         if not valid_targets:
             return None
@@ -850,7 +999,7 @@ class DnDGame:
         valid_targets.sort(key=lambda x: x.hp / x.max_hp)
         return valid_targets[0]
 
-    def _select_attack_target(self, char: Character) -> Character:
+    def _select_attack_target(self, char: CharacterBase) -> CharacterBase:
         # Get valid targets from the opposite team
         valid_targets = [e for e in self.enemies if e.alive] if char in self.players else [p for p in self.players if p.alive]
         if not valid_targets:
@@ -862,7 +1011,7 @@ class DnDGame:
     def is_game_over(self) -> bool:
         return not any(char.alive for char in self.players) or not any(char.alive for char in self.enemies)
 
-    def generate_player_action(self, player: Character) -> str:
+    def generate_player_action(self, player: CharacterBase) -> str:
         """Generate a narrative action for a player character.
 
         Args:
@@ -922,6 +1071,98 @@ class DnDGame:
             )
             self._log(defeat_desc)
 
+    async def run_game_async(self, max_turns: int = 100, max_inflight: int = 2) -> None:
+        """
+        Pipelined variant of run_game.
+
+        Combat mechanics for turn N+1 are resolved while narration for turn N
+        is still being generated in a worker thread. Every turn (and each
+        quest/encounter/conclusion narration) is assigned a sequence number
+        and its log lines are released strictly in that order, so the output
+        matches a sequential run with batch narration.
+        """
+        output = SequencedLogProvider(self.log_provider)
+        original_provider = self.log_provider
+        characters = self.players + self.enemies
+        original_char_providers = [char.log_provider for char in characters]
+        self.log_provider = output
+        for char in characters:
+            char.log_provider = output
+
+        pending: set = set()
+        next_seq = 0
+
+        async def narrate(seq: int, produce) -> None:
+            try:
+                lines = await asyncio.to_thread(produce)
+            except Exception as e:
+                lines = []
+                output.emit(seq, logging.ERROR, f"Narration failed: {e}", {"component": "DnDGame"})
+            for line in lines:
+                output.emit(seq, logging.INFO, line, {"component": "DnDGame"})
+            output.complete(seq)
+
+        async def schedule(produce) -> None:
+            nonlocal next_seq
+            pending.add(asyncio.create_task(narrate(next_seq, produce)))
+            next_seq += 1
+            while len(pending) >= max_inflight:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+
+        def quest() -> List[str]:
+            self.current_quest = self.narrative_engine.generate_quest()
+            return ["\nYour Quest:", self.current_quest]
+
+        def encounter() -> List[str]:
+            return ["\nNew Encounter!", self.narrative_engine.generate_random_encounter(
+                party_level=1,
+                environment=self.current_location
+            )]
+
+        try:
+            await schedule(quest)
+
+            turn_count = 0
+            while not self.is_game_over() and turn_count < max_turns:
+                if turn_count % 3 == 0:
+                    await schedule(encounter)
+
+                # Mechanics log into this turn's slot; narration joins it later
+                actions: List[Dict[str, Any]] = []
+                output.current_seq = next_seq
+                self._resolve_turn(actions, pace=False)
+                await schedule(lambda actions=actions: self._render_narration(actions))
+
+                if self.turn_delay > 0:
+                    async_sleep = getattr(self.time_provider, "async_sleep", None)
+                    if async_sleep:
+                        await async_sleep(self.turn_delay)
+                    else:
+                        await asyncio.to_thread(self.time_provider.sleep, self.turn_delay)
+                turn_count += 1
+
+            victorious = any(char.alive for char in self.players)
+            await schedule(lambda: [self.narrative_engine.handle_player_action(
+                "The party",
+                "emerges victorious" if victorious else "has fallen",
+                "Final battle concluded"
+            )])
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            # On an error or cancellation, stop outstanding narration so no
+            # task emits into the discarded provider, then release what it
+            # already buffered (including the failing turn's mechanics)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            output.drain()
+            self.log_provider = original_provider
+            for char, provider in zip(characters, original_char_providers):
+                char.log_provider = provider
+
 if __name__ == "__main__":
     try:
         game = DnDGame()
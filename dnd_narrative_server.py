@@ -7,13 +7,16 @@ Port: 5002
 
 import os
 import logging
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import random
 from datetime import datetime
 
 from dnd_game import DnDGame, Character
 from narrative_engine import NarrativeEngine, create_narrative_engine
+from narration_stream import stream_sse
+from image_client import ImageGenerationError, ImageRequest, get_image_client
+from narrative_session_store import NarrativeSessionStore
 
 # Setup logging
 logging.basicConfig(
@@ -25,15 +28,13 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Enable CORS for browser access
 
-# Global game state (in-memory for MVP)
-game_sessions = {}
-
 class NarrativeSession:
     """Manages a single narrative theater session."""
 
-    def __init__(self, session_id: str, model: str = "gemini"):
+    def __init__(self, session_id: str, model: str = "gemini", game: DnDGame = None):
         self.session_id = session_id
-        self.game = DnDGame(auto_create_characters=True, model=model)
+        self.model = model
+        self.game = game or DnDGame(auto_create_characters=True, model=model)
 
         # Use Gemini by default, Ollama as fallback
         self.narrative_engine = create_narrative_engine(model)
@@ -45,6 +46,41 @@ class NarrativeSession:
 
         logger.info(f"Created new narrative session: {session_id} with {model} engine")
 
+    def to_dict(self):
+        """Serializable session state, for spilling idle sessions to disk."""
+        return {
+            "session_id": self.session_id,
+            "model": self.model,
+            "turn_count": self.turn_count,
+            "scenes": self.scenes,
+            "character_images": self.character_images,
+            "created_at": self.created_at,
+            "game": {
+                "players": [c.to_dict() for c in self.game.players],
+                "enemies": [c.to_dict() for c in self.game.enemies],
+                "current_location": self.game.current_location,
+                "current_quest": self.game.current_quest,
+                "scene_counter": self.game.scene_counter
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a session written by to_dict."""
+        game = DnDGame(auto_create_characters=False, model=data["model"])
+        game.players = [_restore_character(c) for c in data["game"]["players"]]
+        game.enemies = [_restore_character(c) for c in data["game"]["enemies"]]
+        game.current_location = data["game"]["current_location"]
+        game.current_quest = data["game"]["current_quest"]
+        game.scene_counter = data["game"]["scene_counter"]
+
+        session = cls(data["session_id"], model=data["model"], game=game)
+        session.turn_count = data["turn_count"]
+        session.scenes = data["scenes"]
+        session.character_images = data["character_images"]
+        session.created_at = data["created_at"]
+        return session
+
     def start_adventure(self, theme="epic adventure"):
         """Initialize the adventure with characters and quest."""
         # Generate quest with custom theme if provided
@@ -308,6 +344,34 @@ class NarrativeSession:
         ]
 
 
+def _restore_character(data):
+    """Character from Character.to_dict, with its saved inventory instead of starting gear"""
+    character = Character.from_db_dict({**data, "inventory": None})
+    inventory = data.get("inventory") or {}
+    character.inventory.items = {
+        item_id: item.get("quantity", 1) if isinstance(item, dict) else item
+        for item_id, item in (inventory.get("items") or {}).items()
+    }
+    character.inventory.equipped = {
+        slot: ref.get("item_id") if isinstance(ref, dict) else ref
+        for slot, ref in (inventory.get("equipped") or {}).items()
+    }
+    character.inventory.gold = inventory.get("gold", 0)
+    return character
+
+
+# Sessions stay in memory while in use; idle ones are spilled to disk and
+# reloaded on their next request
+game_sessions = NarrativeSessionStore(
+    NarrativeSession.from_dict,
+    spill_dir=os.getenv("NARRATIVE_SESSION_SPILL_DIR", os.path.join("logs", "narrative_sessions")),
+    max_sessions=int(os.getenv("NARRATIVE_SESSION_MAX_RESIDENT", "64")),
+    max_bytes=int(os.getenv("NARRATIVE_SESSION_MAX_BYTES", str(256 * 1024 * 1024))),
+    idle_seconds=float(os.getenv("NARRATIVE_SESSION_IDLE_SECONDS", "1800")),
+    spill_ttl=float(os.getenv("NARRATIVE_SESSION_SPILL_TTL", str(7 * 24 * 3600)))
+)
+
+
 # =============================================================================
 # API ENDPOINTS
 # =============================================================================
@@ -319,7 +383,17 @@ def health_check():
         "status": "healthy",
         "service": "DnD Narrative Theater Server",
         "port": 5002,
-        "active_sessions": len(game_sessions)
+        "active_sessions": len(game_sessions),
+        "image_client": get_image_client().metrics()
+    })
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Resident and spilled sessions, their memory use, and image client counters."""
+    return jsonify({
+        "sessions": game_sessions.metrics(),
+        "image_client": get_image_client().metrics()
     })
 
 
@@ -405,16 +479,7 @@ def next_scene():
                 "error": "Invalid or missing session_id"
             }), 400
 
-        session = game_sessions[session_id]
-        result = session.generate_next_scene()
-
-        logger.info(f"Generated scene {result['scene']['scene_id']} for session: {session_id}")
-
-        return jsonify({
-            "success": True,
-            "narrative": result['scene']['narrative'],
-            **result
-        })
+        return jsonify(_next_scene_payload(game_sessions[session_id]))
 
     except Exception as e:
         logger.error(f"Error generating next scene: {e}", exc_info=True)
@@ -424,6 +489,49 @@ def next_scene():
         }), 500
 
 
+@app.route('/next-scene/stream', methods=['POST'])
+def next_scene_stream():
+    """
+    Stream the next scene as Server-Sent Events.
+
+    Same request body as /next-scene. Emits `token` events
+    ({"segment": n, "text": "..."}) as the narrative is generated, then a
+    `scene` event with the /next-scene response plus
+    time_to_first_token_ms and total_ms (or an `error` event).
+    """
+    data = request.json or {}
+    session_id = data.get('session_id')
+    if not session_id or session_id not in game_sessions:
+        return jsonify({
+            "success": False,
+            "error": "Invalid or missing session_id"
+        }), 400
+
+    session = game_sessions[session_id]
+    return _sse_response(lambda: _next_scene_payload(session), "scene")
+
+
+def _next_scene_payload(session):
+    result = session.generate_next_scene()
+
+    logger.info(f"Generated scene {result['scene']['scene_id']} for session: {session.session_id}")
+
+    return {
+        "success": True,
+        "narrative": result['scene']['narrative'],
+        **result
+    }
+
+
+def _sse_response(build, final_event):
+    """Stream build()'s narration as SSE, ending with its result"""
+    return Response(
+        stream_sse(build, final_event),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.route('/generate-chapter', methods=['POST'])
 def generate_chapter():
     """
@@ -434,7 +542,8 @@ def generate_chapter():
     {
         "session_id": "...",
         "player_input": "What the player does/says",
-        "story_context": ["previous chapter texts..."] (optional)
+        "story_context": ["previous chapter texts..."] (optional),
+        "include_images": false (optional; generate every scene's image in parallel)
     }
 
     Returns:
@@ -449,7 +558,8 @@ def generate_chapter():
             {
                 "description": "Scene description for image generation",
                 "position": "start|middle|end",
-                "prompt": "Optimized image prompt"
+                "prompt": "Optimized image prompt",
+                "image": {...} (with include_images, as from /generate-scene-image)
             }
         ],
         "character_states": [...],
@@ -468,33 +578,10 @@ def generate_chapter():
                 "error": "Invalid or missing session_id"
             }), 400
 
-        session = game_sessions[session_id]
-
-        # Generate the next scene (this creates the story content)
-        result = session.generate_next_scene()
-        narrative_text = result['scene']['narrative']
-
-        # Extract key scenes from the narrative for image generation
-        scenes = _extract_scenes_for_images(narrative_text, result['scene']['type'])
-
-        # Create chapter data
-        chapter = {
-            "title": _generate_chapter_title(result['scene']['type'], session.turn_count),
-            "content": narrative_text,
-            "number": session.turn_count,
-            "type": result['scene']['type']
-        }
-
-        logger.info(f"Generated chapter {session.turn_count} with {len(scenes)} scenes for session: {session_id}")
-
-        return jsonify({
-            "success": True,
-            "chapter": chapter,
-            "scenes": scenes,
-            "character_states": result['character_states'],
-            "location": result['location'],
-            "turn_count": result['turn_count']
-        })
+        payload = _chapter_payload(game_sessions[session_id])
+        if data.get('include_images'):
+            _attach_scene_images(payload)
+        return jsonify(payload)
 
     except Exception as e:
         logger.error(f"Error generating chapter: {e}", exc_info=True)
@@ -504,6 +591,66 @@ def generate_chapter():
         }), 500
 
 
+@app.route('/generate-chapter/stream', methods=['POST'])
+def generate_chapter_stream():
+    """
+    Stream a story chapter as Server-Sent Events.
+
+    Same request body as /generate-chapter. Emits `token` events while the
+    chapter text is generated, then a `chapter` event with the
+    /generate-chapter response plus time_to_first_token_ms and total_ms.
+    """
+    data = request.json or {}
+    session_id = data.get('session_id')
+    if not session_id or session_id not in game_sessions:
+        return jsonify({
+            "success": False,
+            "error": "Invalid or missing session_id"
+        }), 400
+
+    session = game_sessions[session_id]
+    return _sse_response(lambda: _chapter_payload(session), "chapter")
+
+
+def _chapter_payload(session):
+    # Generate the next scene (this creates the story content)
+    result = session.generate_next_scene()
+    narrative_text = result['scene']['narrative']
+
+    # Extract key scenes from the narrative for image generation
+    scenes = _extract_scenes_for_images(narrative_text, result['scene']['type'])
+
+    # Create chapter data
+    chapter = {
+        "title": _generate_chapter_title(result['scene']['type'], session.turn_count),
+        "content": narrative_text,
+        "number": session.turn_count,
+        "type": result['scene']['type']
+    }
+
+    logger.info(f"Generated chapter {session.turn_count} with {len(scenes)} scenes for session: {session.session_id}")
+
+    return {
+        "success": True,
+        "chapter": chapter,
+        "scenes": scenes,
+        "character_states": result['character_states'],
+        "location": result['location'],
+        "turn_count": result['turn_count']
+    }
+
+
+def _attach_scene_images(payload):
+    """Generate every scene image of a chapter at once, in about the time of the slowest"""
+    scene_type = payload['chapter']['type']
+    images = get_image_client().generate_images([
+        ImageRequest(scene_type=scene_type, description=scene['prompt'], format='landscape')
+        for scene in payload['scenes']
+    ])
+    for scene, image in zip(payload['scenes'], images):
+        scene['image'] = image
+
+
 def _extract_scenes_for_images(narrative_text, scene_type):
     """
     Extract key visual scenes from narrative text for image generation.
@@ -582,123 +729,103 @@ def generate_scene_image():
     {
         "success": true,
         "image": "base64_image_data",
-        "image_type": "sprite|enhanced"
+        "image_type": "sprite|enhanced",
+        "cached": false
     }
     """
     try:
-        import requests
-
         data = request.json
-        session_id = data.get('session_id')
-        scene_description = data.get('scene_description', '')
-        scene_type = data.get('scene_type', 'exploration')
-        format_type = data.get('format', 'square')  # 'landscape' or 'square'
-        width = data.get('width', 64)
-        height = data.get('height', 64)
-
-        # If no scene description provided, try to get from session
-        if not scene_description and session_id and session_id in game_sessions:
-            session = game_sessions[session_id]
-            # NarrativeSession is an object, not a dict
-            if hasattr(session, 'scenes') and session.scenes:
-                latest_scene = session.scenes[-1]
-                if 'narrative' in latest_scene:
-                    scene_description = latest_scene['narrative'][:200]  # First 200 chars
-            if not scene_description and hasattr(session, 'game') and hasattr(session.game, 'quest'):
-                scene_description = f"fantasy tavern scene, {session.game.quest[:100]}"
-
-        # Fallback description
-        if not scene_description:
-            scene_description = "epic fantasy adventure scene, medieval tavern, heroes gathering"
-
-        # For MVP, we'll call the existing servers
-        # Character intros get pixel art sprites
-        if scene_type in ['introduction', 'character_intro']:
-            # Call PixelLab for character sprite
-            response = requests.post(
-                'http://localhost:5001/generate-sprite',
-                json={
-                    "prompt": scene_description,
-                    "width": 128,
-                    "height": 128,
-                    "no_background": True
-                },
-                timeout=60
-            )
+        image = get_image_client().generate_image(_image_request(data))
+        return jsonify({"success": True, **image})
 
-            if response.ok:
-                result = response.json()
-                return jsonify({
-                    "success": True,
-                    "image": result.get('image'),
-                    "image_type": "sprite"
-                })
-
-        # Combat and major scenes get enhanced images
-        elif scene_type in ['combat', 'conclusion']:
-            # Call Nano Banana for enhanced scene
-            response = requests.post(
-                'http://localhost:5000/generate-scene',
-                json={
-                    "description": scene_description,
-                    "style": "fantasy",
-                    "aspect_ratio": "16:9"
-                },
-                timeout=60
-            )
+    except ImageGenerationError as e:
+        logger.warning(f"Image generation failed: {e}")
+        return jsonify({
+            "success": False,
+            "error": "Image generation failed"
+        }), 500
+    except Exception as e:
+        logger.error(f"Error generating scene image: {e}", exc_info=True)
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
 
-            if response.ok:
-                result = response.json()
-                return jsonify({
-                    "success": True,
-                    "image": result.get('image'),
-                    "image_type": "enhanced"
-                })
-
-        # Default: Use Nano Banana for landscape scenes
-        if format_type == 'landscape':
-            response = requests.post(
-                'http://localhost:5000/generate',
-                json={
-                    "prompt": scene_description,
-                    "aspect_ratio": "16:9"  # Landscape format
-                },
-                timeout=60
-            )
-        else:
-            # Square format - use PixelLab
-            response = requests.post(
-                'http://localhost:5001/generate-sprite',
-                json={
-                    "prompt": scene_description,
-                    "width": width,
-                    "height": height,
-                    "no_background": True
-            },
-            timeout=60
-        )
 
-        if response.ok:
-            result = response.json()
+@app.route('/generate-scene-images', methods=['POST'])
+def generate_scene_images():
+    """
+    Generate several scene images in parallel.
+
+    Request body:
+    {
+        "session_id": "...",
+        "scenes": [{...same fields as /generate-scene-image...}, ...]
+    }
+
+    Returns:
+    {
+        "success": true,
+        "images": [{"success": true, "image": "...", "image_type": "..."} | {"success": false, "error": "..."}],
+        "elapsed_ms": 5310.2
+    }
+    """
+    try:
+        data = request.json or {}
+        scenes = data.get('scenes') or []
+        if not isinstance(scenes, list):
             return jsonify({
-                "success": True,
-                "image": result.get('image'),
-                "image_type": "sprite"
-            })
+                "success": False,
+                "error": "scenes must be a list"
+            }), 400
 
+        started = datetime.now()
+        images = get_image_client().generate_images([
+            _image_request({"session_id": data.get('session_id'), **scene}) for scene in scenes
+        ])
         return jsonify({
-            "success": False,
-            "error": "Image generation failed"
-        }), 500
+            "success": True,
+            "images": images,
+            "elapsed_ms": round((datetime.now() - started).total_seconds() * 1000, 1)
+        })
 
     except Exception as e:
-        logger.error(f"Error generating scene image: {e}", exc_info=True)
+        logger.error(f"Error generating scene images: {e}", exc_info=True)
         return jsonify({
             "success": False,
             "error": str(e)
         }), 500
 
 
+def _image_request(data):
+    """ImageRequest from a /generate-scene-image body, filling in the description from the session"""
+    session_id = data.get('session_id')
+    scene_description = data.get('scene_description') or data.get('description', '')
+
+    # If no scene description provided, try to get from session
+    if not scene_description and session_id and session_id in game_sessions:
+        session = game_sessions[session_id]
+        # NarrativeSession is an object, not a dict
+        if hasattr(session, 'scenes') and session.scenes:
+            latest_scene = session.scenes[-1]
+            if 'narrative' in latest_scene:
+                scene_description = latest_scene['narrative'][:200]  # First 200 chars
+        if not scene_description and hasattr(session, 'game') and hasattr(session.game, 'quest'):
+            scene_description = f"fantasy tavern scene, {session.game.quest[:100]}"
+
+    # Fallback description
+    if not scene_description:
+        scene_description = "epic fantasy adventure scene, medieval tavern, heroes gathering"
+
+    return ImageRequest(
+        scene_type=data.get('scene_type', 'exploration'),
+        description=scene_description,
+        format=data.get('format', 'square'),  # 'landscape' or 'square'
+        width=data.get('width', 64),
+        height=data.get('height', 64)
+    )
+
+
 @app.route('/ai-decision', methods=['POST'])
 def ai_decision():
     """
@@ -1314,42 +1441,7 @@ def generate_adaptive_story():
                 "error": "Missing story_element"
             }), 400
 
-        session = game_sessions[session_id]
-
-        # Check if we have Gemini engine available
-        if hasattr(session.narrative_engine, 'generate_adaptive_story'):
-            # Create narrative context
-            from gemini_narrative_engine import NarrativeContext
-            context = NarrativeContext(
-                campaign_id=f"campaign_{session_id}",
-                session_id=session_id,
-                current_scene=session.game.current_location,
-                player_actions=[scene.get('narrative', '')[:100] for scene in session.scenes[-3:]],
-                npc_states={},
-                world_state={"turn_count": session.turn_count},
-                campaign_tone="epic",
-                difficulty_level="medium"
-            )
-
-            story_content = session.narrative_engine.generate_adaptive_story(
-                context, story_element
-            )
-
-            return jsonify({
-                "success": True,
-                "story_content": story_content
-            })
-        else:
-            # Fallback for Ollama engine
-            story_content = session.narrative_engine.generate_quest(
-                difficulty="medium",
-                theme=story_element
-            )
-
-            return jsonify({
-                "success": True,
-                "story_content": story_content
-            })
+        return jsonify(_adaptive_story_payload(game_sessions[session_id], story_element))
 
     except Exception as e:
         logger.error(f"Error generating adaptive story: {e}", exc_info=True)
@@ -1359,6 +1451,66 @@ def generate_adaptive_story():
         }), 500
 
 
+@app.route('/ai/adaptive-story/stream', methods=['POST'])
+def generate_adaptive_story_stream():
+    """
+    Stream adaptive story content as Server-Sent Events.
+
+    Same body as /ai/adaptive-story. Emits `token` events, then a `story`
+    event with the /ai/adaptive-story response plus timings.
+    """
+    data = request.get_json() or {}
+    session_id = data.get('session_id')
+    story_element = data.get('story_element')
+
+    if not session_id or session_id not in game_sessions:
+        return jsonify({
+            "success": False,
+            "error": "Invalid or missing session_id"
+        }), 400
+
+    if not story_element:
+        return jsonify({
+            "success": False,
+            "error": "Missing story_element"
+        }), 400
+
+    session = game_sessions[session_id]
+    return _sse_response(lambda: _adaptive_story_payload(session, story_element), "story")
+
+
+def _adaptive_story_payload(session, story_element):
+    # Check if we have Gemini engine available
+    if hasattr(session.narrative_engine, 'generate_adaptive_story'):
+        # Create narrative context
+        from gemini_narrative_engine import NarrativeContext
+        context = NarrativeContext(
+            campaign_id=f"campaign_{session.session_id}",
+            session_id=session.session_id,
+            current_scene=session.game.current_location,
+            player_actions=[scene.get('narrative', '')[:100] for scene in session.scenes[-3:]],
+            npc_states={},
+            world_state={"turn_count": session.turn_count},
+            campaign_tone="epic",
+            difficulty_level="medium"
+        )
+
+        story_content = session.narrative_engine.generate_adaptive_story(
+            context, story_element
+        )
+    else:
+        # Fallback for Ollama engine
+        story_content = session.narrative_engine.generate_quest(
+            difficulty="medium",
+            theme=story_element
+        )
+
+    return {
+        "success": True,
+        "story_content": story_content
+    }
+
+
 @app.route('/ai/engine-status', methods=['GET'])
 def get_ai_engine_status():
     """
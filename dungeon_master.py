@@ -10,6 +10,7 @@ from typing import Dict, List, Any, Optional, Union, Tuple
 from dnd_game import DnDGame, GameError, Character
 from obsidian_logger import ObsidianLogger
 from game_event_manager import GameEventManager
+from vault_writer import atomic_write_text
 from game_manager import GameManager
 from quest_system import QuestManager, QuestObjective
 from world_builder import WorldManager
@@ -131,7 +132,8 @@ class DungeonMaster:
         }
 
         # Initialize event manager with a reference to this DungeonMaster instance
-        self.event_manager = GameEventManager(self.obsidian, self.current_run_data, self)
+        self.event_manager = GameEventManager(self.obsidian, self.current_run_data)
+        self.event_manager.register_dungeon_master(self)
         self.logger.info("Initialized event manager for real-time updates")
 
         # Initialize game manager
@@ -243,8 +245,7 @@ Current Turn: {self.current_run_data.get('turn_count', 0)}
             content += "*This run is currently in progress. Content will be updated as the game progresses.*\n"
 
             # Write the updated file
-            with open(current_run_path, 'w') as f:
-                f.write(content)
+            atomic_write_text(current_run_path, content)
 
             self.logger.debug(f"Updated Current Run.md (Run ID: {run_id}, Turn: {self.current_run_data.get('turn_count', 0)})")
 
@@ -470,7 +471,7 @@ aliases: [📊 Dashboard]
             self.current_run_data["session"] = session_name
 
             # Final updates to Current Run.md and Dashboard
-            self.update_current_run()
+            self.event_manager.flush(force=True)
             self.update_dashboard()
 
             # NOW generate character introductions after everything else is set up
@@ -664,7 +665,7 @@ aliases: [📊 Dashboard]
                             self.obsidian.log_event_with_event(quest_complete_data, self.event_manager)
 
                 # Update Current Run.md and Dashboard after each turn
-                self.update_current_run()
+                self.event_manager.flush(force=True)
                 self.update_dashboard()
 
                 # Sleep briefly to allow for LLM rate limits and human readability
@@ -692,7 +693,7 @@ aliases: [📊 Dashboard]
             self.obsidian.log_event_with_event(conclusion_event, self.event_manager)
 
             # Final updates to Current Run.md and Dashboard
-            self.update_current_run()
+            self.event_manager.flush(force=True)
             self.update_dashboard()
 
             return True
@@ -779,6 +780,12 @@ aliases: [📊 Dashboard]
                 self.current_run_data["error_details"] = error_tb
                 self.update_current_run()
             return False
+        finally:
+            # Write anything still pending and stop the background writer
+            if self.event_manager:
+                self.event_manager.close()
+            if self.obsidian:
+                self.obsidian.close()
 
     def handle_character_death(self, character_name: str, cause: str) -> None:
         """
@@ -25,6 +25,8 @@ from dnd_game import DnDGame  # noqa: E402  (import after path fix)
 from log_aggregator import LogAggregator  # noqa: E402
 from narrative_engine import NarrativeEngine  # noqa: E402
 
+# Frames carry at most this many of the latest events as cumulative_events
+EVENT_HISTORY_LIMIT = 50
 
 @dataclass(frozen=True)
 class CharacterSnapshot:
@@ -255,7 +257,7 @@ class ShowcaseSimulator:
             return []
         lines = [line.strip() for line in raw.splitlines() if line.strip()]
         self.event_history.extend(lines)
-        self.event_history = self.event_history[-50:]
+        self.event_history = self.event_history[-EVENT_HISTORY_LIMIT:]
         self.aggregator.clear()
         return lines
 
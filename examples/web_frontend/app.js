@@ -271,15 +271,17 @@ async function advanceLiveSession(options = {}) {
   }
   const { steps = 1, preserveAutoplay = false } = options;
   const baseUrl = state.serviceUrl || DEFAULT_SERVICE_URL;
+  // Ask only for frames we don't have yet
+  const since = state.payload?.frames?.length ?? 0;
   const response = await fetch(`${baseUrl}/sessions/${state.sessionId}/advance`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ steps }),
+    body: JSON.stringify({ steps, since }),
   });
   if (!response.ok) {
     throw new Error(`Advance failed (${response.status})`);
   }
-  const payload = await response.json();
+  const payload = mergeSessionDelta(state.payload, await response.json());
   renderDataset(payload, {
     mode: "live",
     sessionId: payload.session_id ?? state.sessionId,
@@ -289,6 +291,17 @@ async function advanceLiveSession(options = {}) {
   return payload;
 }
 
+function mergeSessionDelta(previous, delta) {
+  // Delta frames omit cumulative_events; rebuild them from new_events
+  const frames = (previous?.frames ?? []).slice(0, delta.frame_offset);
+  delta.frames.forEach((frame) => {
+    const prior = frames.length ? frames[frames.length - 1].cumulative_events ?? [] : [];
+    const cumulative = prior.concat(frame.new_events ?? []).slice(-delta.event_window);
+    frames.push({ ...frame, cumulative_events: cumulative });
+  });
+  return { ...delta, frames, frame_offset: 0, event_window: null };
+}
+
 function renderDataset(payload, options = {}) {
   const {
     mode = "offline",
@@ -1,20 +1,45 @@
 import logging
 
+from vault_writer import VaultWriter
+
 class GameEventManager:
     """
     Event manager for the game that enables real-time updates to Obsidian files.
-    Publishes events and updates run_data and Current Run.md in real-time.
+    Publishes events, updates run_data immediately and rewrites Current Run.md
+    in the background at most once per flush interval.
     """
-    def __init__(self, obsidian_logger, run_data, dungeon_master=None):
+    def __init__(self, obsidian_logger, run_data, dungeon_master=None, current_run_updater=None,
+                 flush_interval=None):
+        """
+        Args:
+            obsidian_logger: ObsidianLogger for the vault
+            run_data: Shared run state rendered into Current Run.md
+            dungeon_master: DungeonMaster whose update_current_run() renders the file
+            current_run_updater: Callable used instead when there is no DungeonMaster
+            flush_interval: Minimum seconds between Current Run.md rewrites
+                (defaults to VAULT_FLUSH_INTERVAL; 0 writes on every publish)
+        """
         self.obsidian = obsidian_logger
         self.run_data = run_data
         self.subscribers = {}
         self.logger = logging.getLogger("game_event_manager")
-        self.dungeon_master = dungeon_master  # Store reference to the DungeonMaster instance
+        self.dungeon_master = None
+        self.current_run_updater = current_run_updater
+        if dungeon_master is not None:
+            self.register_dungeon_master(dungeon_master)
+        # Publishes only mark Current Run.md dirty; the writer coalesces rewrites
+        self.writer = VaultWriter(self._write_current_run, interval=flush_interval,
+                                  name="current-run-writer")
+
+    def register_dungeon_master(self, dungeon_master):
+        """Register the DungeonMaster that renders Current Run.md."""
+        if not hasattr(dungeon_master, 'update_current_run'):
+            raise TypeError("dungeon_master must provide update_current_run()")
+        self.dungeon_master = dungeon_master
 
     def publish(self, event_type, event_data):
         """
-        Publish an event which updates run_data and Current Run.md immediately.
+        Publish an event: update run_data now and schedule a Current Run.md rewrite.
 
         Args:
             event_type: Type of event (e.g. "character_created", "location_created")
@@ -26,47 +51,28 @@ class GameEventManager:
         # Update run_data based on event type
         self._update_run_data(event_type, event_data)
 
-        # Update Current Run.md immediately
-        try:
-            # First try to use the direct reference to DungeonMaster instance
-            if self.dungeon_master and hasattr(self.dungeon_master, 'update_current_run'):
-                self.logger.debug(f"Updating Current Run.md via direct DungeonMaster reference after {event_type}")
-                self.dungeon_master.update_current_run()
-            else:
-                # Import here to avoid circular imports
-                # This is a fallback for direct usage of the EventManager
-                try:
-                    # Try to find a DungeonMaster instance to update the run
-                    import sys
-                    dm_found = False
-                    for module in sys.modules.values():
-                        if hasattr(module, 'DungeonMaster'):
-                            for obj_name in dir(module):
-                                obj = getattr(module, obj_name)
-                                if isinstance(obj, module.DungeonMaster) and hasattr(obj, 'update_current_run'):
-                                    self.logger.debug(f"Found DungeonMaster instance, updating Current Run.md after {event_type}")
-                                    obj.update_current_run()
-                                    self.dungeon_master = obj  # Save for future use
-                                    dm_found = True
-                                    break
-
-                    if not dm_found:
-                        self.logger.warning(f"No DungeonMaster instance found to update Current Run.md after {event_type}")
-                except Exception as e:
-                    self.logger.error(f"Failed to find DungeonMaster: {e}")
-                    # Fallback to direct update
-                    try:
-                        from run_game import update_current_run
-                        self.logger.debug(f"Using fallback update_current_run after {event_type}")
-                        update_current_run(self.obsidian, self.run_data)
-                    except Exception as inner_e:
-                        self.logger.error(f"Fallback update also failed: {inner_e}")
-        except Exception as e:
-            self.logger.error(f"Failed to update Current Run.md: {e}")
+        # Bursts of publishes collapse into one write per flush interval
+        self.writer.mark_dirty()
 
         # Notify subscribers if needed
         self._notify_subscribers(event_type, event_data)
 
+    def flush(self, force=False):
+        """Rewrite Current Run.md now if it has pending changes (or ``force``)."""
+        return self.writer.flush(force=force)
+
+    def close(self):
+        """Write any pending changes and stop the background writer."""
+        self.writer.close()
+
+    def _write_current_run(self):
+        if self.dungeon_master is not None:
+            self.dungeon_master.update_current_run()
+        elif self.current_run_updater is not None:
+            self.current_run_updater()
+        else:
+            self.logger.warning("No DungeonMaster or updater registered; Current Run.md not updated")
+
     def _update_run_data(self, event_type, event_data):
         """
         Update the run_data based on the event type. This ensures Current Run.md shows
@@ -168,4 +174,4 @@ class GameEventManager:
 
     def get_event_types(self):
         """Get all registered event types"""
-        return list(self.subscribers.keys())
\ No newline at end of file
+        return list(self.subscribers.keys())
@@ -8,7 +8,8 @@ import os
 import json
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any, Tuple
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 try:
@@ -19,6 +20,12 @@ except ImportError:
 from google import genai
 from google.genai import types
 
+from narration_cache import NarrationCache, get_default_cache
+from narration_prompt import (
+    ADAPTIVE_STORY_INSTRUCTIONS, DEFAULT_TOKEN_BUDGET, AssembledPrompt, ContextCacheRegistry, assemble_prompt
+)
+from narration_stream import aiter_streamed, current_stream
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -68,9 +75,10 @@ class NPCBehavior:
 class GeminiNarrativeEngine:
     """Main engine for Gemini-powered narrative decision making"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[NarrationCache] = None):
         """Initialize the Gemini narrative engine"""
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        self.cache = cache if cache is not None else get_default_cache()
 
         # Log API key status for debugging
         if self.api_key:
@@ -80,6 +88,16 @@ class GeminiNarrativeEngine:
         self.model_name = os.getenv('GEMINI_MODEL', 'gemini-3-pro-preview')
         self.thinking_level = self._validate_thinking_level(os.getenv('GEMINI_THINKING_LEVEL', 'high'))
         self.client = None
+        self.prompt_token_budget = int(os.getenv('GEMINI_PROMPT_TOKEN_BUDGET', str(DEFAULT_TOKEN_BUDGET)))
+        # Explicit context caches for the campaign-state prefix of narrative prompts
+        self.context_caches = ContextCacheRegistry(
+            create=self._create_context_cache,
+            delete=self._delete_context_cache,
+            ttl=int(os.getenv('GEMINI_CONTEXT_CACHE_TTL', '3600')),
+            min_tokens=int(os.getenv('GEMINI_CONTEXT_CACHE_MIN_TOKENS', '4096'))
+        )
+        # Time-to-first-token of streamed generations (what players feel)
+        self.stream_stats = {"streams": 0, "ttft_ms_total": 0.0, "ttft_ms_last": None}
         self.safety_settings = [
             types.SafetySetting(
                 category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
@@ -128,13 +146,9 @@ class GeminiNarrativeEngine:
             raise RuntimeError("Gemini engine not available")
 
         try:
-            # Build context-aware prompt
-            full_prompt = self._build_narrative_prompt(context, prompt)
-
-            # Generate response
             response_text = await asyncio.to_thread(
-                self._generate_text,
-                full_prompt,
+                self._generate_prompt,
+                self._assemble_prompt(context, prompt),
                 max_output_tokens=max_tokens,
                 temperature=0.8,
                 top_p=0.9,
@@ -148,6 +162,33 @@ class GeminiNarrativeEngine:
             logger.error(f"❌ Error generating narrative response: {e}")
             raise
 
+    async def stream_narrative_response(
+        self,
+        context: NarrativeContext,
+        prompt: str,
+        max_tokens: int = 1000,
+        thinking_level: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream a narrative response chunk by chunk as Gemini generates it"""
+        if not self.is_available():
+            raise RuntimeError("Gemini engine not available")
+
+        async for _, chunk in aiter_streamed(
+            self._generate_prompt,
+            self._assemble_prompt(context, prompt),
+            max_output_tokens=max_tokens,
+            temperature=0.8,
+            top_p=0.9,
+            top_k=40,
+            thinking_level=thinking_level
+        ):
+            yield chunk
+
+    async def stream_text(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        """Async iterator over the text chunks of one generation (same options as _generate_text)"""
+        async for _, chunk in aiter_streamed(self._generate_text, prompt, **kwargs):
+            yield chunk
+
     def generate_decision_matrix(
         self,
         context: NarrativeContext,
@@ -336,26 +377,14 @@ class GeminiNarrativeEngine:
             raise RuntimeError("Gemini engine not available")
 
         try:
-            prompt = f"""
-            As an expert D&D storyteller, create adaptive story content that evolves with the campaign.
-
-            Story Element: {story_element}
-            Campaign Tone: {context.campaign_tone}
-            Difficulty: {context.difficulty_level}
-            Player Actions: {', '.join(context.player_actions[-5:])}  # Last 5 actions
-            World State: {json.dumps(context.world_state, indent=2)}
-
-            Create engaging, adaptive content that:
-            1. Builds on previous player actions
-            2. Reflects the current world state
-            3. Maintains campaign tone and difficulty
-            4. Provides meaningful choices and consequences
-
-            Return as narrative text (2-3 paragraphs).
-            """
-
-            response_text = self._generate_text(
-                prompt,
+            response_text = self._generate_prompt(
+                self._assemble_prompt(
+                    context,
+                    story_element,
+                    instructions=ADAPTIVE_STORY_INSTRUCTIONS,
+                    request_label="STORY ELEMENT",
+                    recent_actions=5
+                ),
                 max_output_tokens=600,
                 temperature=0.85,
                 thinking_level=thinking_level
@@ -366,39 +395,57 @@ class GeminiNarrativeEngine:
             logger.error(f"❌ Error generating adaptive story: {e}")
             return f"Story content for {story_element} is being prepared..."
 
-    def _build_narrative_prompt(self, context: NarrativeContext, prompt: str) -> str:
-        """Build context-aware prompt for narrative generation"""
-        return f"""
-        You are an expert D&D Dungeon Master with deep knowledge of storytelling, character development, and game mechanics.
-
-        CAMPAIGN CONTEXT:
-        - Campaign ID: {context.campaign_id}
-        - Session ID: {context.session_id}
-        - Current Scene: {context.current_scene}
-        - Campaign Tone: {context.campaign_tone}
-        - Difficulty Level: {context.difficulty_level}
-
-        RECENT PLAYER ACTIONS:
-        {chr(10).join(f"- {action}" for action in context.player_actions[-3:])}
-
-        NPC STATES:
-        {json.dumps(context.npc_states, indent=2)}
-
-        WORLD STATE:
-        {json.dumps(context.world_state, indent=2)}
+    def _assemble_prompt(self, context: NarrativeContext, request: str, **kwargs: Any) -> AssembledPrompt:
+        """Stable-prefix prompt for the context, held to the engine's token budget"""
+        assembled = assemble_prompt(context, request, token_budget=self.prompt_token_budget, **kwargs)
+        if assembled.pruned_npcs or assembled.pruned_world_keys or assembled.dropped_actions:
+            logger.info(
+                f"✂️ Prompt over {self.prompt_token_budget} tokens: pruned {len(assembled.pruned_npcs)} NPCs, "
+                f"{len(assembled.pruned_world_keys)} world entries, {assembled.dropped_actions} actions"
+            )
+        return assembled
 
-        PLAYER REQUEST:
-        {prompt}
+    def _generate_prompt(self, assembled: AssembledPrompt, **kwargs: Any) -> str:
+        """
+        Generate from an assembled prompt, sending only its volatile part
+        when the campaign state is held in a context cache.
+        """
+        handle = self.context_caches.handle_for(assembled) if self.is_available() else None
+        try:
+            return self._generate_text(
+                assembled.request,
+                system_instruction=assembled.instructions,
+                context=assembled.context,
+                cached_content=handle,
+                **kwargs
+            )
+        except Exception as e:
+            if handle is None:
+                raise
+            # The provider may have dropped the cache early; retry with the full prompt
+            logger.warning(f"⚠️ Generation with context cache {handle} failed, retrying without it: {e}")
+            self.context_caches.invalidate(assembled)
+            return self._generate_text(
+                assembled.request,
+                system_instruction=assembled.instructions,
+                context=assembled.context,
+                **kwargs
+            )
 
-        Provide a compelling, immersive response that:
-        1. Maintains narrative consistency
-        2. Reflects the campaign tone and difficulty
-        3. Builds on previous actions and world state
-        4. Offers meaningful choices and consequences
-        5. Enhances the overall storytelling experience
+    def _create_context_cache(self, assembled: AssembledPrompt, ttl: int) -> str:
+        cache = self.client.caches.create(
+            model=self.model_name,
+            config=types.CreateCachedContentConfig(
+                system_instruction=assembled.instructions,
+                contents=[assembled.context],
+                display_name=f"narrative-{assembled.context_hash[:16]}",
+                ttl=f"{ttl}s"
+            )
+        )
+        return cache.name
 
-        Response:
-        """
+    def _delete_context_cache(self, name: str) -> None:
+        self.client.caches.delete(name=name)
 
     def _generate_text(
         self,
@@ -408,9 +455,21 @@ class GeminiNarrativeEngine:
         temperature: float = 0.8,
         top_p: float = 0.9,
         top_k: int = 40,
-        thinking_level: Optional[str] = None
+        thinking_level: Optional[str] = None,
+        system_instruction: Optional[str] = None,
+        context: Optional[str] = None,
+        cached_content: Optional[str] = None
     ) -> str:
-        """Call Gemini and return concatenated text output."""
+        """
+        Call Gemini and return concatenated text output.
+
+        ``context`` is sent ahead of the prompt, or not at all when
+        ``cached_content`` names a context cache that already holds it
+        together with ``system_instruction``.
+
+        Inside a narration_stream.stream_to block the response is streamed
+        and each chunk is also passed to the stream as it arrives.
+        """
         if not self.is_available():
             raise RuntimeError("Gemini engine not available")
 
@@ -424,6 +483,24 @@ class GeminiNarrativeEngine:
         }
         if level:
             config_kwargs["thinking_level"] = level
+        if cached_content:
+            config_kwargs["cached_content"] = cached_content
+            contents = [prompt]
+        else:
+            if system_instruction:
+                config_kwargs["system_instruction"] = system_instruction
+            contents = [context, prompt] if context else [prompt]
+
+        stream = current_stream()
+        cache_key = None
+        if self.cache is not None:
+            full_prompt = f"{context}\n\n{prompt}" if context else prompt
+            cache_key = self.cache.make_key(self.model_name, system_instruction, full_prompt, level)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if stream is not None:
+                    stream.segment()(cached)
+                return cached
 
         try:
             config = types.GenerateContentConfig(**config_kwargs)
@@ -436,13 +513,53 @@ class GeminiNarrativeEngine:
             else:
                 raise e
 
-        response = self.client.models.generate_content(
+        if stream is not None:
+            text = self._generate_streamed(contents, config, stream.segment())
+        else:
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=contents,
+                config=config
+            )
+            text = self._extract_text(response)
+
+        if cache_key is not None:
+            self.cache.put(cache_key, text)
+        return text
+
+    def _generate_streamed(self, contents: List[str], config: Any, write: Callable[[str], None]) -> str:
+        """Stream a generation, writing each chunk as it arrives; returns the full text"""
+        started = time.perf_counter()
+        parts: List[str] = []
+        for chunk in self.client.models.generate_content_stream(
             model=self.model_name,
-            contents=[prompt],
+            contents=contents,
             config=config
-        )
+        ):
+            piece = self._chunk_text(chunk)
+            if not piece:
+                continue
+            if not parts:
+                ttft_ms = (time.perf_counter() - started) * 1000
+                self.stream_stats["streams"] += 1
+                self.stream_stats["ttft_ms_total"] += ttft_ms
+                self.stream_stats["ttft_ms_last"] = round(ttft_ms, 1)
+            parts.append(piece)
+            write(piece)
+
+        if not parts:
+            raise ValueError("No text parts in Gemini response")
+        return "".join(parts).strip()
 
-        return self._extract_text(response)
+    def _chunk_text(self, chunk: Any) -> str:
+        """Text carried by one streamed chunk (may be empty)"""
+        pieces: List[str] = []
+        for candidate in getattr(chunk, "candidates", None) or []:
+            content = getattr(candidate, "content", None)
+            for part in getattr(content, "parts", None) or []:
+                if getattr(part, "text", None):
+                    pieces.append(part.text)
+        return "".join(pieces)
 
     def _extract_text(self, response: Any) -> str:
         """Extract plain text from a Gemini response."""
@@ -489,12 +606,25 @@ class GeminiNarrativeEngine:
             "api_key_configured": bool(self.api_key),
             "model": self.model_name if self.is_available() else None,
             "thinking_level": self.thinking_level,
+            "streaming": {
+                "streams": self.stream_stats["streams"],
+                "avg_time_to_first_token_ms": round(
+                    self.stream_stats["ttft_ms_total"] / self.stream_stats["streams"], 1
+                ) if self.stream_stats["streams"] else None,
+                "last_time_to_first_token_ms": self.stream_stats["ttft_ms_last"]
+            },
+            "prompt": {
+                "token_budget": self.prompt_token_budget,
+                "context_cache": self.context_caches.metrics()
+            },
             "capabilities": [
                 "narrative_generation",
                 "decision_matrix",
                 "story_branch_analysis",
                 "npc_behavior_generation",
-                "adaptive_storytelling"
+                "adaptive_storytelling",
+                "streaming",
+                "context_caching"
             ],
             "timestamp": datetime.now().isoformat()
         }
@@ -582,6 +712,26 @@ class GeminiNarrativeEngine:
             logger.error(f"Error handling player action: {e}")
             return f"{player_name} {action}."
 
+    def narrate_actions(self, actions: List[Dict[str, Any]], thinking_level: Optional[str] = None) -> Optional[List[str]]:
+        """Narrate a whole turn's actions in one call; None if the reply can't be split"""
+        if not actions:
+            return []
+        if not self.is_available():
+            return None
+
+        from narrative_engine import build_batch_prompt, parse_numbered_narration
+        try:
+            response_text = self._generate_text(
+                build_batch_prompt(actions, words_per_line=25),
+                max_output_tokens=60 * len(actions),
+                temperature=0.8,
+                thinking_level=thinking_level
+            )
+            return parse_numbered_narration(response_text, len(actions))
+        except Exception as e:
+            logger.error(f"Error narrating turn actions: {e}")
+            return None
+
     def describe_combat(self, attacker, target, damage=0, success=True, thinking_level: Optional[str] = None):
         """Describe a combat action"""
         if not self.is_available():
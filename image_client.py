@@ -0,0 +1,292 @@
+"""
+Pooled async HTTP client for the image servers behind the Narrative Theater.
+
+Flask request threads hand image requests to one ``ImageClient``, which
+runs an asyncio loop on a background thread with a single keep-alive
+``httpx.AsyncClient``. Each upstream (PixelLab bridge, Nano Banana) has
+its own concurrency limit and timeout; a request that is still waiting
+after ``hedge_after`` seconds is hedged with a second attempt when the
+upstream has a free slot, and whichever answers first wins. Results are
+cached by (scene_type, description, size), and identical requests that
+arrive while one is in flight share it, so a chapter's images can be
+fanned out together with ``generate_images`` and finish in about the
+time of the slowest one.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PIXELLAB = "pixellab"
+NANO_BANANA = "nano_banana"
+
+# (scene_type, description, size)
+CacheKey = Tuple[str, str, str]
+
+
+class ImageGenerationError(Exception):
+    """Raised when no upstream produced an image"""
+    pass
+
+
+@dataclass
+class Upstream:
+    """One image server and the limits applied to it"""
+    name: str
+    base_url: str
+    concurrency: int = 4
+    timeout: float = 60.0
+    # Seconds before a slow request is hedged; 0 disables hedging
+    hedge_after: float = 0.0
+
+
+@dataclass
+class ImageRequest:
+    scene_type: str = "exploration"
+    description: str = ""
+    format: str = "square"
+    width: int = 64
+    height: int = 64
+
+    @property
+    def size(self) -> str:
+        return "16:9" if self.format == "landscape" else f"{self.width}x{self.height}"
+
+    @property
+    def cache_key(self) -> CacheKey:
+        return (self.scene_type, self.description, self.size)
+
+
+def image_plan(req: ImageRequest) -> List[Tuple[str, str, Dict[str, Any], str]]:
+    """
+    Upstream calls to try in order for a request, as
+    (upstream, path, payload, image_type). Character intros try a PixelLab
+    sprite and combat/conclusion a Nano Banana scene before the format's
+    default.
+    """
+    plan = []
+    if req.scene_type in ('introduction', 'character_intro'):
+        plan.append((PIXELLAB, '/generate-sprite', {
+            "prompt": req.description, "width": 128, "height": 128, "no_background": True
+        }, "sprite"))
+    elif req.scene_type in ('combat', 'conclusion'):
+        plan.append((NANO_BANANA, '/generate-scene', {
+            "description": req.description, "style": "fantasy", "aspect_ratio": "16:9"
+        }, "enhanced"))
+
+    if req.format == 'landscape':
+        plan.append((NANO_BANANA, '/generate', {"prompt": req.description, "aspect_ratio": "16:9"}, "sprite"))
+    else:
+        plan.append((PIXELLAB, '/generate-sprite', {
+            "prompt": req.description, "width": req.width, "height": req.height, "no_background": True
+        }, "sprite"))
+    return plan
+
+
+class ImageClient:
+    """Shared, thread-safe entry point for image generation calls"""
+
+    def __init__(
+        self,
+        upstreams: List[Upstream],
+        cache_size: int = 256,
+        cache_ttl: float = 3600,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.upstreams = {upstream.name: upstream for upstream in upstreams}
+        self.cache_size = max(0, cache_size)
+        self.cache_ttl = cache_ttl
+        self._transport = transport
+        # Everything below is only touched on the loop thread
+        self._cache: "OrderedDict[CacheKey, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self.stats = {"requests": 0, "upstream_calls": 0, "upstream_errors": 0, "hedges": 0,
+                      "hedge_wins": 0, "cache_hits": 0, "shared": 0}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="image-client", daemon=True)
+        self._thread.start()
+
+    def generate_image(self, req: ImageRequest) -> Dict[str, Any]:
+        """
+        Generate one image, blocking the calling thread.
+
+        Returns {"image", "image_type", "upstream", "cached"}.
+
+        Raises:
+            ImageGenerationError: every upstream in the plan failed
+        """
+        return self._run(self._generate(req))
+
+    def generate_images(self, reqs: List[ImageRequest]) -> List[Dict[str, Any]]:
+        """
+        Generate several images concurrently. Each result is either
+        generate_image's result with "success": True or
+        {"success": False, "error"}, in request order.
+        """
+        return self._run(self._generate_all(reqs))
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "cached_images": len(self._cache),
+            "in_flight": len(self._inflight),
+            "upstreams": {
+                name: {"concurrency": upstream.concurrency, "timeout": upstream.timeout,
+                       "hedge_after": upstream.hedge_after}
+                for name, upstream in self.upstreams.items()
+            },
+        }
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _generate_all(self, reqs: List[ImageRequest]) -> List[Dict[str, Any]]:
+        results = await asyncio.gather(*(self._generate(req) for req in reqs), return_exceptions=True)
+        return [
+            {"success": False, "error": str(result)} if isinstance(result, Exception) else {"success": True, **result}
+            for result in results
+        ]
+
+    async def _generate(self, req: ImageRequest) -> Dict[str, Any]:
+        self.stats["requests"] += 1
+        key = req.cache_key
+        entry = self._cache.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return {**entry[0], "cached": True}
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["shared"] += 1
+            return {**await asyncio.shield(pending), "cached": True}
+
+        future = self._loop.create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._generate_uncached(req)
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters see the error; keep it from being reported as never retrieved
+            future.exception()
+            raise
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            if self.cache_size:
+                self._cache[key] = (result, time.monotonic() + self.cache_ttl)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            return {**result, "cached": False}
+        finally:
+            del self._inflight[key]
+
+    async def _generate_uncached(self, req: ImageRequest) -> Dict[str, Any]:
+        errors = []
+        for upstream, path, payload, image_type in image_plan(req):
+            try:
+                result = await self._post(upstream, path, payload)
+            except Exception as e:
+                errors.append(f"{upstream}{path}: {e}")
+                continue
+            if result.get('image'):
+                return {"image": result['image'], "image_type": image_type, "upstream": upstream}
+            errors.append(f"{upstream}{path}: {result.get('error', 'no image in response')}")
+        raise ImageGenerationError("; ".join(errors) or "Image generation failed")
+
+    async def _post(self, name: str, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST to an upstream within its concurrency limit, hedging slow calls"""
+        upstream = self.upstreams[name]
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = self._semaphores[name] = asyncio.Semaphore(max(1, upstream.concurrency))
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=sum(max(1, u.concurrency) for u in self.upstreams.values()) * 2,
+                    max_keepalive_connections=sum(max(1, u.concurrency) for u in self.upstreams.values())
+                )
+            )
+
+        async def attempt() -> Dict[str, Any]:
+            async with semaphore:
+                self.stats["upstream_calls"] += 1
+                try:
+                    response = await self._client.post(
+                        f"{upstream.base_url}{path}", json=payload, timeout=upstream.timeout
+                    )
+                    response.raise_for_status()
+                    return response.json()
+                except Exception:
+                    self.stats["upstream_errors"] += 1
+                    raise
+
+        first = asyncio.ensure_future(attempt())
+        tasks = {first}
+        try:
+            if upstream.hedge_after > 0:
+                done, _ = await asyncio.wait(tasks, timeout=upstream.hedge_after)
+                # Only hedge with spare capacity, never by queueing behind other work
+                if not done and not semaphore.locked():
+                    self.stats["hedges"] += 1
+                    tasks.add(asyncio.ensure_future(attempt()))
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+_client: Optional[ImageClient] = None
+_client_lock = threading.Lock()
+
+
+def get_image_client() -> ImageClient:
+    """Shared image client, configured from the environment on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            concurrency = int(os.getenv("IMAGE_UPSTREAM_CONCURRENCY", "4"))
+            timeout = float(os.getenv("IMAGE_UPSTREAM_TIMEOUT", "60"))
+            hedge_after = float(os.getenv("IMAGE_HEDGE_AFTER", "30"))
+            _client = ImageClient(
+                [
+                    Upstream(PIXELLAB, os.getenv("PIXELLAB_BRIDGE_URL", "http://localhost:5001"),
+                             concurrency, timeout, hedge_after),
+                    Upstream(NANO_BANANA, os.getenv("NANO_BANANA_URL", "http://localhost:5000"),
+                             concurrency, timeout, hedge_after),
+                ],
+                cache_size=int(os.getenv("IMAGE_CACHE_SIZE", "256")),
+                cache_ttl=float(os.getenv("IMAGE_CACHE_TTL", "3600")),
+            )
+        return _client
@@ -0,0 +1,183 @@
+"""
+Content-addressed cache for narrative engine completions.
+
+Entries are keyed by a hash of (model, system prompt, prompt, thinking level)
+and held in a bounded in-memory LRU with per-entry TTL. An optional SQLite
+file acts as a second tier that survives restarts. In "variety" mode each
+key keeps up to ``variety`` alternative completions and only counts as a
+hit once that many have been collected, so repeated prompts still rotate
+through different wording.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (text, expires_at)
+_Entry = Tuple[str, float]
+
+
+class NarrationCache:
+    """Two-tier (memory LRU + optional SQLite) cache for generated text."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 24 * 3600,
+        variety: int = 1,
+        db_path: Optional[str] = None,
+        time_fn: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self.variety = max(1, int(variety))
+        self.db_path = db_path
+        self._time = time_fn
+        self._rng = random.Random()
+        self._memory: "OrderedDict[str, List[_Entry]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0, "writes": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS narration_cache ("
+                "key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS ix_narration_cache_key ON narration_cache (key)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: Optional[str], prompt: str,
+                 thinking_level: Optional[str] = None) -> str:
+        """Stable content hash for a generation request."""
+        material = "\x1f".join([model or "", system_prompt or "", prompt, thinking_level or ""])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached completion, or None on a miss."""
+        now = self._time()
+        with self._lock:
+            entries = self._live(self._memory.get(key), now)
+            if not entries and self._db is not None:
+                entries = self._load_from_disk(key, now)
+                if entries:
+                    self.stats["disk_hits"] += 1
+
+            if entries:
+                self._store(key, entries)
+            else:
+                self._memory.pop(key, None)
+
+            if not entries or len(entries) < self.variety:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["hits"] += 1
+            return self._rng.choice(entries)[0] if self.variety > 1 else entries[0][0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a completion, keeping at most ``variety`` alternatives."""
+        now = self._time()
+        expires_at = now + self.ttl
+        with self._lock:
+            entries = self._live(self._memory.get(key), now) or []
+            if any(text == value for text, _ in entries):
+                return
+            entries.append((value, expires_at))
+            entries = entries[-self.variety:]
+            self._store(key, entries)
+            self.stats["writes"] += 1
+
+            if self._db is not None:
+                self._db.execute("DELETE FROM narration_cache WHERE key = ?", (key,))
+                self._db.executemany(
+                    "INSERT INTO narration_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    [(key, text, exp) for text, exp in entries],
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM narration_cache")
+                self._db.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the SQLite tier; returns rows removed."""
+        if self._db is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM narration_cache WHERE expires_at <= ?", (self._time(),))
+            self._db.commit()
+            return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, float]:
+        """Counters plus current size and hit rate."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._memory),
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            }
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _live(entries: Optional[List[_Entry]], now: float) -> Optional[List[_Entry]]:
+        if entries is None:
+            return None
+        return [entry for entry in entries if entry[1] > now]
+
+    def _store(self, key: str, entries: List[_Entry]) -> None:
+        self._memory[key] = entries
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _load_from_disk(self, key: str, now: float) -> List[_Entry]:
+        rows = self._db.execute(
+            "SELECT value, expires_at FROM narration_cache WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchall()
+        return [(value, expires_at) for value, expires_at in rows]
+
+
+_default_cache: Optional[NarrationCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[NarrationCache]:
+    """
+    Shared cache for both narrative engines, configured from the environment.
+
+    Disabled unless ``NARRATION_CACHE=1``. ``NARRATION_CACHE_SIZE``,
+    ``NARRATION_CACHE_TTL``, ``NARRATION_CACHE_VARIETY`` and
+    ``NARRATION_CACHE_DB`` (SQLite path) tune it.
+    """
+    global _default_cache
+    if os.getenv("NARRATION_CACHE", "0").lower() not in ("1", "true", "yes", "on"):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = NarrationCache(
+                max_entries=int(os.getenv("NARRATION_CACHE_SIZE", "1024")),
+                ttl=float(os.getenv("NARRATION_CACHE_TTL", str(24 * 3600))),
+                variety=int(os.getenv("NARRATION_CACHE_VARIETY", "1")),
+                db_path=os.getenv("NARRATION_CACHE_DB") or None,
+            )
+            logger.info("Narration cache enabled")
+        return _default_cache
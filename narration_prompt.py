@@ -0,0 +1,290 @@
+"""
+Prompt assembly for the Gemini narrative engine.
+
+Prompts are laid out most-stable first so providers can reuse the prefix:
+
+1. static instructions (identical for every request of a kind)
+2. the campaign state: session, tone, difficulty, NPC states and world
+   state as compact canonical JSON (sorted keys, no whitespace), which
+   only changes when the game does
+3. the volatile part last: current scene, the latest player actions and
+   the request itself
+
+The first two parts hash to ``AssembledPrompt.context_hash``, which
+``ContextCacheRegistry`` maps to an explicit provider context cache so
+repeated requests against the same state send only part 3. Every prompt
+is held to a token budget by pruning the state that matters least.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a token in English prose and JSON; only used for budgeting
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 8000
+# Longest single player action kept verbatim
+ACTION_CHARS = 240
+
+NARRATIVE_INSTRUCTIONS = """You are an expert D&D Dungeon Master with deep knowledge of storytelling, character development, and game mechanics.
+
+The campaign state follows as compact JSON, then the current scene, recent player actions and the player request.
+
+Provide a compelling, immersive response that:
+1. Maintains narrative consistency
+2. Reflects the campaign tone and difficulty
+3. Builds on previous actions and world state
+4. Offers meaningful choices and consequences
+5. Enhances the overall storytelling experience"""
+
+ADAPTIVE_STORY_INSTRUCTIONS = """You are an expert D&D storyteller creating adaptive story content that evolves with the campaign.
+
+The campaign state follows as compact JSON, then the current scene, recent player actions and the story element to develop.
+
+Create engaging, adaptive content that:
+1. Builds on previous player actions
+2. Reflects the current world state
+3. Maintains campaign tone and difficulty
+4. Provides meaningful choices and consequences
+
+Return as narrative text (2-3 paragraphs)."""
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def canonical_json(value: Any) -> str:
+    """Compact JSON that is byte-identical for equal values"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+@dataclass
+class AssembledPrompt:
+    """One request split into its cacheable prefix and volatile tail"""
+    instructions: str
+    context: str
+    request: str
+    context_hash: str
+    pruned_npcs: List[str] = field(default_factory=list)
+    pruned_world_keys: List[str] = field(default_factory=list)
+    dropped_actions: int = 0
+
+    @property
+    def prefix_tokens(self) -> int:
+        """Estimated tokens a context cache hit saves"""
+        return estimate_tokens(self.instructions) + estimate_tokens(self.context)
+
+    @property
+    def estimated_tokens(self) -> int:
+        return self.prefix_tokens + estimate_tokens(self.request)
+
+    def as_text(self) -> str:
+        """The whole prompt as one string, prefix first"""
+        return f"{self.instructions}\n\n{self.context}\n\n{self.request}"
+
+
+def assemble_prompt(
+    context: Any,
+    request: str,
+    *,
+    instructions: str = NARRATIVE_INSTRUCTIONS,
+    request_label: str = "PLAYER REQUEST",
+    recent_actions: int = 3,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> AssembledPrompt:
+    """
+    Lay out a NarrativeContext and request for generation.
+
+    When state and request exceed ``token_budget`` (instructions excluded,
+    they are the same every time), the cheapest losses go first: NPCs not
+    mentioned in the scene or recent actions, then the other NPCs, then
+    the largest world state entries, then the oldest of the recent
+    actions. Whatever was pruned is listed by name in the state so the
+    model knows it exists.
+    """
+    actions = [_clip(str(action), ACTION_CHARS) for action in list(context.player_actions)[-recent_actions:]]
+    npcs = dict(context.npc_states or {})
+    world = dict(context.world_state or {})
+
+    def sizes(entries: Dict[str, Any]) -> Dict[str, int]:
+        return {key: estimate_tokens(canonical_json({key: value})) for key, value in entries.items()}
+
+    npc_sizes, world_sizes = sizes(npcs), sizes(world)
+    focus = " ".join([str(context.current_scene)] + actions).lower()
+    # Off-scene NPCs first, largest first within each group
+    npc_order = sorted(npcs, key=lambda name: (str(name).lower() in focus, -npc_sizes[name], str(name)))
+    world_order = sorted(world, key=lambda key: (-world_sizes[key], str(key)))
+
+    pruned_npcs: List[str] = []
+    pruned_world: List[str] = []
+    dropped = 0
+    total = (estimate_tokens(_state_block(context, npcs, world, [], []))
+             + estimate_tokens(_request_block(context.current_scene, actions, request_label, request)))
+    while total > token_budget:
+        if npc_order:
+            name = npc_order.pop(0)
+            del npcs[name]
+            pruned_npcs.append(name)
+            total -= npc_sizes[name] - estimate_tokens(canonical_json(name))
+        elif world_order:
+            key = world_order.pop(0)
+            del world[key]
+            pruned_world.append(key)
+            total -= world_sizes[key] - estimate_tokens(canonical_json(key))
+        elif len(actions) > 1:
+            total -= estimate_tokens(actions.pop(0))
+            dropped += 1
+        else:
+            break
+
+    state = _state_block(context, npcs, world, pruned_npcs, pruned_world)
+    return AssembledPrompt(
+        instructions=instructions,
+        context=state,
+        request=_request_block(context.current_scene, actions, request_label, request),
+        context_hash=hashlib.sha256(f"{instructions}\x1f{state}".encode("utf-8")).hexdigest(),
+        pruned_npcs=pruned_npcs,
+        pruned_world_keys=pruned_world,
+        dropped_actions=dropped,
+    )
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def _state_block(context: Any, npcs: Dict[str, Any], world: Dict[str, Any],
+                 pruned_npcs: List[str], pruned_world: List[str]) -> str:
+    state: Dict[str, Any] = {
+        "campaign": context.campaign_id,
+        "session": context.session_id,
+        "tone": context.campaign_tone,
+        "difficulty": context.difficulty_level,
+        "npcs": npcs,
+        "world": world,
+    }
+    if pruned_npcs or pruned_world:
+        state["omitted"] = {"npcs": sorted(map(str, pruned_npcs)), "world": sorted(map(str, pruned_world))}
+    return f"CAMPAIGN STATE:\n{canonical_json(state)}"
+
+
+def _request_block(scene: str, actions: List[str], label: str, request: str) -> str:
+    lines = [f"CURRENT SCENE: {scene}", "", "RECENT PLAYER ACTIONS:"]
+    lines.extend(f"- {action}" for action in actions)
+    lines.extend(["", f"{label}:", request, "", "Response:"])
+    return "\n".join(lines)
+
+
+class ContextCacheRegistry:
+    """
+    Maps context hashes to provider context cache handles.
+
+    ``create(prompt, ttl_seconds)`` uploads a prompt's instructions and
+    campaign state and returns the handle name; ``delete(name)`` releases
+    one. Prefixes under ``min_tokens`` are not cached (providers reject
+    small caches; implicit prefix caching still benefits from the stable
+    layout). Handles are reused until shortly before their TTL runs out,
+    at most ``max_entries`` are kept, and a state whose cache could not
+    be created is not retried for ``retry_after`` seconds.
+
+    Thread-safe; create and delete run on the calling thread.
+    """
+
+    # Stop handing out a handle this long before the provider expires it
+    EXPIRY_MARGIN = 60.0
+
+    def __init__(
+        self,
+        create: Callable[[AssembledPrompt, int], str],
+        delete: Optional[Callable[[str], None]] = None,
+        ttl: int = 3600,
+        min_tokens: int = 4096,
+        max_entries: int = 64,
+        retry_after: float = 300.0,
+        time_fn: Callable[[], float] = time.time,
+    ):
+        self.create = create
+        self.delete = delete
+        self.ttl = ttl
+        self.min_tokens = min_tokens
+        self.max_entries = max(1, max_entries)
+        self.retry_after = retry_after
+        self._time = time_fn
+        # context_hash -> (handle name, expires_at), oldest first
+        self._handles: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._failed: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "creates": 0, "failures": 0, "too_small": 0, "tokens_reused": 0}
+
+    def handle_for(self, prompt: AssembledPrompt) -> Optional[str]:
+        """Cache handle covering the prompt's prefix, creating one if worthwhile"""
+        prefix_tokens = prompt.prefix_tokens
+        if prefix_tokens < self.min_tokens:
+            with self._lock:
+                self.stats["too_small"] += 1
+            return None
+
+        key = prompt.context_hash
+        now = self._time()
+        with self._lock:
+            entry = self._handles.get(key)
+            if entry is not None and entry[1] - self.EXPIRY_MARGIN > now:
+                self._handles.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["tokens_reused"] += prefix_tokens
+                return entry[0]
+            failed_at = self._failed.get(key)
+            if failed_at is not None and now - failed_at < self.retry_after:
+                return None
+
+        # Created outside the lock; a racing duplicate just expires unused
+        try:
+            name = self.create(prompt, self.ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ Context cache creation failed, sending full prompt: {e}")
+            with self._lock:
+                self.stats["failures"] += 1
+                self._failed[key] = now
+                self._failed.move_to_end(key)
+                while len(self._failed) > self.max_entries:
+                    self._failed.popitem(last=False)
+            return None
+
+        victims: List[str] = []
+        with self._lock:
+            self.stats["creates"] += 1
+            self._failed.pop(key, None)
+            self._handles[key] = (name, now + self.ttl)
+            self._handles.move_to_end(key)
+            while len(self._handles) > self.max_entries:
+                victims.append(self._handles.popitem(last=False)[1][0])
+        for victim in victims:
+            self._release(victim)
+        return name
+
+    def invalidate(self, prompt: AssembledPrompt) -> None:
+        """Forget the prompt's handle (e.g. the provider no longer has it)"""
+        with self._lock:
+            entry = self._handles.pop(prompt.context_hash, None)
+        if entry is not None:
+            self._release(entry[0])
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {"handles": len(self._handles), **self.stats}
+
+    def _release(self, name: str) -> None:
+        if self.delete is None:
+            return
+        try:
+            self.delete(name)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not delete context cache {name}: {e}")
@@ -0,0 +1,132 @@
+"""
+Token streaming plumbing shared by the narrative engines and servers.
+
+A caller opens a ``TokenStream`` with ``stream_to(sink)`` and then runs
+ordinary, blocking narration code. Every engine generation made on that
+thread starts a new segment and passes each chunk of text to the sink as
+soon as it arrives, while still returning the full text as before. The
+existing scene and chapter builders stream without any changes.
+``aiter_streamed`` and ``stream_sse`` adapt this to async iterators and
+Server-Sent Events.
+"""
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
+
+# sink(segment, text): segment counts the generations made within one stream
+Sink = Callable[[int, str], None]
+
+_local = threading.local()
+_DONE = object()
+
+
+class TokenStream:
+    """Collects chunks from successive generations on one thread"""
+
+    def __init__(self, sink: Sink):
+        self.sink = sink
+        self.segments = 0
+
+    def segment(self) -> Callable[[str], None]:
+        """Start a new generation; returns the writer for its chunks"""
+        index = self.segments
+        self.segments += 1
+        return lambda text: self.sink(index, text)
+
+
+def current_stream() -> Optional[TokenStream]:
+    """The stream opened on this thread, if any"""
+    return getattr(_local, "stream", None)
+
+
+@contextmanager
+def stream_to(sink: Sink) -> Iterator[TokenStream]:
+    """Send text generated on this thread to ``sink`` while the block runs"""
+    previous = current_stream()
+    _local.stream = TokenStream(sink)
+    try:
+        yield _local.stream
+    finally:
+        _local.stream = previous
+
+
+async def aiter_streamed(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Run blocking ``fn`` in a worker thread and yield ``(segment, text)``
+    chunks as it generates them. Exceptions from ``fn`` are raised once
+    the chunks produced before them have been yielded.
+    """
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue()
+
+    def sink(segment: int, text: str) -> None:
+        loop.call_soon_threadsafe(chunks.put_nowait, (segment, text))
+
+    def run() -> Any:
+        with stream_to(sink):
+            return fn(*args, **kwargs)
+
+    task = asyncio.ensure_future(asyncio.to_thread(run))
+    task.add_done_callback(lambda _: chunks.put_nowait(_DONE))
+    while True:
+        item = await chunks.get()
+        if item is _DONE:
+            break
+        yield item
+    await task
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_sse(
+    build: Callable[[], Dict[str, Any]],
+    final_event: str,
+    keepalive: float = 15.0,
+) -> Iterator[str]:
+    """
+    Run ``build`` in a worker thread and yield SSE text: a ``token`` event
+    ({"segment", "text"}) per chunk, then ``final_event`` carrying build's
+    result plus ``time_to_first_token_ms`` and ``total_ms``, or an
+    ``error`` event. Comments are sent while nothing arrives for
+    ``keepalive`` seconds so proxies keep the connection open.
+
+    The build keeps running if the client disconnects, so session state
+    is never left half-updated.
+    """
+    events: queue.Queue = queue.Queue()
+
+    def produce() -> None:
+        try:
+            with stream_to(lambda segment, text: events.put(("token", {"segment": segment, "text": text}))):
+                result = build()
+            events.put((final_event, result))
+        except Exception as e:
+            events.put(("error", {"success": False, "error": str(e)}))
+
+    started = time.perf_counter()
+    first_token_ms = None
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        try:
+            event, data = events.get(timeout=keepalive)
+        except queue.Empty:
+            yield ": keep-alive\n\n"
+            continue
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        if event == "token":
+            if first_token_ms is None:
+                first_token_ms = elapsed_ms
+            yield sse_event(event, data)
+            continue
+        if event != "error":
+            data = {**data, "time_to_first_token_ms": first_token_ms, "total_ms": elapsed_ms}
+        yield sse_event(event, data)
+        return
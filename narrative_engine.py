@@ -1,23 +1,111 @@
 import subprocess
 import logging
 import os
+import re
+from typing import Any, Dict, List, Optional
+
+from ollama_pool import OllamaConnectionPool, OllamaPoolError, OllamaTimeoutError, get_default_pool
+from narration_cache import NarrationCache, get_default_cache
+from narration_stream import current_stream
 
 logger = logging.getLogger(__name__)
 
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)[.):]\s*(.+?)\s*$")
+
+
+def format_turn_action(action: Dict[str, Any]) -> str:
+    """Render one recorded turn action as a plain-text prompt line."""
+    if action.get("type") == "scene":
+        return f"Set the scene: {action['location']}, {len(action.get('characters', []))} characters present."
+    line = f"{action['actor']} {action['action']} {action['target']}"
+    if action.get("damage"):
+        line += f" ({action['damage']} damage)"
+    elif action.get("amount"):
+        line += f" (+{action['amount']} HP)"
+    return line
+
+
+def build_batch_prompt(actions: List[Dict[str, Any]], words_per_line: int = 15) -> str:
+    """Build a single prompt asking for one numbered narration line per action."""
+    numbered = "\n".join(f"{i}. {format_turn_action(a)}" for i, a in enumerate(actions, 1))
+    return (
+        f"Narrate each of these {len(actions)} events in order, one line each, "
+        f"under {words_per_line} words per line. Reply with exactly {len(actions)} "
+        f"lines numbered 1 to {len(actions)} and nothing else.\n\n{numbered}"
+    )
+
+
+def parse_numbered_narration(text: str, expected: int) -> Optional[List[str]]:
+    """Split a numbered reply into lines; None unless exactly 1..expected are present."""
+    lines: Dict[int, str] = {}
+    for raw in (text or "").splitlines():
+        match = _NUMBERED_LINE.match(raw)
+        if match:
+            lines.setdefault(int(match.group(1)), match.group(2))
+    if sorted(lines) != list(range(1, expected + 1)):
+        return None
+    return [lines[i] for i in range(1, expected + 1)]
+
+
 class NarrativeEngine:
-    def __init__(self, model="mistral"):
+    FALLBACK_TEXT = "The story continues..."
+
+    def __init__(self, model="mistral", pool: Optional[OllamaConnectionPool] = None,
+                 use_http: Optional[bool] = None, ollama_command: str = "ollama",
+                 cache: Optional[NarrationCache] = None):
         self.model = model
         self.system_prompt = "You are a D&D Dungeon Master. Keep all responses under 15 words and focus on action and atmosphere."
+        if use_http is None:
+            use_http = os.getenv("OLLAMA_BACKEND", "http").lower() != "subprocess"
+        # Pooled HTTP is the primary backend; the CLI is only a fallback
+        self.pool = (pool or get_default_pool()) if use_http else None
+        self.ollama_command = ollama_command
+        self.cache = cache if cache is not None else get_default_cache()
 
     def _call_ollama(self, prompt):
+        text = self._call_ollama_cached(prompt)
+        # Ollama replies are short and unstreamed: pass each one on whole
+        stream = current_stream()
+        if stream is not None and text:
+            stream.segment()(text)
+        return text
+
+    def _call_ollama_cached(self, prompt):
+        if self.cache is None:
+            return self._call_ollama_uncached(prompt)
+
+        key = self.cache.make_key(self.model, self.system_prompt, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        text = self._call_ollama_uncached(prompt)
+        # Never cache the error placeholder or empty CLI output
+        if text and text != self.FALLBACK_TEXT:
+            self.cache.put(key, text)
+        return text
+
+    def _call_ollama_uncached(self, prompt):
+        if self.pool is not None and self.pool.is_available():
+            try:
+                return self.pool.generate(self.model, prompt, system=self.system_prompt)
+            except OllamaTimeoutError as e:
+                # The server is up but slow; rerunning the prompt on the CLI
+                # would only repeat the work
+                logger.warning(f"Ollama HTTP request timed out: {e}")
+                return self.FALLBACK_TEXT
+            except OllamaPoolError as e:
+                logger.warning(f"Ollama HTTP backend failed, falling back to CLI: {e}")
+        return self._call_ollama_subprocess(prompt)
+
+    def _call_ollama_subprocess(self, prompt):
         try:
             full_prompt = f"{self.system_prompt}\n\n{prompt}"
-            cmd = ["ollama", "run", self.model, full_prompt]
+            cmd = [self.ollama_command, "run", self.model, full_prompt]
             result = subprocess.run(cmd, capture_output=True, text=True)
             return result.stdout.strip()
         except Exception as e:
             logger.error(f"Error calling Ollama: {e}")
-            return "The story continues..."
+            return self.FALLBACK_TEXT
 
     def describe_scene(self, location, characters):
         prompt = f"Set the scene in 10 words: {location}, {len(characters)} characters present."
@@ -27,6 +115,12 @@ class NarrativeEngine:
         prompt = f"{attacker} {action} {defender}" + (f" ({damage} damage)" if damage else "")
         return self._call_ollama(prompt)
 
+    def narrate_actions(self, actions: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """Narrate a whole turn's actions in one call; None if the reply can't be split."""
+        if not actions:
+            return []
+        return parse_numbered_narration(self._call_ollama(build_batch_prompt(actions)), len(actions))
+
     def generate_npc_dialogue(self, npc_name, npc_type, situation):
         prompt = f"Generate dialogue for {npc_name}, a {npc_type}, in this situation: {situation}"
         return self._call_ollama(prompt)
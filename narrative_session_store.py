@@ -0,0 +1,392 @@
+"""
+Bounded store for the Narrative Theater's in-memory sessions.
+
+``NarrativeSessionStore`` behaves like the ``game_sessions`` dict it
+replaces (``in``, ``[]``, assignment, ``pop``), but keeps at most
+``max_sessions`` sessions and ``max_bytes`` of narrative text and cached
+images in memory. Least recently used sessions, and sessions idle for
+``idle_seconds``, are spilled to ``spill_dir`` as compressed JSON plus one
+file per cached image, and reloaded transparently the next time a request
+names them. Spilled sessions untouched for ``spill_ttl`` seconds are
+deleted, so disk use is bounded too.
+
+Sessions touched within ``min_resident_seconds`` are never evicted: a
+request may still be working on them, and spilling would drop its
+changes. The bounds are therefore soft under a burst of new sessions.
+
+Disk I/O and rebuilding sessions happen outside the store-wide lock,
+which only guards the LRU map: a per-session lock serialises spilling
+and reloading one session, and concurrent requests for a spilled session
+share a single reload.
+"""
+
+import base64
+import binascii
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Serialized sessions keep their images out of the JSON, as separate files
+IMAGES_KEY = "character_images"
+
+
+@dataclass
+class _Entry:
+    session: Any
+    last_used: float
+    uses: int = 0
+    image_bytes: int = 0
+    scene_bytes: int = 0
+    scenes_measured: int = 0
+
+    @property
+    def bytes(self) -> int:
+        return self.image_bytes + self.scene_bytes
+
+
+class NarrativeSessionStore:
+    """
+    LRU + idle-TTL map of session_id -> NarrativeSession with spill-to-disk.
+
+    Sessions must provide ``to_dict()`` (JSON-serialisable, with cached
+    base64 images under ``character_images``) and ``load`` must rebuild one
+    from that dict. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[Dict[str, Any]], Any],
+        spill_dir: str,
+        max_sessions: int = 64,
+        max_bytes: int = 256 * 1024 * 1024,
+        idle_seconds: float = 1800,
+        min_resident_seconds: float = 120,
+        spill_ttl: float = 7 * 24 * 3600,
+        sweep_interval: float = 60,
+        time_fn: Callable[[], float] = time.time,
+    ):
+        self.load = load
+        self.spill_dir = spill_dir
+        self.max_sessions = max(1, max_sessions)
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.min_resident_seconds = min_resident_seconds
+        self.spill_ttl = spill_ttl
+        self.sweep_interval = sweep_interval
+        self._time = time_fn
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Guards _entries and stats only; never held across disk I/O or load
+        self._lock = threading.Lock()
+        # Held while a session is spilled, reloaded, replaced or removed
+        self._session_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+        self._sweeper: Optional[threading.Thread] = None
+        self.stats = {"spills": 0, "reloads": 0, "spill_errors": 0, "reload_errors": 0,
+                      "expired_spills": 0, "reload_seconds": 0.0}
+
+    # ------------------------------------------------------------------
+    # dict interface
+    # ------------------------------------------------------------------
+
+    def __contains__(self, session_id: Any) -> bool:
+        if not isinstance(session_id, str):
+            return False
+        with self._lock:
+            if session_id in self._entries:
+                return True
+        # Spills are written before the entry is dropped and removed after it is
+        # restored, so a session moving between the two is always in one of them
+        return os.path.exists(self._spill_path(session_id))
+
+    def __getitem__(self, session_id: str) -> Any:
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        return session
+
+    def __setitem__(self, session_id: str, session: Any) -> None:
+        entry = _Entry(session, self._time())
+        self._measure(entry)
+        with self._session_lock(session_id):
+            with self._lock:
+                self._entries[session_id] = entry
+                self._entries.move_to_end(session_id)
+        self._enforce_limits()
+        self._start_sweeper()
+
+    def __len__(self) -> int:
+        """Resident sessions only"""
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def get(self, session_id: str, default: Any = None) -> Any:
+        """Session by id, reloading it from disk if it was spilled"""
+        entry = self._touch(session_id)
+        if entry is None:
+            with self._session_lock(session_id):
+                # Another request may have reloaded it while we waited
+                entry = self._touch(session_id)
+                if entry is None:
+                    entry = self._reload(session_id)
+                    if entry is None:
+                        return default
+                    with self._lock:
+                        self._entries[session_id] = entry
+                    shutil.rmtree(self._spill_path(session_id), ignore_errors=True)
+        with self._session_lock(session_id):
+            self._measure(entry)
+        self._enforce_limits()
+        return entry.session
+
+    def pop(self, session_id: str, default: Any = None) -> Any:
+        """Remove a session from memory and disk"""
+        with self._session_lock(session_id):
+            with self._lock:
+                entry = self._entries.pop(session_id, None)
+            shutil.rmtree(self._spill_path(session_id), ignore_errors=True)
+        return entry.session if entry else default
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def values(self) -> List[Any]:
+        with self._lock:
+            return [entry.session for entry in self._entries.values()]
+
+    def items(self) -> List[tuple]:
+        with self._lock:
+            return [(session_id, entry.session) for session_id, entry in self._entries.items()]
+
+    # ------------------------------------------------------------------
+    # eviction
+    # ------------------------------------------------------------------
+
+    def spill(self, session_id: str) -> bool:
+        """
+        Write one resident session to disk and drop it from memory. A
+        session used again while it was being written stays resident.
+        """
+        with self._session_lock(session_id):
+            with self._lock:
+                entry = self._entries.get(session_id)
+                if entry is None:
+                    return False
+                uses = entry.uses
+            try:
+                self._write_spill(session_id, entry.session)
+            except Exception as e:
+                with self._lock:
+                    self.stats["spill_errors"] += 1
+                logger.error(f"Error spilling narrative session {session_id}: {e}")
+                return False
+            with self._lock:
+                kept = self._entries.get(session_id) is not entry or entry.uses != uses
+                if not kept:
+                    del self._entries[session_id]
+                    self.stats["spills"] += 1
+            if kept:
+                shutil.rmtree(self._spill_path(session_id), ignore_errors=True)
+                return False
+            return True
+
+    def sweep(self) -> int:
+        """Spill idle sessions and delete expired spills; returns how many were spilled"""
+        now = self._time()
+        with self._lock:
+            idle = [session_id for session_id, entry in self._entries.items()
+                    if now - entry.last_used > self.idle_seconds]
+        spilled = sum(1 for session_id in idle if self.spill(session_id))
+        # Spill ages come from file mtimes, so compare against wall-clock time
+        self._expire_spills(time.time())
+        return spilled
+
+    def metrics(self) -> Dict[str, Any]:
+        now = self._time()
+        with self._lock:
+            sessions = [
+                {
+                    "session_id": session_id,
+                    "bytes": entry.bytes,
+                    "image_bytes": entry.image_bytes,
+                    "scenes": entry.scenes_measured,
+                    "idle_seconds": round(now - entry.last_used, 1),
+                }
+                for session_id, entry in reversed(self._entries.items())
+            ]
+            stats = dict(self.stats)
+        reloads = stats.pop("reloads")
+        reload_seconds = stats.pop("reload_seconds")
+        spilled, spill_bytes = self._spill_usage()
+        return {
+            "resident_sessions": len(sessions),
+            "max_sessions": self.max_sessions,
+            "resident_bytes": sum(s["bytes"] for s in sessions),
+            "resident_image_bytes": sum(s["image_bytes"] for s in sessions),
+            "max_bytes": self.max_bytes,
+            "spilled_sessions": spilled,
+            "spilled_bytes": spill_bytes,
+            "reloads": reloads,
+            "reload_avg_ms": round(reload_seconds / reloads * 1000, 2) if reloads else 0.0,
+            **stats,
+            "sessions": sessions,
+        }
+
+    def _enforce_limits(self) -> None:
+        # One victim at a time, picked under the lock and spilled outside it
+        now = self._time()
+        tried = set()
+        while True:
+            with self._lock:
+                total = sum(entry.bytes for entry in self._entries.values())
+                if len(self._entries) <= self.max_sessions and total <= self.max_bytes:
+                    return
+                victim = next(((session_id, entry) for session_id, entry in self._entries.items()
+                               if session_id not in tried), None)
+            if victim is None or now - victim[1].last_used < self.min_resident_seconds:
+                # Oldest first, so every later session is in use too
+                return
+            tried.add(victim[0])
+            self.spill(victim[0])
+
+    def _touch(self, session_id: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry.last_used = self._time()
+                entry.uses += 1
+                self._entries.move_to_end(session_id)
+            return entry
+
+    def _session_lock(self, session_id: str) -> threading.Lock:
+        with self._lock:
+            lock = self._session_locks.get(session_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._session_locks[session_id] = lock
+            return lock
+
+    def _measure(self, entry: _Entry) -> None:
+        """Refresh the entry's byte counts; scenes are append-only, so only new ones are sized"""
+        images = getattr(entry.session, IMAGES_KEY, None)
+        if isinstance(images, dict):
+            entry.image_bytes = sum(len(image) for image in images.values() if isinstance(image, (str, bytes)))
+        scenes = getattr(entry.session, "scenes", None)
+        if isinstance(scenes, list):
+            if len(scenes) < entry.scenes_measured:
+                entry.scene_bytes, entry.scenes_measured = 0, 0
+            for scene in scenes[entry.scenes_measured:]:
+                entry.scene_bytes += len(json.dumps(scene, default=str))
+            entry.scenes_measured = len(scenes)
+
+    # ------------------------------------------------------------------
+    # spill files
+    # ------------------------------------------------------------------
+
+    def _spill_path(self, session_id: str) -> str:
+        # Session ids come from clients; never use them as paths
+        return os.path.join(self.spill_dir, hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32])
+
+    def _write_spill(self, session_id: str, session: Any) -> None:
+        data = session.to_dict()
+        images = data.pop(IMAGES_KEY, None) or {}
+        path = self._spill_path(session_id)
+        staging = f"{path}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(os.path.join(staging, "images"))
+
+        manifest = {}
+        for n, (key, image) in enumerate(images.items()):
+            try:
+                raw, name = base64.b64decode(image, validate=True), f"{n}.img"
+            except (binascii.Error, TypeError, ValueError):
+                raw, name = str(image).encode("utf-8"), f"{n}.txt"
+            with open(os.path.join(staging, "images", name), "wb") as f:
+                f.write(raw)
+            manifest[key] = name
+        data["image_files"] = manifest
+        with gzip.open(os.path.join(staging, "session.json.gz"), "wt", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(staging, path)
+
+    def _reload(self, session_id: str) -> Optional[_Entry]:
+        path = self._spill_path(session_id)
+        if not os.path.exists(path):
+            return None
+        started = time.perf_counter()
+        try:
+            with gzip.open(os.path.join(path, "session.json.gz"), "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            images = {}
+            for key, name in data.pop("image_files", {}).items():
+                with open(os.path.join(path, "images", name), "rb") as f:
+                    raw = f.read()
+                images[key] = base64.b64encode(raw).decode("ascii") if name.endswith(".img") else raw.decode("utf-8")
+            data[IMAGES_KEY] = images
+            session = self.load(data)
+        except Exception as e:
+            with self._lock:
+                self.stats["reload_errors"] += 1
+            logger.error(f"Error reloading narrative session {session_id}: {e}")
+            return None
+
+        with self._lock:
+            self.stats["reloads"] += 1
+            self.stats["reload_seconds"] += time.perf_counter() - started
+        return _Entry(session, self._time(), uses=1)
+
+    def _spill_usage(self) -> tuple:
+        if not os.path.isdir(self.spill_dir):
+            return 0, 0
+        count = size = 0
+        for name in os.listdir(self.spill_dir):
+            if name.endswith(".tmp"):
+                continue
+            count += 1
+            for root, _, files in os.walk(os.path.join(self.spill_dir, name)):
+                size += sum(os.path.getsize(os.path.join(root, file)) for file in files)
+        return count, size
+
+    def _expire_spills(self, now: float) -> None:
+        if not os.path.isdir(self.spill_dir):
+            return
+        for name in os.listdir(self.spill_dir):
+            path = os.path.join(self.spill_dir, name)
+            try:
+                if now - os.path.getmtime(path) > self.spill_ttl:
+                    shutil.rmtree(path, ignore_errors=True)
+                    with self._lock:
+                        self.stats["expired_spills"] += 1
+            except OSError:
+                continue
+
+    def _start_sweeper(self) -> None:
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(target=self._run_sweeper, name="narrative-session-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _run_sweeper(self) -> None:
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                spilled = self.sweep()
+                if spilled:
+                    logger.info(f"Spilled {spilled} idle narrative sessions to disk")
+            except Exception as e:
+                logger.error(f"Error sweeping narrative sessions: {e}")
@@ -1,22 +1,45 @@
 import os
 import re
+import atexit
 import logging
+import threading
 import datetime
 import jinja2
 from typing import Dict, List, Any, Optional, Union
 
+from vault_index import VaultIndex
+from vault_writer import VaultWriter, atomic_write_text
+
+# Categories listed in Index.md, in display order
+INDEX_CATEGORIES = {
+    "Characters": "Characters encountered in the game",
+    "Locations": "Places visited in the game world",
+    "Events": "Notable events that have occurred",
+    "Sessions": "Game sessions and summaries",
+    "Quests": "Active and completed quests",
+    "Items": "Items discovered during gameplay",
+    "Journals": "Character journals and internal thoughts"
+}
+
+def sanitize_filename(name: str) -> str:
+    """Strip characters that are invalid in note file names (spaces are kept)."""
+    return re.sub(r'[\\/*?:"<>|]', "", name)
+
+
 class ObsidianLogger:
     """
     A class for logging game events, characters, locations, etc. to an Obsidian vault.
     Creates and updates markdown files with proper Obsidian-style [[internal links]].
     """
 
-    def __init__(self, vault_path: str = "ai-dnd-test-vault"):
+    def __init__(self, vault_path: str = "ai-dnd-test-vault", index_flush_interval: Optional[float] = None):
         """
         Initialize the Obsidian logger.
 
         Args:
             vault_path: Path to the Obsidian vault
+            index_flush_interval: Minimum seconds between Index.md rewrites
+                (defaults to VAULT_FLUSH_INTERVAL; 0 rewrites on every entity)
         """
         self.vault_path = vault_path
         self.logger = logging.getLogger("obsidian_logger")
@@ -59,6 +82,16 @@ class ObsidianLogger:
         # Create central reference files if they don't exist
         self._create_central_reference_files()
 
+        # In-memory note index (persisted to a sidecar) behind Index.md; the
+        # file itself is rewritten in the background at most once per interval
+        self.index = VaultIndex(vault_path, self.directories)
+        self._reference_files_checked = set()
+        self._touched_reference_files = set()
+        self._reference_lock = threading.Lock()
+        self._index_writer = VaultWriter(self._write_index, interval=index_flush_interval,
+                                         name="obsidian-index-writer")
+        atexit.register(self._index_writer.close)
+
     def _sanitize_filename(self, name: str) -> str:
         """
         Convert a string to a valid filename.
@@ -70,8 +103,7 @@ class ObsidianLogger:
             A sanitized filename
         """
         # Remove invalid characters but preserve spaces
-        sanitized = re.sub(r'[\\/*?:"<>|]', "", name)
-        return sanitized
+        return sanitize_filename(name)
 
     def _create_internal_link(self, text: str, target: Optional[str] = None) -> str:
         """
@@ -88,46 +120,63 @@ class ObsidianLogger:
             return f"[[{target}|{text}]]"
         return f"[[{text}]]"
 
-    def _update_index(self):
-        """Update the main index file of the vault."""
-        index_path = os.path.join(self.vault_path, "Index.md")
+    def _update_index(self, category: Optional[str] = None, note_name: Optional[str] = None):
+        """
+        Record a new note and schedule an Index.md rewrite.
+
+        Args:
+            category: Directory key of the note (characters, events, ...)
+            note_name: File name of the note without the .md extension
+        """
+        if category and note_name:
+            self.index.add_note(category, note_name)
+        self._index_writer.mark_dirty()
+
+    def flush(self, rescan: bool = False):
+        """
+        Write Index.md, the index sidecar and reference timestamps now.
+
+        Args:
+            rescan: Rebuild the index from the vault directories first
+        """
+        if rescan:
+            self.index.rescan()
+        self._index_writer.flush(force=True)
 
+    def close(self):
+        """Flush pending index writes and stop the background writer."""
+        self._index_writer.close()
+
+    def _render_index(self) -> str:
         content = "# AI-DnD Game Index\n\n"
         content += f"Last updated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
 
-        # Add sections for each category
-        categories = {
-            "Characters": "Characters encountered in the game",
-            "Locations": "Places visited in the game world",
-            "Events": "Notable events that have occurred",
-            "Sessions": "Game sessions and summaries",
-            "Quests": "Active and completed quests",
-            "Items": "Items discovered during gameplay",
-            "Journals": "Character journals and internal thoughts"
-        }
-
-        for category, description in categories.items():
+        for category, description in INDEX_CATEGORIES.items():
             content += f"## {category}\n\n"
             content += f"{description}\n\n"
 
-            # Get all files in this category and create links
-            dir_path = self.directories[category.lower()]
-            if os.path.exists(dir_path):
-                files = [f for f in os.listdir(dir_path) if f.endswith('.md')]
-
-                if files:
-                    for file in sorted(files):
-                        # Remove .md extension for the link text
-                        link_text = file[:-3]
-                        content += f"- {self._create_internal_link(link_text)}\n"
-                else:
-                    content += "No entries yet.\n"
+            notes = self.index.list_notes(category.lower())
+            if notes:
+                for note_name in notes:
+                    content += f"- {self._create_internal_link(note_name)}\n"
+            else:
+                content += "No entries yet.\n"
 
             content += "\n"
-
-        with open(index_path, 'w') as f:
-            f.write(content)
-
+        return content
+
+    def _write_index(self):
+        """Rewrite Index.md from the in-memory index and persist the sidecar."""
+        if not os.path.isdir(self.vault_path):
+            return  # vault removed (e.g. temporary test vault) before the final flush
+        # Stamping renames files in the category directories, so do it before
+        # rescanning; the rescan picks up notes written outside the log_*
+        # methods (e.g. JournalManager) and keeps the saved mtimes current
+        self._stamp_reference_files()
+        self.index.rescan_changed()
+        index_path = os.path.join(self.vault_path, "Index.md")
+        atomic_write_text(index_path, self._render_index())
+        self.index.save()
         self.logger.info(f"Updated index file at {index_path}")
 
     def _render_template(self, template_name: str, context: Dict[str, Any]) -> str:
@@ -181,20 +230,62 @@ updated: {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
 This is the central reference file for all {entity_type} in the game. This file is automatically updated when new {entity_type} are created or existing {entity_type} are modified.
 
-## List of {entity_type.capitalize()}
-
-*This section will be automatically populated as {entity_type} are created.*
-
 ## Tags
 #{entity_type} #reference
+
+## List of {entity_type.capitalize()}
+
 """
                 with open(filepath, 'w') as f:
                     f.write(content)
 
+    def _reference_file_path(self, entity_type: str) -> str:
+        return os.path.join(self.directories[entity_type], f"{entity_type.capitalize()}.md")
+
+    def _prepare_reference_file(self, entity_type: str, reference_file: str):
+        """
+        Make sure the entity list is the last section of a reference file so
+        new entries can be appended, and seed the index with its links.
+
+        Done once per reference file per process; older vaults (list followed
+        by a Tags section and a placeholder line) are rewritten once.
+        """
+        with open(reference_file, 'r') as f:
+            content = f.read()
+
+        list_section = f"## List of {entity_type.capitalize()}"
+        placeholder = f"*This section will be automatically populated as {entity_type} are created.*"
+        section_match = re.search(
+            rf"^{re.escape(list_section)}\n(.*?)(?=^## |\Z)", content, re.DOTALL | re.MULTILINE
+        )
+
+        if section_match is None:
+            entries = ""
+            rest = content
+        else:
+            entries = section_match.group(1).replace(placeholder, "").strip("\n")
+            rest = content[:section_match.start()] + content[section_match.end():]
+
+        self.index.add_references(entity_type, re.findall(r"^- \[\[([^\]|]+)", entries, re.MULTILINE))
+
+        if section_match is not None and section_match.end() == len(content) and placeholder not in content:
+            if not content.endswith("\n"):
+                with open(reference_file, 'a') as f:
+                    f.write("\n")
+            return
+
+        new_content = rest.rstrip("\n") + f"\n\n{list_section}\n\n"
+        if entries:
+            new_content += entries + "\n"
+        atomic_write_text(reference_file, new_content)
+
     def _update_central_reference_file(self, entity_type: str, entity_name: str, action: str = "added"):
         """
         Update the central reference file for an entity type when a new entity is created or updated.
 
+        New entities are appended to the end of the file; the "updated"
+        timestamp is refreshed with the next index flush.
+
         Args:
             entity_type: Type of entity (characters, locations, etc.)
             entity_name: Name of the entity
@@ -204,63 +295,49 @@ This is the central reference file for all {entity_type} in the game. This file
             self.logger.warning(f"Unknown entity type: {entity_type}")
             return
 
-        reference_file = os.path.join(self.directories[entity_type], f"{entity_type.capitalize()}.md")
+        reference_file = self._reference_file_path(entity_type)
 
         if not os.path.exists(reference_file):
             self.logger.warning(f"Central reference file for {entity_type} not found, creating it")
             self._create_central_reference_files()
+            self._reference_files_checked.discard(entity_type)
 
         try:
-            # Read current content
-            with open(reference_file, 'r') as f:
-                content = f.read()
-
-            # Update the "updated" timestamp in frontmatter
-            content = re.sub(
-                r"updated: .*",
-                f"updated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                content
-            )
-
-            # Check if entity is already listed
-            entity_link = self._create_internal_link(entity_name)
-            list_section = f"## List of {entity_type.capitalize()}"
-
-            if list_section in content:
-                # Find the section
-                section_pattern = f"{list_section}.*?(?=^#|$)"
-                section_match = re.search(section_pattern, content, re.DOTALL | re.MULTILINE)
+            with self._reference_lock:
+                if entity_type not in self._reference_files_checked:
+                    self._prepare_reference_file(entity_type, reference_file)
+                    self._reference_files_checked.add(entity_type)
 
-                if section_match:
-                    section_content = section_match.group(0)
+                if self.index.has_reference(entity_type, entity_name):
+                    return
 
-                    # Check if entity is already in the list
-                    if entity_link in section_content:
-                        # Entity already exists, nothing to do if just updating the list
-                        pass
-                    else:
-                        # Add entity to the list
-                        new_section_content = section_content.replace(
-                            "*This section will be automatically populated as",
-                            f"- {entity_link} - Added on {datetime.datetime.now().strftime('%Y-%m-%d')}\n*This section will be automatically populated as"
-                        )
-
-                        if new_section_content == section_content:  # No placeholder text found
-                            # Add to the end of the section
-                            new_line = f"\n- {entity_link} - Added on {datetime.datetime.now().strftime('%Y-%m-%d')}"
-                            new_section_content = section_content + new_line
-
-                        content = content.replace(section_content, new_section_content)
-
-            # Write updated content
-            with open(reference_file, 'w') as f:
-                f.write(content)
+                entity_link = self._create_internal_link(entity_name)
+                with open(reference_file, 'a') as f:
+                    f.write(f"- {entity_link} - Added on {datetime.datetime.now().strftime('%Y-%m-%d')}\n")
+                self.index.add_references(entity_type, [entity_name])
+                self._touched_reference_files.add(entity_type)
+            self._index_writer.mark_dirty()
 
             self.logger.info(f"Updated central reference file for {entity_type} with {entity_name}")
 
         except Exception as e:
             self.logger.error(f"Error updating central reference file for {entity_type}: {e}")
 
+    def _stamp_reference_files(self):
+        """Refresh the "updated" frontmatter of reference files changed since the last flush."""
+        now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._reference_lock:
+            touched, self._touched_reference_files = self._touched_reference_files, set()
+            for entity_type in touched:
+                reference_file = self._reference_file_path(entity_type)
+                try:
+                    with open(reference_file, 'r') as f:
+                        content = f.read()
+                    atomic_write_text(reference_file, re.sub(r"^updated: .*$", f"updated: {now}", content,
+                                                             count=1, flags=re.MULTILINE))
+                except OSError as e:
+                    self.logger.error(f"Error stamping central reference file for {entity_type}: {e}")
+
     def log_character(self, character_data: Dict[str, Any]):
         """
         Log a character to the vault.
@@ -298,7 +375,7 @@ This is the central reference file for all {entity_type} in the game. This file
         self.logger.info(f"Logged character: {name} to {file_path}")
 
         # Update index
-        self._update_index()
+        self._update_index("characters", file_name)
 
         # Update the central reference file
         self._update_central_reference_file("characters", character_data["name"], "added")
@@ -357,7 +434,7 @@ This is the central reference file for all {entity_type} in the game. This file
             self.logger.info(f"Logged location: {name} to {file_path}")
 
             # Update index
-            self._update_index()
+            self._update_index("locations", file_name)
 
             # Update the central reference file
             self._update_central_reference_file("locations", location_data["name"], "added")
@@ -413,7 +490,7 @@ This is the central reference file for all {entity_type} in the game. This file
         self.logger.info(f"Logged event: {name} to {file_path}")
 
         # Update index
-        self._update_index()
+        self._update_index("events", file_name)
 
         # Update references in related entities
         if "location" in event_context:
@@ -477,7 +554,7 @@ This is the central reference file for all {entity_type} in the game. This file
         self.logger.info(f"Logged session: {name} to {file_path}")
 
         # Update index
-        self._update_index()
+        self._update_index("sessions", file_name)
 
         # Update the central reference file
         self._update_central_reference_file("sessions", session_data["name"], "added")
@@ -573,7 +650,7 @@ This is the central reference file for all {entity_type} in the game. This file
         self.logger.info(f"Logged quest: {name} to {file_path}")
 
         # Update index
-        self._update_index()
+        self._update_index("quests", file_name)
 
         # Update the central reference file
         self._update_central_reference_file("quests", quest_data["name"], "added")
@@ -623,7 +700,7 @@ This is the central reference file for all {entity_type} in the game. This file
         self.logger.info(f"Logged item: {name} to {file_path}")
 
         # Update index
-        self._update_index()
+        self._update_index("items", file_name)
 
         # Update the central reference file
         self._update_central_reference_file("items", item_data["name"], "added")
@@ -688,7 +765,7 @@ This is the central reference file for all {entity_type} in the game. This file
                 )
 
         # Update index
-        self._update_index()
+        self._update_index("events", file_name)
 
         # Update the central reference file
         self._update_central_reference_file("events", combat_data["name"], "added")
@@ -0,0 +1,196 @@
+"""
+Pooled HTTP client for the local Ollama server.
+
+Keeps a small set of keep-alive connections to the Ollama REST API
+(``POST /api/generate``) so narration calls reuse an already-loaded model
+instead of forking ``ollama run`` for every line of text.
+"""
+
+import http.client
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OLLAMA_HOST = "http://127.0.0.1:11434"
+
+
+class OllamaPoolError(Exception):
+    """Raised when the pooled HTTP backend cannot produce a response."""
+    pass
+
+
+class OllamaTimeoutError(OllamaPoolError):
+    """Raised when the server accepted a request but did not answer in time."""
+    pass
+
+
+def _parse_host(host: str) -> Tuple[str, int]:
+    """Split an ``OLLAMA_HOST`` style value into (hostname, port)."""
+    if "://" not in host:
+        host = f"http://{host}"
+    parts = urlsplit(host)
+    return parts.hostname or "127.0.0.1", parts.port or 11434
+
+
+class OllamaConnectionPool:
+    """Thread-safe pool of persistent HTTP connections to Ollama."""
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        max_connections: int = 4,
+        timeout: float = 60.0,
+        keep_alive: str = "10m",
+        retry_after: float = 30.0,
+    ):
+        self.host = host or os.getenv("OLLAMA_HOST", DEFAULT_OLLAMA_HOST)
+        self.hostname, self.port = _parse_host(self.host)
+        self.max_connections = max(1, int(max_connections))
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.retry_after = retry_after
+
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._lock = threading.Lock()
+        self._unavailable_until = 0.0
+        self.stats = {"requests": 0, "errors": 0, "connections_opened": 0}
+
+    # ------------------------------------------------------------------
+    # Connection management
+    # ------------------------------------------------------------------
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        if not self._slots.acquire(timeout=self.timeout):
+            raise OllamaPoolError("Timed out waiting for a free Ollama connection")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.stats["connections_opened"] += 1
+            return http.client.HTTPConnection(self.hostname, self.port, timeout=self.timeout)
+
+    def _release(self, conn: Optional[http.client.HTTPConnection]) -> None:
+        if conn is not None:
+            self._idle.put(conn)
+        self._slots.release()
+
+    def is_available(self) -> bool:
+        """False while backing off after the server refused connections."""
+        return time.monotonic() >= self._unavailable_until
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def _post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        # A pooled connection may have been closed by the server since its
+        # last use; retry once on a fresh socket before giving up.
+        for attempt in range(2):
+            conn = self._acquire()
+            if conn.sock is None:
+                # Connect separately so only an unreachable server (refused
+                # or connect timeout) triggers the back-off, not a slow reply
+                try:
+                    conn.connect()
+                except OSError as e:
+                    conn.close()
+                    self._release(None)
+                    if isinstance(e, (ConnectionRefusedError, socket.timeout)):
+                        self._unavailable_until = time.monotonic() + self.retry_after
+                    raise OllamaPoolError(f"Could not connect to Ollama: {e}") from e
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                raw = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                self._release(None)
+                stale = isinstance(e, (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError))
+                if stale and attempt == 0:
+                    continue
+                if isinstance(e, socket.timeout):
+                    raise OllamaTimeoutError(f"Ollama did not respond within {self.timeout}s") from e
+                raise OllamaPoolError(f"Ollama request failed: {e}") from e
+
+            if response.will_close:
+                conn.close()
+                self._release(None)
+            else:
+                self._release(conn)
+
+            if response.status != 200:
+                raise OllamaPoolError(f"Ollama returned HTTP {response.status}: {raw[:200]!r}")
+            try:
+                return json.loads(raw)
+            except ValueError as e:
+                raise OllamaPoolError(f"Invalid JSON from Ollama: {e}") from e
+
+        raise OllamaPoolError("Ollama request failed")
+
+    def generate(self, model: str, prompt: str, system: Optional[str] = None,
+                 options: Optional[Dict[str, Any]] = None) -> str:
+        """Run a non-streaming completion and return the response text."""
+        if not self.is_available():
+            raise OllamaPoolError("Ollama HTTP backend is backing off after a failure")
+
+        payload: Dict[str, Any] = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+        }
+        if system:
+            payload["system"] = system
+        if options:
+            payload["options"] = options
+
+        with self._lock:
+            self.stats["requests"] += 1
+        try:
+            data = self._post_json("/api/generate", payload)
+        except OllamaPoolError:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        return str(data.get("response", "")).strip()
+
+
+_default_pools: Dict[str, OllamaConnectionPool] = {}
+_default_pools_lock = threading.Lock()
+
+
+def get_default_pool(host: Optional[str] = None) -> OllamaConnectionPool:
+    """Return the process-wide pool for ``host`` (shared by all engines)."""
+    host = host or os.getenv("OLLAMA_HOST", DEFAULT_OLLAMA_HOST)
+    with _default_pools_lock:
+        pool = _default_pools.get(host)
+        if pool is None:
+            pool = OllamaConnectionPool(
+                host=host,
+                max_connections=int(os.getenv("OLLAMA_POOL_SIZE", "4")),
+                timeout=float(os.getenv("OLLAMA_TIMEOUT", "60")),
+                keep_alive=os.getenv("OLLAMA_KEEP_ALIVE", "10m"),
+            )
+            _default_pools[host] = pool
+        return pool
@@ -10,6 +10,7 @@ import argparse
 from dnd_game import DnDGame, GameError, Character
 from obsidian_logger import ObsidianLogger
 from game_event_manager import GameEventManager
+from vault_writer import atomic_write_text
 from save_state import save_game_to_file, load_game_from_file, list_save_files
 
 # Configure logging
@@ -151,8 +152,7 @@ Current Turn: {run_data.get('turn_count', 0)}
 
     # Write the updated file
     current_run_path = os.path.join(obsidian.vault_path, "Current Run.md")
-    with open(current_run_path, 'w') as f:
-        f.write(content)
+    atomic_write_text(current_run_path, content)
 
     # Log at debug level instead of info to reduce noise during frequent updates
     logging.debug(f"Updated Current Run.md (Run ID: {run_id}, Turn: {run_data.get('turn_count', 0)})")
@@ -306,7 +306,10 @@ def run_game(resume_from: str = None, save_file: str = "saves/game_autosave.json
             run_data["session"] = obs_data["session"]
 
     # Initialize the event manager for real-time updates
-    event_manager = GameEventManager(obsidian, run_data)
+    event_manager = GameEventManager(
+        obsidian, run_data,
+        current_run_updater=lambda: update_current_run(obsidian, run_data)
+    )
     logging.info("Initialized event manager for real-time updates.")
 
     # Update the Current Run.md file immediately with the valid run_id
@@ -650,7 +653,7 @@ def run_game(resume_from: str = None, save_file: str = "saves/game_autosave.json
                 run_data["combat"].append(combat_name)
 
             # Update Current Run.md and Dashboard
-            update_current_run(obsidian, run_data)
+            event_manager.flush(force=True)
             update_dashboard(obsidian, run_data)
 
             # AUTOSAVE after each turn
@@ -719,6 +722,9 @@ def run_game(resume_from: str = None, save_file: str = "saves/game_autosave.json
         run_data["status"] = "error"
         run_data["conclusion"] = f"The adventure ended unexpectedly due to an error: {e}"
         update_current_run(obsidian, run_data)
+    finally:
+        event_manager.close()
+        obsidian.close()
 
     logging.info("\nGame completed. Check your Obsidian vault for the adventure log.")
     return True
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Narration latency benchmark: pooled Ollama HTTP vs. ``ollama run`` subprocess.
+
+Starts a local stub of the Ollama ``/api/generate`` endpoint and a fake
+``ollama`` CLI that forwards to it (after a simulated model load), then
+times ``DnDGame.play_turn`` with each NarrativeEngine backend.
+
+Example:
+    python3 scripts/benchmark_ollama_pool.py --turns 50 --load-delay 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import stat
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.app.core.providers import InstantTimeProvider  # noqa: E402
+from dnd_game import DnDGame  # noqa: E402
+from narrative_engine import NarrativeEngine  # noqa: E402
+from ollama_pool import OllamaConnectionPool  # noqa: E402
+
+FAKE_CLI = """#!{python}
+import json, sys, time, urllib.request
+time.sleep({load_delay})
+body = json.dumps({{"model": sys.argv[2], "prompt": sys.argv[3], "stream": False}}).encode()
+req = urllib.request.Request("{url}/api/generate", data=body, headers={{"Content-Type": "application/json"}})
+print(json.loads(urllib.request.urlopen(req).read())["response"])
+"""
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer headers and body into one segment, as a real server would,
+    # so Nagle/delayed-ACK stalls do not dominate the measurement.
+    wbufsize = 64 * 1024
+    gen_delay = 0.005
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.gen_delay)
+        body = json.dumps({"model": payload.get("model"), "response": "Steel rings out.", "done": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class NullLogProvider:
+    def log(self, level, message, extra=None):
+        pass
+
+
+def time_turns(engine: NarrativeEngine, turns: int) -> list:
+    samples = []
+    for _ in range(turns):
+        game = DnDGame(time_provider=InstantTimeProvider(), log_provider=NullLogProvider())
+        game.narrative_engine = engine
+        start = time.perf_counter()
+        game.play_turn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: list) -> float:
+    p50 = statistics.median(samples)
+    p95 = sorted(samples)[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{label:<12} p50={p50 * 1000:8.1f} ms   p95={p95 * 1000:8.1f} ms   n={len(samples)}")
+    return p50
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--gen-delay", type=float, default=0.005, help="stub generation time per request (s)")
+    parser.add_argument("--load-delay", type=float, default=0.2, help="simulated model load per CLI call (s)")
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    StubOllamaHandler.gen_delay = args.gen_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cli = Path(tmp) / "ollama"
+        cli.write_text(FAKE_CLI.format(python=sys.executable, load_delay=args.load_delay, url=url))
+        cli.chmod(cli.stat().st_mode | stat.S_IEXEC)
+
+        pool = OllamaConnectionPool(host=url, max_connections=args.pool_size, timeout=10)
+        pooled = NarrativeEngine(pool=pool)
+        subproc = NarrativeEngine(use_http=False, ollama_command=str(cli))
+
+        print(f"Stub Ollama at {url} (gen {args.gen_delay * 1000:.0f} ms, CLI load {args.load_delay * 1000:.0f} ms)")
+        http_p50 = report("http-pool", time_turns(pooled, args.turns))
+        cli_p50 = report("subprocess", time_turns(subproc, args.turns))
+        print(f"speedup      {cli_p50 / http_p50:8.1f}x  (connections opened: {pool.stats['connections_opened']})")
+
+        pool.close()
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
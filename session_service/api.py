@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from .manager import SessionManager
 from .schemas import AdvanceRequest, CreateSessionRequest, SessionPayload
@@ -28,9 +29,9 @@ def create_session(request: CreateSessionRequest) -> SessionPayload:
 
 
 @app.get("/sessions/{session_id}", response_model=SessionPayload)
-def get_session(session_id: str) -> SessionPayload:
+def get_session(session_id: str, since: int | None = Query(default=None, ge=0)) -> SessionPayload:
     try:
-        return manager.get_session(session_id)
+        return manager.get_session(session_id, since=since)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail="Session not found") from exc
 
@@ -38,12 +39,30 @@ def get_session(session_id: str) -> SessionPayload:
 @app.post("/sessions/{session_id}/advance", response_model=SessionPayload)
 def advance_session(session_id: str, request: AdvanceRequest | None = None) -> SessionPayload:
     steps = request.steps if request else 1
+    since = request.since if request else None
     try:
-        return manager.advance_session(session_id, steps=steps)
+        return manager.advance_session(session_id, steps=steps, since=since)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail="Session not found") from exc
 
 
+@app.get("/sessions/{session_id}/stream")
+def stream_session(
+    session_id: str,
+    since: int = Query(default=0, ge=0),
+    interval: float = Query(default=0.0, ge=0.0, le=10.0),
+) -> StreamingResponse:
+    """NDJSON stream of SessionPayload deltas, one line per newly revealed frame batch."""
+    try:
+        deltas = manager.stream_session(session_id, since=since, interval=interval)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail="Session not found") from exc
+    return StreamingResponse(
+        (payload.model_dump_json() + "\n" for payload in deltas),
+        media_type="application/x-ndjson",
+    )
+
+
 @app.get("/sessions", response_model=list[str])
 def list_sessions() -> list[str]:
     return manager.active_session_ids()
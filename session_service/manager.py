@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import threading
+import time
 import uuid
-from dataclasses import dataclass
-from typing import Dict, Iterable, List
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List
 
-from examples.simple_demo.showcase_engine import ShowcaseResult, ShowcaseSimulator
+from examples.simple_demo.showcase_engine import EVENT_HISTORY_LIMIT, ShowcaseResult, ShowcaseSimulator, TurnFrame
 
 from .schemas import SessionPayload, TurnFrameModel
 
@@ -19,58 +20,92 @@ class LiveSession:
     session_id: str
     result: ShowcaseResult
     cursor: int = 0
+    # Frame models are built once, when first revealed, in full and delta form
+    _frames: List[TurnFrameModel] = field(default_factory=list, init=False, repr=False)
+    _delta_frames: List[TurnFrameModel] = field(default_factory=list, init=False, repr=False)
+    _changed: threading.Condition = field(default_factory=threading.Condition, init=False, repr=False)
 
-    def advance(self, steps: int = 1) -> SessionPayload:
-        """Advance the internal pointer and return the updated payload."""
+    def advance(self, steps: int = 1, *, since: int | None = None) -> SessionPayload:
+        """Advance the internal pointer and return the updated payload (a delta when ``since`` is set)."""
 
-        if self.cursor < len(self.result.frames) - 1:
-            self.cursor = min(self.cursor + steps, len(self.result.frames) - 1)
-        return self.payload
+        with self._changed:
+            if self.cursor < len(self.result.frames) - 1:
+                self.cursor = min(self.cursor + steps, len(self.result.frames) - 1)
+                self._changed.notify_all()
+            return self.payload_since(since)
 
     @property
     def payload(self) -> SessionPayload:
-        frames = list(self._visible_frames)
-        is_complete = bool(frames and frames[-1].is_final)
-        conclusion = self.result.conclusion if is_complete else None
-        return SessionPayload(
-            session_id=self.session_id,
-            quest_hook=self.result.quest_hook,
-            frames=frames,
-            conclusion=conclusion,
-            is_complete=is_complete,
-            turn_index=self.cursor,
-        )
+        return self.payload_since(None)
 
     @property
-    def _visible_frames(self) -> Iterable[TurnFrameModel]:
-        for frame in self.result.frames[: self.cursor + 1]:
-            yield TurnFrameModel(
-                turn=frame.turn,
-                players=[
-                    {
-                        "name": character.name,
-                        "char_class": character.char_class,
-                        "hp": character.hp,
-                        "max_hp": character.max_hp,
-                        "alive": character.alive,
-                    }
-                    for character in frame.players
-                ],
-                enemies=[
-                    {
-                        "name": character.name,
-                        "char_class": character.char_class,
-                        "hp": character.hp,
-                        "max_hp": character.max_hp,
-                        "alive": character.alive,
-                    }
-                    for character in frame.enemies
-                ],
-                new_events=list(frame.new_events),
-                cumulative_events=list(frame.cumulative_events),
-                is_final=frame.is_final,
+    def is_complete(self) -> bool:
+        return bool(self.result.frames) and self.result.frames[self.cursor].is_final
+
+    def payload_since(self, since: int | None) -> SessionPayload:
+        """Every visible frame, or only those from index ``since`` on without cumulative events."""
+
+        with self._changed:
+            visible = self.cursor + 1 if self.result.frames else 0
+            self._reveal(visible)
+            if since is None:
+                offset, frames, window = 0, self._frames[:visible], None
+            else:
+                offset = min(since, visible)
+                frames, window = self._delta_frames[offset:visible], EVENT_HISTORY_LIMIT
+            is_complete = self.is_complete
+            return SessionPayload(
+                session_id=self.session_id,
+                quest_hook=self.result.quest_hook,
+                frames=frames,
+                conclusion=self.result.conclusion if is_complete else None,
+                is_complete=is_complete,
+                turn_index=self.cursor,
+                frame_offset=offset,
+                event_window=window,
             )
 
+    def wait_for_frames(self, since: int, timeout: float) -> bool:
+        """Block until more than ``since`` frames are visible or the session is complete."""
+
+        with self._changed:
+            return self._changed.wait_for(lambda: self.cursor + 1 > since or self.is_complete, timeout)
+
+    def _reveal(self, visible: int) -> None:
+        while len(self._frames) < visible:
+            model = _frame_model(self.result.frames[len(self._frames)])
+            self._frames.append(model)
+            self._delta_frames.append(model.model_copy(update={"cumulative_events": []}))
+
+
+def _frame_model(frame: TurnFrame) -> TurnFrameModel:
+    return TurnFrameModel(
+        turn=frame.turn,
+        players=[
+            {
+                "name": character.name,
+                "char_class": character.char_class,
+                "hp": character.hp,
+                "max_hp": character.max_hp,
+                "alive": character.alive,
+            }
+            for character in frame.players
+        ],
+        enemies=[
+            {
+                "name": character.name,
+                "char_class": character.char_class,
+                "hp": character.hp,
+                "max_hp": character.max_hp,
+                "alive": character.alive,
+            }
+            for character in frame.enemies
+        ],
+        new_events=list(frame.new_events),
+        cumulative_events=list(frame.cumulative_events),
+        is_final=frame.is_final,
+    )
+
 
 class SessionManager:
     """Thread-safe registry for active sessions."""
@@ -92,21 +127,55 @@ class SessionManager:
 
         return live_session.payload
 
-    def get_session(self, session_id: str) -> SessionPayload:
-        with self._lock:
-            session = self._sessions.get(session_id)
-        if not session:
-            raise KeyError(session_id)
-        return session.payload
-
-    def advance_session(self, session_id: str, *, steps: int = 1) -> SessionPayload:
-        with self._lock:
-            session = self._sessions.get(session_id)
-            if not session:
-                raise KeyError(session_id)
-            payload = session.advance(steps=steps)
-        return payload
+    def get_session(self, session_id: str, *, since: int | None = None) -> SessionPayload:
+        return self._require(session_id).payload_since(since)
+
+    def advance_session(self, session_id: str, *, steps: int = 1, since: int | None = None) -> SessionPayload:
+        return self._require(session_id).advance(steps=steps, since=since)
+
+    def stream_session(
+        self,
+        session_id: str,
+        *,
+        since: int = 0,
+        interval: float = 0.0,
+        heartbeat: float = 15.0,
+    ) -> Iterator[SessionPayload]:
+        """
+        Deltas for a session as frames are revealed: first everything after
+        ``since``, then one delta per change until the session completes.
+
+        With ``interval`` the stream advances the session itself every
+        ``interval`` seconds; otherwise it follows advances made through
+        ``advance_session``, sending an empty delta every ``heartbeat``
+        seconds while nothing happens.
+        """
+
+        session = self._require(session_id)
+
+        def deltas() -> Iterator[SessionPayload]:
+            cursor = since
+            while True:
+                payload = session.payload_since(cursor)
+                cursor = payload.frame_offset + len(payload.frames)
+                yield payload
+                if payload.is_complete:
+                    return
+                if interval > 0:
+                    time.sleep(interval)
+                    session.advance()
+                else:
+                    session.wait_for_frames(cursor, heartbeat)
+
+        return deltas()
 
     def active_session_ids(self) -> List[str]:
         with self._lock:
             return list(self._sessions.keys())
+
+    def _require(self, session_id: str) -> LiveSession:
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if not session:
+            raise KeyError(session_id)
+        return session
@@ -29,7 +29,13 @@ class TurnFrameModel(BaseModel):
 
 
 class SessionPayload(BaseModel):
-    """Envelope returned to the front end when requesting session state."""
+    """Envelope returned to the front end when requesting session state.
+
+    Requests that pass a ``since`` cursor get a delta: ``frames`` holds only
+    the frames from index ``frame_offset`` on, without ``cumulative_events``.
+    Clients rebuild those as the previous frame's cumulative events plus
+    the new frame's ``new_events``, keeping the last ``event_window``.
+    """
 
     session_id: str
     quest_hook: str
@@ -37,6 +43,8 @@ class SessionPayload(BaseModel):
     conclusion: Optional[str] = None
     is_complete: bool = False
     turn_index: int = 0
+    frame_offset: int = 0
+    event_window: Optional[int] = None
 
 
 class CreateSessionRequest(BaseModel):
@@ -51,3 +59,6 @@ class AdvanceRequest(BaseModel):
     """Optional payload for the advance endpoint."""
 
     steps: int = Field(default=1, ge=1, le=5)
+    since: Optional[int] = Field(
+        default=None, ge=0, description="Number of frames the client already holds; returns a delta when set"
+    )
@@ -0,0 +1,82 @@
+import math
+import random
+import statistics
+import unittest
+
+try:
+    import numpy as np
+    from combat_montecarlo import roll_loot_tables, simulate_matchup
+except ImportError:  # numpy is optional for the rest of the game
+    np = None
+
+from combat_simulator import run_simulation
+from items import LOOT_TABLES
+
+MATCHUPS = [
+    (("Fighter", "Wizard"), ("Goblin", "Orc")),
+    (("Cleric", "Rogue"), ("Skeleton", "Bandit")),
+]
+
+
+def _within(a, b, sigma, n_a, n_b, k=4.5):
+    """True if two sample means differ by less than k standard errors."""
+    return abs(a - b) <= k * sigma * math.sqrt(1 / n_a + 1 / n_b) + 1e-9
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestMonteCarloAgreesWithScalar(unittest.TestCase):
+    """The vectorized engine must agree statistically with DnDGame's rules"""
+
+    VECTOR_BATTLES = 20000
+    SCALAR_BATTLES = 3000
+
+    def test_matchup_statistics_agree(self):
+        for matchup in MATCHUPS:
+            with self.subTest(matchup=matchup):
+                vector = simulate_matchup(*matchup, self.VECTOR_BATTLES, seed=11).to_dict()
+                scalar = run_simulation([matchup], self.SCALAR_BATTLES, workers=1, seed=11)[matchup].to_dict()
+
+                for key in ("player_win_rate", "enemy_win_rate"):
+                    p = scalar[key]
+                    sigma = math.sqrt(max(p * (1 - p), 1e-4))
+                    self.assertTrue(
+                        _within(vector[key], p, sigma, self.VECTOR_BATTLES, self.SCALAR_BATTLES),
+                        f"{key}: vectorized {vector[key]} vs scalar {p}",
+                    )
+
+                # Turn counts and gold are loosely bounded by their spread;
+                # use a generous sigma estimate from the scalar mean.
+                for key in ("avg_turns", "avg_gold_looted"):
+                    sigma = max(scalar[key], 1.0)
+                    self.assertTrue(
+                        _within(vector[key], scalar[key], sigma, self.VECTOR_BATTLES, self.SCALAR_BATTLES),
+                        f"{key}: vectorized {vector[key]} vs scalar {scalar[key]}",
+                    )
+
+                self.assertEqual(set(vector["damage"]), set(scalar["damage"]))
+                for char_class, summary in scalar["damage"].items():
+                    self.assertAlmostEqual(vector["damage"][char_class]["mean"], summary["mean"], delta=0.5)
+
+    def test_loot_rolls_agree(self):
+        rng = np.random.default_rng(5)
+        random.seed(5)
+        for table_name in ("goblin", "orc", "skeleton", "bandit"):
+            with self.subTest(table=table_name):
+                vector = roll_loot_tables(table_name, 20000, rng)
+                scalar = [LOOT_TABLES[table_name].roll() for _ in range(4000)]
+                for item_id, drops in vector.items():
+                    scalar_values = [roll.get(item_id, 0) for roll in scalar]
+                    sigma = max(statistics.pstdev(scalar_values), 0.05)
+                    self.assertTrue(
+                        _within(float(drops.mean()), statistics.fmean(scalar_values), sigma, 20000, 4000),
+                        f"{table_name}/{item_id}",
+                    )
+
+    def test_seed_is_reproducible(self):
+        first = simulate_matchup(*MATCHUPS[0], 500, seed=3).to_dict()
+        second = simulate_matchup(*MATCHUPS[0], 500, seed=3).to_dict()
+        self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from combat_simulator import MatchupStats, all_matchups, run_simulation, simulate_battle
+
+MATCHUP = (("Fighter", "Cleric"), ("Orc", "Goblin"))
+
+
+class TestCombatSimulator(unittest.TestCase):
+    def test_battle_is_reproducible(self):
+        """The same seed replays the same battle"""
+        first = simulate_battle(*MATCHUP, seed=42)
+        second = simulate_battle(*MATCHUP, seed=42)
+        self.assertEqual(first, second)
+        self.assertIn(first.winner, ("players", "enemies", "draw"))
+        self.assertGreater(first.turns, 0)
+
+    def test_report_rates_sum_to_one(self):
+        """Win, loss and draw rates cover every battle"""
+        stats = run_simulation([MATCHUP], 50, workers=1, seed=3)[MATCHUP]
+        report = stats.to_dict()
+        self.assertEqual(report["battles"], 50)
+        self.assertAlmostEqual(
+            report["player_win_rate"] + report["enemy_win_rate"] + report["draw_rate"], 1.0, places=3
+        )
+        self.assertTrue(report["damage"])
+
+    def test_process_pool_matches_inline(self):
+        """Splitting work across processes doesn't change the results"""
+        inline = run_simulation([MATCHUP], 40, workers=1, seed=7, chunk_size=10)[MATCHUP]
+        pooled = run_simulation([MATCHUP], 40, workers=2, seed=7, chunk_size=10)[MATCHUP]
+        self.assertEqual(inline.to_dict(), pooled.to_dict())
+
+    def test_all_matchups(self):
+        """2v2 compositions with replacement: 10 parties x 10 enemy teams"""
+        self.assertEqual(len(all_matchups()), 100)
+
+    def test_merge(self):
+        """Merged stats add up counts and histograms"""
+        a = MatchupStats()
+        a.add(simulate_battle(*MATCHUP, seed=1))
+        b = MatchupStats()
+        b.add(simulate_battle(*MATCHUP, seed=2))
+        a.merge(b)
+        self.assertEqual(a.battles, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,12 @@
+import asyncio
+import random
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 import logging
-from dnd_game import Character, DnDGame, GameError
+from dnd_game import Character, CompactCharacter, DnDGame, GameError
+from narrative_engine import format_turn_action
+from backend.app.core.providers import InstantTimeProvider, SequencedLogProvider
 
 # Configure logging for tests
 logging.basicConfig(level=logging.INFO)
@@ -927,6 +932,206 @@ class TestErrorRecovery(unittest.TestCase):
                 # Verify error was logged
                 self.assertTrue(any("Test error" in msg for msg in log.output))
 
+class TestBatchNarration(unittest.TestCase):
+    """Test one-call-per-turn narration"""
+
+    def setUp(self):
+        self.game = DnDGame(batch_narration=True)
+        self.game.narrative_engine = MagicMock()
+
+    def test_turn_uses_single_batched_call(self):
+        """A batched turn narrates every action in one engine call"""
+        def narrate(actions):
+            return [f"line {i}" for i in range(len(actions))]
+
+        self.game.narrative_engine.narrate_actions.side_effect = narrate
+        with patch.object(self.game, '_log') as mock_log:
+            self.game.play_turn()
+
+        self.game.narrative_engine.narrate_actions.assert_called_once()
+        self.game.narrative_engine.describe_combat.assert_not_called()
+        self.game.narrative_engine.describe_scene.assert_not_called()
+        actions = self.game.narrative_engine.narrate_actions.call_args[0][0]
+        self.assertEqual(actions[0]["type"], "scene")
+        logged = [c.args[0] for c in mock_log.call_args_list]
+        self.assertEqual([m for m in logged if m.startswith("line ")],
+                         [f"line {i}" for i in range(len(actions))])
+
+    def test_unparseable_batch_falls_back(self):
+        """A reply that can't be split falls back to per-action calls"""
+        self.game.narrative_engine.narrate_actions.return_value = None
+        self.game.narrative_engine.describe_scene.return_value = "scene"
+        self.game.play_turn()
+        self.game.narrative_engine.describe_scene.assert_called_once()
+
+    def test_parse_numbered_narration(self):
+        """Numbered replies split in order and reject missing lines"""
+        from narrative_engine import parse_numbered_narration
+        self.assertEqual(parse_numbered_narration("1. a\n2) b\n", 2), ["a", "b"])
+        self.assertIsNone(parse_numbered_narration("1. a\n3. c", 2))
+        self.assertIsNone(parse_numbered_narration("no numbers", 1))
+
+class TestAsyncPipeline(unittest.TestCase):
+    """Test the pipelined run_game_async runner"""
+
+    class _SlowEngine:
+        def __init__(self, seed):
+            self._delays = random.Random(seed)
+
+        def _wait(self):
+            time.sleep(self._delays.random() * 0.01)
+
+        def narrate_actions(self, actions):
+            self._wait()
+            return [format_turn_action(a) for a in actions]
+
+        def generate_quest(self):
+            self._wait()
+            return "QUEST"
+
+        def generate_random_encounter(self, party_level, environment):
+            self._wait()
+            return "ENCOUNTER"
+
+        def handle_player_action(self, name, action, context):
+            return f"END {action}"
+
+    class _ListLogProvider:
+        def __init__(self):
+            self.messages = []
+
+        def log(self, level, message, extra=None):
+            self.messages.append(message)
+
+    def _run(self, delay_seed):
+        random.seed(1234)
+        logs = self._ListLogProvider()
+        game = DnDGame(time_provider=InstantTimeProvider(), log_provider=logs)
+        game.narrative_engine = self._SlowEngine(delay_seed)
+        asyncio.run(game.run_game_async(max_turns=20))
+        self.assertTrue(game.is_game_over() or game.scene_counter == 20)
+        return logs.messages
+
+    def test_log_order_is_deterministic(self):
+        """Output order doesn't depend on how long narration takes"""
+        first = self._run(delay_seed=1)
+        second = self._run(delay_seed=2)
+        self.assertEqual(first, second)
+        self.assertEqual(first[first.index("\nYour Quest:") + 1], "QUEST")
+        self.assertTrue(first[-1].startswith("END "))
+
+    def test_sequenced_provider_orders_output(self):
+        """Sequences completed out of order are released in order"""
+        logs = self._ListLogProvider()
+        output = SequencedLogProvider(logs)
+        output.emit(1, logging.INFO, "b")
+        output.emit(0, logging.INFO, "a")
+        output.complete(1)
+        self.assertEqual(logs.messages, [])
+        output.complete(0)
+        self.assertEqual(logs.messages, ["a", "b"])
+
+    def test_failed_turn_cancels_narration_and_flushes(self):
+        """A turn that raises cancels pending narration and releases buffered lines"""
+        random.seed(1234)
+        logs = self._ListLogProvider()
+        game = DnDGame(time_provider=InstantTimeProvider(), log_provider=logs)
+        game.narrative_engine = self._SlowEngine(1)
+        resolve_turn = game._resolve_turn
+        turns = []
+
+        def failing_resolve(actions, pace=True):
+            turns.append(len(turns))
+            if len(turns) == 3:
+                game._log("before failure")
+                raise GameError("turn failed")
+            resolve_turn(actions, pace=pace)
+
+        game._resolve_turn = failing_resolve
+
+        async def scenario():
+            with self.assertRaises(GameError):
+                await game.run_game_async(max_turns=20)
+            return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+        self.assertEqual(asyncio.run(scenario()), [])
+        self.assertIs(game.log_provider, logs)
+        self.assertIn("QUEST", logs.messages)
+        self.assertEqual(logs.messages[-1], "before failure")
+
+    def test_sequenced_provider_drain(self):
+        """drain releases buffered sequences in order, even past a gap"""
+        logs = self._ListLogProvider()
+        output = SequencedLogProvider(logs)
+        output.emit(2, logging.INFO, "c")
+        output.complete(2)
+        output.emit(1, logging.INFO, "b")
+        output.emit(0, logging.INFO, "a")
+        output.complete(0)
+        self.assertEqual(logs.messages, ["a"])
+        output.drain()
+        self.assertEqual(logs.messages, ["a", "b", "c"])
+
+class TestCompactCharacter(unittest.TestCase):
+    """Test the slotted CompactCharacter representation"""
+
+    def test_no_instance_dict(self):
+        """Compact characters are fully slotted"""
+        char = CompactCharacter("Hero", "Fighter")
+        self.assertFalse(hasattr(char, "__dict__"))
+        with self.assertRaises(AttributeError):
+            char.nickname = "Bob"
+
+    def test_matches_character(self):
+        """Serialized state matches a regular Character"""
+        for char_class in ["Fighter", "Wizard", "Rogue", "Cleric", "Goblin", "Orc", "Skeleton", "Bandit"]:
+            random.seed(1)
+            regular = Character("X", char_class, hp=30, max_hp=30, attack=10, defense=3)
+            random.seed(1)
+            compact = CompactCharacter("X", char_class, hp=30, max_hp=30, attack=10, defense=3)
+            self.assertEqual(compact.to_dict(), regular.to_dict())
+            self.assertEqual(compact.to_db_dict("c1", "s1"), regular.to_db_dict("c1", "s1"))
+            self.assertEqual(list(compact.abilities), list(regular.abilities))
+
+    def test_invalid_class(self):
+        """Unknown classes are rejected"""
+        with self.assertRaises(GameError):
+            CompactCharacter("X", "Bard")
+
+    def test_shared_templates_not_mutated(self):
+        """Serialized ability scores are copies of the class template"""
+        a = CompactCharacter("A", "Wizard")
+        a.to_dict()["ability_scores"]["INT"] = 1
+        self.assertEqual(CompactCharacter("B", "Wizard").ability_scores["INT"], 16)
+
+    def test_lazy_inventory(self):
+        """Starting equipment is created on first access"""
+        char = CompactCharacter("Hero", "Fighter")
+        self.assertIsNone(char._inventory)
+        self.assertGreater(len(char.inventory.items), 0)
+        self.assertIs(char.inventory, char.inventory)
+
+    def test_from_db_dict_round_trip(self):
+        """to_db_dict/from_db_dict preserve state"""
+        char = CompactCharacter("Hero", "Rogue", hp=12, max_hp=30, attack=8, defense=2, character_id="c1")
+        char.team = "players"
+        char.inventory.gold = 77
+        data = char.to_db_dict("c1", "s1")
+        restored = CompactCharacter.from_db_dict(data)
+        self.assertIsInstance(restored, CompactCharacter)
+        self.assertEqual((restored.hp, restored.team, restored.inventory.gold), (12, "players", 77))
+        self.assertEqual(restored.skill_proficiencies, data["skill_proficiencies"])
+
+    def test_game_with_compact_characters(self):
+        """DnDGame can run turns with compact characters"""
+        game = DnDGame(compact_characters=True, time_provider=InstantTimeProvider())
+        game.narrative_engine = MagicMock()
+        self.assertTrue(all(isinstance(c, CompactCharacter) for c in game.players + game.enemies))
+        for _ in range(5):
+            if game.is_game_over():
+                break
+            game.play_turn()
+
 def run_extended_test_suite():
     """Run all tests including the new test classes"""
     loader = unittest.TestLoader()
@@ -938,6 +1143,9 @@ def run_extended_test_suite():
     suite.addTests(loader.loadTestsFromTestCase(TestTeamComposition))
     suite.addTests(loader.loadTestsFromTestCase(TestGameFlow))
     suite.addTests(loader.loadTestsFromTestCase(TestErrorRecovery))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchNarration))
+    suite.addTests(loader.loadTestsFromTestCase(TestAsyncPipeline))
+    suite.addTests(loader.loadTestsFromTestCase(TestCompactCharacter))
 
     runner = unittest.TextTestRunner()
     result = runner.run(suite)
@@ -0,0 +1,118 @@
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from image_client import (
+    NANO_BANANA, PIXELLAB, ImageClient, ImageGenerationError, ImageRequest, Upstream, image_plan
+)
+
+
+class FakeUpstreams:
+    """httpx transport standing in for the PixelLab bridge and Nano Banana"""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_paths = set()
+        self.slow_first = 0.0
+
+    async def __call__(self, request):
+        self.calls.append(request.url.path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay = self.delay
+            if self.slow_first and len(self.calls) == 1:
+                delay = self.slow_first
+            await asyncio.sleep(delay)
+            if request.url.path in self.fail_paths:
+                return httpx.Response(500, json={"success": False})
+            return httpx.Response(200, json={"success": True, "image": f"img{len(self.calls)}"})
+        finally:
+            self.in_flight -= 1
+
+
+class TestImageClient(unittest.TestCase):
+    def make_client(self, fake, concurrency=4, hedge_after=0.0, **kwargs):
+        client = ImageClient(
+            [Upstream(PIXELLAB, "http://pixellab", concurrency, 5, hedge_after),
+             Upstream(NANO_BANANA, "http://nano", concurrency, 5, hedge_after)],
+            transport=httpx.MockTransport(fake),
+            **kwargs
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def test_plan_matches_scene_type(self):
+        self.assertEqual([p[:2] for p in image_plan(ImageRequest("combat", "x", "square"))],
+                         [(NANO_BANANA, "/generate-scene"), (PIXELLAB, "/generate-sprite")])
+        self.assertEqual([p[:2] for p in image_plan(ImageRequest("exploration", "x", "landscape"))],
+                         [(NANO_BANANA, "/generate")])
+        self.assertEqual(image_plan(ImageRequest("introduction", "x"))[0][2]["width"], 128)
+
+    def test_fan_out_takes_about_the_slowest(self):
+        """Four images finish in roughly the time of one"""
+        fake = FakeUpstreams(delay=0.3)
+        client = self.make_client(fake)
+        started = time.perf_counter()
+        results = client.generate_images(
+            [ImageRequest("exploration", f"scene {n}", "landscape") for n in range(4)]
+        )
+        elapsed = time.perf_counter() - started
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertLess(elapsed, 0.9)
+        self.assertEqual(fake.max_in_flight, 4)
+
+    def test_concurrency_limit_per_upstream(self):
+        fake = FakeUpstreams(delay=0.05)
+        client = self.make_client(fake, concurrency=2)
+        client.generate_images([ImageRequest("exploration", f"scene {n}", "landscape") for n in range(6)])
+        self.assertEqual(fake.max_in_flight, 2)
+
+    def test_cache_and_shared_in_flight(self):
+        """Identical requests share one upstream call, later ones hit the cache"""
+        fake = FakeUpstreams(delay=0.1)
+        client = self.make_client(fake)
+        same = ImageRequest("exploration", "the tavern", "landscape")
+        results = client.generate_images([same, same])
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual(results[0]["image"], results[1]["image"])
+        again = client.generate_image(same)
+        self.assertTrue(again["cached"])
+        self.assertEqual(len(fake.calls), 1)
+        client.generate_image(ImageRequest("exploration", "the tavern", "square", 64, 64))
+        self.assertEqual(len(fake.calls), 2)
+
+    def test_falls_back_to_next_upstream(self):
+        fake = FakeUpstreams(delay=0)
+        fake.fail_paths.add("/generate-scene")
+        client = self.make_client(fake)
+        result = client.generate_image(ImageRequest("combat", "orcs", "square"))
+        self.assertEqual((result["upstream"], result["image_type"]), (PIXELLAB, "sprite"))
+
+    def test_all_upstreams_failing_raises(self):
+        fake = FakeUpstreams(delay=0)
+        fake.fail_paths.update({"/generate-scene", "/generate-sprite"})
+        client = self.make_client(fake)
+        with self.assertRaises(ImageGenerationError):
+            client.generate_image(ImageRequest("combat", "orcs", "square"))
+        results = client.generate_images([ImageRequest("combat", "orcs", "square")])
+        self.assertFalse(results[0]["success"])
+
+    def test_slow_request_is_hedged(self):
+        fake = FakeUpstreams(delay=0.05)
+        fake.slow_first = 2.0
+        client = self.make_client(fake, hedge_after=0.1)
+        started = time.perf_counter()
+        client.generate_image(ImageRequest("exploration", "bridge", "landscape"))
+        self.assertLess(time.perf_counter() - started, 1.0)
+        metrics = client.metrics()
+        self.assertEqual((metrics["hedges"], metrics["hedge_wins"]), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
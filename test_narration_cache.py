@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from narration_cache import NarrationCache
+from narrative_engine import NarrativeEngine
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestNarrationCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_key_covers_all_fields(self):
+        """Model, system prompt, prompt and thinking level all change the key"""
+        base = NarrationCache.make_key("m", "sys", "p", "high")
+        self.assertEqual(base, NarrationCache.make_key("m", "sys", "p", "high"))
+        self.assertNotEqual(base, NarrationCache.make_key("m2", "sys", "p", "high"))
+        self.assertNotEqual(base, NarrationCache.make_key("m", "sys2", "p", "high"))
+        self.assertNotEqual(base, NarrationCache.make_key("m", "sys", "p2", "high"))
+        self.assertNotEqual(base, NarrationCache.make_key("m", "sys", "p", "low"))
+
+    def test_hit_miss_and_ttl(self):
+        """Entries hit until their TTL passes"""
+        cache = NarrationCache(ttl=10, time_fn=self.clock)
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", "text")
+        self.assertEqual(cache.get("k"), "text")
+        self.clock.now += 11
+        self.assertIsNone(cache.get("k"))
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_lru_eviction(self):
+        """The least recently used key is evicted first"""
+        cache = NarrationCache(max_entries=2, time_fn=self.clock)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_variety_mode(self):
+        """Variety mode misses until k alternatives exist, then rotates"""
+        cache = NarrationCache(variety=2, time_fn=self.clock)
+        cache.put("k", "one")
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", "two")
+        seen = {cache.get("k") for _ in range(50)}
+        self.assertEqual(seen, {"one", "two"})
+
+    def test_sqlite_tier_survives_restart(self):
+        """Entries written to SQLite are found by a fresh cache"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            NarrationCache(db_path=path, time_fn=self.clock).put("k", "persisted")
+            cache = NarrationCache(db_path=path, time_fn=self.clock)
+            self.assertEqual(cache.get("k"), "persisted")
+            self.assertEqual(cache.get_stats()["disk_hits"], 1)
+
+    def test_engine_uses_cache(self):
+        """NarrativeEngine serves repeated prompts from the cache"""
+        engine = NarrativeEngine(use_http=False, cache=NarrationCache())
+        engine._call_ollama_uncached = MagicMock(return_value="A smoky tavern.")
+        first = engine.describe_scene("Starting Tavern", ["A", "B"])
+        second = engine.describe_scene("Starting Tavern", ["A", "B"])
+        self.assertEqual(first, second)
+        engine._call_ollama_uncached.assert_called_once()
+
+    def test_engine_does_not_cache_fallback(self):
+        """The error placeholder is never cached"""
+        engine = NarrativeEngine(use_http=False, cache=NarrationCache())
+        engine._call_ollama_uncached = MagicMock(return_value=NarrativeEngine.FALLBACK_TEXT)
+        engine.describe_scene("Starting Tavern", [])
+        engine.describe_scene("Starting Tavern", [])
+        self.assertEqual(engine._call_ollama_uncached.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+from types import SimpleNamespace
+
+from narration_prompt import (
+    ADAPTIVE_STORY_INSTRUCTIONS, NARRATIVE_INSTRUCTIONS, ContextCacheRegistry,
+    assemble_prompt, canonical_json, estimate_tokens
+)
+
+
+def make_context(**overrides):
+    values = dict(
+        campaign_id="camp",
+        session_id="s1",
+        current_scene="A mysterious tavern",
+        player_actions=["Entered tavern", "Approached bartender"],
+        npc_states={"bartender": {"mood": "suspicious", "trust": 0.3}},
+        world_state={"weather": "stormy", "time": "night"},
+        campaign_tone="mystery",
+        difficulty_level="medium",
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAssemblePrompt(unittest.TestCase):
+    def test_layout_is_stable_prefix_then_request(self):
+        """Instructions, then compact state, then the volatile request"""
+        prompt = assemble_prompt(make_context(), "What do I see?")
+        text = prompt.as_text()
+        self.assertTrue(text.startswith(NARRATIVE_INSTRUCTIONS))
+        self.assertLess(text.index("CAMPAIGN STATE"), text.index("CURRENT SCENE"))
+        self.assertLess(text.index("CURRENT SCENE"), text.index("What do I see?"))
+        self.assertIn(canonical_json({"mood": "suspicious", "trust": 0.3}), prompt.context)
+        self.assertNotIn("\n  ", prompt.context)
+
+    def test_state_hash_ignores_request_and_key_order(self):
+        """Only the campaign state and instructions change the context hash"""
+        base = assemble_prompt(make_context(), "Look around")
+        reordered = assemble_prompt(make_context(world_state={"time": "night", "weather": "stormy"}), "Leave")
+        moved = assemble_prompt(make_context(current_scene="The docks", player_actions=["Ran"]), "Hide")
+        self.assertEqual(base.context_hash, reordered.context_hash)
+        self.assertEqual(base.context_hash, moved.context_hash)
+        self.assertNotEqual(base.context_hash,
+                            assemble_prompt(make_context(world_state={"weather": "clear"}), "Look").context_hash)
+        self.assertNotEqual(base.context_hash,
+                            assemble_prompt(make_context(), "Look", instructions=ADAPTIVE_STORY_INSTRUCTIONS).context_hash)
+
+    def test_only_recent_actions_are_sent(self):
+        actions = [f"action {n}" for n in range(20)]
+        prompt = assemble_prompt(make_context(player_actions=actions), "Next", recent_actions=3)
+        self.assertIn("- action 19", prompt.request)
+        self.assertIn("- action 17", prompt.request)
+        self.assertNotIn("action 16", prompt.as_text())
+
+    def test_budget_prunes_off_scene_npcs_first(self):
+        """Over budget, NPCs nobody mentions go before those in the scene"""
+        npcs = {f"npc{n}": {"notes": "x" * 400} for n in range(40)}
+        npcs["bartender"] = {"notes": "y" * 400}
+        prompt = assemble_prompt(make_context(npc_states=npcs), "Talk", token_budget=1000)
+        state = prompt.context
+        self.assertIn("y" * 400, state)
+        self.assertTrue(prompt.pruned_npcs)
+        self.assertNotIn("bartender", prompt.pruned_npcs)
+        self.assertIn('"omitted"', state)
+        self.assertLessEqual(estimate_tokens(state) + estimate_tokens(prompt.request), 1000)
+
+    def test_budget_then_prunes_world_and_actions(self):
+        world = {"history": "h" * 8000, "weather": "rain"}
+        actions = ["a" * 200 for _ in range(5)]
+        prompt = assemble_prompt(make_context(world_state=world, player_actions=actions, npc_states={}),
+                                 "Go", recent_actions=5, token_budget=250)
+        self.assertEqual(prompt.pruned_world_keys[0], "history")
+        self.assertGreater(prompt.dropped_actions, 0)
+        self.assertIn("- " + "a" * 200, prompt.request)
+
+    def test_long_actions_are_clipped(self):
+        prompt = assemble_prompt(make_context(player_actions=["z" * 1000]), "Go")
+        self.assertNotIn("z" * 300, prompt.request)
+
+
+class TestContextCacheRegistry(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.created = []
+        self.deleted = []
+
+    def registry(self, **kwargs):
+        def create(prompt, ttl):
+            self.created.append(prompt.context_hash)
+            return f"cachedContents/{len(self.created)}"
+        kwargs.setdefault("min_tokens", 0)
+        return ContextCacheRegistry(create, self.deleted.append, time_fn=self.clock, **kwargs)
+
+    def test_reuses_handle_for_same_state(self):
+        registry = self.registry(ttl=600)
+        first = registry.handle_for(assemble_prompt(make_context(), "one"))
+        second = registry.handle_for(assemble_prompt(make_context(), "two"))
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(registry.metrics()["hits"], 1)
+        self.assertGreater(registry.metrics()["tokens_reused"], 0)
+
+    def test_refreshes_before_expiry(self):
+        registry = self.registry(ttl=600)
+        prompt = assemble_prompt(make_context(), "one")
+        registry.handle_for(prompt)
+        self.clock.now += 600 - ContextCacheRegistry.EXPIRY_MARGIN + 1
+        self.assertEqual(registry.handle_for(prompt), "cachedContents/2")
+
+    def test_small_prefix_is_not_cached(self):
+        registry = self.registry(min_tokens=10_000)
+        self.assertIsNone(registry.handle_for(assemble_prompt(make_context(), "one")))
+        self.assertEqual(self.created, [])
+        self.assertEqual(registry.metrics()["too_small"], 1)
+
+    def test_failures_back_off(self):
+        calls = []
+
+        def create(prompt, ttl):
+            calls.append(prompt)
+            raise RuntimeError("unsupported")
+        registry = ContextCacheRegistry(create, min_tokens=0, retry_after=300, time_fn=self.clock)
+        prompt = assemble_prompt(make_context(), "one")
+        self.assertIsNone(registry.handle_for(prompt))
+        self.assertIsNone(registry.handle_for(prompt))
+        self.assertEqual(len(calls), 1)
+        self.clock.now += 301
+        registry.handle_for(prompt)
+        self.assertEqual(len(calls), 2)
+
+    def test_evicts_oldest_and_invalidate_deletes(self):
+        registry = self.registry(max_entries=2)
+        prompts = [assemble_prompt(make_context(session_id=f"s{n}"), "go") for n in range(3)]
+        for prompt in prompts:
+            registry.handle_for(prompt)
+        self.assertEqual(self.deleted, ["cachedContents/1"])
+        registry.invalidate(prompts[2])
+        self.assertEqual(self.deleted, ["cachedContents/1", "cachedContents/3"])
+        self.assertEqual(registry.metrics()["handles"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from narration_stream import aiter_streamed, current_stream, stream_sse, stream_to
+from narrative_engine import NarrativeEngine
+
+
+def parse_sse(chunks):
+    """[(event, data)] from SSE text, skipping keep-alive comments"""
+    events = []
+    for block in "".join(chunks).split("\n\n"):
+        if not block or block.startswith(":"):
+            continue
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def fake_generation(*pieces):
+    """Stand-in for an engine call: one segment, streamed piece by piece"""
+    stream = current_stream()
+    write = stream.segment() if stream else None
+    for piece in pieces:
+        if write:
+            write(piece)
+    return "".join(pieces)
+
+
+class TestNarrationStream(unittest.TestCase):
+    def test_stream_to_numbers_segments_and_restores(self):
+        """Each generation gets its own segment; the stream only lives inside the block"""
+        seen = []
+        with stream_to(lambda segment, text: seen.append((segment, text))):
+            fake_generation("The ", "tavern")
+            fake_generation("A goblin")
+        self.assertEqual(seen, [(0, "The "), (0, "tavern"), (1, "A goblin")])
+        self.assertIsNone(current_stream())
+
+    def test_sse_tokens_then_result(self):
+        """Tokens arrive as events before the final result, which carries timings"""
+        def build():
+            return {"success": True, "narrative": fake_generation("Once ", "upon")}
+
+        events = parse_sse(stream_sse(build, "scene"))
+        self.assertEqual([e for e, _ in events], ["token", "token", "scene"])
+        self.assertEqual(events[0][1], {"segment": 0, "text": "Once "})
+        final = events[-1][1]
+        self.assertEqual(final["narrative"], "Once upon")
+        self.assertIsNotNone(final["time_to_first_token_ms"])
+        self.assertGreaterEqual(final["total_ms"], final["time_to_first_token_ms"])
+
+    def test_sse_error(self):
+        """A failing build ends the stream with an error event"""
+        def build():
+            fake_generation("partial")
+            raise RuntimeError("quota exceeded")
+
+        events = parse_sse(stream_sse(build, "scene"))
+        self.assertEqual(events[-1], ("error", {"success": False, "error": "quota exceeded"}))
+
+    def test_async_iterator(self):
+        """aiter_streamed yields chunks in order, then raises the call's error"""
+        async def collect(fn):
+            return [chunk async for chunk in aiter_streamed(fn)]
+
+        chunks = asyncio.run(collect(lambda: fake_generation("a", "b", "c")))
+        self.assertEqual(chunks, [(0, "a"), (0, "b"), (0, "c")])
+
+        def failing():
+            fake_generation("a")
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(collect(failing))
+
+    def test_ollama_engine_emits_whole_replies(self):
+        """The unstreamed Ollama engine still feeds the stream, one segment per reply"""
+        engine = NarrativeEngine(use_http=False, cache=MagicMock(get=MagicMock(return_value=None)))
+        seen = []
+        with patch.object(engine, "_call_ollama_uncached", side_effect=["Torches flicker.", "Steel rings."]):
+            with stream_to(lambda segment, text: seen.append((segment, text))):
+                engine.describe_scene("Tavern", ["Hero"])
+                engine.describe_combat("Hero", "Orc", "attacks", 3)
+        self.assertEqual(seen, [(0, "Torches flicker."), (1, "Steel rings.")])
+
+
+class TestStreamingRoutes(unittest.TestCase):
+    def setUp(self):
+        import dnd_narrative_server as server
+        self.server = server
+        self.client = server.app.test_client()
+
+    def tearDown(self):
+        self.server.game_sessions.pop("stream-test", None)
+
+    def test_next_scene_stream(self):
+        session = MagicMock(session_id="stream-test")
+        session.generate_next_scene.side_effect = lambda: {
+            "scene": {"scene_id": 1, "narrative": fake_generation("Dark ", "halls")},
+            "character_states": [], "turn_count": 1, "location": "Crypt"
+        }
+        self.server.game_sessions["stream-test"] = session
+
+        response = self.client.post("/next-scene/stream", json={"session_id": "stream-test"})
+        self.assertEqual(response.mimetype, "text/event-stream")
+        events = parse_sse([response.get_data(as_text=True)])
+        self.assertEqual([e for e, _ in events], ["token", "token", "scene"])
+        self.assertEqual(events[-1][1]["narrative"], "Dark halls")
+
+    def test_stream_rejects_unknown_session(self):
+        response = self.client.post("/generate-chapter/stream", json={"session_id": "nope"})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
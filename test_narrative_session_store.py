@@ -0,0 +1,154 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from narrative_session_store import NarrativeSessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSession:
+    def __init__(self, session_id, scenes=None, images=None):
+        self.session_id = session_id
+        self.scenes = scenes or []
+        self.character_images = images or {}
+
+    def to_dict(self):
+        return {"session_id": self.session_id, "scenes": self.scenes, "character_images": self.character_images}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["session_id"], data["scenes"], data["character_images"])
+
+
+class TestNarrativeSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.clock = FakeClock()
+
+    def make_store(self, **kwargs):
+        kwargs.setdefault("min_resident_seconds", 0)
+        return NarrativeSessionStore(FakeSession.from_dict, self.tmp.name, time_fn=self.clock, **kwargs)
+
+    def test_lru_spills_and_reloads_transparently(self):
+        store = self.make_store(max_sessions=2)
+        for n in range(3):
+            store[f"s{n}"] = FakeSession(f"s{n}", scenes=[{"narrative": f"scene {n}"}])
+            self.clock.now += 1
+        self.assertEqual(store.keys(), ["s1", "s2"])
+        self.assertIn("s0", store)
+        reloaded = store["s0"]
+        self.assertEqual(reloaded.scenes, [{"narrative": "scene 0"}])
+        self.assertEqual(store.keys(), ["s2", "s0"])
+        self.assertEqual(store.metrics()["reloads"], 1)
+
+    def test_images_round_trip_through_files(self):
+        store = self.make_store()
+        images = {"Hero 1": "aGVsbG8=", "Hero 2": "not base64!"}
+        store["s"] = FakeSession("s", images=images)
+        self.assertEqual(store.metrics()["resident_image_bytes"], len("aGVsbG8=") + len("not base64!"))
+        self.assertTrue(store.spill("s"))
+        self.assertEqual(store.metrics()["spilled_sessions"], 1)
+        self.assertEqual(store["s"].character_images, images)
+        self.assertEqual(store.metrics()["spilled_sessions"], 0)
+
+    def test_byte_limit_evicts_oldest(self):
+        store = self.make_store(max_bytes=1000)
+        store["big"] = FakeSession("big", images={"a": "A" * 900})
+        self.clock.now += 1
+        store["next"] = FakeSession("next", images={"b": "B" * 200})
+        self.assertEqual(store.keys(), ["next"])
+        self.assertIn("big", store)
+
+    def test_growth_is_measured_on_access(self):
+        store = self.make_store()
+        session = FakeSession("s")
+        store["s"] = session
+        session.scenes.append({"narrative": "x" * 500})
+        store.get("s")
+        self.assertGreater(store.metrics()["resident_bytes"], 500)
+
+    def test_recently_used_sessions_are_not_evicted(self):
+        store = self.make_store(max_sessions=1, min_resident_seconds=60)
+        store["a"] = FakeSession("a")
+        store["b"] = FakeSession("b")
+        self.assertEqual(len(store), 2)
+        self.clock.now += 61
+        store.get("b")
+        self.assertEqual(store.keys(), ["b"])
+
+    def test_sweep_spills_idle_sessions(self):
+        store = self.make_store(idle_seconds=100)
+        store["old"] = FakeSession("old")
+        self.clock.now += 50
+        store["new"] = FakeSession("new")
+        self.clock.now += 60
+        self.assertEqual(store.sweep(), 1)
+        self.assertEqual(store.keys(), ["new"])
+
+    def test_unknown_and_hostile_ids(self):
+        store = self.make_store()
+        self.assertNotIn("missing", store)
+        self.assertNotIn(None, store)
+        with self.assertRaises(KeyError):
+            store["missing"]
+        store["../../etc"] = FakeSession("../../etc")
+        store.spill("../../etc")
+        self.assertEqual(len(os.listdir(self.tmp.name)), 1)
+        self.assertEqual(store.pop("../../etc"), None)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_slow_reload_runs_once_without_blocking_other_sessions(self):
+        loads = []
+
+        def slow_load(data):
+            loads.append(data["session_id"])
+            time.sleep(0.3)
+            return FakeSession.from_dict(data)
+
+        store = NarrativeSessionStore(slow_load, self.tmp.name, min_resident_seconds=0, time_fn=self.clock)
+        store["cold"] = FakeSession("cold")
+        store["warm"] = FakeSession("warm")
+        store.spill("cold")
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(store["cold"])) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        self.assertIn("cold", store)
+        self.assertEqual(store["warm"].session_id, "warm")
+        self.assertLess(time.perf_counter() - started, 0.2)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(loads, ["cold"])
+        self.assertEqual(len({id(session) for session in results}), 1)
+
+
+class TestNarrativeSessionSpill(unittest.TestCase):
+    def test_narrative_session_round_trip(self):
+        """A real session keeps its party, scenes and inventory across a spill"""
+        from dnd_narrative_server import NarrativeSession
+
+        session = NarrativeSession("round-trip", model="mistral")
+        session.turn_count = 3
+        session.scenes.append({"scene_id": 0, "narrative": "The tavern"})
+        session.game.players[0].hp = 7
+        restored = NarrativeSession.from_dict(session.to_dict())
+        self.assertEqual(restored.to_dict(), session.to_dict())
+        self.assertEqual(restored.game.players[0].hp, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from narrative_engine import NarrativeEngine
+from ollama_pool import OllamaConnectionPool, OllamaPoolError, OllamaTimeoutError
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        _StubHandler.requests_seen.append(payload)
+        if payload["prompt"] == "slow":
+            time.sleep(0.5)
+        body = json.dumps({"response": f"echo: {payload['prompt']}", "done": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestOllamaConnectionPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        _StubHandler.requests_seen = []
+
+    def test_generate_reuses_connection(self):
+        """Sequential requests share a single keep-alive connection"""
+        pool = OllamaConnectionPool(host=self.url, max_connections=2, timeout=5)
+        for i in range(5):
+            self.assertEqual(pool.generate("mistral", f"line {i}", system="DM"), f"echo: line {i}")
+        self.assertEqual(pool.stats["connections_opened"], 1)
+        self.assertEqual(_StubHandler.requests_seen[0]["system"], "DM")
+        self.assertFalse(_StubHandler.requests_seen[0]["stream"])
+        pool.close()
+
+    def test_concurrency_is_bounded(self):
+        """Parallel callers never open more connections than the pool size"""
+        pool = OllamaConnectionPool(host=self.url, max_connections=2, timeout=5)
+        threads = [threading.Thread(target=pool.generate, args=("mistral", "hi")) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertLessEqual(pool.stats["connections_opened"], 2)
+        self.assertEqual(pool.stats["requests"], 8)
+        pool.close()
+
+    def test_refused_connection_backs_off(self):
+        """A refused connection marks the pool unavailable"""
+        pool = OllamaConnectionPool(host="http://127.0.0.1:1", timeout=1, retry_after=60)
+        with self.assertRaises(OllamaPoolError):
+            pool.generate("mistral", "hi")
+        self.assertFalse(pool.is_available())
+
+    def test_read_timeout_does_not_back_off(self):
+        """A slow reply raises a timeout but leaves the pool available"""
+        pool = OllamaConnectionPool(host=self.url, timeout=0.1, retry_after=60)
+        with self.assertRaises(OllamaTimeoutError):
+            pool.generate("mistral", "slow")
+        self.assertTrue(pool.is_available())
+        pool.close()
+
+    def test_engine_does_not_rerun_timed_out_prompt(self):
+        """NarrativeEngine doesn't retry a timed-out prompt on the CLI"""
+        engine = NarrativeEngine(pool=OllamaConnectionPool(host=self.url, timeout=0.1))
+        with patch("narrative_engine.subprocess.run") as mock_run:
+            self.assertEqual(engine._call_ollama("slow"), NarrativeEngine.FALLBACK_TEXT)
+            mock_run.assert_not_called()
+
+    def test_engine_uses_pool(self):
+        """NarrativeEngine narrates through the HTTP pool when available"""
+        engine = NarrativeEngine(pool=OllamaConnectionPool(host=self.url, timeout=5))
+        with patch("narrative_engine.subprocess.run") as mock_run:
+            result = engine.describe_scene("Tavern", ["A", "B"])
+            mock_run.assert_not_called()
+        self.assertTrue(result.startswith("echo: Set the scene"))
+
+    def test_engine_falls_back_to_subprocess(self):
+        """NarrativeEngine falls back to the CLI when the pool fails"""
+        engine = NarrativeEngine(pool=OllamaConnectionPool(host="http://127.0.0.1:1", timeout=1))
+        with patch("narrative_engine.subprocess.run") as mock_run:
+            mock_run.return_value.stdout = "From the CLI "
+            self.assertEqual(engine.describe_scene("Tavern", []), "From the CLI")
+            mock_run.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import threading
+import unittest
+
+from fastapi.testclient import TestClient
+
+from session_service.api import app, manager
+
+
+class TestSessionDeltas(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+        self.session_id = self.client.post("/sessions", json={"turns": 6, "seed": 3}).json()["session_id"]
+
+    def advance(self, **body):
+        response = self.client.post(f"/sessions/{self.session_id}/advance", json=body)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_full_payload_unchanged_without_cursor(self):
+        first = self.advance()
+        self.assertEqual(len(first["frames"]), 2)
+        self.assertEqual(first["frame_offset"], 0)
+        self.assertIsNone(first["event_window"])
+        self.assertTrue(first["frames"][1]["cumulative_events"])
+
+    def test_advance_with_cursor_returns_only_new_frames(self):
+        delta = self.advance(since=1)
+        self.assertEqual((delta["frame_offset"], len(delta["frames"])), (1, 1))
+        self.assertEqual(delta["frames"][0]["cumulative_events"], [])
+        delta = self.advance(steps=2, since=2)
+        self.assertEqual([f["turn"] for f in delta["frames"]], [2, 3])
+
+    def test_client_rebuilds_full_timeline_from_deltas(self):
+        """Merged deltas equal the full payload, cumulative events included"""
+        frames = self.client.get(f"/sessions/{self.session_id}").json()["frames"]
+        while True:
+            delta = self.advance(since=len(frames))
+            for frame in delta["frames"]:
+                cumulative = (frames[-1]["cumulative_events"] + frame["new_events"])[-delta["event_window"]:]
+                frames.append({**frame, "cumulative_events": cumulative})
+            if delta["is_complete"]:
+                break
+        full = self.client.get(f"/sessions/{self.session_id}").json()
+        self.assertEqual(frames, full["frames"])
+        self.assertIsNotNone(delta["conclusion"])
+
+    def test_frame_models_are_memoized(self):
+        self.advance(steps=3)
+        session = manager._require(self.session_id)
+        before = list(session._frames)
+        self.advance(since=0)
+        self.assertTrue(all(a is b for a, b in zip(before, session._frames)))
+
+    def test_stream_auto_advances_to_completion(self):
+        response = self.client.get(f"/sessions/{self.session_id}/stream", params={"interval": 0.01})
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        lines = [line for line in response.text.splitlines() if line]
+        deltas = [json.loads(line) for line in lines]
+        turns = [frame["turn"] for delta in deltas for frame in delta["frames"]]
+        full = self.client.get(f"/sessions/{self.session_id}").json()
+        self.assertEqual(turns, [frame["turn"] for frame in full["frames"]])
+        self.assertTrue(deltas[-1]["is_complete"])
+
+    def test_stream_follows_advances(self):
+        deltas = manager.stream_session(self.session_id, since=1, heartbeat=5)
+        self.assertEqual(next(deltas).frames, [])
+        threading.Timer(0.05, lambda: manager.advance_session(self.session_id)).start()
+        delta = next(deltas)
+        self.assertEqual((delta.frame_offset, len(delta.frames)), (1, 1))
+
+    def test_unknown_session(self):
+        self.assertEqual(self.client.get("/sessions/nope/stream").status_code, 404)
+        self.assertEqual(self.client.post("/sessions/nope/advance", json={}).status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
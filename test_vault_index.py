@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from obsidian_logger import ObsidianLogger
+from vault_index import VaultIndex
+
+OLD_REFERENCE_FILE = """---
+title: Characters
+created: 2024-01-01 00:00:00
+updated: 2024-01-01 00:00:00
+---
+
+# Characters
+
+This is the central reference file for all characters in the game.
+
+## List of Characters
+
+- [[Old Hero]] - Added on 2024-01-01
+*This section will be automatically populated as characters are created.*
+
+## Tags
+#characters #reference
+"""
+
+
+class TestVaultIndex(unittest.TestCase):
+    def setUp(self):
+        self.vault = tempfile.mkdtemp(prefix="vault_index_test_")
+
+    def tearDown(self):
+        shutil.rmtree(self.vault, ignore_errors=True)
+
+    def _logger(self):
+        return ObsidianLogger(self.vault, index_flush_interval=60)
+
+    def _read(self, *parts):
+        with open(os.path.join(self.vault, *parts)) as f:
+            return f.read()
+
+    def test_logging_does_not_rewrite_index_per_entity(self):
+        """Index.md is written on flush, not for every logged entity"""
+        obsidian = self._logger()
+        for i in range(5):
+            obsidian.log_character({"name": f"Hero {i}", "class": "Fighter"})
+        # At most the leading-edge write can have happened within the interval
+        self.assertLessEqual(obsidian._index_writer.stats["flushes"], 1)
+        obsidian.flush()
+        index = self._read("Index.md")
+        for i in range(5):
+            self.assertIn(f"[[Hero {i}]]", index)
+        obsidian.close()
+
+    def test_reference_file_appends_once(self):
+        """Each entity is appended to its reference file exactly once"""
+        obsidian = self._logger()
+        obsidian.log_character({"name": "Aria", "class": "Wizard"})
+        obsidian.log_character({"name": "Aria", "class": "Wizard"})
+        obsidian.log_character({"name": "Borin", "class": "Fighter"})
+        content = self._read("Characters", "Characters.md")
+        self.assertEqual(content.count("[[Aria]]"), 1)
+        self.assertTrue(content.rstrip().splitlines()[-1].startswith("- [[Borin]]"))
+        obsidian.close()
+
+    def test_old_reference_layout_is_migrated(self):
+        """Older reference files keep their entries and get the list moved last"""
+        os.makedirs(os.path.join(self.vault, "Characters"))
+        with open(os.path.join(self.vault, "Characters", "Characters.md"), "w") as f:
+            f.write(OLD_REFERENCE_FILE)
+        obsidian = self._logger()
+        obsidian.log_character({"name": "New Hero", "class": "Rogue"})
+        obsidian.log_character({"name": "Old Hero", "class": "Rogue"})
+        content = self._read("Characters", "Characters.md")
+        self.assertNotIn("automatically populated", content)
+        self.assertEqual(content.count("[[Old Hero]]"), 1)
+        self.assertLess(content.index("## Tags"), content.index("## List of Characters"))
+        self.assertLess(content.index("[[Old Hero]]"), content.index("[[New Hero]]"))
+        obsidian.close()
+
+    def test_sidecar_reload_and_stale_rescan(self):
+        """The sidecar is trusted unless a directory changed since it was saved"""
+        obsidian = self._logger()
+        obsidian.log_character({"name": "Hero", "class": "Fighter"})
+        obsidian.close()
+
+        index = VaultIndex(self.vault, obsidian.directories)
+        self.assertIn("Hero", index.list_notes("characters"))
+        self.assertEqual(index.stats["rescans"], 0)
+
+        with open(os.path.join(self.vault, "Items", "Sword.md"), "w") as f:
+            f.write("# Sword")
+        index = VaultIndex(self.vault, obsidian.directories)
+        self.assertIn("Sword", index.list_notes("items"))
+        self.assertEqual(index.stats["rescans"], 1)
+
+    def test_flush_rescan(self):
+        """flush(rescan=True) picks up notes written by other tools"""
+        obsidian = self._logger()
+        with open(os.path.join(self.vault, "Journals", "Diary.md"), "w") as f:
+            f.write("# Diary")
+        obsidian.flush(rescan=True)
+        self.assertIn("[[Diary]]", self._read("Index.md"))
+        obsidian.close()
+
+    def test_direct_notes_reach_index(self):
+        """Notes written outside the log_* methods are listed on the next flush"""
+        obsidian = self._logger()
+        with open(os.path.join(self.vault, "Journals", "Hero Journal.md"), "w") as f:
+            f.write("# Hero Journal")
+        obsidian.log_character({"name": "Hero", "class": "Fighter"})
+        obsidian.close()
+        self.assertIn("[[Hero Journal]]", self._read("Index.md"))
+
+        obsidian = self._logger()
+        obsidian.flush()
+        index = self._read("Index.md")
+        self.assertIn("[[Hero Journal]]", index)
+        self.assertIn("[[Hero]]", index)
+        obsidian.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
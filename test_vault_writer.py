@@ -0,0 +1,121 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from game_event_manager import GameEventManager
+from vault_writer import VaultWriter, atomic_write_text
+
+
+class TestAtomicWrite(unittest.TestCase):
+    def test_replaces_file_and_leaves_no_temp(self):
+        """The target is replaced and no temp file is left behind"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "Current Run.md")
+            atomic_write_text(path, "old")
+            atomic_write_text(path, "new")
+            with open(path) as f:
+                self.assertEqual(f.read(), "new")
+            self.assertEqual(os.listdir(tmp), ["Current Run.md"])
+
+
+class TestVaultWriter(unittest.TestCase):
+    def test_burst_is_coalesced(self):
+        """Many marks within one interval produce few writes"""
+        flush_fn = MagicMock()
+        writer = VaultWriter(flush_fn, interval=0.2)
+        for _ in range(50):
+            writer.mark_dirty()
+        writer.close()
+        self.assertLessEqual(flush_fn.call_count, 2)
+        self.assertGreaterEqual(flush_fn.call_count, 1)
+        self.assertFalse(writer.dirty)
+
+    def test_background_flush_happens(self):
+        """A pending change is written without an explicit flush"""
+        written = threading.Event()
+        writer = VaultWriter(written.set, interval=0.01)
+        writer.mark_dirty()
+        self.assertTrue(written.wait(2))
+        writer.close()
+
+    def test_flush_only_when_dirty(self):
+        """flush() is a no-op unless dirty or forced"""
+        flush_fn = MagicMock()
+        writer = VaultWriter(flush_fn, interval=60)
+        self.assertFalse(writer.flush())
+        self.assertTrue(writer.flush(force=True))
+        writer.mark_dirty()
+        self.assertTrue(writer.flush())
+        self.assertFalse(writer.flush())
+        writer.close()
+        self.assertEqual(flush_fn.call_count, 2)
+
+    def test_zero_interval_writes_immediately(self):
+        """interval=0 keeps the old write-per-change behaviour"""
+        flush_fn = MagicMock()
+        writer = VaultWriter(flush_fn, interval=0)
+        writer.mark_dirty()
+        writer.mark_dirty()
+        self.assertEqual(flush_fn.call_count, 2)
+
+    def test_flush_errors_are_contained(self):
+        """A failing flush is counted, not raised"""
+        writer = VaultWriter(MagicMock(side_effect=OSError("disk full")), interval=0)
+        writer.mark_dirty()
+        self.assertEqual(writer.stats["errors"], 1)
+
+    def test_failed_flush_is_retried(self):
+        """A write that fails once stays pending and is retried"""
+        written = threading.Event()
+        attempts = []
+
+        def flush_fn():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError("file locked")
+            written.set()
+
+        writer = VaultWriter(flush_fn, interval=0.01)
+        writer.mark_dirty()
+        self.assertTrue(written.wait(2))
+        writer.close()
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(writer.stats["errors"], 1)
+        self.assertFalse(writer.dirty)
+
+class TestGameEventManagerWriter(unittest.TestCase):
+    def test_publish_burst_rewrites_once(self):
+        """A burst of publishes triggers a single Current Run.md render"""
+        dm = MagicMock()
+        run_data = {"characters": []}
+        manager = GameEventManager(MagicMock(), run_data, dungeon_master=dm, flush_interval=60)
+        for i in range(30):
+            manager.publish("character_created", {"name": f"Hero {i}"})
+        self.assertEqual(len(run_data["characters"]), 30)
+        dm.update_current_run.assert_not_called()
+        manager.close()
+        dm.update_current_run.assert_called_once()
+
+    def test_explicit_registration_and_updater(self):
+        """The registered DungeonMaster wins over the plain updater"""
+        updater = MagicMock()
+        manager = GameEventManager(MagicMock(), {}, current_run_updater=updater, flush_interval=0)
+        manager.publish("quest_created", {"name": "Q"})
+        updater.assert_called_once()
+
+        dm = MagicMock()
+        manager.register_dungeon_master(dm)
+        manager.publish("quest_created", {"name": "Q2"})
+        dm.update_current_run.assert_called_once()
+        self.assertEqual(updater.call_count, 1)
+
+    def test_register_rejects_non_dungeon_master(self):
+        manager = GameEventManager(MagicMock(), {}, flush_interval=0)
+        with self.assertRaises(TypeError):
+            manager.register_dungeon_master(object())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+In-memory index of the notes in an Obsidian vault, persisted to a sidecar.
+
+``ObsidianLogger`` used to rebuild ``Index.md`` with an ``os.listdir`` of
+every category directory for each logged entity. ``VaultIndex`` keeps the
+note names per category (and the names already linked from each central
+reference file) in memory, so adding an entity is a set insertion. Note
+lists are saved to ``.vault_index.json`` in the vault root together with
+each directory's mtime; on load, any directory whose mtime changed since
+the save (notes added by other tools, a crash before the save) is
+rescanned, everything else is trusted. ``rescan_changed`` applies the
+same check while running, so notes written directly (journals, other
+tools) are picked up before the next save.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from vault_writer import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_NAME = ".vault_index.json"
+SIDECAR_VERSION = 1
+
+
+class VaultIndex:
+    """
+    Note names per category plus central-reference membership.
+
+    Reference membership is seeded from the reference file itself the first
+    time it is touched in a process, so it is not persisted.
+    """
+
+    def __init__(self, vault_path: str, directories: Dict[str, str]):
+        self.vault_path = vault_path
+        self.directories = dict(directories)
+        self.sidecar_path = os.path.join(vault_path, SIDECAR_NAME)
+        self.notes: Dict[str, Set[str]] = {category: set() for category in self.directories}
+        self.references: Dict[str, Set[str]] = {}
+        # Directory mtime each category's note list was last read at
+        self.mtimes: Dict[str, Optional[int]] = {}
+        self.stats = {"rescans": 0, "loads": 0, "saves": 0}
+        self._lock = threading.RLock()
+        self.load()
+
+    # ------------------------------------------------------------------
+    # Queries and updates
+
+    def add_note(self, category: str, note_name: str) -> bool:
+        """Record a note; returns True if it was not indexed yet."""
+        with self._lock:
+            names = self.notes.setdefault(category, set())
+            if note_name in names:
+                return False
+            names.add(note_name)
+            return True
+
+    def list_notes(self, category: str) -> List[str]:
+        with self._lock:
+            return sorted(self.notes.get(category, ()))
+
+    def has_reference(self, entity_type: str, entity_name: str) -> bool:
+        with self._lock:
+            return entity_name in self.references.get(entity_type, ())
+
+    def add_references(self, entity_type: str, entity_names: Iterable[str]) -> None:
+        with self._lock:
+            self.references.setdefault(entity_type, set()).update(entity_names)
+
+    def remove_reference(self, entity_type: str, entity_name: str) -> None:
+        with self._lock:
+            self.references.get(entity_type, set()).discard(entity_name)
+
+    # ------------------------------------------------------------------
+    # Scanning and persistence
+
+    def rescan(self, categories: Optional[Iterable[str]] = None) -> None:
+        """Rebuild note lists from disk (all categories by default)."""
+        with self._lock:
+            for category in categories if categories is not None else self.directories:
+                directory = self.directories[category]
+                # Read the mtime first: a note written during the scan makes it look stale
+                self.mtimes[category] = self._mtime(directory)
+                self.notes[category] = self._scan(directory)
+                self.stats["rescans"] += 1
+
+    def rescan_changed(self) -> List[str]:
+        """Rescan categories whose directory changed since it was last read."""
+        with self._lock:
+            stale = [category for category, directory in self.directories.items()
+                     if self.mtimes.get(category) != self._mtime(directory)]
+            if stale:
+                self.rescan(stale)
+            return stale
+
+    def load(self) -> None:
+        """Load the sidecar, rescanning directories that changed since it was saved."""
+        with self._lock:
+            data = None
+            if os.path.exists(self.sidecar_path):
+                try:
+                    with open(self.sidecar_path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("version") != SIDECAR_VERSION:
+                        data = None
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable vault index {self.sidecar_path}: {e}")
+                    data = None
+
+            if data is None:
+                self.rescan()
+                return
+
+            saved_notes = data.get("notes", {})
+            saved_mtimes = data.get("mtimes", {})
+            stale = []
+            for category, directory in self.directories.items():
+                if category in saved_notes and saved_mtimes.get(category) == self._mtime(directory):
+                    self.notes[category] = set(saved_notes[category])
+                    self.mtimes[category] = saved_mtimes[category]
+                else:
+                    stale.append(category)
+            if stale:
+                self.rescan(stale)
+            self.stats["loads"] += 1
+
+    def save(self) -> None:
+        """
+        Write the sidecar atomically.
+
+        The mtimes saved are the ones each note list was read at, not the
+        current ones, so a directory changed since its last scan stays stale.
+        """
+        with self._lock:
+            data = {
+                "version": SIDECAR_VERSION,
+                "notes": {category: sorted(names) for category, names in self.notes.items()},
+                "mtimes": dict(self.mtimes),
+            }
+        atomic_write_text(self.sidecar_path, json.dumps(data, indent=1))
+        self.stats["saves"] += 1
+
+    @staticmethod
+    def _scan(directory: str) -> Set[str]:
+        if not os.path.isdir(directory):
+            return set()
+        return {f[:-3] for f in os.listdir(directory) if f.endswith(".md")}
+
+    @staticmethod
+    def _mtime(directory: str) -> Optional[int]:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
@@ -0,0 +1,135 @@
+"""
+Write-behind helpers for vault files that are rewritten on every change.
+
+``VaultWriter`` coalesces bursts of "this file is stale" notifications into
+at most one rewrite per ``interval`` seconds, performed on a background
+thread. ``atomic_write_text`` writes through a temp file and ``os.replace``
+so Obsidian never sees a half-written note.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write_text(path: str, content: str, encoding: str = "utf-8") -> None:
+    """Replace ``path`` with ``content`` atomically (temp file + rename)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def default_flush_interval() -> float:
+    """Seconds between coalesced rewrites, from ``VAULT_FLUSH_INTERVAL``."""
+    try:
+        return max(0.0, float(os.getenv("VAULT_FLUSH_INTERVAL", "1.0")))
+    except ValueError:
+        return 1.0
+
+
+class VaultWriter:
+    """
+    Debounced background writer.
+
+    ``mark_dirty()`` is cheap and may be called any number of times; the
+    ``flush_fn`` runs at most once per ``interval`` while changes keep
+    arriving. ``flush()`` writes synchronously (e.g. at turn end) and
+    ``close()`` flushes pending changes and stops the thread. A failed
+    write stays pending and is retried after the interval. With
+    ``interval=0`` every ``mark_dirty()`` writes immediately.
+    """
+
+    def __init__(self, flush_fn: Callable[[], object], interval: Optional[float] = None,
+                 name: str = "vault-writer"):
+        self.flush_fn = flush_fn
+        self.interval = default_flush_interval() if interval is None else max(0.0, interval)
+        self.name = name
+        self.stats = {"marks": 0, "flushes": 0, "errors": 0}
+
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._closed = False
+        self._last_flush = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    def mark_dirty(self) -> None:
+        """Note that the file is stale; it will be rewritten soon."""
+        with self._cond:
+            self.stats["marks"] += 1
+            self._dirty = True
+            if self.interval == 0 or self._closed:
+                immediate = True
+            else:
+                immediate = False
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+                self._cond.notify()
+        if immediate:
+            self.flush()
+
+    def flush(self, force: bool = False) -> bool:
+        """Write now if there are pending changes (or ``force``); returns True if written."""
+        with self._write_lock:
+            with self._cond:
+                if not (self._dirty or force):
+                    return False
+                self._dirty = False
+            try:
+                self.flush_fn()
+                self.stats["flushes"] += 1
+                return True
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"{self.name}: flush failed: {e}")
+                # Keep the change pending so the background thread retries it
+                with self._cond:
+                    self._dirty = True
+                return False
+            finally:
+                with self._cond:
+                    self._last_flush = time.monotonic()
+
+    @property
+    def dirty(self) -> bool:
+        with self._cond:
+            return self._dirty
+
+    def close(self) -> None:
+        """Flush pending changes and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Debounce: wait out the rest of the interval since the last write
+                remaining = self._last_flush + self.interval - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+            self.flush()